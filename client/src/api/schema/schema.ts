@@ -14311,6 +14311,7 @@ export interface operations {
              * @deprecated
              * @description Legacy name for the `dataset_details` parameter.
              */
+            /** @description Only return contents after the item identified by `<hid>-<type_id>`, usually the last item of the previous page. Only valid when ordering by `hid`, unlike `offset` the cost of a page doesn't grow with its position in the history. */
             /**
              * @deprecated
              * @description A comma-separated list of encoded `HDA/HDCA` IDs. If this list is provided, only information about the specific datasets will be returned. Also, setting this value will return `all` details of the content item.
@@ -14338,6 +14339,7 @@ export interface operations {
             query?: {
                 v?: string | null;
                 details?: string | null;
+                after?: string | null;
                 ids?: string | null;
                 types?: string[] | null;
                 deleted?: boolean | null;
@@ -15225,6 +15227,7 @@ export interface operations {
              * @deprecated
              * @description Legacy name for the `dataset_details` parameter.
              */
+            /** @description Only return contents after the item identified by `<hid>-<type_id>`, usually the last item of the previous page. Only valid when ordering by `hid`, unlike `offset` the cost of a page doesn't grow with its position in the history. */
             /**
              * @deprecated
              * @description A comma-separated list of encoded `HDA/HDCA` IDs. If this list is provided, only information about the specific datasets will be returned. Also, setting this value will return `all` details of the content item.
@@ -15252,6 +15255,7 @@ export interface operations {
             query?: {
                 v?: string | null;
                 details?: string | null;
+                after?: string | null;
                 ids?: string | null;
                 types?: string[] | null;
                 deleted?: boolean | null;
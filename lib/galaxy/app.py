@@ -140,6 +140,7 @@ from galaxy.util import (
     StructuredExecutionTimer,
 )
 from galaxy.util.task import IntervalTask
+from galaxy.util.template import template_cache
 from galaxy.util.tool_shed import tool_shed_registry
 from galaxy.visualization.data_providers.registry import DataProviderRegistry
 from galaxy.visualization.genomes import Genomes
@@ -325,6 +326,7 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
             mulled_channels=self.config.mulled_channels,
         )
         mulled_resolution_cache = None
+        mulled_unresolved_cache = None
         if self.config.mulled_resolution_cache_type:
             cache_opts = {
                 "cache.type": self.config.mulled_resolution_cache_type,
@@ -335,10 +337,20 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
                 "cache.table_name": self.config.mulled_resolution_cache_table_name,
                 "cache.schema_name": self.config.mulled_resolution_cache_schema_name,
             }
-            mulled_resolution_cache = CacheManager(**parse_cache_config_options(cache_opts)).get_cache(
-                "mulled_resolution"
-            )
-        self.container_finder = containers.ContainerFinder(app_info, mulled_resolution_cache=mulled_resolution_cache)
+            cache_manager = CacheManager(**parse_cache_config_options(cache_opts))
+            mulled_resolution_cache = cache_manager.get_cache("mulled_resolution")
+            if self.config.mulled_resolution_cache_unresolved_expire > 0:
+                mulled_unresolved_cache = cache_manager.get_cache(
+                    "mulled_unresolved", expire=self.config.mulled_resolution_cache_unresolved_expire
+                )
+        self.container_finder = self._register_singleton(
+            containers.ContainerFinder,
+            containers.ContainerFinder(
+                app_info,
+                mulled_resolution_cache=mulled_resolution_cache,
+                mulled_unresolved_cache=mulled_unresolved_cache,
+            ),
+        )
         self._set_enabled_container_types()
         index_help = getattr(self.config, "index_tool_help", True)
         self.toolbox_search = self._register_singleton(
@@ -407,6 +419,12 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
 
     def _configure_object_store(self, **kwds):
         self.object_store = build_object_store_from_config(self.config, **kwds)
+        if self.config.object_store_metadata_cache_ttl:
+            # configured before the application's execution timer factory
+            statsd_client = ExecutionTimerFactory(self.config).galaxy_statsd_client
+            self.object_store.enable_metadata_cache(
+                self.config.object_store_metadata_cache_ttl, statsd_client=statsd_client
+            )
 
     def _configure_security(self):
         self.security = IdEncodingHelper(id_secret=self.config.id_secret)
@@ -452,6 +470,7 @@ class MinimalGalaxyApplication(BasicSharedApp, HaltableContainer, SentryClientMi
             engine,
             combined_install_database,
             self.config.thread_local_log,
+            record_disk_usage_changes=self.config.disk_usage_reconciliation_interval > 0,
         )
 
         if combined_install_database:
@@ -514,6 +533,10 @@ class GalaxyManagerApplication(MinimalManagerApp, MinimalGalaxyApplication, Inst
         self.execution_timer_factory = self._register_singleton(
             ExecutionTimerFactory, ExecutionTimerFactory(self.config)
         )
+        template_cache.configure(
+            self.config.cheetah_template_cache_size,
+            statsd_client=self.execution_timer_factory.galaxy_statsd_client,
+        )
         self.configure_fluent_log()
         self.application_stack = self._register_singleton(ApplicationStack, application_stack_instance(app=self))
         if configure_logging:
@@ -218,6 +218,7 @@ class MockAppConfig(GalaxyDataTestConfig, CommonConfigurationMixin):
 
         self.umask = 0o77
         self.flush_per_n_datasets = 0
+        self.flush_per_n_jobs = 1000
 
         # Compliance related config
         self.redact_email_in_job_name = False
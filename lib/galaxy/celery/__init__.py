@@ -229,8 +229,11 @@ def setup_periodic_tasks(config, celery_app):
 
     beat_schedule: Dict[str, Dict[str, Any]] = {}
     schedule_task("prune_history_audit_table", config.history_audit_table_prune_interval)
+    schedule_task("compact_history_state_counts", config.history_state_count_compaction_interval)
     schedule_task("cleanup_short_term_storage", config.short_term_storage_cleanup_interval)
     schedule_task("cleanup_expired_notifications", config.expired_notifications_cleanup_interval)
+    schedule_task("reconcile_user_disk_usage", config.disk_usage_reconciliation_interval)
+    schedule_task("prewarm_container_resolution_cache", config.mulled_resolution_cache_prewarm_interval)
 
     if config.object_store_cache_monitor_driver in ["auto", "celery"]:
         schedule_task("clean_object_store_caches", config.object_store_cache_monitor_interval)
@@ -60,6 +60,8 @@ from galaxy.schema.tasks import (
 )
 from galaxy.short_term_storage import ShortTermStorageMonitor
 from galaxy.structured_app import MinimalManagerApp
+from galaxy.tool_util.deps.containers import ContainerFinder
+from galaxy.tool_util.deps.dependencies import ToolInfo
 from galaxy.tools import create_tool_from_representation
 from galaxy.tools.data_fetch import do_fetch
 from galaxy.util import galaxy_directory
@@ -94,6 +96,15 @@ def recalculate_user_disk_usage(
         log.error("Recalculate user disk usage task received without user_id.")
 
 
+@galaxy_task(action="reconcile users' disk usage")
+def reconcile_user_disk_usage(session: galaxy_scoped_session, object_store: BaseObjectStore):
+    """Recalculate the disk usage of users whose usage changed since it was last recalculated."""
+    for user_id in model.UserDiskUsageLedger.user_ids(session):
+        user = session.get(User, user_id)
+        if user:
+            user.calculate_and_set_disk_usage(object_store)
+
+
 @galaxy_task(ignore_result=True, action="purge a history dataset")
 def purge_hda(hda_manager: HDAManager, hda_id: int, task_user_id: Optional[int] = None):
     hda = hda_manager.by_id(hda_id)
@@ -153,7 +164,7 @@ def change_datatype(
         return
     if datatype == "auto":
         path = dataset_instance.dataset.get_file_name()
-        datatype = sniff.guess_ext(path, datatypes_registry.sniff_order)
+        datatype = sniff.guess_ext(path, datatypes_registry.sniff_index)
     datatypes_registry.change_datatype(dataset_instance, datatype)
     with transaction(sa_session):
         sa_session.commit()
@@ -461,6 +472,29 @@ def prune_history_audit_table(sa_session: galaxy_scoped_session):
     model.HistoryAudit.prune(sa_session)
 
 
+@galaxy_task(action="compacting history state counts")
+def compact_history_state_counts(sa_session: galaxy_scoped_session):
+    """Merge the rows of the ever growing history_state_count table."""
+    model.HistoryStateCount.compact(sa_session)
+
+
+@galaxy_task(action="prewarming the container resolution cache")
+def prewarm_container_resolution_cache(app: MinimalManagerApp, container_finder: ContainerFinder):
+    """Resolve mulled container images of all installed tools into the persistent resolution cache."""
+    tool_infos = (
+        ToolInfo(
+            tool.containers,
+            tool.requirements,
+            tool.requires_galaxy_python_environment,
+            tool_id=tool.id,
+            tool_version=tool.version,
+        )
+        for _, tool in app.toolbox.tools()
+    )
+    resolved = container_finder.prewarm_resolution_cache(tool_infos)
+    log.info(f"Prewarmed container resolution cache with {resolved} mulled image names")
+
+
 @galaxy_task(action="clean up short term storage")
 def cleanup_short_term_storage(storage_monitor: ShortTermStorageMonitor):
     """Cleanup short term storage."""
@@ -19,6 +19,7 @@ log = logging.getLogger(__name__)
 @build_sniff_from_prefix
 class SnapHmm(Text):
     file_ext = "snaphmm"
+    sniff_prefix_signatures = (b"zoeHMM",)
     edam_data = "data_1364"
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
@@ -48,6 +49,7 @@ class Augustus(CompressedArchive):
     """
 
     file_ext = "augustus"
+    sniff_requires_tar = True
     edam_data = "data_0950"
     compressed = True
 
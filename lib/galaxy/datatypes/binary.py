@@ -294,6 +294,7 @@ class Meryldb(CompressedArchive):
     """MerylDB is a tar.gz archive, with 128 files. 64 data files and 64 index files."""
 
     file_ext = "meryldb"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         """
@@ -324,6 +325,7 @@ class Visium(CompressedArchive):
     """Visium is a tar.gz archive with at least a 'Spatial' subfolder, a filtered h5 file and a raw h5 file."""
 
     file_ext = "visium.tar.gz"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         """
@@ -2268,6 +2270,7 @@ class Sff(Binary):
     edam_format = "format_3284"
     edam_data = "data_0924"
     file_ext = "sff"
+    sniff_prefix_signatures = (b".sff",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         # The first 4 bytes of any sff file is '.sff', and the file is binary. For details
@@ -3120,6 +3123,7 @@ class Sra(Binary):
     """Sequence Read Archive (SRA) datatype originally from mdshw5/sra-tools-galaxy"""
 
     file_ext = "sra"
+    sniff_prefix_signatures = (b"NCBI.sra",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         """The first 8 bytes of any NCBI sra file is 'NCBI.sra', and the file is binary.
@@ -3165,6 +3169,7 @@ class RData(CompressedArchive):
     VERSION_2_PREFIX = b"RDX2\nX\n"
     VERSION_3_PREFIX = b"RDX3\nX\n"
     file_ext = "rdata"
+    sniff_prefix_signatures = (VERSION_2_PREFIX, VERSION_3_PREFIX)
 
     MetadataElement(
         name="version",
@@ -3505,6 +3510,7 @@ class PostgresqlArchive(CompressedArchive):
         visible=True,
     )
     file_ext = "postgresql"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3561,6 +3567,7 @@ class MongoDBArchive(CompressedArchive):
         visible=True,
     )
     file_ext = "mongodb"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3637,6 +3644,7 @@ class Fast5Archive(CompressedArchive):
         name="fast5_count", default="0", param=MetadataParameter, desc="Read Count", readonly=True, visible=True
     )
     file_ext = "fast5.tar"
+    sniff_requires_tar = True
 
     def set_meta(self, dataset: DatasetProtocol, overwrite: bool = True, **kwd) -> None:
         super().set_meta(dataset, overwrite=overwrite, **kwd)
@@ -3791,6 +3799,7 @@ class NetCDF(Binary):
     """Binary data in netCDF format"""
 
     file_ext = "netcdf"
+    sniff_prefix_signatures = (b"CDF",)
     edam_format = "format_3650"
     edam_data = "data_0943"
 
@@ -4036,6 +4045,7 @@ class Parquet(Binary):
     """
 
     file_ext = "parquet"
+    sniff_prefix_signatures = (b"PAR1",)
 
     def __init__(self, **kwd):
         super().__init__(**kwd)
@@ -4061,6 +4071,7 @@ class BafTar(CompressedArchive):
     edam_data = "data_2536"  # mass spectrometry data
     edam_format = "format_3712"  # TODO: add more raw formats to EDAM?
     file_ext = "brukerbaf.d.tar"
+    sniff_requires_tar = True
 
     def get_signature_file(self) -> str:
         return "analysis.baf"
@@ -4154,6 +4165,7 @@ class WiffTar(BafTar):
     """
 
     file_ext = "wiff.tar"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         if tarfile.is_tarfile(filename):
@@ -4182,6 +4194,7 @@ class Wiff2Tar(BafTar):
     """
 
     file_ext = "wiff2.tar"
+    sniff_requires_tar = True
 
     def sniff(self, filename: str) -> bool:
         if tarfile.is_tarfile(filename):
@@ -4206,6 +4219,7 @@ class Pretext(Binary):
     """
 
     file_ext = "pretext"
+    sniff_prefix_signatures = (b"pstm",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         # The first 4 bytes of any pretext file is 'pstm', and the rest of the
@@ -187,6 +187,21 @@ def _get_file_size(data):
     return file_size
 
 
+def _file_exists(data) -> bool:
+    if data.dataset.object_store and not data.dataset.external_filename:
+        # avoids pulling objects from remote object stores into their cache
+        return data.dataset.object_store.exists(data.dataset)
+    return os.path.exists(data.get_file_name())
+
+
+def _read_file_start(data, count: int) -> bytes:
+    """Return the first ``count`` bytes of the dataset's file."""
+    if data.dataset.object_store and not data.dataset.external_filename:
+        return bytes(data.dataset.object_store.get_data_range(data.dataset, start=0, count=count))
+    with open(data.get_file_name(), "rb") as fh:
+        return fh.read(count)
+
+
 @p_dataproviders.decorators.has_dataproviders
 class Data(metaclass=DataMeta):
     """
@@ -228,6 +243,12 @@ class Data(metaclass=DataMeta):
     # The dataset contains binary data --> do not space_to_tab or convert newlines, etc.
     # Allow binary file uploads of this type when True.
     is_binary: Union[bool, Literal["maybe"]] = True
+    # Declarative preconditions of the sniffer, used to narrow the sniffers run by guess_ext().
+    # Only honoured when declared on the class that defines the sniff_prefix() (or sniff()) method.
+    # Byte prefixes of which the (decompressed) content must start with one for sniff_prefix() to match.
+    sniff_prefix_signatures: Optional[Tuple[bytes, ...]] = None
+    # The sniffer can only match tar archives.
+    sniff_requires_tar = False
     # Composite datatypes
     composite_type: Optional[str] = None
     composite_files: Dict[str, Any] = {}
@@ -488,7 +509,7 @@ class Data(metaclass=DataMeta):
             trans.fill_template_mako(
                 "/dataset/binary_file.mako",
                 data=data,
-                file_contents=open(data.get_file_name(), "rb").read(max_peek_size),
+                file_contents=_read_file_start(data, max_peek_size),
                 file_size=util.nice_size(file_size),
                 truncated=file_size > max_peek_size,
             ),
@@ -507,7 +528,7 @@ class Data(metaclass=DataMeta):
         return (
             trans.fill_template_mako(
                 "/dataset/large_file.mako",
-                truncated_data=open(data.get_file_name(), "rb").read(max_peek_size),
+                truncated_data=_read_file_start(data, max_peek_size),
                 data=data,
             ),
             headers,
@@ -583,8 +604,8 @@ class Data(metaclass=DataMeta):
         downloading = to_ext is not None
         file_size = _get_file_size(dataset)
 
-        if not os.path.exists(dataset.get_file_name()):
-            raise ObjectNotFound(f"File Not Found ({dataset.get_file_name()}).")
+        if not _file_exists(dataset):
+            raise ObjectNotFound(f"File Not Found ({dataset.get_file_name(sync_cache=False)}).")
 
         if downloading:
             trans.log_event(f"Download dataset id: {str(dataset.id)}")
@@ -20,6 +20,7 @@ class AthenaProject(Text):
     """
 
     file_ext = "prj"
+    sniff_prefix_signatures = (b"# Athena project file",)
     compressed = True
     compressed_format = "gzip"
 
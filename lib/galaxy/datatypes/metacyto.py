@@ -30,6 +30,7 @@ class mSummary(Tabular):
     """Class describing the summary table output by MetaCyto after FCS preprocessing"""
 
     file_ext = "metacyto_summary.txt"
+    sniff_prefix_signatures = (b"study_id\tantibodies\tfilenames",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         return file_prefix.startswith("study_id\tantibodies\tfilenames")
@@ -33,6 +33,7 @@ STOCKHOLM_SEARCH_PATTERN = re.compile(r"#\s+STOCKHOLM\s+1\.0")
 @build_sniff_from_prefix
 class InfernalCM(Text):
     file_ext = "cm"
+    sniff_prefix_signatures = (b"INFERNAL",)
 
     MetadataElement(
         name="number_of_models",
@@ -116,6 +117,7 @@ class Hmmer(Text):
 class Hmmer2(Hmmer):
     edam_format = "format_3328"
     file_ext = "hmm2"
+    sniff_prefix_signatures = (b"HMMER2.0",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         """HMMER2 files start with HMMER2.0"""
@@ -125,6 +127,7 @@ class Hmmer2(Hmmer):
 class Hmmer3(Hmmer):
     edam_format = "format_3329"
     file_ext = "hmm3"
+    sniff_prefix_signatures = (b"HMMER3/f",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         """HMMER3 files start with HMMER3/f"""
@@ -260,6 +263,7 @@ class Stockholm_1_0(Text):
 @build_sniff_from_prefix
 class MauveXmfa(Text):
     file_ext = "xmfa"
+    sniff_prefix_signatures = (b"#FormatVersion Mauve1",)
 
     MetadataElement(
         name="number_of_models",
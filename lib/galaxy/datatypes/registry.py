@@ -40,6 +40,7 @@ from . import (
     xml,
 )
 from .display_applications.application import DisplayApplication
+from .sniff import SniffIndex
 
 if TYPE_CHECKING:
     from galaxy.datatypes.data import Data
@@ -76,6 +77,7 @@ class Registry:
         self.available_tracks = []
         self.set_external_metadata_tool = None
         self.sniff_order = []
+        self._sniff_index: Optional[SniffIndex] = None
         self.upload_file_formats = []
         # Datatype elements defined in local datatypes_conf.xml that contain display applications.
         self.display_app_containers = []
@@ -543,6 +545,14 @@ class Registry:
                                     if sniffer_class not in sniffer_elem_classes:
                                         self.sniffer_elems.append(elem)
 
+    @property
+    def sniff_index(self) -> SniffIndex:
+        """Dispatch index over ``sniff_order``, rebuilt whenever the sniff order changes."""
+        sniff_index = self._sniff_index
+        if sniff_index is None or not sniff_index.built_from(self.sniff_order):
+            sniff_index = self._sniff_index = SniffIndex(self.sniff_order)
+        return sniff_index
+
     def get_datatype_from_filename(self, name):
         max_extension_parts = 3
         generic_datatype_instance = self.get_datatype_by_extension("data")
@@ -14,11 +14,16 @@ import tempfile
 import zipfile
 from functools import partial
 from typing import (
+    Any,
     Callable,
     Dict,
     IO,
+    Iterable,
+    Iterator,
+    List,
     NamedTuple,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -604,6 +609,7 @@ class FilePrefix:
         self.contents_header = contents_header
         self.contents_header_bytes = contents_header_bytes
         self._is_binary = None
+        self._is_tar: Optional[bool] = None
         self._file_size = None
 
     @property
@@ -624,6 +630,15 @@ class FilePrefix:
                 self._is_binary = True
         return self._is_binary
 
+    @property
+    def is_tar(self) -> bool:
+        if self._is_tar is None:
+            try:
+                self._is_tar = is_tar(self.filename)
+            except Exception:
+                self._is_tar = False
+        return self._is_tar
+
     @property
     def file_size(self):
         if self._file_size is None:
@@ -680,11 +695,128 @@ def _get_file_prefix(filename_or_file_prefix: Union[str, FilePrefix], auto_decom
     return filename_or_file_prefix
 
 
+def _sniffer_attribute(datatype, name: str):
+    """Return attribute ``name`` as declared on the class defining the sniffer ``datatype`` uses.
+
+    Sniffer preconditions are only honoured when declared next to the sniffer
+    they describe, so a subclass overriding the sniffer does not inherit
+    preconditions that no longer apply to it.
+    """
+    sniffer = "sniff_prefix" if hasattr(datatype, "sniff_prefix") else "sniff"
+    for klass in type(datatype).__mro__:
+        if sniffer in vars(klass):
+            return vars(klass).get(name)
+    return None
+
+
+def _may_sniff(datatype, compressed_format: Optional[str], binary: bool) -> bool:
+    """Check the compression and binary flags of ``datatype`` against those of a file prefix."""
+    datatype_compressed = getattr(datatype, "compressed", False)
+    if datatype_compressed and not compressed_format and not datatype.file_ext.endswith(".tar"):
+        # we don't auto-detect tar as compressed
+        return False
+    if not datatype_compressed and compressed_format:
+        return False
+    if binary != datatype.is_binary and not datatype.is_binary == "maybe":
+        # Binary detection doesn't match datatype ...
+        compressed_data_for_compressed_text_datatype = (
+            binary and compressed_format and datatype_compressed and not datatype.is_binary
+        )
+        if not compressed_data_for_compressed_text_datatype:
+            # ... and mismatch is not due to compressed text data for a compressed text datatype
+            return False
+    if compressed_format and hasattr(datatype, "sniff_prefix"):
+        # Compare the compressed format detected to the expected.
+        expected_compressed_format = getattr(datatype, "compressed_format", None)
+        if expected_compressed_format and compressed_format != expected_compressed_format:
+            return False
+    return True
+
+
+class SniffIndex:
+    """Dispatch index over a sniff order.
+
+    ``run_sniffers_raw`` used to test every datatype of the sniff order against
+    each file. The index partitions the sniff order once per combination of
+    detected compression format and binary flag. Within a partition datatypes
+    declaring ``sniff_prefix_signatures`` are only offered files whose
+    (decompressed) content starts with one of their signatures, and datatypes
+    declaring ``sniff_requires_tar`` are only offered tar archives. The
+    remaining candidates are returned in sniff order so the first matching
+    sniffer wins exactly as with a linear walk.
+
+    >>> from galaxy.datatypes.registry import example_datatype_registry_for_sample
+    >>> sniff_index = SniffIndex(example_datatype_registry_for_sample().sniff_order)
+    >>> file_prefix = FilePrefix(get_test_fname('1.sff'))
+    >>> candidates = [d.file_ext for d in sniff_index.candidates(file_prefix)]
+    >>> 'sff' in candidates and 'sra' not in candidates and 'fastqsanger' not in candidates
+    True
+    >>> len(candidates) < len(sniff_index)
+    True
+    """
+
+    def __init__(self, sniff_order: Iterable[Any]):
+        self._sniff_order = list(sniff_order)
+        self._preconditions = [
+            (
+                tuple(_sniffer_attribute(datatype, "sniff_prefix_signatures") or ()),
+                bool(_sniffer_attribute(datatype, "sniff_requires_tar")),
+            )
+            for datatype in self._sniff_order
+        ]
+        self._partitions: Dict[Tuple[Optional[str], bool], List[Tuple[Any, Tuple[Tuple[bytes, ...], bool]]]] = {}
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._sniff_order)
+
+    def __len__(self) -> int:
+        return len(self._sniff_order)
+
+    def built_from(self, sniff_order: List[Any]) -> bool:
+        return len(sniff_order) == len(self._sniff_order) and all(
+            a is b for a, b in zip(sniff_order, self._sniff_order)
+        )
+
+    def _partition(self, compressed_format: Optional[str], binary: bool):
+        key = (compressed_format, binary)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = [
+                (datatype, preconditions)
+                for datatype, preconditions in zip(self._sniff_order, self._preconditions)
+                if _may_sniff(datatype, compressed_format, binary)
+            ]
+            self._partitions[key] = partition
+        return partition
+
+    def candidates(self, file_prefix: "FilePrefix") -> Iterator[Any]:
+        """Yield the datatypes that may match ``file_prefix``, in sniff order."""
+        header = file_prefix.contents_header_bytes
+        for datatype, (signatures, requires_tar) in self._partition(file_prefix.compressed_format, file_prefix.binary):
+            if signatures and header is not None and not header.startswith(signatures):
+                continue
+            if requires_tar and not file_prefix.is_tar:
+                continue
+            yield datatype
+
+
 def run_sniffers_raw(file_prefix: FilePrefix, sniff_order):
-    """Run through sniffers specified by sniff_order, return None of None match."""
+    """Run through sniffers specified by sniff_order, return None of None match.
+
+    ``sniff_order`` may be a :class:`SniffIndex` (as provided by the registry's
+    ``sniff_index``), in which case only candidate sniffers are run.
+    """
     fname = file_prefix.filename
     file_ext = None
-    for datatype in sniff_order:
+    if isinstance(sniff_order, SniffIndex):
+        candidates = sniff_order.candidates(file_prefix)
+    else:
+        candidates = (
+            datatype
+            for datatype in sniff_order
+            if _may_sniff(datatype, file_prefix.compressed_format, file_prefix.binary)
+        )
+    for datatype in candidates:
         """
         Some classes may not have a sniff function, which is ok.  In fact,
         Binary, Data, Tabular and Text are examples of classes that should never
@@ -693,27 +825,8 @@ def run_sniffers_raw(file_prefix: FilePrefix, sniff_order):
         from this function after all other datatypes in sniff_order have not been
         successfully discovered.
         """
-        datatype_compressed = getattr(datatype, "compressed", False)
-        if datatype_compressed and not file_prefix.compressed_format and not datatype.file_ext.endswith(".tar"):
-            # we don't auto-detect tar as compressed
-            continue
-        if not datatype_compressed and file_prefix.compressed_format:
-            continue
-        if file_prefix.binary != datatype.is_binary and not datatype.is_binary == "maybe":
-            # Binary detection doesn't match datatype ...
-            compressed_data_for_compressed_text_datatype = (
-                file_prefix.binary and file_prefix.compressed_format and datatype_compressed and not datatype.is_binary
-            )
-            if not compressed_data_for_compressed_text_datatype:
-                # ... and mismatch is not due to compressed text data for a compressed text datatype
-                continue
         try:
             if hasattr(datatype, "sniff_prefix"):
-                if file_prefix.compressed_format and getattr(datatype, "compressed_format", None):
-                    # Compare the compressed format detected
-                    # to the expected.
-                    if file_prefix.compressed_format != datatype.compressed_format:
-                        continue
                 if datatype.sniff_prefix(file_prefix):
                     file_ext = datatype.file_ext
                     break
@@ -809,9 +922,9 @@ def handle_compressed_file(
         compressed_type = file_prefix.compressed_format
     if is_compressed and is_valid:
         if ext in AUTO_DETECT_EXTENSIONS:
-            # attempt to sniff for a keep-compressed datatype (observing the sniff order)
-            sniff_datatypes = filter(lambda d: getattr(d, "compressed", False), datatypes_registry.sniff_order)
-            sniffed_ext = run_sniffers_raw(file_prefix, sniff_datatypes)
+            # attempt to sniff for a keep-compressed datatype (observing the sniff order), the sniff
+            # index only offers compressed datatypes for compressed data
+            sniffed_ext = run_sniffers_raw(file_prefix, datatypes_registry.sniff_index)
             if sniffed_ext:
                 ext = sniffed_ext
                 keep_compressed = True
@@ -909,7 +1022,7 @@ def handle_uploaded_dataset_file_internal(
             # TODO: skip this if we haven't actually converted the dataset
             guessed_ext = guess_ext(
                 converted_path,
-                sniff_order=datatypes_registry.sniff_order,
+                sniff_order=datatypes_registry.sniff_index,
                 auto_decompress=file_prefix.auto_decompress,
             )
 
@@ -925,7 +1038,7 @@ def handle_uploaded_dataset_file_internal(
                 assert _converted_path
                 converted_path = _converted_path
             if ext in AUTO_DETECT_EXTENSIONS:
-                ext = guess_ext(converted_path, sniff_order=datatypes_registry.sniff_order)
+                ext = guess_ext(converted_path, sniff_order=datatypes_registry.sniff_index)
         else:
             ext = guessed_ext
 
@@ -65,6 +65,11 @@ from galaxy.datatypes.sniff import (
     iter_headers,
     validate_tabular,
 )
+from galaxy.datatypes.util.column_types import (
+    ColumnTypeGuesser,
+    DEFAULT_COLUMN_TYPE,
+    guess_column_type,
+)
 from galaxy.util import compression_utils
 from galaxy.util.compression_utils import (
     FileObjType,
@@ -445,75 +450,17 @@ class Tabular(TabularData):
         requested_skip = skip
         if skip is None:
             skip = 0
-        column_type_set_order = ["int", "float", "list", "str"]  # Order to set column types in
-        default_column_type = column_type_set_order[-1]  # Default column type is lowest in list
-        column_type_compare_order = list(column_type_set_order)  # Order to compare column types
-        column_type_compare_order.reverse()
-
-        def type_overrules_type(column_type1, column_type2):
-            if column_type1 is None or column_type1 == column_type2:
-                return False
-            if column_type2 is None:
-                return True
-            for column_type in column_type_compare_order:
-                if column_type1 == column_type:
-                    return True
-                if column_type2 == column_type:
-                    return False
-            # neither column type was found in our ordered list, this cannot happen
-            raise ValueError(f"Tried to compare unknown column types: {column_type1} and {column_type2}")
-
-        def is_int(column_text):
-            # Don't allow underscores in numeric literals (PEP 515)
-            if "_" in column_text:
-                return False
-            try:
-                int(column_text)
-                return True
-            except ValueError:
-                return False
-
-        def is_float(column_text):
-            # Don't allow underscores in numeric literals (PEP 515)
-            if "_" in column_text:
-                return False
-            try:
-                float(column_text)
-                return True
-            except ValueError:
-                if column_text.strip().lower() == "na":
-                    return True  # na is special cased to be a float
-                return False
-
-        def is_list(column_text):
-            return "," in column_text
-
-        def is_str(column_text):
-            # anything, except an empty string, is True
-            if column_text == "":
-                return False
-            return True
-
-        is_column_type = {}  # Dict to store column type string to checking function
-        for column_type in column_type_set_order:
-            is_column_type[column_type] = locals()[f"is_{column_type}"]
-
-        def guess_column_type(column_text):
-            for column_type in column_type_set_order:
-                if is_column_type[column_type](column_text):
-                    return column_type
-            return None
-
         data_lines = 0
         comment_lines = 0
         column_names = None
-        column_types: List = []
-        first_line_column_types = [default_column_type]  # default value is one column of type str
+        column_types: List[Optional[str]] = []
+        first_line_column_types: List[Optional[str]] = [DEFAULT_COLUMN_TYPE]  # default value is one column of type str
+        # Column types are guessed in batches of lines while the file is read once
+        column_type_guesser = ColumnTypeGuesser()
         if dataset.has_data():
             # NOTE: if skip > num_check_lines, we won't detect any metadata, and will use default
             with compression_utils.get_fileobj(dataset.get_file_name()) as dataset_fh:
-                i = 0
-                for line in iter(dataset_fh.readline, ""):
+                for i, line in enumerate(dataset_fh):
                     line = line.rstrip("\r\n")
                     if i == 0:
                         column_names = self.get_column_names(first_line=line)
@@ -522,16 +469,7 @@ class Tabular(TabularData):
                         comment_lines += 1
                     else:
                         data_lines += 1
-                        if max_guess_type_data_lines is None or data_lines <= max_guess_type_data_lines:
-                            fields = line.split("\t")
-                            for field_count, field in enumerate(fields):
-                                if field_count >= len(
-                                    column_types
-                                ):  # found a previously unknown column, we append None
-                                    column_types.append(None)
-                                column_type = guess_column_type(field)
-                                if type_overrules_type(column_type, column_types[field_count]):
-                                    column_types[field_count] = column_type
+                        guess_type = max_guess_type_data_lines is None or data_lines <= max_guess_type_data_lines
                         if i == 0 and requested_skip is None:
                             # This is our first line, people seem to like to upload files that have a header line, but do not
                             # start with '#' (i.e. all column types would then most likely be detected as str).  We will assume
@@ -546,16 +484,20 @@ class Tabular(TabularData):
                             # "column_types": ["list", "float", "float", "str"]  *** would seem to be the 'Truth' by manual
                             # observation that the first line should be included as data.  The old method would have detected as
                             # "column_types": ["int", "int", "str", "list"]
-                            first_line_column_types = column_types
-                            column_types = [None for col in first_line_column_types]
+                            first_line_column_types = []
+                            if guess_type:
+                                first_line_column_types = [guess_column_type(field) for field in line.split("\t")]
+                            column_type_guesser = ColumnTypeGuesser(columns=len(first_line_column_types))
+                        elif guess_type:
+                            column_type_guesser.add(line.split("\t"))
                     if max_data_lines is not None and data_lines >= max_data_lines:
-                        if dataset_fh.tell() != dataset.get_size():
+                        if dataset_fh.read(1):
                             # Clear optional data_lines metadata value
                             data_lines = None  # type: ignore [assignment]
                             # Clear optional comment_lines metadata value; additional comment lines could appear below this point
                             comment_lines = None  # type: ignore [assignment]
                         break
-                    i += 1
+            column_types = column_type_guesser.finish()
 
         # we error on the larger number of columns
         # first we pad our column_types by using data from first line
@@ -566,7 +508,7 @@ class Tabular(TabularData):
         for i in range(len(column_types)):
             if column_types[i] is None:
                 if len(first_line_column_types) <= i or first_line_column_types[i] is None:
-                    column_types[i] = default_column_type
+                    column_types[i] = DEFAULT_COLUMN_TYPE
                 else:
                     column_types[i] = first_line_column_types[i]
         # Set the discovered metadata values for the dataset
@@ -1660,6 +1602,7 @@ class MatrixMarket(TabularData):
     """
 
     file_ext = "mtx"
+    sniff_prefix_signatures = (b"%%MatrixMarket matrix coordinate",)
 
     def __init__(self, **kwd):
         super().__init__(**kwd)
@@ -916,6 +916,7 @@ class IQTree(Text):
     """IQ-TREE format"""
 
     file_ext = "iqtree"
+    sniff_prefix_signatures = (b"IQ-TREE",)
 
     def sniff_prefix(self, file_prefix: FilePrefix) -> bool:
         """
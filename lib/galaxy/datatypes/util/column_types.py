@@ -0,0 +1,155 @@
+"""
+Column type detection for tabular datasets.
+
+A column gets the highest ranked type of any of its values, in the order
+``int`` < ``float`` < ``list`` < ``str``; empty values have no type.
+:class:`ColumnTypeGuesser` receives the rows of a dataset in batches and checks
+all values of a column in a batch at once, by matching a single regular
+expression against the joined values. Values are only looked at one by one if a
+column contains something else than plain decimal numbers.
+"""
+
+import re
+import sys
+from itertools import zip_longest
+from typing import (
+    List,
+    Optional,
+    Sequence,
+)
+
+COLUMN_TYPES = ["int", "float", "list", "str"]
+DEFAULT_COLUMN_TYPE = COLUMN_TYPES[-1]
+DEFAULT_BATCH_SIZE = 10000
+
+_RANK = {column_type: rank for rank, column_type in enumerate(COLUMN_TYPES)}
+# int() refuses to convert more than sys.get_int_max_str_digits() digits (Python >= 3.11)
+_INT_MAX_DIGITS = getattr(sys, "get_int_max_str_digits", lambda: 0)()
+_INT = rf"[+-]?[0-9]{{1,{_INT_MAX_DIGITS}}}" if _INT_MAX_DIGITS else r"[+-]?[0-9]+"
+# the alternatives must not overlap, a value that can be matched in several ways backtracks exponentially
+_FLOAT = r"[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+# newline separated values that are all empty or plain ints (resp. floats)
+_INT_VALUES_RE = re.compile(rf"(?:{_INT})?(?:\n(?:{_INT})?)*")
+_FLOAT_VALUES_RE = re.compile(rf"(?:{_FLOAT})?(?:\n(?:{_FLOAT})?)*")
+
+
+def is_int(column_text: str) -> bool:
+    # Don't allow underscores in numeric literals (PEP 515)
+    if "_" in column_text:
+        return False
+    try:
+        int(column_text)
+        return True
+    except ValueError:
+        return False
+
+
+def is_float(column_text: str) -> bool:
+    # Don't allow underscores in numeric literals (PEP 515)
+    if "_" in column_text:
+        return False
+    try:
+        float(column_text)
+        return True
+    except ValueError:
+        if column_text.strip().lower() == "na":
+            return True  # na is special cased to be a float
+        return False
+
+
+def is_list(column_text: str) -> bool:
+    return "," in column_text
+
+
+def guess_column_type(column_text: str) -> Optional[str]:
+    """
+    >>> [guess_column_type(text) for text in ["1", " -2 ", "2.5e3", "NA", "1_000", "1,2", "chr1", ""]]
+    ['int', 'int', 'float', 'float', 'str', 'list', 'str', None]
+    """
+    if is_int(column_text):
+        return "int"
+    if is_float(column_text):
+        return "float"
+    if is_list(column_text):
+        return "list"
+    if column_text:
+        return "str"
+    return None
+
+
+def column_type_max(column_type1: Optional[str], column_type2: Optional[str]) -> Optional[str]:
+    if column_type1 is None:
+        return column_type2
+    if column_type2 is None or _RANK[column_type1] >= _RANK[column_type2]:
+        return column_type1
+    return column_type2
+
+
+def guess_values_type(values: Sequence[str], column_type: Optional[str] = None) -> Optional[str]:
+    """
+    Return the highest ranked type among ``column_type`` and the types of ``values``.
+
+    >>> guess_values_type(["1", "", "-3"])
+    'int'
+    >>> guess_values_type(["1", "2.5", ""], "int")
+    'float'
+    >>> guess_values_type(["1", "na"])
+    'float'
+    >>> guess_values_type(["1", "1,2", "x"], "float")
+    'str'
+    >>> guess_values_type(["", ""]) is None
+    True
+    """
+    if column_type == DEFAULT_COLUMN_TYPE:
+        return column_type
+    rank = _RANK[column_type] if column_type is not None else -1
+    joined = "\n".join(values)
+    if rank <= _RANK["int"] and _INT_VALUES_RE.fullmatch(joined):
+        return column_type_max(column_type, "int" if any(values) else None)
+    if rank <= _RANK["float"] and _FLOAT_VALUES_RE.fullmatch(joined):
+        # at least one value is not an int or empty
+        return "float"
+    for value in values:
+        column_type = column_type_max(column_type, guess_column_type(value))
+        if column_type == DEFAULT_COLUMN_TYPE:
+            break
+    return column_type
+
+
+class ColumnTypeGuesser:
+    """
+    Guess the types of the columns of rows added one by one.
+
+    >>> guesser = ColumnTypeGuesser(batch_size=2)
+    >>> for row in [["1", "a", "1.5"], ["2", "b"], ["3", "", "x", "4,5"]]:
+    ...     guesser.add(row)
+    >>> guesser.finish()
+    ['int', 'str', 'str', 'list']
+    """
+
+    def __init__(self, columns: int = 0, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.column_types: List[Optional[str]] = [None] * columns
+        self.batch_size = batch_size
+        self._batch: List[List[str]] = []
+
+    def add(self, fields: List[str]) -> None:
+        self._batch.append(fields)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def finish(self) -> List[Optional[str]]:
+        """Return the column types, ``None`` for columns without any value."""
+        self._flush()
+        return self.column_types
+
+    def _flush(self) -> None:
+        batch = self._batch
+        if not batch:
+            return
+        self._batch = []
+        column_types = self.column_types
+        # missing values at the end of short rows are filled in as empty values, which have no type
+        for i, values in enumerate(zip_longest(*batch, fillvalue="")):
+            if i == len(column_types):
+                column_types.append(None)
+            column_types[i] = guess_values_type(values, column_types[i])
@@ -33,6 +33,7 @@ class GenericXml(data.Text):
 
     edam_format = "format_2332"
     file_ext = "xml"
+    sniff_prefix_signatures = (b"<?xml ",)
 
     def set_peek(self, dataset: DatasetProtocol, **kwd) -> None:
         """Set the peek and blurb text"""
@@ -74,6 +74,7 @@ class PermissionProvider(AbstractPermissionProvider):
         self._inp_data = inp_data
         self._user = job.user
         self._permissions = None
+        self._copied_permissions = {}
 
     @property
     def permissions(self):
@@ -94,7 +95,13 @@ class PermissionProvider(AbstractPermissionProvider):
             self._security_agent.set_all_dataset_permissions(primary_data.dataset, permissions, new=True, flush=False)
 
     def copy_dataset_permissions(self, init_from, primary_data):
-        self._security_agent.copy_dataset_permissions(init_from.dataset, primary_data.dataset, flush=False)
+        # All datasets discovered for an output copy the permissions of that output, look them up only once.
+        source = init_from.dataset
+        if source not in self._copied_permissions:
+            self._copied_permissions[source] = self._security_agent.get_permissions(source)
+        self._security_agent.set_all_dataset_permissions(
+            primary_data.dataset, self._copied_permissions[source], flush=False
+        )
 
 
 class MetadataSourceProvider(AbstractMetadataSourceProvider):
@@ -296,6 +303,7 @@ class JobContext(BaseJobContext):
         self.sa_session.add(obj)
 
     def flush(self):
+        self.preallocate_ids()
         with transaction(self.sa_session):
             self.sa_session.commit()
 
@@ -408,6 +416,7 @@ class SessionlessJobContext(SessionlessModelPersistenceContext, BaseJobContext):
         working_directory,
         final_job_state,
         max_discovered_files: Optional[int],
+        metadata_processes: int = 1,
     ):
         # TODO: use a metadata source provider... (pop from inputs and add parameter)
         super().__init__(object_store, export_store, working_directory)
@@ -416,6 +425,7 @@ class SessionlessJobContext(SessionlessModelPersistenceContext, BaseJobContext):
         self.import_store = import_store
         self.final_job_state = final_job_state
         self.max_discovered_files = float("inf") if max_discovered_files is None else max_discovered_files
+        self.metadata_processes = metadata_processes
         self.discovered_file_count = 0
 
     def output_collection_def(self, name):
@@ -491,6 +501,7 @@ def collect_primary_datasets(job_context: Union[JobContext, SessionlessJobContex
         ):
             job_context.increment_discovered_file_count()
             filenames[discovered_file.path] = discovered_file
+        new_primary_datasets = []
         for filename_index, (filename, discovered_file) in enumerate(filenames.items()):
             extra_file_collector = discovered_file.collector
             fields_match = discovered_file.match
@@ -547,9 +558,12 @@ def collect_primary_datasets(job_context: Union[JobContext, SessionlessJobContex
             )
             # Associate new dataset with job
             job_context.add_output_dataset_association(f"__new_primary_file_{name}|{designation}__", primary_data)
-            job_context.add_datasets_to_history([primary_data], for_output_dataset=outdata)
+            new_primary_datasets.append(primary_data)
             # Add dataset to return dict
             primary_datasets[name][designation] = primary_data
+        if new_primary_datasets:
+            # Allocate the hids of all datasets discovered for this output at once.
+            job_context.add_datasets_to_history(new_primary_datasets, for_output_dataset=outdata)
         if primary_output_assigned:
             outdata.name = new_outdata_name
             outdata.init_meta()
@@ -561,8 +575,7 @@ def collect_primary_datasets(job_context: Union[JobContext, SessionlessJobContex
                 sa_session.add(outdata)
 
     # Move discovered outputs to storage and set metdata / peeks
-    for callback in storage_callbacks:
-        callback()
+    job_context.run_storage_callbacks(storage_callbacks)
     return primary_datasets
 
 
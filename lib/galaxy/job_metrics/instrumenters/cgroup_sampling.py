@@ -0,0 +1,237 @@
+"""The module describes the ``cgroup_sampling`` job metrics plugin."""
+import logging
+import math
+import os
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from galaxy.util import nice_size
+from . import InstrumentPlugin
+from .. import formatting
+
+log = logging.getLogger(__name__)
+
+VALID_VERSIONS = ("auto", "1", "2")
+DEFAULT_INTERVAL = 10
+# CPU usage (in cores) below which an interval between two samples is considered idle
+IDLE_CPU_CORES = 0.05
+
+SAMPLES_KEY = "samples"
+SAMPLED_SECONDS_KEY = "sampled_seconds"
+MEMORY_P50_KEY = "memory_p50"
+MEMORY_P95_KEY = "memory_p95"
+MEMORY_MAX_KEY = "memory_max"
+CPU_EFFICIENCY_KEY = "cpu_efficiency"
+IDLE_SECONDS_KEY = "idle_seconds"
+IO_READ_KEY = "io_read_bytes"
+IO_WRITE_KEY = "io_write_bytes"
+
+TITLES = {
+    SAMPLES_KEY: "Number of resource usage samples",
+    SAMPLED_SECONDS_KEY: "Sampled runtime",
+    MEMORY_P50_KEY: "Median memory usage",
+    MEMORY_P95_KEY: "95th percentile memory usage",
+    MEMORY_MAX_KEY: "Max sampled memory usage",
+    CPU_EFFICIENCY_KEY: "CPU efficiency (of allocated cores)",
+    IDLE_SECONDS_KEY: "Idle time",
+    IO_READ_KEY: "Bytes read",
+    IO_WRITE_KEY: "Bytes written",
+}
+
+SAMPLE_FUNCTION = "__instrument_cgroup_sampling_sample"
+SAMPLER_PID = "__instrument_cgroup_sampling_pid"
+# Each sample is a line of the columns: epoch seconds, memory usage in bytes, CPU usage in microseconds,
+# bytes read and bytes written. Values that cannot be read on the compute node are recorded as NA.
+CGROUPSV1_SAMPLE_TEMPLATE = r"""
+if [ -e "/proc/$$/cgroup" -a -d "{cgroup_mount}" -a ! -f "{cgroup_mount}/cgroup.controllers" ]; then
+    {sample_function}() {{
+        memory_path=$(awk -F':' '$2=="memory" {{print $3}}' /proc/$$/cgroup);
+        if [ ! -e "{cgroup_mount}/memory$memory_path/memory.usage_in_bytes" ]; then
+            memory_path="";
+        fi;
+        cpu_path=$(awk -F':' '($2=="cpuacct,cpu") || ($2=="cpu,cpuacct") || ($2=="cpuacct") {{print $3}}' /proc/$$/cgroup);
+        if [ ! -e "{cgroup_mount}/cpuacct$cpu_path/cpuacct.usage" ]; then
+            cpu_path="";
+        fi;
+        blkio_path=$(awk -F':' '$2=="blkio" {{print $3}}' /proc/$$/cgroup);
+        if [ ! -e "{cgroup_mount}/blkio$blkio_path/blkio.throttle.io_service_bytes" ]; then
+            blkio_path="";
+        fi;
+        memory=$(cat "{cgroup_mount}/memory$memory_path/memory.usage_in_bytes" 2>/dev/null);
+        cpu=$(awk '{{printf "%.0f", $1 / 1000}}' "{cgroup_mount}/cpuacct$cpu_path/cpuacct.usage" 2>/dev/null);
+        io=$(awk '$2=="Read" {{r += $3}} $2=="Write" {{w += $3}} END {{print r + 0, w + 0}}' "{cgroup_mount}/blkio$blkio_path/blkio.throttle.io_service_bytes" 2>/dev/null);
+        echo "$(date +%s) ${{memory:-NA}} ${{cpu:-NA}} ${{io:-NA NA}}" >> {samples};
+    }};
+fi
+""".replace(
+    "\n", " "
+).strip()
+CGROUPSV2_SAMPLE_TEMPLATE = r"""
+if [ -e "/proc/$$/cgroup" -a -f "{cgroup_mount}/cgroup.controllers" ]; then
+    {sample_function}() {{
+        cgroup_path=$(awk -F':' '($1=="0") {{print $3}}' /proc/$$/cgroup);
+        memory=$(cat "{cgroup_mount}/${{cgroup_path}}/memory.current" 2>/dev/null);
+        cpu=$(awk '$1=="usage_usec" {{print $2}}' "{cgroup_mount}/${{cgroup_path}}/cpu.stat" 2>/dev/null);
+        io=$(awk '{{for (i = 2; i <= NF; i++) {{split($i, a, "="); if (a[1]=="rbytes") r += a[2]; if (a[1]=="wbytes") w += a[2]}}}} END {{print r + 0, w + 0}}' "{cgroup_mount}/${{cgroup_path}}/io.stat" 2>/dev/null);
+        echo "$(date +%s) ${{memory:-NA}} ${{cpu:-NA}} ${{io:-NA NA}}" >> {samples};
+    }};
+fi
+""".replace(
+    "\n", " "
+).strip()
+# Sample in the background until the job script exits or the sampler is stopped after the tool command.
+START_SAMPLER_TEMPLATE = r"""
+if type {sample_function} > /dev/null 2>&1; then
+    echo "#galaxy_slots ${{GALAXY_SLOTS:-1}}" > {samples};
+    (
+        trap 'kill $sleep_pid 2>/dev/null; exit 0' TERM;
+        while kill -0 $$ 2>/dev/null; do
+            {sample_function};
+            sleep {interval} & sleep_pid=$!;
+            wait $sleep_pid;
+        done
+    ) &
+    {sampler_pid}=$!;
+fi
+""".replace(
+    "\n", " "
+).strip()
+STOP_SAMPLER_TEMPLATE = r"""
+if [ -n "${sampler_pid}" ]; then
+    kill ${sampler_pid} 2>/dev/null;
+    wait ${sampler_pid} 2>/dev/null;
+    {sample_function};
+fi
+""".replace(
+    "\n", " "
+).strip()
+
+Sample = Tuple[int, Optional[int], Optional[int], Optional[int], Optional[int]]
+
+
+class CgroupSamplingPluginFormatter(formatting.JobMetricFormatter):
+    def format(self, key, value):
+        title = TITLES.get(key, key)
+        if key in (MEMORY_P50_KEY, MEMORY_P95_KEY, MEMORY_MAX_KEY, IO_READ_KEY, IO_WRITE_KEY):
+            return title, nice_size(value)
+        elif key in (SAMPLED_SECONDS_KEY, IDLE_SECONDS_KEY):
+            return title, formatting.seconds_to_str(int(value))
+        elif key == CPU_EFFICIENCY_KEY:
+            return title, f"{float(value):.1f}%"
+        return title, int(value)
+
+
+class CgroupSamplingPlugin(InstrumentPlugin):
+    """Plugin that periodically samples memory, cpu and io usage of the job's cgroup
+    and summarizes the resulting time series.
+    """
+
+    plugin_type = "cgroup_sampling"
+    formatter = CgroupSamplingPluginFormatter()
+
+    def __init__(self, **kwargs):
+        self.cgroup_mount = kwargs.get("cgroup_mount", "/sys/fs/cgroup")
+        self.version = str(kwargs.get("version", "auto"))
+        assert self.version in VALID_VERSIONS, f"cgroup metric version option must be one of {VALID_VERSIONS}"
+        self.interval = int(kwargs.get("interval", DEFAULT_INTERVAL))
+        assert self.interval > 0, "cgroup_sampling interval option must be a positive number of seconds"
+
+    def pre_execute_instrument(self, job_directory: str) -> List[str]:
+        samples = self.__samples_file(job_directory)
+        commands: List[str] = []
+        if self.version in ("auto", "1"):
+            commands.append(
+                CGROUPSV1_SAMPLE_TEMPLATE.format(
+                    sample_function=SAMPLE_FUNCTION, samples=samples, cgroup_mount=self.cgroup_mount
+                )
+            )
+        if self.version in ("auto", "2"):
+            commands.append(
+                CGROUPSV2_SAMPLE_TEMPLATE.format(
+                    sample_function=SAMPLE_FUNCTION, samples=samples, cgroup_mount=self.cgroup_mount
+                )
+            )
+        commands.append(
+            START_SAMPLER_TEMPLATE.format(
+                sample_function=SAMPLE_FUNCTION, samples=samples, interval=self.interval, sampler_pid=SAMPLER_PID
+            )
+        )
+        return commands
+
+    def post_execute_instrument(self, job_directory: str) -> List[str]:
+        return [STOP_SAMPLER_TEMPLATE.format(sample_function=SAMPLE_FUNCTION, sampler_pid=SAMPLER_PID)]
+
+    def job_properties(self, job_id, job_directory: str) -> Dict[str, Any]:
+        path = self.__samples_file(job_directory)
+        if not os.path.exists(path):
+            return {}
+        galaxy_slots, samples = self.__read_samples(path)
+        return summarize_samples(samples, galaxy_slots)
+
+    def __samples_file(self, job_directory):
+        return self._instrument_file_path(job_directory, "samples")
+
+    def __read_samples(self, path):
+        galaxy_slots = 1
+        samples: List[Sample] = []
+        with open(path) as infile:
+            for line in infile:
+                try:
+                    if line.startswith("#galaxy_slots"):
+                        galaxy_slots = int(line.split()[1])
+                        continue
+                    fields = line.split()
+                    if len(fields) != 5:
+                        # e.g. the sampler was killed while writing a line
+                        continue
+                    epoch, *counters = fields
+                    samples.append((int(epoch), *(None if value == "NA" else int(value) for value in counters)))
+                except Exception:
+                    log.exception("Caught exception attempting to read resource usage sample line: %s", line)
+        return galaxy_slots, samples
+
+
+def summarize_samples(samples: List[Sample], galaxy_slots: int = 1) -> Dict[str, Any]:
+    """Summarize samples of (epoch, memory bytes, cpu microseconds, bytes read, bytes written)."""
+    properties: Dict[str, Any] = {SAMPLES_KEY: len(samples)}
+    if not samples:
+        return properties
+    properties[SAMPLED_SECONDS_KEY] = samples[-1][0] - samples[0][0]
+
+    memory = sorted(sample[1] for sample in samples if sample[1] is not None)
+    if memory:
+        properties[MEMORY_P50_KEY] = _percentile(memory, 50)
+        properties[MEMORY_P95_KEY] = _percentile(memory, 95)
+        properties[MEMORY_MAX_KEY] = memory[-1]
+
+    # counters are cumulative for the cgroup, only their increase while sampling is attributed to the job
+    cpu = [(sample[0], sample[2]) for sample in samples if sample[2] is not None]
+    if len(cpu) > 1 and cpu[-1][0] > cpu[0][0]:
+        cpu_seconds = (cpu[-1][1] - cpu[0][1]) / 10**6
+        cpu_efficiency = 100 * cpu_seconds / ((cpu[-1][0] - cpu[0][0]) * max(galaxy_slots, 1))
+        properties[CPU_EFFICIENCY_KEY] = round(cpu_efficiency, 2)
+        idle_seconds = 0
+        for (start, start_usage), (end, end_usage) in zip(cpu, cpu[1:]):
+            if end > start and (end_usage - start_usage) / 10**6 < IDLE_CPU_CORES * (end - start):
+                idle_seconds += end - start
+        properties[IDLE_SECONDS_KEY] = idle_seconds
+
+    for key, index in ((IO_READ_KEY, 3), (IO_WRITE_KEY, 4)):
+        values = [sample[index] for sample in samples if sample[index] is not None]
+        if values:
+            properties[key] = values[-1] - values[0]
+    return properties
+
+
+def _percentile(sorted_values: List[int], percent: int) -> int:
+    # nearest-rank percentile
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+__all__ = ("CgroupSamplingPlugin",)
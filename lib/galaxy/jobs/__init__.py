@@ -55,6 +55,10 @@ from galaxy.jobs.mapper import (
     JobMappingException,
     JobRunnerMapper,
 )
+from galaxy.jobs.readiness import (
+    READINESS_TRACKING_FULL,
+    READINESS_TRACKING_MODES,
+)
 from galaxy.jobs.runners import (
     BaseJobRunner,
     JobState,
@@ -308,6 +312,10 @@ class JobConfiguration(ConfiguresHandlers):
 
     DEFAULT_HANDLER_READY_WINDOW_SIZE = 100
 
+    DEFAULT_HANDLER_READINESS_TRACKING = READINESS_TRACKING_FULL
+
+    DEFAULT_HANDLER_READINESS_RECONCILE_INTERVAL = 60
+
     JOB_RESOURCE_CONDITIONAL_XML = """<conditional name="__job_resource">
         <param name="__job_resource__select" type="select" label="Job Resource Parameters">
             <option value="no">Use default job resource parameters</option>
@@ -329,6 +337,8 @@ class JobConfiguration(ConfiguresHandlers):
         self.handler_assignment_methods_configured = False
         self.handler_max_grab = None
         self.handler_ready_window_size = None
+        self.handler_readiness_tracking = None
+        self.handler_readiness_reconcile_interval = None
         self.destinations = {}
         self.default_destination_id = None
         self.tools = {}
@@ -441,6 +451,19 @@ class JobConfiguration(ConfiguresHandlers):
         self.handler_ready_window_size = int(
             handling_config_dict.get("ready_window_size", JobConfiguration.DEFAULT_HANDLER_READY_WINDOW_SIZE)
         )
+        self.handler_readiness_tracking = handling_config_dict.get(
+            "readiness_tracking", JobConfiguration.DEFAULT_HANDLER_READINESS_TRACKING
+        ).lower()
+        assert (
+            self.handler_readiness_tracking in READINESS_TRACKING_MODES
+        ), "Invalid job handler readiness tracking mode '{}', must be one of: {}".format(
+            self.handler_readiness_tracking, ", ".join(READINESS_TRACKING_MODES)
+        )
+        self.handler_readiness_reconcile_interval = int(
+            handling_config_dict.get(
+                "readiness_reconcile_interval", JobConfiguration.DEFAULT_HANDLER_READINESS_RECONCILE_INTERVAL
+            )
+        )
 
         # Parse environments
         job_metrics = self.app.job_metrics
@@ -613,6 +636,8 @@ class JobConfiguration(ConfiguresHandlers):
         else:
             self.app.application_stack.init_job_handling(self)
         self.handler_ready_window_size = JobConfiguration.DEFAULT_HANDLER_READY_WINDOW_SIZE
+        self.handler_readiness_tracking = JobConfiguration.DEFAULT_HANDLER_READINESS_TRACKING
+        self.handler_readiness_reconcile_interval = JobConfiguration.DEFAULT_HANDLER_READINESS_RECONCILE_INTERVAL
         # Set the destination
         self.default_destination_id = "local"
         self.destinations["local"] = [JobDestination(id="local", runner="local")]
@@ -2124,6 +2149,17 @@ class MinimalJobWrapper(HasResourceParameters):
                 )
         except Exception:
             log.exception("Unable to cleanup job %d", self.job_id)
+        self._release_inputs()
+
+    def _release_inputs(self):
+        # Drop the object store cache pins placed on the inputs when the job was dispatched
+        try:
+            job = self.get_job()
+            for dataset_assoc in job.input_datasets + job.input_library_datasets:
+                if dataset_assoc.dataset is not None:
+                    self.object_store.release(dataset_assoc.dataset.dataset, job_id=self.job_id)
+        except Exception:
+            log.exception("Unable to release inputs of job %d", self.job_id)
 
     def _collect_metrics(self, has_metrics, job_metrics_directory=None):
         job = has_metrics.get_job()
@@ -2310,6 +2346,7 @@ class MinimalJobWrapper(HasResourceParameters):
             job=job,
             max_metadata_value_size=self.app.config.max_metadata_value_size,
             max_discovered_files=self.app.config.max_discovered_files,
+            metadata_processes=self.app.config.metadata_processes,
             validate_outputs=self.validate_outputs,
             link_data_only=self.__link_file_check(),
             **kwds,
@@ -5,6 +5,7 @@ import datetime
 import os
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from queue import (
     Empty,
     Queue,
@@ -12,12 +13,15 @@ from queue import (
 from typing import (
     Dict,
     List,
+    Optional,
+    Set,
     Tuple,
     Type,
     Union,
 )
 
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.expression import (
     and_,
     func,
@@ -36,10 +40,17 @@ from galaxy.jobs import (
     TaskWrapper,
 )
 from galaxy.jobs.mapper import JobNotReadyException
+from galaxy.jobs.readiness import (
+    JobReadinessIndex,
+    READINESS_TRACKING_INCREMENTAL,
+)
 from galaxy.managers.jobs import get_jobs_to_check_at_startup
 from galaxy.model.base import transaction
 from galaxy.structured_app import MinimalManagerApp
-from galaxy.util import unicodify
+from galaxy.util import (
+    chunk_iterable,
+    unicodify,
+)
 from galaxy.util.custom_logging import get_logger
 from galaxy.util.monitors import Monitors
 from galaxy.web_stack.handlers import HANDLER_ASSIGNMENT_METHODS
@@ -252,6 +263,16 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         self.waiting_jobs: List[int] = []
         # Contains wrappers of jobs that are limited or ready (so they aren't created unnecessarily/multiple times)
         self.job_wrappers: Dict[int, JobWrapper] = {}
+        # Index of new jobs and the inputs they are waiting on, only used with incremental readiness tracking
+        self.readiness_index: Optional[JobReadinessIndex] = None
+        self._readiness_cycles_since_reconcile = 0
+        # Pins and prefetches the inputs of dispatched jobs off the monitor thread, see __prefetch_job_inputs
+        self.prefetch_executor: Optional[ThreadPoolExecutor] = None
+        if (
+            self.track_jobs_in_database
+            and self.app.job_config.handler_readiness_tracking == READINESS_TRACKING_INCREMENTAL
+        ):
+            self.readiness_index = JobReadinessIndex()
         name = "JobHandlerQueue.monitor_thread"
         self._init_monitor_thread(name, target=self.__monitor, config=app.config)
         self.job_grabber = None
@@ -407,67 +428,10 @@ class JobHandlerQueue(BaseJobHandlerQueue):
             # Clear the session so we get fresh states for job and all datasets
             self.sa_session.expunge_all()
             # Fetch all new jobs
-            hda_not_ready = (
-                self.sa_session.query(model.Job.id)
-                .enable_eagerloads(False)
-                .join(model.JobToInputDatasetAssociation)
-                .join(model.HistoryDatasetAssociation)
-                .join(model.Dataset)
-                .filter(
-                    and_(
-                        model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states)
-                    )
-                )
-                .subquery()
-            )
-            ldda_not_ready = (
-                self.sa_session.query(model.Job.id)
-                .enable_eagerloads(False)
-                .join(model.JobToInputLibraryDatasetAssociation)
-                .join(model.LibraryDatasetDatasetAssociation)
-                .join(model.Dataset)
-                .filter(
-                    and_(
-                        model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states)
-                    )
-                )
-                .subquery()
-            )
-            coalesce_exp = func.coalesce(
-                model.Job.table.c.user_id, model.Job.table.c.session_id
-            )  # accommodate jobs by anonymous users
-            rank = func.rank().over(partition_by=coalesce_exp, order_by=model.Job.table.c.id).label("rank")
-            job_filter_conditions = (
-                (model.Job.state == model.Job.states.NEW),
-                (model.Job.handler == self.app.config.server_name),
-                ~model.Job.table.c.id.in_(select(hda_not_ready)),
-                ~model.Job.table.c.id.in_(select(ldda_not_ready)),
-            )
-            if self.app.config.user_activation_on:
-                job_filter_conditions = job_filter_conditions + (
-                    or_((model.Job.user_id == null()), (model.User.active == true())),
-                )
-            if self.sa_session.bind.name == "sqlite":
-                query_objects = (model.Job,)
+            if self.readiness_index is not None:
+                jobs_to_check = self.__fetch_ready_jobs_incremental()
             else:
-                query_objects = (model.Job, rank)
-            ready_query = (
-                self.sa_session.query(*query_objects)
-                .enable_eagerloads(False)
-                .outerjoin(model.User)
-                .filter(and_(*job_filter_conditions))
-                .order_by(model.Job.id)
-            )
-            if self.sa_session.bind.name == "sqlite":
-                jobs_to_check = ready_query.all()
-            else:
-                ranked = ready_query.subquery()
-                jobs_to_check = (
-                    self.sa_session.query(model.Job)
-                    .join(ranked, model.Job.id == ranked.c.id)
-                    .filter(ranked.c.rank <= self.app.job_config.handler_ready_window_size)
-                    .all()
-                )
+                jobs_to_check = self.__fetch_ready_jobs()
             # Filter jobs with invalid input states
             jobs_to_check = self.__filter_jobs_with_invalid_input_states(jobs_to_check)
             # Fetch all "resubmit" jobs
@@ -501,13 +465,15 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                 pass
         # Ensure that we get new job counts on each iteration
         self.__clear_job_count()
+        # Load everything needed to check the readiness of this iteration's jobs in a fixed number of queries
+        self.__prefetch_ready_window(jobs_to_check)
         # Check resubmit jobs first so that limits of new jobs will still be enforced
         for job in resubmit_jobs:
             log.debug("(%s) Job was resubmitted and is being dispatched immediately", job.id)
             # Reassemble resubmit job destination from persisted value
             jw = self.__recover_job_wrapper(job)
             if jw.is_ready_for_resubmission(job):
-                self.increase_running_job_count(job.user_id, jw.job_destination.id)
+                self.increase_running_job_count(job.user_id, jw.job_destination.id, job.session_id)
                 self.dispatcher.put(jw)
         # Iterate over new and waiting jobs and look for any that are
         # ready to run
@@ -541,6 +507,7 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                 elif job_state == JOB_INPUT_DELETED:
                     log.info("(%d) Job unable to run: one or more inputs deleted" % job.id)
                 elif job_state == JOB_READY:
+                    self.__prefetch_job_inputs(job)
                     self.dispatcher.put(self.job_wrappers.pop(job.id))
                     log.info("(%d) Job dispatched" % job.id)
                 elif job_state == JOB_DELETED:
@@ -581,6 +548,142 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         # Done with the session
         self.sa_session.remove()
 
+    def __fetch_ready_jobs(self):
+        """
+        Query for all new jobs assigned to this handler whose inputs are ready, limited to the ready window size per
+        user.
+        """
+        hda_not_ready = (
+            self.sa_session.query(model.Job.id)
+            .enable_eagerloads(False)
+            .join(model.JobToInputDatasetAssociation)
+            .join(model.HistoryDatasetAssociation)
+            .join(model.Dataset)
+            .filter(
+                and_(model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states))
+            )
+            .subquery()
+        )
+        ldda_not_ready = (
+            self.sa_session.query(model.Job.id)
+            .enable_eagerloads(False)
+            .join(model.JobToInputLibraryDatasetAssociation)
+            .join(model.LibraryDatasetDatasetAssociation)
+            .join(model.Dataset)
+            .filter(
+                and_(model.Job.state == model.Job.states.NEW, model.Dataset.state.in_(model.Dataset.non_ready_states))
+            )
+            .subquery()
+        )
+        coalesce_exp = func.coalesce(
+            model.Job.table.c.user_id, model.Job.table.c.session_id
+        )  # accommodate jobs by anonymous users
+        rank = func.rank().over(partition_by=coalesce_exp, order_by=model.Job.table.c.id).label("rank")
+        job_filter_conditions = (
+            (model.Job.state == model.Job.states.NEW),
+            (model.Job.handler == self.app.config.server_name),
+            ~model.Job.table.c.id.in_(select(hda_not_ready)),
+            ~model.Job.table.c.id.in_(select(ldda_not_ready)),
+        )
+        if self.app.config.user_activation_on:
+            job_filter_conditions = job_filter_conditions + (
+                or_((model.Job.user_id == null()), (model.User.active == true())),
+            )
+        if self.sa_session.bind.name == "sqlite":
+            query_objects = (model.Job,)
+        else:
+            query_objects = (model.Job, rank)
+        ready_query = (
+            self.sa_session.query(*query_objects)
+            .enable_eagerloads(False)
+            .outerjoin(model.User)
+            .filter(and_(*job_filter_conditions))
+            .order_by(model.Job.id)
+        )
+        if self.sa_session.bind.name == "sqlite":
+            return ready_query.all()
+        else:
+            ranked = ready_query.subquery()
+            return (
+                self.sa_session.query(model.Job)
+                .join(ranked, model.Job.id == ranked.c.id)
+                .filter(ranked.c.rank <= self.app.job_config.handler_ready_window_size)
+                .all()
+            )
+
+    def __fetch_ready_jobs_incremental(self):
+        """
+        Determine new jobs that are ready to run using the in-memory readiness index. Only the membership of the set
+        of new jobs and the states of inputs that were not ready on a previous iteration are queried, rather than
+        re-evaluating the input states of every new job. The index is periodically rebuilt from scratch.
+        """
+        index = self.readiness_index
+        assert index is not None
+        self._readiness_cycles_since_reconcile += 1
+        if self._readiness_cycles_since_reconcile >= self.app.job_config.handler_readiness_reconcile_interval:
+            log.debug("Reconciling job readiness index (%d jobs tracked)", len(index))
+            index.clear()
+            self._readiness_cycles_since_reconcile = 0
+        # Jobs currently new and assigned to this handler
+        job_filter_conditions = (
+            (model.Job.state == model.Job.states.NEW),
+            (model.Job.handler == self.app.config.server_name),
+        )
+        new_jobs_query = select(model.Job.id, model.Job.user_id, model.Job.session_id)
+        if self.app.config.user_activation_on:
+            new_jobs_query = new_jobs_query.outerjoin(model.User, model.Job.user_id == model.User.id)
+            job_filter_conditions = job_filter_conditions + (
+                or_((model.Job.user_id == null()), (model.User.active == true())),
+            )
+        new_jobs = {}
+        for job_id, user_id, session_id in self.sa_session.execute(new_jobs_query.where(and_(*job_filter_conditions))):
+            # accommodate jobs by anonymous users
+            new_jobs[job_id] = user_id if user_id is not None else session_id
+        for job_id in index.job_ids - new_jobs.keys():
+            index.remove_job(job_id)
+        # Register untracked jobs along with those of their inputs that are not ready yet
+        untracked_job_ids = [job_id for job_id in new_jobs if job_id not in index]
+        pending = defaultdict(set)
+        for job_ids in chunk_iterable(untracked_job_ids):
+            for job_to_input, input_association in [
+                (model.JobToInputDatasetAssociation, model.HistoryDatasetAssociation),
+                (model.JobToInputLibraryDatasetAssociation, model.LibraryDatasetDatasetAssociation),
+            ]:
+                result = self.sa_session.execute(
+                    select(job_to_input.job_id, model.Dataset.id)
+                    .select_from(job_to_input)
+                    .join(input_association)
+                    .join(model.Dataset)
+                    .where(
+                        and_(
+                            job_to_input.job_id.in_(job_ids),
+                            model.Dataset.state.in_(model.Dataset.non_ready_states),
+                        )
+                    )
+                )
+                for job_id, dataset_id in result:
+                    pending[job_id].add(dataset_id)
+        for job_id in untracked_job_ids:
+            index.add_job(job_id, new_jobs[job_id], pending.get(job_id, ()))
+        # Only inputs that were not ready are checked again
+        for dataset_ids in chunk_iterable(index.pending_dataset_ids()):
+            ready_dataset_ids = self.sa_session.scalars(
+                select(model.Dataset.id).where(
+                    and_(
+                        model.Dataset.id.in_(dataset_ids),
+                        model.Dataset.state.not_in(model.Dataset.non_ready_states),
+                    )
+                )
+            ).all()
+            index.datasets_ready(ready_dataset_ids)
+        ready_job_ids = index.ready_job_ids(self.app.job_config.handler_ready_window_size)
+        jobs = []
+        for job_ids in chunk_iterable(ready_job_ids):
+            jobs.extend(
+                self.sa_session.scalars(select(model.Job).where(model.Job.id.in_(job_ids)).order_by(model.Job.id)).all()
+            )
+        return jobs
+
     def __filter_jobs_with_invalid_input_states(self, jobs):
         """
         Takes  list of jobs and filters out jobs whose input datasets are in invalid state and
@@ -691,7 +794,7 @@ class JobHandlerQueue(BaseJobHandlerQueue):
 
         if state == JOB_READY:
             # PASS.  increase usage by one job (if caching) so that multiple jobs aren't dispatched on this queue iteration
-            self.increase_running_job_count(job.user_id, job_destination.id)
+            self.increase_running_job_count(job.user_id, job_destination.id, job.session_id)
             for job_to_input_dataset_association in job.input_datasets:
                 # We record the input dataset version, now that we know the inputs are ready
                 if job_to_input_dataset_association.dataset:
@@ -732,44 +835,70 @@ class JobHandlerQueue(BaseJobHandlerQueue):
 
         if state == JOB_READY:
             state = self.__check_user_jobs(job, job_wrapper)
-        if state == JOB_READY and self.app.quota_agent.is_over_quota(self.app, job, job_destination):
+        if state == JOB_READY and self.__is_over_quota(job, job_destination):
             return JOB_USER_OVER_QUOTA, job_destination
         # Check total walltime limits
-        if state == JOB_READY and "delta" in self.app.job_config.limits.total_walltime:
-            jobs_to_check = self.sa_session.query(model.Job).filter(
+        if (
+            state == JOB_READY
+            and "delta" in self.app.job_config.limits.total_walltime
+            and self.__get_total_walltime(job) > self.app.job_config.limits.total_walltime["delta"]
+        ):
+            return JOB_USER_OVER_TOTAL_WALLTIME, job_destination
+
+        return state, job_destination
+
+    def __is_over_quota(self, job, job_destination):
+        """Check quota once per user (or history for anonymous users) and object store per iteration."""
+        object_store_id = job_destination.params.get("object_store_id", None) if job_destination else None
+        key = (job.user_id, job.history_id if job.user_id is None else None, object_store_id)
+        if key not in self.window_over_quota:
+            self.window_over_quota[key] = self.app.quota_agent.is_over_quota(self.app, job, job_destination)
+        return self.window_over_quota[key]
+
+    def __get_total_walltime(self, job):
+        """Return the runtime of the user's (or session's) jobs within the total walltime window.
+
+        This is calculated once per user per iteration.
+        """
+        key = (job.user_id, job.session_id if job.user_id is None else None)
+        if key in self.window_total_walltime:
+            return self.window_total_walltime[key]
+        jobs_to_check = (
+            self.sa_session.query(model.Job)
+            .options(selectinload(model.Job.state_history))
+            .filter(
                 model.Job.update_time
                 >= datetime.datetime.now() - datetime.timedelta(self.app.job_config.limits.total_walltime["window"]),
                 model.Job.state == "ok",
             )
-            if job.user_id:
-                jobs_to_check = jobs_to_check.filter(model.Job.user_id == job.user_id)
+        )
+        if job.user_id:
+            jobs_to_check = jobs_to_check.filter(model.Job.user_id == job.user_id)
+        else:
+            jobs_to_check = jobs_to_check.filter(model.Job.session_id == job.session_id)
+        time_spent = datetime.timedelta(0)
+        for finished_job in jobs_to_check:
+            # History is job.state_history
+            started = None
+            finished = None
+            for history in sorted(finished_job.state_history, key=lambda h: h.create_time):
+                if history.state == "running":
+                    started = history.create_time
+                elif history.state == "ok":
+                    finished = history.create_time
+
+            if started is not None and finished is not None:
+                time_spent += finished - started
             else:
-                jobs_to_check = jobs_to_check.filter(model.Job.session_id == job.session_id)
-            time_spent = datetime.timedelta(0)
-            for job in jobs_to_check:
-                # History is job.state_history
-                started = None
-                finished = None
-                for history in sorted(job.state_history, key=lambda h: h.create_time):
-                    if history.state == "running":
-                        started = history.create_time
-                    elif history.state == "ok":
-                        finished = history.create_time
-
-                if started is not None and finished is not None:
-                    time_spent += finished - started
-                else:
-                    log.warning(
-                        "Unable to calculate time spent for job %s; started: %s, finished: %s",
-                        job.id,
-                        started,
-                        finished,
-                    )
-
-            if time_spent > self.app.job_config.limits.total_walltime["delta"]:
-                return JOB_USER_OVER_TOTAL_WALLTIME, job_destination
+                log.warning(
+                    "Unable to calculate time spent for job %s; started: %s, finished: %s",
+                    finished_job.id,
+                    started,
+                    finished,
+                )
 
-        return state, job_destination
+        self.window_total_walltime[key] = time_spent
+        return time_spent
 
     def __verify_in_memory_job_inputs(self, job):
         """Perform the same checks that happen via SQL for in-memory managed
@@ -813,12 +942,118 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         self.user_job_count = None
         self.user_job_count_per_destination = None
         self.total_job_count_per_destination = None
+        # Per-iteration counts and checks for the jobs in the ready window, see __prefetch_ready_window
+        self.window_user_ids: Set[int] = set()
+        self.window_session_ids: Set[int] = set()
+        self.window_user_job_count: Dict[int, int] = {}
+        self.window_user_job_count_per_destination: Dict[int, Dict[str, int]] = {}
+        self.window_session_job_count: Dict[int, int] = {}
+        self.window_over_quota: Dict[Tuple, bool] = {}
+        self.window_total_walltime: Dict[Tuple, datetime.timedelta] = {}
+
+    def __prefetch_job_inputs(self, job):
+        """
+        Let the object store pin the job's inputs in its cache (and pull them in ahead of time if configured to) so
+        that they are available and not evicted while the job is queued and running. Object stores may need to contact
+        remote storage to locate the inputs, so this happens in a background thread rather than the monitor thread.
+        """
+        try:
+            dataset_ids = [
+                dataset_assoc.dataset.dataset_id
+                for dataset_assoc in job.input_datasets + job.input_library_datasets
+                if dataset_assoc.dataset is not None
+            ]
+            if not dataset_ids:
+                return
+            if self.prefetch_executor is None:
+                self.prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="JobInputPrefetch")
+            self.prefetch_executor.submit(self._prefetch_inputs, job.id, dataset_ids)
+        except Exception:
+            log.exception("(%d) Failed to prefetch job inputs", job.id)
+
+    def _prefetch_inputs(self, job_id, dataset_ids):
+        try:
+            for dataset in self.sa_session.query(model.Dataset).filter(model.Dataset.id.in_(dataset_ids)):
+                self.app.object_store.prefetch(dataset, job_id=job_id)
+        except Exception:
+            log.exception("(%d) Failed to prefetch job inputs", job_id)
+        finally:
+            # Done with this thread's session
+            self.sa_session.remove()
+
+    def __prefetch_ready_window(self, jobs):
+        """
+        Bulk load the relationships and job counts needed to check whether the jobs in this iteration's ready window
+        can be dispatched, so that the number of queries issued does not grow with the number of jobs checked.
+        """
+        if not jobs:
+            return
+        # Populate inputs, users and sessions of the jobs already in the session
+        for job_ids in chunk_iterable([job.id for job in jobs]):
+            self.sa_session.query(model.Job).filter(model.Job.id.in_(job_ids)).options(
+                selectinload(model.Job.input_datasets).joinedload(model.JobToInputDatasetAssociation.dataset),
+                selectinload(model.Job.input_library_datasets).joinedload(
+                    model.JobToInputLibraryDatasetAssociation.dataset
+                ),
+                selectinload(model.Job.user),
+                selectinload(model.Job.galaxy_session),
+            ).all()
+        limits = self.app.job_config.limits
+        user_ids = {job.user_id for job in jobs if job.user_id is not None}
+        if user_ids and not self.app.config.cache_user_job_count:
+            # When caching is enabled, counts for all users are loaded in a single query on first use instead
+            if limits.registered_user_concurrent_jobs:
+                for user_id, job_count in self.sa_session.execute(
+                    select(model.Job.table.c.user_id, func.count(model.Job.table.c.id))
+                    .where(
+                        and_(
+                            model.Job.table.c.state.in_(
+                                (model.Job.states.QUEUED, model.Job.states.RUNNING, model.Job.states.RESUBMITTED)
+                            ),
+                            model.Job.table.c.user_id.in_(user_ids),
+                        )
+                    )
+                    .group_by(model.Job.table.c.user_id)
+                ):
+                    self.window_user_job_count[user_id] = job_count
+            for user_id, destination_id, job_count in self.sa_session.execute(
+                select(
+                    model.Job.table.c.user_id,
+                    model.Job.table.c.destination_id,
+                    func.count(model.Job.table.c.id),
+                )
+                .where(
+                    and_(
+                        model.Job.table.c.state.in_((model.Job.states.QUEUED, model.Job.states.RUNNING)),
+                        model.Job.table.c.user_id.in_(user_ids),
+                    )
+                )
+                .group_by(model.Job.table.c.user_id, model.Job.table.c.destination_id)
+            ):
+                self.window_user_job_count_per_destination.setdefault(user_id, {})[destination_id] = job_count
+            self.window_user_ids = user_ids
+        session_ids = {job.session_id for job in jobs if job.user_id is None and job.session_id is not None}
+        if session_ids and limits.anonymous_user_concurrent_jobs:
+            for session_id, job_count in self.sa_session.execute(
+                select(model.Job.table.c.session_id, func.count(model.Job.table.c.id))
+                .where(
+                    and_(
+                        model.Job.table.c.state.in_((model.Job.states.QUEUED, model.Job.states.RUNNING)),
+                        model.Job.table.c.session_id.in_(session_ids),
+                    )
+                )
+                .group_by(model.Job.table.c.session_id)
+            ):
+                self.window_session_job_count[session_id] = job_count
+            self.window_session_ids = session_ids
 
     def get_user_job_count(self, user_id):
         self.__cache_user_job_count()
         # This could have been incremented by a previous job dispatched on this iteration, even if we're not caching
         rval = self.user_job_count.get(user_id, 0)
-        if not self.app.config.cache_user_job_count:
+        if not self.app.config.cache_user_job_count and user_id in self.window_user_ids:
+            rval += self.window_user_job_count.get(user_id, 0)
+        elif not self.app.config.cache_user_job_count:
             result = self.sa_session.execute(
                 select(func.count(model.Job.table.c.id)).where(
                     and_(
@@ -867,6 +1102,10 @@ class JobHandlerQueue(BaseJobHandlerQueue):
             # queue.
             rval = {}
             rval.update(cached)
+            if user_id in self.window_user_ids:
+                for destination_id, job_count in self.window_user_job_count_per_destination.get(user_id, {}).items():
+                    rval[destination_id] = rval.get(destination_id, 0) + job_count
+                return rval
             result = self.sa_session.execute(
                 select(
                     model.Job.table.c.destination_id, func.count(model.Job.table.c.destination_id).label("job_count")
@@ -904,7 +1143,10 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         elif self.user_job_count_per_destination is None:
             self.user_job_count_per_destination = {}
 
-    def increase_running_job_count(self, user_id, destination_id):
+    def increase_running_job_count(self, user_id, destination_id, session_id=None):
+        if user_id is None and session_id in self.window_session_ids:
+            # anonymous jobs are counted per session, the window's counts are not reloaded during the iteration
+            self.window_session_job_count[session_id] = self.window_session_job_count.get(session_id, 0) + 1
         if (
             self.app.job_config.limits.registered_user_concurrent_jobs
             or self.app.job_config.limits.anonymous_user_concurrent_jobs
@@ -961,19 +1203,23 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         elif job.galaxy_session:
             # Anonymous users only get the hard limit
             if self.app.job_config.limits.anonymous_user_concurrent_jobs:
-                count = (
-                    self.sa_session.query(model.Job)
-                    .enable_eagerloads(False)
-                    .filter(
-                        and_(
-                            model.Job.session_id == job.galaxy_session.id,
-                            or_(
-                                model.Job.state == model.Job.states.RUNNING, model.Job.state == model.Job.states.QUEUED
-                            ),
+                if job.session_id in self.window_session_ids:
+                    count = self.window_session_job_count.get(job.session_id, 0)
+                else:
+                    count = (
+                        self.sa_session.query(model.Job)
+                        .enable_eagerloads(False)
+                        .filter(
+                            and_(
+                                model.Job.session_id == job.galaxy_session.id,
+                                or_(
+                                    model.Job.state == model.Job.states.RUNNING,
+                                    model.Job.state == model.Job.states.QUEUED,
+                                ),
+                            )
                         )
+                        .count()
                     )
-                    .count()
-                )
                 if count >= self.app.job_config.limits.anonymous_user_concurrent_jobs:
                     return JOB_WAIT
         else:
@@ -1045,6 +1291,8 @@ class JobHandlerQueue(BaseJobHandlerQueue):
             # A message could still be received while shutting down, should be ok since they will be picked up on next startup.
             self.sleeper.wake()
             self.shutdown_monitor()
+            if self.prefetch_executor is not None:
+                self.prefetch_executor.shutdown(wait=False)
             log.info("job handler queue stopped")
             self.dispatcher.shutdown()
 
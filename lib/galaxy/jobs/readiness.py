@@ -0,0 +1,123 @@
+"""
+Incremental tracking of which ``new`` jobs assigned to a handler are ready to run.
+"""
+from collections import defaultdict
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+
+READINESS_TRACKING_FULL = "full"
+READINESS_TRACKING_INCREMENTAL = "incremental"
+READINESS_TRACKING_MODES = (READINESS_TRACKING_FULL, READINESS_TRACKING_INCREMENTAL)
+
+
+class JobReadinessIndex:
+    """Dependency index mapping jobs to the input datasets they are still waiting on.
+
+    The handler registers every ``new`` job it is responsible for along with the
+    ids of the input datasets that are not yet in a ready state. When datasets
+    become ready the index is notified, and only jobs whose last pending input
+    just became ready move into the ready set - jobs that are still waiting are
+    never re-evaluated.
+
+    >>> index = JobReadinessIndex()
+    >>> index.add_job(1, owner=7, pending_dataset_ids=[10, 11])
+    >>> index.add_job(2, owner=7, pending_dataset_ids=[])
+    >>> index.ready_job_ids()
+    [2]
+    >>> sorted(index.pending_dataset_ids())
+    [10, 11]
+    >>> index.datasets_ready([10])
+    []
+    >>> index.datasets_ready([11])
+    [1]
+    >>> index.ready_job_ids()
+    [1, 2]
+    >>> index.remove_job(2)
+    >>> index.ready_job_ids()
+    [1]
+    """
+
+    def __init__(self):
+        # job id -> ids of input datasets not yet ready
+        self._pending: Dict[int, Set[int]] = {}
+        # dataset id -> ids of jobs waiting on it
+        self._waiters: Dict[int, Set[int]] = defaultdict(set)
+        # job id -> key used to rank jobs per user (user id or session id)
+        self._owners: Dict[int, Optional[Hashable]] = {}
+        self._ready: Set[int] = set()
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._owners
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    @property
+    def job_ids(self) -> Set[int]:
+        return set(self._owners)
+
+    def add_job(self, job_id: int, owner: Optional[Hashable], pending_dataset_ids: Iterable[int]) -> None:
+        if job_id in self._owners:
+            self.remove_job(job_id)
+        pending = set(pending_dataset_ids)
+        self._owners[job_id] = owner
+        if pending:
+            self._pending[job_id] = pending
+            for dataset_id in pending:
+                self._waiters[dataset_id].add(job_id)
+        else:
+            self._ready.add(job_id)
+
+    def remove_job(self, job_id: int) -> None:
+        self._owners.pop(job_id, None)
+        self._ready.discard(job_id)
+        for dataset_id in self._pending.pop(job_id, ()):
+            waiters = self._waiters.get(dataset_id)
+            if waiters is not None:
+                waiters.discard(job_id)
+                if not waiters:
+                    del self._waiters[dataset_id]
+
+    def pending_dataset_ids(self) -> Set[int]:
+        return set(self._waiters)
+
+    def datasets_ready(self, dataset_ids: Iterable[int]) -> List[int]:
+        """Record that ``dataset_ids`` are ready, return ids of jobs that became ready as a result."""
+        newly_ready = []
+        for dataset_id in dataset_ids:
+            for job_id in self._waiters.pop(dataset_id, ()):
+                pending = self._pending.get(job_id)
+                if pending is None:
+                    continue
+                pending.discard(dataset_id)
+                if not pending:
+                    del self._pending[job_id]
+                    self._ready.add(job_id)
+                    newly_ready.append(job_id)
+        return sorted(newly_ready)
+
+    def ready_job_ids(self, window_size: Optional[int] = None) -> List[int]:
+        """Return ready job ids in submission order, at most ``window_size`` per owner."""
+        job_ids = sorted(self._ready)
+        if not window_size:
+            return job_ids
+        per_owner: Dict[Optional[Hashable], int] = defaultdict(int)
+        rval = []
+        for job_id in job_ids:
+            owner = self._owners[job_id]
+            if per_owner[owner] < window_size:
+                per_owner[owner] += 1
+                rval.append(job_id)
+        return rval
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._waiters.clear()
+        self._owners.clear()
+        self._ready.clear()
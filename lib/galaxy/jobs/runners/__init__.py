@@ -2,6 +2,8 @@
 Base classes for job runner plugins.
 """
 import datetime
+import heapq
+import itertools
 import os
 import string
 import subprocess
@@ -87,11 +89,33 @@ class RunnerParams(ParamsWithSpecs):
         raise Exception(JOB_RUNNER_PARAMETER_VALIDATION_FAILED_MESSAGE % name)
 
 
+class RunnerWorkQueue(Queue):
+    """
+    Work queue for a job runner's worker threads that hands work items for the
+    given ``finish_methods`` to a dedicated ``finish_queue`` instead, so that
+    bursts of job completions and job submissions do not starve each other.
+    """
+
+    def __init__(self, finish_queue: "Queue", finish_methods: typing.Iterable[typing.Callable]):
+        super().__init__()
+        self.finish_queue = finish_queue
+        self.finish_methods = list(finish_methods)
+
+    def put(self, item, block=True, timeout=None):
+        if isinstance(item, tuple) and item[0] in self.finish_methods:
+            self.finish_queue.put(item, block=block, timeout=timeout)
+        else:
+            super().put(item, block=block, timeout=timeout)
+
+
 class BaseJobRunner:
     runner_name = "BaseJobRunner"
 
     start_methods = ["_init_monitor_thread", "_init_worker_threads"]
-    DEFAULT_SPECS = dict(recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0))
+    DEFAULT_SPECS = dict(
+        recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+        finish_workers=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+    )
 
     def __init__(self, app: "GalaxyManagerApplication", nworkers: int, **kwargs):
         """Start the job runner"""
@@ -113,8 +137,14 @@ class BaseJobRunner:
             getattr(self, start_method, lambda: None)()
 
     def _init_worker_threads(self):
-        """Start ``nworkers`` worker threads."""
-        self.work_queue = Queue()
+        """Start ``nworkers`` worker threads, plus ``finish_workers`` threads dedicated to finishing jobs."""
+        self.finish_threads = []
+        if self.runner_params.finish_workers:
+            self.finish_queue: typing.Optional[Queue] = Queue()
+            self.work_queue = RunnerWorkQueue(self.finish_queue, self._finish_methods())
+        else:
+            self.finish_queue = None
+            self.work_queue = Queue()
         self.work_threads = []
         log.debug(f"Starting {self.nworkers} {self.runner_name} workers")
         for i in range(self.nworkers):
@@ -122,24 +152,47 @@ class BaseJobRunner:
             worker.daemon = True
             worker.start()
             self.work_threads.append(worker)
+        if self.finish_queue is not None:
+            log.debug(f"Starting {self.runner_params.finish_workers} {self.runner_name} finish workers")
+            for i in range(self.runner_params.finish_workers):
+                worker = threading.Thread(
+                    name="%s.finish_thread-%d" % (self.runner_name, i),
+                    target=self.run_next,
+                    kwargs={"queue": self.finish_queue},
+                )
+                worker.daemon = True
+                worker.start()
+                self.finish_threads.append(worker)
+
+    def _finish_methods(self) -> typing.List[typing.Callable]:
+        """Methods whose work items are run by the finish workers, if any are configured."""
+        return [self.finish_job] if hasattr(self, "finish_job") else []
+
+    def queue_depths(self) -> typing.Dict[str, int]:
+        """Return the number of work items waiting for the worker and finish threads."""
+        return {
+            "work_queue": self.work_queue.qsize(),
+            "finish_queue": self.finish_queue.qsize() if self.finish_queue is not None else 0,
+        }
 
     def _alive_worker_threads(self, cycle=False):
         # yield endlessly as long as there are alive threads if cycle is True
         alive = True
         while alive:
             alive = False
-            for thread in self.work_threads:
+            for thread in self.work_threads + self.finish_threads:
                 if thread.is_alive():
                     if cycle:
                         alive = True
                     yield thread
 
-    def run_next(self):
+    def run_next(self, queue: typing.Optional[Queue] = None):
         """Run the next item in the work queue (a job waiting to run)"""
+        work_queue = queue or self.work_queue
         while self._should_stop is False:
             with self.app.model.session():  # Create a Session instance and ensure it's closed.
                 try:
-                    (method, arg) = self.work_queue.get(timeout=1)
+                    (method, arg) = work_queue.get(timeout=1)
                 except Empty:
                     continue
                 if method is STOP_SIGNAL:
@@ -216,6 +269,9 @@ class BaseJobRunner:
         self._should_stop = True
         for _ in range(len(self.work_threads)):
             self.work_queue.put((STOP_SIGNAL, None))
+        if self.finish_queue is not None:
+            for _ in range(len(self.finish_threads)):
+                self.finish_queue.put((STOP_SIGNAL, None))
 
         if (join_timeout := self.app.config.monitor_thread_join_timeout) > 0:
             log.info("Waiting up to %d seconds for job worker threads to shutdown...", join_timeout)
@@ -739,6 +795,10 @@ class AsynchronousJobState(JobState):
         self._running = False
         self.check_count = 0
         self.start_time = None
+        # Used by the runner monitor to schedule checks of this job, see MonitorSchedule
+        self.last_check_time: typing.Optional[float] = None
+        self.next_check_time: float = 0.0
+        self.unchanged_checks = 0
 
         # job_id is the DRM's job id, not the Galaxy job id
         self.job_id = job_id
@@ -784,6 +844,102 @@ class AsynchronousJobState(JobState):
             self.cleanup_file_attributes.append(attribute)
 
 
+class MonitorSchedule:
+    """
+    Priority queue of watched job states keyed by the time each should next be
+    checked.
+
+    Jobs whose state did not change since their previous check are checked
+    again after an exponentially growing interval (capped at
+    ``max_interval``), while jobs that are new or whose state just changed
+    (e.g. jobs that just started running) are checked on every iteration.
+    """
+
+    def __init__(self, base_interval: float, max_interval: float, factor: float = 2.0):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self._heap: typing.List[typing.Tuple[float, int, AsynchronousJobState]] = []
+        self._counter = itertools.count()
+        # jobs are scheduled by the monitor thread, but may be removed by the worker stopping them
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def job_states(self) -> typing.List[AsynchronousJobState]:
+        with self._lock:
+            return [entry[2] for entry in self._heap]
+
+    def remove(self, job_state: AsynchronousJobState) -> bool:
+        with self._lock:
+            heap = [entry for entry in self._heap if entry[2] is not job_state]
+            if len(heap) == len(self._heap):
+                return False
+            heapq.heapify(heap)
+            self._heap = heap
+            return True
+
+    def interval(self, unchanged_checks: int) -> float:
+        if unchanged_checks <= 0:
+            return 0.0
+        return min(self.base_interval * self.factor ** (unchanged_checks - 1), self.max_interval)
+
+    def reschedule(self, job_state: AsynchronousJobState, changed: bool, now: float) -> None:
+        if changed:
+            job_state.unchanged_checks = 0
+        else:
+            job_state.unchanged_checks += 1
+        job_state.next_check_time = now + self.interval(job_state.unchanged_checks)
+        with self._lock:
+            heapq.heappush(self._heap, (job_state.next_check_time, next(self._counter), job_state))
+
+    def pop_due(self, now: float) -> typing.List[AsynchronousJobState]:
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+        return due
+
+
+class MonitorMetrics:
+    """Counters describing how a runner's monitor thread checks watched jobs."""
+
+    def __init__(self):
+        self.iterations = 0
+        self.checks = 0
+        self.watched = 0
+        self.checks_per_second = 0.0
+        self.average_staleness = 0.0
+        self.queue_depths: typing.Dict[str, int] = {}
+        self._last_iteration_time: typing.Optional[float] = None
+
+    def record_iteration(
+        self,
+        checked: typing.List[AsynchronousJobState],
+        watched: int,
+        now: float,
+        queue_depths: typing.Optional[typing.Dict[str, int]] = None,
+    ) -> None:
+        self.iterations += 1
+        self.queue_depths = queue_depths or {}
+        self.checks += len(checked)
+        self.watched = watched
+        if self._last_iteration_time is not None and now > self._last_iteration_time:
+            self.checks_per_second = len(checked) / (now - self._last_iteration_time)
+        self._last_iteration_time = now
+        staleness = [now - job_state.last_check_time for job_state in checked if job_state.last_check_time is not None]
+        self.average_staleness = sum(staleness) / len(staleness) if staleness else 0.0
+
+    def send(self, statsd_client, prefix: str, checked: int) -> None:
+        statsd_client.incr(f"{prefix}.checks", checked)
+        statsd_client.timing(f"{prefix}.average_staleness", self.average_staleness * 1000)
+        statsd_client.gauge(f"{prefix}.checks_per_second", self.checks_per_second)
+        statsd_client.gauge(f"{prefix}.watched", self.watched)
+        for name, depth in self.queue_depths.items():
+            statsd_client.gauge(f"{prefix}.{name}_depth", depth)
+
+
 class AsynchronousJobRunner(BaseJobRunner, Monitors):
     """Parent class for any job runner that runs jobs asynchronously (e.g. via
     a distributed resource manager).  Provides general methods for having a
@@ -791,6 +947,15 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
     to the correct methods (queue, finish, cleanup) at appropriate times..
     """
 
+    DEFAULT_SPECS = dict(
+        BaseJobRunner.DEFAULT_SPECS,
+        monitor_backoff_max_interval=dict(map=float, valid=lambda x: float(x) >= 0, default=0.0),
+        monitor_backoff_factor=dict(map=float, valid=lambda x: float(x) >= 1, default=2.0),
+    )
+    # Runners whose job states change in a way _monitor_fingerprint() can observe set this to allow backoff,
+    # for the others an unchanged fingerprint would not mean the job is unchanged.
+    supports_monitor_backoff = False
+
     def __init__(self, app, nworkers, **kwargs):
         super().__init__(app, nworkers, **kwargs)
         # 'watched' and 'queue' are both used to keep track of jobs to watch.
@@ -800,6 +965,22 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
         # to 'watched' and then manage the watched jobs.
         self.watched = []
         self.monitor_queue = Queue()
+        # States of watched jobs fetched by check_watched_items_bulk() for the
+        # current monitor iteration, keyed by external job id.
+        self.bulk_job_states: typing.Dict[str, typing.Any] = {}
+        # Jobs whose state has not changed recently are checked less often if
+        # backoff is enabled, these wait in 'monitor_schedule' until their next
+        # check is due.
+        self.monitor_schedule: typing.Optional[MonitorSchedule] = None
+        if self.runner_params.monitor_backoff_max_interval > 0 and not self.supports_monitor_backoff:
+            log.warning("%s: monitor backoff is not supported by this runner, ignoring it", self.runner_name)
+        elif self.runner_params.monitor_backoff_max_interval > 0:
+            self.monitor_schedule = MonitorSchedule(
+                base_interval=self.app.config.job_runner_monitor_sleep,
+                max_interval=self.runner_params.monitor_backoff_max_interval,
+                factor=self.runner_params.monitor_backoff_factor,
+            )
+        self.monitor_metrics = MonitorMetrics()
 
     def _init_monitor_thread(self):
         name = f"{self.runner_name}.monitor_thread"
@@ -826,14 +1007,79 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
                     self.watched.append(async_job_state)
             except Empty:
                 pass
+            now = time.time()
+            if self.monitor_schedule is not None:
+                self.watched.extend(self.monitor_schedule.pop_due(now))
+            checked = list(self.watched)
+            fingerprints = {}
+            if self.monitor_schedule is not None:
+                try:
+                    fingerprints = {id(job_state): self._job_fingerprint(job_state) for job_state in checked}
+                except Exception:
+                    log.exception("Unhandled exception fingerprinting active jobs")
             # Iterate over the list of watched jobs and check state
             try:
                 self.check_watched_items()
             except Exception:
                 log.exception("Unhandled exception checking active jobs")
+            try:
+                self._record_monitor_iteration(checked, fingerprints, now)
+            except Exception:
+                log.exception("Unhandled exception recording monitor iteration")
             # Sleep a bit before the next state check
             time.sleep(self.app.config.job_runner_monitor_sleep)
 
+    @staticmethod
+    def _monitor_fingerprint(job_state):
+        """
+        Return a value that changes whenever the runner observes a change of the job's state.
+
+        By default this is the last state reported by the resource manager, which the runners
+        setting ``supports_monitor_backoff`` record in ``old_state``.
+        """
+        return (getattr(job_state, "old_state", None), getattr(job_state, "running", None))
+
+    def _job_fingerprint(self, job_state):
+        try:
+            return self._monitor_fingerprint(job_state)
+        except Exception:
+            log.exception("(%s) Unhandled exception fingerprinting job state", job_state.job_id)
+            # a fingerprint that never matches, so the job is checked on every iteration
+            return object()
+
+    def watched_job_states(self) -> typing.List[AsynchronousJobState]:
+        """Return the states of all watched jobs, including those waiting for their next check."""
+        job_states = list(self.watched)
+        if self.monitor_schedule is not None:
+            job_states.extend(self.monitor_schedule.job_states())
+        return job_states
+
+    def unwatch(self, job_state: AsynchronousJobState) -> None:
+        """Stop monitoring ``job_state``, wherever it is waiting for its next check."""
+        self.watched = [watched for watched in self.watched if watched is not job_state]
+        if self.monitor_schedule is not None:
+            self.monitor_schedule.remove(job_state)
+
+    def _record_monitor_iteration(self, checked, fingerprints, now):
+        if self.monitor_schedule is not None:
+            still_watched = self.watched
+            self.watched = []
+            for job_state in still_watched:
+                changed = fingerprints.get(id(job_state)) != self._job_fingerprint(job_state)
+                self.monitor_schedule.reschedule(job_state, changed=changed, now=now)
+            watched_count = len(self.monitor_schedule)
+        else:
+            watched_count = len(self.watched)
+        queue_depths = self.queue_depths() if hasattr(self, "work_queue") else None
+        self.monitor_metrics.record_iteration(checked, watched_count, now, queue_depths=queue_depths)
+        for job_state in checked:
+            if hasattr(job_state, "last_check_time"):
+                job_state.last_check_time = now
+        timer_factory = getattr(self.app, "execution_timer_factory", None)
+        if (statsd_client := getattr(timer_factory, "galaxy_statsd_client", None)) is not None:
+            prefix = f"galaxy.jobs.runners.{self.runner_name.lower()}.monitor"
+            self.monitor_metrics.send(statsd_client, prefix, len(checked))
+
     def monitor_job(self, job_state):
         self.monitor_queue.put(job_state)
 
@@ -853,6 +1099,7 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
         initially) or just override check_watched_item and allow the list processing to
         reuse the logic here.
         """
+        self.update_bulk_job_states()
         new_watched = []
         for async_job_state in self.watched:
             new_async_job_state = self.check_watched_item(async_job_state)
@@ -864,6 +1111,31 @@ class AsynchronousJobRunner(BaseJobRunner, Monitors):
     def check_watched_item(self, job_state):
         raise NotImplementedError()
 
+    def check_watched_items_bulk(
+        self, job_states: typing.List[AsynchronousJobState]
+    ) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """
+        Return a dictionary mapping external job ids to states for the given
+        watched jobs, using as few calls to the resource manager as possible
+        (ideally one per monitor iteration).
+
+        Runners that can fetch the state of many jobs at once should override
+        this, the default of ``None`` indicates bulk polling is not supported.
+        Jobs missing from the returned dictionary are checked individually by
+        ``check_watched_item``.
+        """
+        return None
+
+    def update_bulk_job_states(self):
+        """Refresh ``self.bulk_job_states`` for the currently watched jobs."""
+        bulk_job_states = None
+        if self.watched:
+            try:
+                bulk_job_states = self.check_watched_items_bulk(self.watched)
+            except Exception:
+                log.exception("Unable to check job states in bulk, checking jobs individually")
+        self.bulk_job_states = bulk_job_states or {}
+
     def finish_job(self, job_state: AsynchronousJobState):
         """
         Get the output/error for a finished job, pass to `job_wrapper.finish`
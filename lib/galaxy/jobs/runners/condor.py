@@ -51,6 +51,15 @@ class CondorJobRunner(AsynchronousJobRunner):
     """
 
     runner_name = "CondorRunner"
+    supports_monitor_backoff = True
+
+    @staticmethod
+    def _monitor_fingerprint(job_state):
+        if job_state.job_wrapper.tool.tool_type == "interactive":
+            # entry points of interactive tools are looked for on every check
+            return object()
+        # every change of the job's state is written to its user log
+        return job_state.user_log_size
 
     def queue_job(self, job_wrapper):
         """Create job script and submit it to the DRM"""
@@ -225,19 +234,17 @@ class CondorJobRunner(AsynchronousJobRunner):
         if job.container:
             try:
                 log.info(f"stop_job(): {job.id}: trying to stop container .... ({external_id})")
-                # self.watched = [cjs for cjs in self.watched if cjs.job_id != external_id]
-                new_watch_list = list()
                 cjs = None
-                for tcjs in self.watched:
-                    if tcjs.job_id != external_id:
-                        new_watch_list.append(tcjs)
-                    else:
+                for tcjs in self.watched_job_states():
+                    if tcjs.job_id == external_id:
                         cjs = tcjs
                         break
-                self.watched = new_watch_list
+                if cjs is not None:
+                    self.unwatch(cjs)
                 self._stop_container(job_wrapper)
-                # self.watched.append(cjs)
-                if cjs.job_wrapper.get_state() != model.Job.states.DELETED:
+                if cjs is None:
+                    log.debug(f"({galaxy_id_tag}/{external_id}) job is no longer watched")
+                elif cjs.job_wrapper.get_state() != model.Job.states.DELETED:
                     external_metadata = not asbool(
                         cjs.job_wrapper.job_destination.params.get("embed_metadata_in_job", True)
                     )
@@ -37,6 +37,7 @@ class DRMAAJobRunner(AsynchronousJobRunner):
     """
 
     runner_name = "DRMAARunner"
+    supports_monitor_backoff = True
     restrict_job_name_length = 15
 
     def __init__(self, app, nworkers, **kwargs):
@@ -283,7 +284,9 @@ class DRMAAJobRunner(AsynchronousJobRunner):
         state = None
         try:
             assert external_job_id not in (None, "None"), f"({galaxy_id_tag}/{external_job_id}) Invalid job id"
-            state = self.ds.job_status(external_job_id)
+            state = self.bulk_job_states.get(external_job_id)
+            if state is None:
+                state = self.ds.job_status(external_job_id)
             # Reset exception retries
             for retry_exception in RETRY_EXCEPTIONS_LOWER:
                 setattr(ajs, f"{retry_exception}_retries", 0)
@@ -337,6 +340,7 @@ class DRMAAJobRunner(AsynchronousJobRunner):
         Called by the monitor thread to look at each watched job and deal
         with state changes.
         """
+        self.update_bulk_job_states()
         new_watched = []
         for ajs in self.watched:
             external_job_id = ajs.job_id
@@ -46,7 +46,7 @@ class LocalJobRunner(BaseJobRunner):
 
     runner_name = "LocalRunner"
 
-    def __init__(self, app, nworkers):
+    def __init__(self, app, nworkers, **kwargs):
         """Start the job runner"""
 
         self._proc_lock = threading.Lock()
@@ -54,7 +54,7 @@ class LocalJobRunner(BaseJobRunner):
 
         self._environ = new_clean_env()
 
-        super().__init__(app, nworkers)
+        super().__init__(app, nworkers, **kwargs)
 
     def __command_line(self, job_wrapper: "MinimalJobWrapper") -> Tuple[str, str]:
         """ """
@@ -2,11 +2,16 @@
 SLURM job control via the DRMAA API.
 """
 import os
+import subprocess
 import time
+from collections import defaultdict
 
 from galaxy import model
 from galaxy.jobs.runners.drmaa import DRMAAJobRunner
-from galaxy.util import commands
+from galaxy.util import (
+    chunk_iterable,
+    commands,
+)
 from galaxy.util.custom_logging import get_logger
 
 log = get_logger(__name__)
@@ -31,11 +36,96 @@ SLURM_MEMORY_LIMIT_EXCEEDED_PARTIAL_WARNINGS = [
 OUT_OF_MEMORY_MSG = "This job was terminated because it used more memory than it was allocated."
 PROBABLY_OUT_OF_MEMORY_MSG = "This job was cancelled probably because it used more memory than it was allocated."
 
+# Maximum number of job ids passed to a single squeue invocation
+SQUEUE_MAX_JOB_IDS = 500
+# Seconds to wait for a single squeue invocation before checking jobs individually
+SQUEUE_TIMEOUT = 30
+
+# SLURM job states (as reported by ``squeue -o %T``) mapped to the names of the
+# equivalent ``drmaa.JobState`` attributes. Jobs in states not listed here are
+# checked individually through DRMAA.
+SLURM_TO_DRMAA_STATES = {
+    "PENDING": "QUEUED_ACTIVE",
+    "CONFIGURING": "QUEUED_ACTIVE",
+    "REQUEUED": "QUEUED_ACTIVE",
+    "RESIZING": "RUNNING",
+    "RUNNING": "RUNNING",
+    "COMPLETING": "RUNNING",
+    "STAGE_OUT": "RUNNING",
+    "SIGNALING": "RUNNING",
+    "SUSPENDED": "SYSTEM_SUSPENDED",
+    "STOPPED": "SYSTEM_SUSPENDED",
+    "REQUEUE_HOLD": "SYSTEM_ON_HOLD",
+    "RESV_DEL_HOLD": "SYSTEM_ON_HOLD",
+    "COMPLETED": "DONE",
+    "BOOT_FAIL": "FAILED",
+    "CANCELLED": "FAILED",
+    "DEADLINE": "FAILED",
+    "FAILED": "FAILED",
+    "NODE_FAIL": "FAILED",
+    "OUT_OF_MEMORY": "FAILED",
+    "PREEMPTED": "FAILED",
+    "TIMEOUT": "FAILED",
+}
+
+
+def parse_squeue_states(stdout, drmaa_job_states, cluster=None):
+    """Parse ``squeue -h -o '%i %T'`` output into a dict of external job id to drmaa job state."""
+    states = {}
+    for line in stdout.splitlines():
+        fields = line.split()
+        # squeue -M prints a "CLUSTER: <name>" line before the jobs of each cluster
+        if len(fields) != 2 or fields[0] == "CLUSTER:":
+            continue
+        job_id, slurm_state = fields
+        drmaa_state_name = SLURM_TO_DRMAA_STATES.get(slurm_state.rstrip("+"))
+        if drmaa_state_name is None:
+            continue
+        if cluster:
+            job_id = f"{job_id}.{cluster}"
+        states[job_id] = getattr(drmaa_job_states, drmaa_state_name)
+    return states
+
 
 class SlurmJobRunner(DRMAAJobRunner):
     runner_name = "SlurmRunner"
     restrict_job_name_length = False
 
+    def check_watched_items_bulk(self, job_states):
+        """
+        Fetch the state of all watched jobs with one ``squeue`` call (per
+        cluster and chunk of job ids) rather than one DRMAA call per job.
+        """
+        job_ids_by_cluster = defaultdict(list)
+        for ajs in job_states:
+            if ajs.job_id in (None, "None"):
+                continue
+            if "." in ajs.job_id:
+                # custom slurm-drmaa-with-cluster-support job id syntax
+                job_id, cluster = ajs.job_id.split(".", 1)
+            else:
+                job_id, cluster = ajs.job_id, None
+            job_ids_by_cluster[cluster].append(job_id)
+        states = {}
+        for cluster, cluster_job_ids in job_ids_by_cluster.items():
+            for job_ids in chunk_iterable(cluster_job_ids, SQUEUE_MAX_JOB_IDS):
+                cmd = ["squeue", "-h", "--states=all", "-o", "%i %T"]
+                if cluster:
+                    cmd.extend(["-M", cluster])
+                cmd.extend(["-j", ",".join(job_ids)])
+                try:
+                    stdout = commands.execute(cmd, timeout=SQUEUE_TIMEOUT)
+                except commands.CommandLineException as e:
+                    # e.g. all jobs in the chunk have left the controller's memory, check them individually
+                    log.debug("squeue failed for jobs %s: %s", ",".join(job_ids), e.stderr)
+                    continue
+                except subprocess.TimeoutExpired:
+                    # the controller is not responding, check the remaining jobs individually
+                    log.warning("squeue did not finish within %s seconds, checking jobs individually", SQUEUE_TIMEOUT)
+                    return states
+                states.update(parse_squeue_states(stdout, self.drmaa_job_states, cluster=cluster))
+        return states
+
     def _complete_terminal_job(self, ajs, drmaa_state, **kwargs):
         def _get_slurm_state_with_sacct(job_id, cluster):
             cmd = ["sacct", "-n", "-o", "state%-32"]
@@ -8,21 +8,23 @@ from typing import (
     Any,
     Dict,
     List,
+    Optional,
+    Tuple,
 )
 
 from sqlalchemy import (
+    and_,
     asc,
     cast,
     desc,
-    false,
     func,
     Integer,
     literal,
     nullsfirst,
     nullslast,
+    or_,
     select,
     sql,
-    true,
 )
 from sqlalchemy.orm import (
     joinedload,
@@ -91,6 +93,8 @@ class HistoryContentsManager(base.SortableManager):
         "update_time",
     )
     default_order_by = "hid"
+    #: the columns identifying the position of an item in the keyset (cursor) paginated contents
+    keyset_columns = ("hid", "history_content_type", "id")
 
     def __init__(self, app: MinimalManagerApp):
         self.app = app
@@ -108,6 +112,27 @@ class HistoryContentsManager(base.SortableManager):
             container, filters=filters, limit=limit, offset=offset, order_by=order_by, **kwargs
         )
 
+    def contents_after(
+        self,
+        container,
+        after: Optional[Tuple[int, str, int]] = None,
+        descending: bool = False,
+        filters=None,
+        limit=None,
+        offset=None,
+        **kwargs,
+    ):
+        """
+        Returns a list of both/all types of contents ordered by ``(hid, history_content_type, id)``,
+        starting after the item with the key ``after``.
+
+        Each page is read from the ``(history_id, hid, id)`` indexes of the content classes, so
+        a page deep into a large history costs the same as the first page.
+        """
+        return self._union_of_contents(
+            container, filters=filters, limit=limit, offset=offset, keyset=(after, descending), **kwargs
+        )
+
     def contents_count(self, container, filters=None, limit=None, offset=None, order_by=None, **kwargs):
         """
         Returns a count of both/all types of contents, based on the given filters.
@@ -156,15 +181,12 @@ class HistoryContentsManager(base.SortableManager):
 
         Note: does not include deleted/hidden contents.
         """
-        filters = [
-            base.ModelFilterParser.parsed_filter("orm", sql.column("deleted") == false()),
-            base.ModelFilterParser.parsed_filter("orm", sql.column("visible") == true()),
-        ]
-        contents_subquery = self._union_of_contents_query(history, filters=filters).subquery()
+        active = func.sum(model.HistoryStateCount.active)
         statement = (
-            sql.select(sql.column("state"), func.count("*"))
-            .select_from(contents_subquery)
-            .group_by(sql.column("state"))
+            select(model.HistoryStateCount.state, active)
+            .filter_by(history_id=history.id)
+            .group_by(model.HistoryStateCount.state)
+            .having(active > 0)
         )
         counts = self.app.model.context.execute(statement).fetchall()
         return dict(counts)
@@ -177,31 +199,14 @@ class HistoryContentsManager(base.SortableManager):
         Note: counts for deleted and hidden overlap; In other words, a dataset that's
         both deleted and hidden will be added to both totals.
         """
-        hda_select = self._active_counts_statement(model.HistoryDatasetAssociation, history.id)
-        hdca_select = self._active_counts_statement(model.HistoryDatasetCollectionAssociation, history.id)
-        subquery = hda_select.union_all(hdca_select).subquery()
         statement = select(
-            cast(func.sum(subquery.c.deleted), Integer).label("deleted"),
-            cast(func.sum(subquery.c.hidden), Integer).label("hidden"),
-            cast(func.sum(subquery.c.active), Integer).label("active"),
-        )
+            cast(func.sum(model.HistoryStateCount.deleted), Integer).label("deleted"),
+            cast(func.sum(model.HistoryStateCount.hidden), Integer).label("hidden"),
+            cast(func.sum(model.HistoryStateCount.active), Integer).label("active"),
+        ).filter_by(history_id=history.id)
         returned = self.app.model.context.execute(statement).one()
         return dict(returned._mapping)
 
-    def _active_counts_statement(self, model_class, history_id):
-        deleted_attr = model_class.deleted
-        visible_attr = model_class.visible
-        table_attr = model_class.table
-        return (
-            select(
-                func.sum(cast(deleted_attr, Integer)).label("deleted"),
-                func.sum(cast(visible_attr == false(), Integer)).label("hidden"),
-                func.sum(func.abs(cast(visible_attr, Integer) * (cast(deleted_attr, Integer) - 1))).label("active"),
-            )
-            .select_from(table_attr)
-            .filter_by(history_id=history_id)
-        )
-
     def map_datasets(self, history, fn, **kwargs):
         """
         Iterate over the datasets of a given history, recursing into collections, and
@@ -275,11 +280,14 @@ class HistoryContentsManager(base.SortableManager):
         return True
 
     def _union_of_contents_query(
-        self, container, filters=None, limit=None, offset=None, order_by=None, user_id=None, **kwargs
+        self, container, filters=None, limit=None, offset=None, order_by=None, user_id=None, keyset=None, **kwargs
     ):
         """
         Returns a query for a limited and offset list of both types of contents,
         filtered and in some order.
+
+        If ``keyset`` is an ``(after, descending)`` tuple the contents are ordered by
+        :attr:`keyset_columns` and start after the key ``after``, ``order_by`` is ignored.
         """
         order_by = order_by if order_by is not None else self.default_order_by
         order_by = order_by if isinstance(order_by, (tuple, list)) else (order_by,)
@@ -311,6 +319,24 @@ class HistoryContentsManager(base.SortableManager):
                 contained_query = self._apply_orm_filter(contained_query, orm_filter)
                 subcontainer_query = self._apply_orm_filter(subcontainer_query, orm_filter)
 
+        if keyset is not None:
+            after, descending = keyset
+            # limit each part of the union to a page, so the database only walks the indexes up to the page end
+            page_size = None if limit is None else limit + (offset or 0)
+            contained_query = self._keyset_page_query(
+                contained_query, self.contained_class, self.contained_class_type_name, after, descending, page_size
+            )
+            subcontainer_query = self._keyset_page_query(
+                subcontainer_query,
+                self.subcontainer_class,
+                self.subcontainer_class_type_name,
+                after,
+                descending,
+                page_size,
+            )
+            direction = desc if descending else asc
+            order_by = tuple(direction(column_name) for column_name in self.keyset_columns)
+
         contents_query = contained_query.union_all(subcontainer_query)
         contents_query = contents_query.order_by(*order_by)
 
@@ -320,6 +346,32 @@ class HistoryContentsManager(base.SortableManager):
             contents_query = contents_query.offset(offset)
         return contents_query
 
+    def _keyset_page_query(self, query, component_class, content_type, after, descending, page_size):
+        hid_column = component_class.hid
+        id_column = component_class.id
+        direction = desc if descending else asc
+        if after is not None:
+            after_hid, after_content_type, after_id = after
+
+            def beyond(column, value):
+                return column < value if descending else column > value
+
+            if content_type == after_content_type:
+                query = query.filter(
+                    or_(beyond(hid_column, after_hid), and_(hid_column == after_hid, beyond(id_column, after_id)))
+                )
+            elif (content_type < after_content_type) == descending:
+                # all items of this type with the same hid come after the key
+                query = query.filter(or_(beyond(hid_column, after_hid), hid_column == after_hid))
+            else:
+                query = query.filter(beyond(hid_column, after_hid))
+        query = query.order_by(direction(hid_column), direction(id_column))
+        if page_size is not None:
+            query = query.limit(page_size)
+        # LIMIT isn't allowed in the parts of a compound select on all databases, wrap it in a subquery
+        subquery = query.subquery()
+        return self._session().query(*(subquery_column.label(subquery_column.name) for subquery_column in subquery.c))
+
     def _apply_orm_filter(self, qry, orm_filter):
         if isinstance(orm_filter.filter, sql.elements.BinaryExpression):
             for match in filter(lambda col: col["name"] == orm_filter.filter.left.name, qry.column_descriptions):
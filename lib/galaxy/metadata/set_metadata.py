@@ -65,6 +65,7 @@ from galaxy.tool_util.parser.stdio import (
 )
 from galaxy.tool_util.provided_metadata import parse_tool_provided_metadata
 from galaxy.util import (
+    map_in_processes,
     safe_contains,
     stringify_dictionary_keys,
 )
@@ -187,6 +188,7 @@ def set_metadata_portable(
     provided_metadata_style = metadata_params.get("provided_metadata_style")
     max_metadata_value_size = metadata_params.get("max_metadata_value_size") or 0
     max_discovered_files = metadata_params.get("max_discovered_files")
+    metadata_processes = metadata_params.get("metadata_processes") or 1
     outputs = metadata_params["outputs"]
 
     tool_provided_metadata = load_job_metadata(job_metadata, provided_metadata_style)
@@ -310,6 +312,7 @@ def set_metadata_portable(
         tool_job_working_directory / "working",
         final_job_state=final_job_state,
         max_discovered_files=max_discovered_files,
+        metadata_processes=metadata_processes,
     )
 
     if extended_metadata_collection:
@@ -508,7 +511,7 @@ def set_metadata_portable(
     if export_store:
         export_store.push_metadata_files()
         export_store._finalize()
-    write_job_metadata(tool_job_working_directory, job_metadata, set_meta, tool_provided_metadata)
+    write_job_metadata(tool_job_working_directory, job_metadata, set_meta, tool_provided_metadata, metadata_processes)
 
 
 def validate_and_load_datatypes_config(datatypes_config):
@@ -539,8 +542,13 @@ def load_job_metadata(job_metadata, provided_metadata_style):
     return parse_tool_provided_metadata(job_metadata, provided_metadata_style=provided_metadata_style)
 
 
-def write_job_metadata(tool_job_working_directory, job_metadata, set_meta, tool_provided_metadata):
-    for i, file_dict in enumerate(tool_provided_metadata.get_new_datasets_for_metadata_collection(), start=1):
+def write_job_metadata(
+    tool_job_working_directory, job_metadata, set_meta, tool_provided_metadata, metadata_processes=1
+):
+    new_datasets = list(enumerate(tool_provided_metadata.get_new_datasets_for_metadata_collection(), start=1))
+
+    def new_dataset_metadata(indexed_file_dict):
+        i, file_dict = indexed_file_dict
         filename = file_dict["filename"]
         new_dataset_filename = os.path.join(tool_job_working_directory, "working", filename)
         new_dataset = Dataset(id=-i, external_filename=new_dataset_filename)
@@ -552,8 +560,13 @@ def write_job_metadata(tool_job_working_directory, job_metadata, set_meta, tool_
             id=-i, dataset=new_dataset, extension=file_dict.get("ext", "data")
         )
         set_meta(new_dataset_instance, file_dict)
-        file_dict["metadata"] = json.loads(
-            new_dataset_instance.metadata.to_JSON_dict()
-        )  # storing metadata in external form, need to turn back into dict, then later jsonify
+        # storing metadata in external form, need to turn back into dict, then later jsonify
+        return json.loads(new_dataset_instance.metadata.to_JSON_dict())
+
+    # the new datasets are independent of each other, so their metadata can be set in worker processes
+    for (_, file_dict), metadata in zip(
+        new_datasets, map_in_processes(new_dataset_metadata, new_datasets, metadata_processes)
+    ):
+        file_dict["metadata"] = metadata
 
     tool_provided_metadata.rewrite()
@@ -68,6 +68,7 @@ from sqlalchemy import (
     ForeignKey,
     func,
     Index,
+    insert,
     inspect,
     Integer,
     join,
@@ -104,6 +105,7 @@ from sqlalchemy.orm import (
     reconstructor,
     registry,
     relationship,
+    selectinload,
 )
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.orm.collections import attribute_mapped_collection
@@ -155,6 +157,7 @@ from galaxy.security import get_permitted_actions
 from galaxy.security.idencoding import IdEncodingHelper
 from galaxy.security.validate_user_input import validate_password_str
 from galaxy.util import (
+    chunk_iterable,
     directory_hash_id,
     enum_values,
     hex_to_lowercase_alphanum,
@@ -582,9 +585,11 @@ WHERE dataset.id IN (SELECT dataset_id FROM per_hist_hdas)
 """
 
 
-def calculate_user_disk_usage_statements(user_id, quota_source_map, for_sqlite=False):
-    """Standalone function so can be reused for postgres directly in pgcleanup.py."""
-    statements = []
+def user_disk_usage_queries(user_id, quota_source_map):
+    """Return ``(quota_source_label, sql, params)`` for the queries calculating a user's usage per quota source.
+
+    The usage of the default quota source is labeled ``None``.
+    """
     default_quota_enabled = quota_source_map.default_quota_enabled
     default_exclude_ids = quota_source_map.default_usage_excluded_ids()
     default_cond = "dataset.object_store_id IS NULL" if default_quota_enabled and default_exclude_ids else ""
@@ -594,17 +599,10 @@ def calculate_user_disk_usage_statements(user_id, quota_source_map, for_sqlite=F
     if default_usage_dataset_condition.strip():
         default_usage_dataset_condition = f"AND ( {default_usage_dataset_condition} )"
     default_usage = UNIQUE_DATASET_USER_USAGE.format(and_dataset_condition=default_usage_dataset_condition)
-    default_usage = (
-        """
-UPDATE galaxy_user SET disk_usage = (%s)
-WHERE id = :id
-"""
-        % default_usage
-    )
     params = {"id": user_id}
     if default_exclude_ids:
         params["exclude_object_store_ids"] = default_exclude_ids
-    statements.append((default_usage, params))
+    queries = [(None, default_usage, params)]
     source = quota_source_map.ids_per_quota_source()
     # TODO: Merge a lot of these settings together by generating a temp table for
     # the object_store_id to quota_source_label into a temp table of values
@@ -612,11 +610,16 @@ WHERE id = :id
         label_usage = UNIQUE_DATASET_USER_USAGE.format(
             and_dataset_condition="AND ( dataset.object_store_id IN :include_object_store_ids )"
         )
-        if for_sqlite:
-            # hacky alternative for older sqlite
-            statement = f"""
+        queries.append((quota_source_label, label_usage, {"id": user_id, "include_object_store_ids": object_store_ids}))
+    return queries
+
+
+def _set_quota_source_usage_statement(usage, for_sqlite=False):
+    if for_sqlite:
+        # hacky alternative for older sqlite
+        return f"""
 WITH new (user_id, quota_source_label, disk_usage) AS (
-    VALUES(:id, :label, ({label_usage}))
+    VALUES(:id, :label, ({usage}))
 )
 INSERT OR REPLACE INTO user_quota_source_usage (id, user_id, quota_source_label, disk_usage)
 SELECT old.id, new.user_id, new.quota_source_label, new.disk_usage
@@ -625,20 +628,18 @@ FROM new
         ON new.user_id = old.user_id
             AND new.quota_source_label = old.quota_source_label
 """
-        else:
-            statement = f"""
+    else:
+        return f"""
 INSERT INTO user_quota_source_usage(user_id, quota_source_label, disk_usage)
-VALUES(:id, :label, ({label_usage}))
+VALUES(:id, :label, ({usage}))
 ON CONFLICT
 ON constraint uqsu_unique_label_per_user
 DO UPDATE SET disk_usage = excluded.disk_usage
 """
-        statements.append(
-            (statement, {"id": user_id, "label": quota_source_label, "include_object_store_ids": object_store_ids})
-        )
 
+
+def _clean_old_quota_source_usage_statement(user_id, source_labels):
     params = {"id": user_id}
-    source_labels = list(source.keys())
     if len(source_labels) > 0:
         clean_old_statement = """
 DELETE FROM user_quota_source_usage
@@ -650,7 +651,35 @@ WHERE user_id = :id AND quota_source_label NOT IN :labels
 DELETE FROM user_quota_source_usage
 WHERE user_id = :id AND quota_source_label IS NOT NULL
 """
-    statements.append((clean_old_statement, params))
+    return clean_old_statement, params
+
+
+def _disk_usage_text(sql, args):
+    statement = text(sql)
+    binds = []
+    for key, _ in args.items():
+        expand_binding = key.endswith("s")
+        binds.append(bindparam(key, expanding=expand_binding))
+    return statement.bindparams(*binds)
+
+
+def calculate_user_disk_usage_statements(user_id, quota_source_map, for_sqlite=False):
+    """Standalone function so can be reused for postgres directly in pgcleanup.py."""
+    statements = []
+    queries = user_disk_usage_queries(user_id, quota_source_map)
+    _, default_usage, params = queries[0]
+    default_usage = (
+        """
+UPDATE galaxy_user SET disk_usage = (%s)
+WHERE id = :id
+"""
+        % default_usage
+    )
+    statements.append((default_usage, params))
+    for quota_source_label, label_usage, params in queries[1:]:
+        statement = _set_quota_source_usage_statement(label_usage, for_sqlite)
+        statements.append((statement, dict(params, label=quota_source_label)))
+    statements.append(_clean_old_quota_source_usage_statement(user_id, [label for label, _, _ in queries[1:]]))
     return statements
 
 
@@ -675,6 +704,8 @@ class User(Base, Dictifiable, RepresentById):
 
     use_pbkdf2 = True
     bootstrap_admin_user = False
+    # Record changes to disk usage in the ledger, only read by the periodic reconciliation of disk usage.
+    record_disk_usage_changes = True
     # api_keys: 'List[APIKeys]'  already declared as relationship()
 
     __tablename__ = "galaxy_user"
@@ -926,6 +957,8 @@ WHERE user_id = :user_id and quota_source_label = :label
         if amount != 0:
             if quota_source_label is None:
                 self.disk_usage = func.coalesce(self.table.c.disk_usage, 0) + amount
+                if self.record_disk_usage_changes:
+                    object_session(self).add(UserDiskUsageLedger(user_id=self.id, amount=int(amount)))
             else:
                 # else would work on newer sqlite - 3.24.0
                 engine = object_session(self).bind
@@ -953,6 +986,12 @@ ON CONFLICT
                 }
                 with engine.connect() as conn, conn.begin():
                     conn.execute(statement, params)
+                    if self.record_disk_usage_changes:
+                        conn.execute(
+                            insert(UserDiskUsageLedger.__table__).values(
+                                user_id=self.id, quota_source_label=quota_source_label, amount=int(amount)
+                            )
+                        )
 
     def _get_social_auth(self, provider_backend):
         if not self.social_auth:
@@ -1031,29 +1070,71 @@ ON CONFLICT
 
     def _calculate_or_set_disk_usage(self, object_store):
         """
-        Utility to calculate and return the disk usage.  If dryrun is False,
-        the new value is set immediately.
+        Recalculate the disk usage of the user and reconcile it with the usage ledger.
+
+        The usage is calculated on a separate connection without locking the user.
+        Changes recorded in the ledger while the calculation runs, or still pending
+        in this session, are applied on top of its result, the ledger entries
+        covered by the calculation are removed. The result is committed together
+        with any other pending changes of the user's session, like before the
+        ledger existed.
         """
         assert object_store is not None
         quota_source_map = object_store.get_quota_source_map()
         sa_session = object_session(self)
         for_sqlite = "sqlite" in sa_session.bind.dialect.name
-        statements = calculate_user_disk_usage_statements(self.id, quota_source_map, for_sqlite)
-        for sql, args in statements:
-            statement = text(sql)
-            binds = []
-            for key, _ in args.items():
-                expand_binding = key.endswith("s")
-                binds.append(bindparam(key, expanding=expand_binding))
-            statement = statement.bindparams(*binds)
-            sa_session.execute(statement, args)
-            # expire user.disk_usage so sqlalchemy knows to ignore
-            # the existing value - we're setting it in raw SQL for
-            # performance reasons and bypassing object properties.
-            sa_session.expire(self, ["disk_usage"])
+        ledger = UserDiskUsageLedger.__table__
+        user_id = self.id
+        # Ledger entries are written in the same transaction as the changes they record, so the entries visible in the
+        # snapshot the usage is calculated from are exactly the ones covered by the calculation.
+        with sa_session.bind.connect() as connection:
+            if not for_sqlite:
+                connection = connection.execution_options(isolation_level="REPEATABLE READ")
+            with connection.begin():
+                covered_entry_ids = set(
+                    connection.execute(select(ledger.c.id).where(ledger.c.user_id == user_id)).scalars()
+                )
+                usages = self._calculate_disk_usage(quota_source_map, connection)
+
+        user_table = self.table
+        recorded_usage = sa_session.scalar(
+            select(user_table.c.disk_usage).where(user_table.c.id == user_id).with_for_update()
+        )
+        recorded_since: Dict[Optional[str], int] = defaultdict(int)
+        for entry_id, quota_source_label, amount in sa_session.execute(
+            select(ledger.c.id, ledger.c.quota_source_label, ledger.c.amount).where(ledger.c.user_id == user_id)
+        ):
+            if entry_id not in covered_entry_ids:
+                recorded_since[quota_source_label] += int(amount)
+        disk_usage = usages.pop(None) + recorded_since[None]
+        if recorded_usage is not None and int(recorded_usage) != disk_usage:
+            log.info("Corrected disk usage of user %s from %s to %s", user_id, recorded_usage, disk_usage)
+        sa_session.execute(update(user_table).where(user_table.c.id == user_id).values(disk_usage=disk_usage))
+        for quota_source_label, usage in usages.items():
+            params = {
+                "id": user_id,
+                "label": quota_source_label,
+                "disk_usage": usage + recorded_since[quota_source_label],
+            }
+            sa_session.execute(text(_set_quota_source_usage_statement(":disk_usage", for_sqlite)), params)
+        sql, args = _clean_old_quota_source_usage_statement(user_id, list(usages.keys()))
+        sa_session.execute(_disk_usage_text(sql, args), args)
+        for entry_ids in chunk_iterable(sorted(covered_entry_ids)):
+            sa_session.execute(delete(ledger).where(ledger.c.id.in_(entry_ids)))
+        # expire user.disk_usage so sqlalchemy knows to ignore
+        # the existing value - we're setting it in raw SQL for
+        # performance reasons and bypassing object properties.
+        sa_session.expire(self, ["disk_usage"])
         with transaction(sa_session):
             sa_session.commit()
 
+    def _calculate_disk_usage(self, quota_source_map, connection):
+        """Return the disk usage of the user per quota source label, ``None`` for the default quota source."""
+        usages = {}
+        for quota_source_label, sql, args in user_disk_usage_queries(self.id, quota_source_map):
+            usages[quota_source_label] = int(connection.execute(_disk_usage_text(sql, args), args).scalar() or 0)
+        return usages
+
     @staticmethod
     def user_template_environment(user):
         """
@@ -2910,6 +2991,73 @@ class HistoryAudit(Base, RepresentById):
             session.execute(q)
 
 
+class HistoryStateCount(Base, RepresentById):
+    """
+    Changes to the number of contents of a history in each state.
+
+    Rows are inserted by database triggers (see :mod:`galaxy.model.triggers.history_state_count`)
+    whenever contents are added, moved, deleted, hidden or change their state, the counts of a
+    history are the sums of its rows. ``active`` counts contents that are neither deleted nor hidden.
+    """
+
+    __tablename__ = "history_state_count"
+
+    id = Column(Integer, primary_key=True)
+    history_id = Column(Integer, ForeignKey("history.id"), index=True, nullable=False)
+    state = Column(TrimmedString(64))
+    active = Column(Integer, nullable=False)
+    deleted = Column(Integer, nullable=False)
+    hidden = Column(Integer, nullable=False)
+
+    # This class should never be instantiated, rows are inserted by database triggers.
+    __init__ = None  # type: ignore[assignment]
+
+    @classmethod
+    def compact(cls, sa_session, batch_size=1000):
+        """Merge the rows of each history and state into a single row."""
+        uncompacted = (
+            select(cls.history_id)
+            .group_by(cls.history_id)
+            .having(func.count() > func.count(func.distinct(func.coalesce(cls.state, ""))))
+        )
+        with sa_session() as session:
+            history_ids = session.scalars(uncompacted).all()
+        for i in range(0, len(history_ids), batch_size):
+            batch = history_ids[i : i + batch_size]
+            with sa_session() as session, session.begin():
+                # read and delete the same rows, changes committed meanwhile are kept for the next compaction
+                conn = session.connection(execution_options={"isolation_level": "SERIALIZABLE"})
+                counts = conn.execute(
+                    select(
+                        cls.history_id,
+                        cls.state,
+                        func.sum(cls.active).label("active"),
+                        func.sum(cls.deleted).label("deleted"),
+                        func.sum(cls.hidden).label("hidden"),
+                        func.max(cls.id).label("max_id"),
+                    )
+                    .where(cls.history_id.in_(batch))
+                    .group_by(cls.history_id, cls.state)
+                ).all()
+                if not counts:
+                    continue
+                max_id = max(count.max_id for count in counts)
+                conn.execute(delete(cls).where(cls.history_id.in_(batch), cls.id <= max_id))
+                values = [
+                    dict(
+                        history_id=count.history_id,
+                        state=count.state,
+                        active=count.active,
+                        deleted=count.deleted,
+                        hidden=count.hidden,
+                    )
+                    for count in counts
+                    if count.active or count.deleted or count.hidden
+                ]
+                if values:
+                    conn.execute(insert(cls), values)
+
+
 class History(Base, HasTags, Dictifiable, UsesAnnotations, HasName, Serializable):
     __tablename__ = "history"
     __table_args__ = (Index("ix_history_slug", "slug", mysql_length=200),)
@@ -3571,6 +3719,23 @@ class UserQuotaSourceUsage(Base, Dictifiable, RepresentById):
     user = relationship("User", back_populates="quota_source_usages")
 
 
+class UserDiskUsageLedger(Base, RepresentById):
+    """Changes to a user's disk usage recorded since the usage was last recalculated."""
+
+    __tablename__ = "user_disk_usage_ledger"
+
+    id = Column(Integer, primary_key=True)
+    create_time = Column(DateTime, default=now)
+    user_id = Column(Integer, ForeignKey("galaxy_user.id"), index=True, nullable=False)
+    quota_source_label = Column(String(32))
+    amount = Column(Numeric(15, 0), nullable=False)
+
+    @classmethod
+    def user_ids(cls, sa_session):
+        """Return the ids of the users with changes recorded since their usage was last recalculated."""
+        return sa_session.scalars(select(cls.user_id).distinct()).all()
+
+
 class UserQuotaAssociation(Base, Dictifiable, RepresentById):
     __tablename__ = "user_quota_association"
 
@@ -6400,6 +6565,8 @@ class DatasetCollection(Base, Dictifiable, UsesAnnotations, Serializable):
         db_session = object_session(self)
         if db_session and self.id:
             stmt = self._build_nested_collection_attributes_stmt(return_entities=(DatasetCollectionElement,))
+            # load the element objects in bulk instead of one query per element when they are accessed
+            stmt = stmt.options(selectinload(DatasetCollectionElement.hda), selectinload(DatasetCollectionElement.ldda))
             tuples = db_session.execute(stmt).all()
             return [tuple[0] for tuple in tuples]
         elements = []
@@ -6584,6 +6751,7 @@ class HistoryDatasetCollectionAssociation(
     """Associates a DatasetCollection with a History."""
 
     __tablename__ = "history_dataset_collection_association"
+    __table_args__ = (Index("ix_history_dataset_collection_association_history_id_hid_id", "history_id", "hid", "id"),)
 
     id = Column(Integer, primary_key=True)
     collection_id = Column(Integer, ForeignKey("dataset_collection.id"), index=True)
@@ -8419,6 +8587,27 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
 
     @staticmethod
     def poll_active_workflow_ids(engine, scheduler=None, handler=None):
+        stmt = select(WorkflowInvocation.id).filter(WorkflowInvocation._active_conditions(scheduler, handler))
+        stmt = stmt.order_by(WorkflowInvocation.id.asc())
+        # Immediately just load all ids into memory so time slicing logic
+        # is relatively intutitive.
+        with engine.connect() as conn:
+            return conn.scalars(stmt).all()
+
+    @staticmethod
+    def poll_active_workflow_owners(engine, scheduler=None, handler=None):
+        """Like :meth:`poll_active_workflow_ids` but return rows of ``id``, ``history_id`` and ``user_id``."""
+        stmt = (
+            select(WorkflowInvocation.id, WorkflowInvocation.history_id, History.user_id)
+            .join(History, History.id == WorkflowInvocation.history_id)
+            .filter(WorkflowInvocation._active_conditions(scheduler, handler))
+            .order_by(WorkflowInvocation.id.asc())
+        )
+        with engine.connect() as conn:
+            return conn.execute(stmt).all()
+
+    @staticmethod
+    def _active_conditions(scheduler=None, handler=None):
         and_conditions = [
             or_(
                 WorkflowInvocation.state == WorkflowInvocation.states.NEW,
@@ -8430,12 +8619,7 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
             and_conditions.append(WorkflowInvocation.scheduler == scheduler)
         if handler is not None:
             and_conditions.append(WorkflowInvocation.handler == handler)
-
-        stmt = select(WorkflowInvocation.id).filter(and_(*and_conditions)).order_by(WorkflowInvocation.id.asc())
-        # Immediately just load all ids into memory so time slicing logic
-        # is relatively intutitive.
-        with engine.connect() as conn:
-            return conn.scalars(stmt).all()
+        return and_(*and_conditions)
 
     def add_output(self, workflow_output, step, output_object):
         if not hasattr(output_object, "history_content_type"):
@@ -10764,6 +10948,7 @@ HistoryDatasetAssociation.table = Table(
     Column(
         "hidden_beneath_collection_instance_id", ForeignKey("history_dataset_collection_association.id"), nullable=True
     ),
+    Index("ix_history_dataset_association_history_id_hid_id", "history_id", "hid", "id"),
 )
 
 LibraryDatasetDatasetAssociation.table = Table(
@@ -13,13 +13,23 @@ from inspect import (
 )
 from typing import (
     Dict,
+    Iterable,
+    List,
     Type,
     TYPE_CHECKING,
     Union,
 )
 
-from sqlalchemy import event
+from sqlalchemy import (
+    event,
+    false,
+    func,
+    inspect,
+    select,
+    update,
+)
 from sqlalchemy.orm import (
+    Mapper,
     object_session,
     scoped_session,
     Session,
@@ -187,3 +197,57 @@ def ensure_object_added_to_session(object_to_add, *, object_in_session=None, ses
         object_session(object_in_session).add(object_to_add)
         return True
     return False
+
+
+def preallocate_ids(session: Union[scoped_session, Session], model_classes: Iterable[Type]) -> None:
+    """Assign ids to all pending objects of ``model_classes`` with one query per table.
+
+    The ORM inserts rows without a primary key one at a time to read back the generated id.
+    Once the ids are assigned, the next flush sends the rows of each table as a single
+    executemany INSERT. Only PostgreSQL and SQLite are supported, other databases are left
+    to generate the ids on insert.
+    """
+    if isinstance(session, scoped_session):
+        session = session()
+    dialect = session.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        return
+    model_classes = tuple(model_classes)
+    pending: Dict[Mapper, List] = {}
+    # ids assigned to pending objects by a previous call that have not been flushed yet
+    assigned: Dict[Mapper, int] = {}
+    for obj in session.new:
+        if isinstance(obj, model_classes):
+            mapper = inspect(obj).mapper
+            if len(mapper.primary_key) != 1:
+                continue
+            obj_id = mapper.primary_key_from_instance(obj)[0]
+            if obj_id is None:
+                pending.setdefault(mapper, []).append(obj)
+            else:
+                assigned[mapper] = max(obj_id, assigned.get(mapper, 0))
+    if not pending:
+        return
+    if dialect == "sqlite":
+        # SQLite hands out max(id) + 1, take the write lock first so no other connection
+        # inserts rows into the reserved range before this transaction commits.
+        column = next(iter(pending)).primary_key[0]
+        session.execute(update(column.table).where(false()).values({column.name: column}))
+    for mapper, objs in pending.items():
+        column = mapper.primary_key[0]
+        if dialect == "postgresql":
+            sequence = func.pg_get_serial_sequence(column.table.name, column.name)
+            stmt = select(func.nextval(sequence)).select_from(func.generate_series(1, len(objs)))
+            ids = session.execute(stmt).scalars().all()
+            if None in ids:
+                # no sequence owned by the id column, let the database assign the ids
+                continue
+            ids.sort()
+        else:
+            max_id = max(session.execute(select(func.max(column))).scalar() or 0, assigned.get(mapper, 0))
+            ids = list(range(max_id + 1, max_id + 1 + len(objs)))
+        # keep ids ascending in the order the objects were created
+        objs.sort(key=lambda obj: inspect(obj).insert_order)
+        key = mapper.get_property_by_column(column).key
+        for obj, obj_id in zip(objs, ids):
+            setattr(obj, key, obj_id)
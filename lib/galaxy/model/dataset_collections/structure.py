@@ -1,10 +1,95 @@
 """ Module for reasoning about structure of and matching hierarchical collections of data.
 """
 import logging
+from collections import defaultdict
+from typing import (
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from sqlalchemy import (
+    inspect,
+    select,
+)
+from sqlalchemy.orm import (
+    object_session,
+    selectinload,
+)
+
+from galaxy import model
 
 log = logging.getLogger(__name__)
 
 
+class ElementLevel(NamedTuple):
+    """Elements of one nesting level of a collection in depth first order.
+
+    The children of the i-th element of the previous level (the collection itself for the first
+    level) are ``elements[offsets[i]:offsets[i + 1]]``.
+    """
+
+    elements: list
+    offsets: List[int]
+
+
+def load_element_levels(dataset_collection, depth, load_elements=False) -> Optional[List[ElementLevel]]:
+    """Load the first ``depth`` levels of elements of a persisted collection with one query per level.
+
+    Levels are rows with ``dataset_collection_id``, ``element_index``, ``element_identifier`` and
+    ``child_collection_id`` attributes, the last level holds ``DatasetCollectionElement`` objects with
+    their element objects loaded if ``load_elements`` is set. Returns ``None`` if the collection's
+    elements are already loaded, if it has no flushed database state to query or if an inner level
+    is not populated, callers then walk the collection's ORM objects instead.
+    """
+    if not isinstance(dataset_collection, model.DatasetCollection):
+        return None
+    if "elements" not in inspect(dataset_collection).unloaded:
+        # walking the loaded elements needs no queries for this level
+        return None
+    session = object_session(dataset_collection)
+    if session is None or dataset_collection.id is None:
+        return None
+    dce = model.DatasetCollectionElement
+    if any(isinstance(obj, dce) for obj in session.new):
+        # unflushed elements would be missing from the queries
+        return None
+    parent_ids = [dataset_collection.id]
+    parent_filter = dce.dataset_collection_id == dataset_collection.id
+    levels: List[ElementLevel] = []
+    for level in range(depth):
+        if level == depth - 1 and load_elements:
+            stmt = (
+                select(dce)
+                .where(parent_filter)
+                .order_by(dce.element_index)
+                .options(selectinload(dce.hda), selectinload(dce.ldda), selectinload(dce.child_collection))
+            )
+            rows = session.scalars(stmt).all()
+        else:
+            stmt = (
+                select(dce.dataset_collection_id, dce.element_index, dce.element_identifier, dce.child_collection_id)
+                .where(parent_filter)
+                .order_by(dce.element_index)
+            )
+            rows = session.execute(stmt).all()
+        rows_by_parent = defaultdict(list)
+        for row in rows:
+            rows_by_parent[row.dataset_collection_id].append(row)
+        elements: list = []
+        offsets = [0]
+        for parent_id in parent_ids:
+            elements.extend(rows_by_parent.get(parent_id, ()))
+            offsets.append(len(elements))
+        levels.append(ElementLevel(elements, offsets))
+        if level < depth - 1:
+            parent_ids = [row.child_collection_id for row in elements]
+            if None in parent_ids:
+                return None
+            parent_filter = dce.dataset_collection_id.in_(select(dce.child_collection_id).where(parent_filter))
+    return levels
+
+
 class Leaf:
     children_known = True
 
@@ -70,6 +155,9 @@ class Tree(BaseTree):
 
     @staticmethod
     def for_dataset_collection(dataset_collection, collection_type_description):
+        levels = load_element_levels(dataset_collection, _depth(collection_type_description))
+        if levels is not None:
+            return Tree._for_element_levels(levels, 0, 0, len(levels[0].elements), collection_type_description)
         children = []
         for element in dataset_collection.elements:
             if collection_type_description.has_subcollections():
@@ -85,8 +173,58 @@ class Tree(BaseTree):
                 children.append((element.element_identifier, leaf))
         return Tree(children, collection_type_description)
 
+    @staticmethod
+    def _for_element_levels(levels, level, start, end, collection_type_description):
+        elements = levels[level].elements
+        if not collection_type_description.has_subcollections():
+            return Tree(
+                [(element.element_identifier, leaf) for element in elements[start:end]], collection_type_description
+            )
+        subcollection_type_description = collection_type_description.subcollection_type_description()
+        offsets = levels[level + 1].offsets
+        children = []
+        for index in range(start, end):
+            tree = Tree._for_element_levels(
+                levels, level + 1, offsets[index], offsets[index + 1], subcollection_type_description
+            )
+            children.append((elements[index].element_identifier, tree))
+        return Tree(children, collection_type_description)
+
     def walk_collections(self, hdca_dict):
-        return self._walk_collections(dict_map(lambda hdca: hdca.collection, hdca_dict))
+        collection_dict = dict_map(lambda hdca: hdca.collection, hdca_dict)
+        depth = _depth(self.collection_type_description)
+        levels_dict = {}
+        for name, collection in collection_dict.items():
+            levels = load_element_levels(collection, depth, load_elements=True)
+            if levels is None:
+                return self._walk_collections(collection_dict)
+            levels_dict[name] = levels
+        return self._walk_element_levels(levels_dict)
+
+    def _walk_element_levels(self, levels_dict):
+        # Slicing matched collections is a walk over the index aligned element arrays of their leaf levels.
+        if not levels_dict:
+            return
+        some_levels = next(iter(levels_dict.values()))
+        top_level_indices = None
+        if self.when_values and len(self.when_values) > 1:
+            top_level_indices = list(range(len(some_levels[0].elements)))
+            for level in some_levels[1:]:
+                offsets = level.offsets
+                top_level_indices = [
+                    top_level_index
+                    for index, top_level_index in enumerate(top_level_indices)
+                    for _ in range(offsets[index + 1] - offsets[index])
+                ]
+        leaf_elements = {name: levels[-1].elements for name, levels in levels_dict.items()}
+        for index in range(len(some_levels[-1].elements)):
+            when_value = None
+            if self.when_values:
+                if top_level_indices is None:
+                    when_value = self.when_values[0]
+                else:
+                    when_value = self.when_values[top_level_indices[index]]
+            yield {name: elements[index] for name, elements in leaf_elements.items()}, when_value
 
     def _walk_collections(self, collection_dict):
         for index, (_identifier, substructure) in enumerate(self.children):
@@ -189,6 +327,10 @@ def dict_map(func, input_dict):
     return {k: func(v) for k, v in input_dict.items()}
 
 
+def _depth(collection_type_description):
+    return collection_type_description.collection_type.count(":") + 1
+
+
 def get_structure(dataset_collection_instance, collection_type_description, leaf_subcollection_type=None):
     if leaf_subcollection_type:
         collection_type_description = collection_type_description.effective_collection_type_description(
@@ -1,4 +1,5 @@
 from galaxy import exceptions
+from .structure import load_element_levels
 
 
 def split_dataset_collection_instance(dataset_collection_instance, collection_type):
@@ -11,6 +12,14 @@ def _split_dataset_collection(dataset_collection, collection_type):
     if not this_collection_type.endswith(collection_type) or this_collection_type == collection_type:
         raise exceptions.MessageException("Cannot split collection in desired fashion.")
 
+    depth = this_collection_type.count(":") - collection_type.count(":")
+    levels = load_element_levels(dataset_collection, depth, load_elements=True)
+    if levels is not None:
+        split_elements = levels[-1].elements
+        if any(element.child_collection is None for element in split_elements):
+            raise exceptions.MessageException("Cannot split collection in desired fashion.")
+        return split_elements
+
     split_elements = []
     for element in dataset_collection.elements:
         child_collection = element.child_collection
@@ -11,6 +11,7 @@ from galaxy.model import mapper_registry
 from galaxy.model.base import SharedModelMapping
 from galaxy.model.orm.engine_factory import build_engine
 from galaxy.model.security import GalaxyRBACAgent
+from galaxy.model.triggers.history_state_count import install as install_history_state_count_triggers
 from galaxy.model.triggers.update_audit_table import install as install_timestamp_triggers
 
 log = logging.getLogger(__name__)
@@ -38,6 +39,7 @@ def init(
     slow_query_log_threshold=0,
     thread_local_log: Optional[local] = None,
     log_query_counts=False,
+    record_disk_usage_changes=True,
 ) -> GalaxyModelMapping:
     # Build engine
     engine = build_engine(
@@ -60,11 +62,20 @@ def init(
             install_mapping.create_database_objects(engine)
 
     # Configure model, build ModelMapping
-    return configure_model_mapping(file_path, object_store, use_pbkdf2, engine, map_install_models, thread_local_log)
+    return configure_model_mapping(
+        file_path,
+        object_store,
+        use_pbkdf2,
+        engine,
+        map_install_models,
+        thread_local_log,
+        record_disk_usage_changes=record_disk_usage_changes,
+    )
 
 
 def create_additional_database_objects(engine):
     install_timestamp_triggers(engine)
+    install_history_state_count_triggers(engine)
 
 
 def configure_model_mapping(
@@ -74,15 +85,17 @@ def configure_model_mapping(
     engine,
     map_install_models,
     thread_local_log,
+    record_disk_usage_changes=True,
 ) -> GalaxyModelMapping:
-    _configure_model(file_path, object_store, use_pbkdf2)
+    _configure_model(file_path, object_store, use_pbkdf2, record_disk_usage_changes)
     return _build_model_mapping(engine, map_install_models, thread_local_log)
 
 
-def _configure_model(file_path: str, object_store, use_pbkdf2) -> None:
+def _configure_model(file_path: str, object_store, use_pbkdf2, record_disk_usage_changes=True) -> None:
     model.Dataset.file_path = file_path
     model.Dataset.object_store = object_store
     model.User.use_pbkdf2 = use_pbkdf2
+    model.User.record_disk_usage_changes = record_disk_usage_changes
 
 
 def _build_model_mapping(engine, map_install_models, thread_local_log) -> GalaxyModelMapping:
@@ -110,6 +123,7 @@ def init_models_from_config(
         object_store=object_store,
         trace_logger=trace_logger,
         use_pbkdf2=config.get_bool("use_pbkdf2", True),
+        record_disk_usage_changes=config.disk_usage_reconciliation_interval > 0,
         slow_query_log_threshold=config.slow_query_log_threshold,
         thread_local_log=config.thread_local_log,
         log_query_counts=config.database_log_query_counts,
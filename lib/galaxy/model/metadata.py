@@ -15,6 +15,7 @@ from os.path import abspath
 from typing import (
     Any,
     Iterator,
+    List,
     Optional,
     TYPE_CHECKING,
     Union,
@@ -31,6 +32,7 @@ from galaxy.security.object_wrapper import sanitize_lists_to_string
 from galaxy.util import (
     form_builder,
     listify,
+    map_in_processes,
     string_as_bool,
     stringify_dictionary_keys,
     unicodify,
@@ -670,7 +672,8 @@ class FileParameter(MetadataParameter):
                 # directory. Correct.
                 file_name = path_rewriter(file_name)
             mf.update_from_file(file_name)
-            value = mf.id
+            # without a session (e.g. extended metadata) the new MetadataFile has no id yet
+            value = self.marshal(mf)
         return value
 
     def to_external_value(self, value):
@@ -747,6 +750,68 @@ class MetadataTempFile:
             log.debug("Failed to cleanup MetadataTempFile temp files from %s: %s", filename, unicodify(e))
 
 
+def set_meta_in_processes(
+    dataset_instances: List["DatasetInstance"], processes: int = 1, **set_meta_kwds
+) -> List[bool]:
+    """
+    Set the metadata of ``dataset_instances`` in up to ``processes`` forked worker processes.
+
+    Each worker runs the datatype's ``set_meta`` on its copy of a dataset
+    instance and returns the metadata as JSON, with new metadata files as
+    :class:`MetadataTempFile`. The JSON is loaded back into the dataset
+    instances in the order they were given, independent of the order in which
+    the workers finish. Returns whether the metadata of each dataset instance
+    has been set; the caller should call ``set_meta`` for the others (e.g.
+    when ``processes`` is 1 or ``set_meta`` failed in the worker) to get its
+    usual error handling.
+    """
+    if processes <= 1 or len(dataset_instances) <= 1:
+        return [False] * len(dataset_instances)
+    try:
+        paths = []
+        for dataset_instance in dataset_instances:
+            dataset_instance.clear_associated_files(metadata_safe=True)
+            paths.append((dataset_instance.get_file_name(), dataset_instance.extra_files_path))
+    except Exception:
+        log.debug("Failed to prepare setting metadata in worker processes", exc_info=True)
+        return [False] * len(dataset_instances)
+    with tempfile.TemporaryDirectory(prefix="metadata_") as metadata_tmp_files_dir:
+
+        def set_meta(index: int) -> Optional[str]:
+            dataset_instance = dataset_instances[index]
+            dataset = dataset_instance.dataset
+            dataset.external_filename, dataset.external_extra_files_path = paths[index]
+            # Without an object store metadata files are created as MetadataTempFiles,
+            # which are copied to the object store when the JSON is loaded by the parent.
+            dataset.object_store = None
+            MetadataTempFile.tmp_dir = metadata_tmp_files_dir
+            try:
+                dataset_instance.datatype.set_meta(
+                    dataset_instance, metadata_tmp_files_dir=metadata_tmp_files_dir, **set_meta_kwds
+                )
+                return dataset_instance.metadata.to_JSON_dict()
+            except Exception:
+                log.debug("Failed to set metadata of %s in worker process", dataset_instance, exc_info=True)
+                return None
+
+        metadata_set = []
+        try:
+            metadata_jsons = map_in_processes(set_meta, range(len(dataset_instances)), processes)
+        except Exception:
+            # e.g. a worker process got killed
+            log.warning("Failed to set metadata in worker processes", exc_info=True)
+            metadata_jsons = [None] * len(dataset_instances)
+        for dataset_instance, metadata_json in zip(dataset_instances, metadata_jsons):
+            if metadata_json is not None:
+                try:
+                    dataset_instance.metadata.from_JSON_dict(json_dict=metadata_json)
+                except Exception:
+                    log.debug("Failed to load metadata of %s set in worker process", dataset_instance, exc_info=True)
+                    metadata_json = None
+            metadata_set.append(metadata_json is not None)
+    return metadata_set
+
+
 __all__ = (
     "Statement",
     "MetadataElement",
@@ -764,4 +829,5 @@ __all__ = (
     "PythonObjectParameter",
     "FileParameter",
     "MetadataTempFile",
+    "set_meta_in_processes",
 )
@@ -0,0 +1,32 @@
+"""add history contents (history_id, hid, id) indexes
+
+Revision ID: 1c4b2a7e9d3f
+Revises: f26280703ce0
+Create Date: 2026-10-18 11:02:17.390512
+
+"""
+from galaxy.model.database_object_names import build_index_name
+from galaxy.model.migrations.util import (
+    create_index,
+    drop_index,
+)
+
+# revision identifiers, used by Alembic.
+revision = "1c4b2a7e9d3f"
+down_revision = "f26280703ce0"
+branch_labels = None
+depends_on = None
+
+# database object names used in this revision
+column_names = ["history_id", "hid", "id"]
+table_names = ["history_dataset_association", "history_dataset_collection_association"]
+
+
+def upgrade():
+    for table_name in table_names:
+        create_index(build_index_name(table_name, column_names), table_name, column_names)
+
+
+def downgrade():
+    for table_name in table_names:
+        drop_index(build_index_name(table_name, column_names), table_name)
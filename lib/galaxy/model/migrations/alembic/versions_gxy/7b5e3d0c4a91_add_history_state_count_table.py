@@ -0,0 +1,68 @@
+"""add history_state_count table
+
+Revision ID: 7b5e3d0c4a91
+Revises: 1c4b2a7e9d3f
+Create Date: 2026-10-18 12:24:05.118237
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from galaxy.model.custom_types import TrimmedString
+from galaxy.model.migrations.util import (
+    create_table,
+    drop_table,
+)
+from galaxy.model.triggers.history_state_count import (
+    counts_select,
+    get_install_sql,
+    get_remove_sql,
+)
+
+# revision identifiers, used by Alembic.
+revision = "7b5e3d0c4a91"
+down_revision = "1c4b2a7e9d3f"
+branch_labels = None
+depends_on = None
+
+# database object names used in this revision
+table_name = "history_state_count"
+
+# count the existing contents (table, table with the state, foreign key, state column)
+backfill_config = [
+    ("history_dataset_association", "dataset", "dataset_id", "state"),
+    ("history_dataset_collection_association", "dataset_collection", "collection_id", "populated_state"),
+]
+
+
+def upgrade():
+    create_table(
+        table_name,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("history_id", sa.Integer, sa.ForeignKey("history.id"), index=True, nullable=False),
+        sa.Column("state", TrimmedString(64)),
+        sa.Column("active", sa.Integer, nullable=False),
+        sa.Column("deleted", sa.Integer, nullable=False),
+        sa.Column("hidden", sa.Integer, nullable=False),
+    )
+    for contents_table, state_table, foreign_key, state_column in backfill_config:
+        op.execute(
+            f"""
+            INSERT INTO {table_name} (history_id, state, active, deleted, hidden)
+            SELECT history_id, state, SUM(active), SUM(deleted), SUM(hidden)
+            FROM ({counts_select("contents", f"{state_table}.{state_column}")}
+                FROM {contents_table} AS contents
+                JOIN {state_table} ON {state_table}.id = contents.{foreign_key}
+                WHERE contents.history_id IS NOT NULL
+            ) AS counts
+            GROUP BY history_id, state
+            """
+        )
+    for statement in get_install_sql(op.get_bind().dialect):
+        op.execute(statement)
+
+
+def downgrade():
+    for statement in get_remove_sql(op.get_bind().dialect):
+        op.execute(statement)
+    drop_table(table_name)
@@ -0,0 +1,37 @@
+"""add user_disk_usage_ledger table
+
+Revision ID: f26280703ce0
+Revises: 8a19186a6ee7
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+import sqlalchemy as sa
+
+from galaxy.model.migrations.util import (
+    create_table,
+    drop_table,
+)
+
+# revision identifiers, used by Alembic.
+revision = "f26280703ce0"
+down_revision = "8a19186a6ee7"
+branch_labels = None
+depends_on = None
+
+# database object names used in this revision
+table_name = "user_disk_usage_ledger"
+
+
+def upgrade():
+    create_table(
+        table_name,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("create_time", sa.DateTime),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("galaxy_user.id"), index=True, nullable=False),
+        sa.Column("quota_source_label", sa.String(32)),
+        sa.Column("amount", sa.Numeric(15, 0), nullable=False),
+    )
+
+
+def downgrade():
+    drop_table(table_name)
@@ -24,7 +24,9 @@ from sqlalchemy.orm.scoping import ScopedSession
 import galaxy.model
 from galaxy import util
 from galaxy.exceptions import RequestParameterInvalidException
+from galaxy.model.base import preallocate_ids
 from galaxy.model.dataset_collections import builder
+from galaxy.model.metadata import set_meta_in_processes
 from galaxy.model.tags import GalaxySessionlessTagHandler
 from galaxy.objectstore import (
     ObjectStore,
@@ -44,6 +46,20 @@ log = logging.getLogger(__name__)
 UNSET = object()
 DEFAULT_CHUNK_SIZE = 1000
 
+# Model objects created for discovered files, their ids are assigned in batches by
+# ModelPersistenceContext.preallocate_ids.
+DISCOVERED_MODEL_CLASSES = (
+    galaxy.model.Dataset,
+    galaxy.model.DatasetCollection,
+    galaxy.model.DatasetCollectionElement,
+    galaxy.model.DatasetHash,
+    galaxy.model.DatasetPermissions,
+    galaxy.model.DatasetSource,
+    galaxy.model.HistoryDatasetAssociation,
+    galaxy.model.HistoryDatasetAssociationTagAssociation,
+    galaxy.model.JobToOutputDatasetAssociation,
+)
+
 
 class MaxDiscoveredFilesExceededError(ValueError):
     pass
@@ -62,6 +78,8 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
     job_working_directory: str  # TODO: rename
     max_discovered_files = float("inf")
     discovered_file_count: int
+    # number of processes used to set metadata of discovered datasets
+    metadata_processes = 1
 
     def get_job(self) -> Optional[galaxy.model.Job]:
         return getattr(self, "job", None)
@@ -208,11 +226,14 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                         filename=filename,
                         link_data=link_data,
                         output_name=output_name,
+                        set_metadata=False,
                     )
                 )
         return primary_data
 
-    def finalize_storage(self, primary_data, dataset_attributes, extra_files, filename, link_data, output_name):
+    def finalize_storage(
+        self, primary_data, dataset_attributes, extra_files, filename, link_data, output_name, set_metadata=True
+    ):
         # Move data from temp location to dataset location
         if not link_data:
             dataset = primary_data.dataset
@@ -229,10 +250,19 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
             # We are sure there are no extra files, so optimize things that follow by settting total size also.
             primary_data.set_size(no_extra_files=True)
         # TODO: this might run set_meta after copying the file to the object store, which could be inefficient if job working directory is closer to the node.
-        self.set_datasets_metadata(datasets=[primary_data], datasets_attributes=[dataset_attributes])
-
-    @staticmethod
-    def set_datasets_metadata(datasets, datasets_attributes=None):
+        if set_metadata:
+            self.set_datasets_metadata(datasets=[primary_data], datasets_attributes=[dataset_attributes])
+        return primary_data, dataset_attributes
+
+    def run_storage_callbacks(self, storage_callbacks):
+        """Run the callbacks collected by ``create_dataset`` and set the metadata of all stored datasets at once."""
+        self.preallocate_ids()
+        stored = [callback() for callback in storage_callbacks]
+        if stored:
+            datasets, datasets_attributes = zip(*stored)
+            self.set_datasets_metadata(datasets=list(datasets), datasets_attributes=list(datasets_attributes))
+
+    def set_datasets_metadata(self, datasets, datasets_attributes=None):
         datasets_attributes = datasets_attributes or [{} for _ in datasets]
         for primary_data, dataset_attributes in zip(datasets, datasets_attributes):
             # add tool/metadata provided information
@@ -249,6 +279,18 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                         dataset_attributes.get(att_set, getattr(primary_data, dataset_att_name)),
                     )
 
+        # datasets without tool provided metadata are set in worker processes, if enabled
+        to_set = [
+            primary_data
+            for primary_data, dataset_attributes in zip(datasets, datasets_attributes)
+            if not dataset_attributes.get("metadata")
+        ]
+        metadata_set = {
+            id(primary_data)
+            for primary_data, is_set in zip(to_set, set_meta_in_processes(to_set, self.metadata_processes))
+            if is_set
+        }
+        for primary_data, dataset_attributes in zip(datasets, datasets_attributes):
             try:
                 metadata_dict = dataset_attributes.get("metadata", None)
                 if metadata_dict:
@@ -256,7 +298,7 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                         metadata_dict["dbkey"] = dataset_attributes["dbkey"]
                     # branch tested with tool_provided_metadata_3 / tool_provided_metadata_10
                     primary_data.metadata.from_JSON_dict(json_dict=metadata_dict)
-                else:
+                elif id(primary_data) not in metadata_set:
                     primary_data.set_meta()
             except Exception:
                 if primary_data.state == galaxy.model.HistoryDatasetAssociation.states.OK:
@@ -405,6 +447,8 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
                 self.tag_handler.add_tags_from_list(self.user, dataset, tags, flush=False)
 
     def update_object_store_with_datasets(self, datasets, paths, extra_files, output_name):
+        # object stores storing by id would otherwise commit to get the id of each dataset
+        self.preallocate_ids()
         for dataset, path, extra_file in zip(datasets, paths, extra_files):
             object_store_id = self.override_object_store_id(output_name)
             if object_store_id:
@@ -513,6 +557,15 @@ class ModelPersistenceContext(metaclass=abc.ABCMeta):
     def flush(self):
         """If database bound, flush the persisted objects to ensure IDs."""
 
+    def preallocate_ids(self):
+        """If database bound, assign IDs to the pending discovered objects.
+
+        Without IDs the flush inserts the datasets, HDAs, permissions and collection elements
+        one row at a time, with IDs they are inserted in one batch per table.
+        """
+        if self.sa_session is not None:
+            preallocate_ids(self.sa_session, DISCOVERED_MODEL_CLASSES)
+
     def increment_discovered_file_count(self):
         self.discovered_file_count += 1
         if self.discovered_file_count > self.max_discovered_files:
@@ -846,8 +899,7 @@ def persist_hdas(elements, model_persistence_context, final_job_state="ok"):
 
     collect_elements_for_history(elements)
     model_persistence_context.add_datasets_to_history(datasets)
-    for callback in storage_callbacks:
-        callback()
+    model_persistence_context.run_storage_callbacks(storage_callbacks)
 
     def add_datasets_to_history(self, datasets, for_output_dataset=None):
         if for_output_dataset is not None:
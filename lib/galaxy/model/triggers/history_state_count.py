@@ -0,0 +1,243 @@
+"""
+Triggers maintaining the history_state_count table (see :class:`galaxy.model.HistoryStateCount`).
+
+Whenever history contents are added, removed, moved, deleted, hidden or the state of
+their dataset (or collection) changes, the triggers insert rows removing the old
+contribution of the content item from the counts of its history and adding the new one.
+"""
+
+from galaxy.model.triggers.utils import execute_statements
+
+target_table = "history_state_count"
+
+# map between history contents table and the (table, foreign key, column) holding the state of an item
+trigger_config = {
+    "history_dataset_association": ("dataset", "dataset_id", "state"),
+    "history_dataset_collection_association": ("dataset_collection", "collection_id", "populated_state"),
+}
+
+# columns of the contents tables that change the counts of a history
+count_columns = ["history_id", "deleted", "visible"]
+
+
+def install(engine):
+    """Install history state count triggers"""
+    execute_statements(engine, get_install_sql(engine.dialect))
+
+
+def remove(engine):
+    """Uninstall history state count triggers"""
+    execute_statements(engine, get_remove_sql(engine.dialect))
+
+
+def get_install_sql(dialect):
+    """Generate a list of SQL statements installing the triggers"""
+    sql = get_remove_sql(dialect)
+    if "postgres" in dialect.name:
+        sql.extend(_postgres_install(dialect))
+    else:
+        sql.extend(_sqlite_install())
+    return sql
+
+
+def get_remove_sql(dialect):
+    """Generate a list of SQL statements removing the triggers"""
+    if "postgres" in dialect.name:
+        return _postgres_remove()
+    return _sqlite_remove()
+
+
+def counts_select(row, state, sign=""):
+    """
+    Select the contribution of the contents ``row`` (a table alias or ``OLD``/``NEW``)
+    to the counts of its history, ``sign`` is ``-`` to remove it.
+    """
+    return f"""
+        SELECT
+            {row}.history_id AS history_id,
+            {state} AS state,
+            CASE WHEN {row}.visible AND NOT {row}.deleted THEN {sign}1 ELSE 0 END AS active,
+            CASE WHEN {row}.deleted THEN {sign}1 ELSE 0 END AS deleted,
+            CASE WHEN NOT {row}.visible THEN {sign}1 ELSE 0 END AS hidden
+    """
+
+
+def _insert(select):
+    return f"INSERT INTO {target_table} (history_id, state, active, deleted, hidden) {select}"
+
+
+def _contents_statement(contents_table, row, sign=""):
+    """Count (or uncount) the contents ``row`` with the current state of its dataset or collection"""
+    state_table, foreign_key, state_column = trigger_config[contents_table]
+    select = counts_select(row, f"{state_table}.{state_column}", sign)
+    return _insert(
+        f"""{select}
+        FROM {state_table}
+        WHERE {state_table}.id = {row}.{foreign_key} AND {row}.history_id IS NOT NULL
+        """
+    )
+
+
+def _state_statement(contents_table):
+    """Move all contents of the dataset or collection ``NEW`` from its old to its new state"""
+    _, foreign_key, state_column = trigger_config[contents_table]
+    selects = [
+        f"""{counts_select("contents", f"{row}.{state_column}", sign)}
+        FROM {contents_table} AS contents
+        WHERE contents.{foreign_key} = NEW.id AND contents.history_id IS NOT NULL
+        """
+        for row, sign in [("OLD", "-"), ("NEW", "")]
+    ]
+    return _insert(" UNION ALL ".join(selects))
+
+
+def _changed(columns, distinct="IS DISTINCT FROM"):
+    return " OR ".join(f"OLD.{column} {distinct} NEW.{column}" for column in columns)
+
+
+# Postgres trigger installation
+
+
+def _postgres_remove():
+    """postgres trigger removal sql"""
+    sql = []
+    for contents_table, (state_table, _, _) in trigger_config.items():
+        sql.append(f"DROP FUNCTION IF EXISTS {_fn_name(contents_table)}() CASCADE;")
+        sql.append(f"DROP FUNCTION IF EXISTS {_fn_name(state_table)}() CASCADE;")
+    return sql
+
+
+def _postgres_install(dialect):
+    """postgres trigger installation sql"""
+    sql = []
+    version = dialect.server_version_info[0] if dialect.server_version_info else 11
+    # FUNCTION and PROCEDURE are equivalent, PROCEDURE is deprecated but required by postgres <= 10
+    function_keyword = "FUNCTION" if version > 10 else "PROCEDURE"
+
+    for contents_table, (state_table, foreign_key, state_column) in trigger_config.items():
+        contents_fn = _fn_name(contents_table)
+        sql.append(
+            f"""
+            CREATE OR REPLACE FUNCTION {contents_fn}()
+                RETURNS TRIGGER
+                LANGUAGE 'plpgsql'
+            AS $BODY$
+                BEGIN
+                    IF (TG_OP = 'DELETE' OR TG_OP = 'UPDATE') THEN
+                        {_contents_statement(contents_table, "OLD", "-")};
+                    END IF;
+                    IF (TG_OP = 'INSERT' OR TG_OP = 'UPDATE') THEN
+                        {_contents_statement(contents_table, "NEW")};
+                    END IF;
+                    RETURN NULL;
+                END;
+            $BODY$
+            """
+        )
+        sql.append(
+            f"""
+            CREATE TRIGGER {_trigger_name(contents_table, "INSERT OR DELETE")}
+            AFTER INSERT OR DELETE ON {contents_table}
+            FOR EACH ROW EXECUTE {function_keyword} {contents_fn}();
+            """
+        )
+        columns = count_columns + [foreign_key]
+        sql.append(
+            f"""
+            CREATE TRIGGER {_trigger_name(contents_table, "UPDATE")}
+            AFTER UPDATE OF {", ".join(columns)} ON {contents_table}
+            FOR EACH ROW
+            WHEN ({_changed(columns)})
+            EXECUTE {function_keyword} {contents_fn}();
+            """
+        )
+
+        state_fn = _fn_name(state_table)
+        sql.append(
+            f"""
+            CREATE OR REPLACE FUNCTION {state_fn}()
+                RETURNS TRIGGER
+                LANGUAGE 'plpgsql'
+            AS $BODY$
+                BEGIN
+                    {_state_statement(contents_table)};
+                    RETURN NULL;
+                END;
+            $BODY$
+            """
+        )
+        sql.append(
+            f"""
+            CREATE TRIGGER {_trigger_name(state_table, "UPDATE")}
+            AFTER UPDATE OF {state_column} ON {state_table}
+            FOR EACH ROW
+            WHEN ({_changed([state_column])})
+            EXECUTE {function_keyword} {state_fn}();
+            """
+        )
+    return sql
+
+
+# SQLite trigger installation
+
+
+def _sqlite_remove():
+    sql = []
+    for contents_table, (state_table, _, _) in trigger_config.items():
+        for operation in ["INSERT", "DELETE", "UPDATE"]:
+            sql.append(f"DROP TRIGGER IF EXISTS {_trigger_name(contents_table, operation)};")
+        sql.append(f"DROP TRIGGER IF EXISTS {_trigger_name(state_table, 'UPDATE')};")
+    return sql
+
+
+def _sqlite_install():
+    sql = []
+    for contents_table, (state_table, foreign_key, state_column) in trigger_config.items():
+        for operation, rows in [("INSERT", [("NEW", "")]), ("DELETE", [("OLD", "-")])]:
+            sql.append(_sqlite_trigger(contents_table, operation, rows))
+        columns = count_columns + [foreign_key]
+        sql.append(
+            _sqlite_trigger(
+                contents_table,
+                f"UPDATE OF {', '.join(columns)}",
+                [("OLD", "-"), ("NEW", "")],
+                when=_changed(columns, distinct="IS NOT"),
+            )
+        )
+        sql.append(
+            f"""
+            CREATE TRIGGER {_trigger_name(state_table, "UPDATE")}
+                AFTER UPDATE OF {state_column}
+                ON {state_table}
+                FOR EACH ROW
+                WHEN {_changed([state_column], distinct="IS NOT")}
+                BEGIN
+                    {_state_statement(contents_table)};
+                END;
+            """
+        )
+    return sql
+
+
+def _sqlite_trigger(contents_table, operation, rows, when=None):
+    statements = "".join(f"{_contents_statement(contents_table, row, sign)};" for row, sign in rows)
+    when_clause = f"WHEN {when}" if when else ""
+    return f"""
+        CREATE TRIGGER {_trigger_name(contents_table, operation.split()[0])}
+            AFTER {operation}
+            ON {contents_table}
+            FOR EACH ROW
+            {when_clause}
+            BEGIN
+                {statements}
+            END;
+    """
+
+
+def _fn_name(source_table):
+    return f"fn_{source_table}_state_count"
+
+
+def _trigger_name(source_table, operation):
+    op_initials = "".join(word[0] for word in operation.lower().split() if word != "or")
+    return f"trigger_{source_table}_state_count_a{op_initials}r"
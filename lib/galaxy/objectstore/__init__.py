@@ -7,6 +7,7 @@ tools
 
 import abc
 import logging
+import mmap
 import os
 import random
 import shutil
@@ -52,7 +53,10 @@ from .badges import (
     serialize_badges,
     StoredBadgeDict,
 )
-from .caching import CacheTarget
+from .caching import (
+    CacheTarget,
+    ObjectStoreMetadataCache,
+)
 
 if TYPE_CHECKING:
     from galaxy.model import DatasetInstance
@@ -63,6 +67,10 @@ NO_SESSION_ERROR_MESSAGE = (
 DEFAULT_PRIVATE = False
 DEFAULT_QUOTA_SOURCE = None  # Just track quota right on user object in Galaxy.
 DEFAULT_QUOTA_ENABLED = True  # enable quota tracking in object stores by default
+# Object store methods whose results may be served from the metadata cache,
+# and methods that change the object they are called for.
+METADATA_CACHED_METHODS = ("exists", "size")
+METADATA_INVALIDATING_METHODS = ("create", "delete", "update_from_file")
 
 log = logging.getLogger(__name__)
 
@@ -202,6 +210,20 @@ class ObjectStore(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    def get_data_range(self, obj, start=0, count=-1, **kwargs) -> memoryview:
+        """
+        Return at most `count` bytes of the object starting at offset `start` as a read-only buffer.
+
+        Unlike :meth:`get_data` this reads bytes and avoids copying them: files on
+        disk are memory mapped and object stores backed by remote storage request
+        only the given byte range if the object is not in their cache yet. If
+        `count` is negative everything from `start` to the end of the object is
+        returned.
+
+        If the object does not exist raises `ObjectNotFound`.
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def get_filename(
         self, obj, base_dir=None, dir_only=False, extra_dir=None, extra_dir_at_root=False, alt_name=None, obj_dir=False
@@ -252,6 +274,18 @@ class ObjectStore(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    def prefetch(self, obj, job_id=None, **kwargs):
+        """
+        Hint that the file for `obj` is about to be used, e.g. as the input of the job `job_id`.
+
+        Object stores keeping a local cache of remote data pin the cached file for the
+        job so it is not evicted and, if configured to, start pulling it into the cache
+        in the background. Other object stores ignore the hint.
+        """
+
+    def release(self, obj, job_id=None, **kwargs):
+        """Drop the pin placed on the cached file for `obj` by :meth:`prefetch` for `job_id`."""
+
     @abc.abstractmethod
     def get_concrete_store_name(self, obj):
         """Return a display name or title of the objectstore corresponding to obj.
@@ -333,6 +367,7 @@ class ObjectStore(metaclass=abc.ABCMeta):
 class BaseObjectStore(ObjectStore):
     store_by: str
     store_type: str
+    metadata_cache: Optional[ObjectStoreMetadataCache] = None
 
     def __init__(self, config, config_dict=None, **kwargs):
         """
@@ -417,7 +452,27 @@ class BaseObjectStore(ObjectStore):
             # job working directories.
             return obj.id
 
+    def enable_metadata_cache(self, ttl: float, statsd_client=None) -> None:
+        """Serve repeated ``exists`` and ``size`` calls for the same object from memory for up to ``ttl`` seconds.
+
+        Only enable this on the object store used by the application, nested
+        object stores modify their backends without going through their public
+        methods. Hits and misses are reported to ``statsd_client`` if set.
+        """
+        self.metadata_cache = ObjectStoreMetadataCache(ttl, statsd_client=statsd_client)
+
     def _invoke(self, delegate, obj=None, **kwargs):
+        metadata_cache = self.metadata_cache
+        if metadata_cache is not None and obj is not None:
+            if delegate in METADATA_CACHED_METHODS and not kwargs.get("base_dir"):
+                return metadata_cache.get_or_call(
+                    delegate, obj, kwargs, lambda: self.__getattribute__(f"_{delegate}")(obj=obj, **kwargs)
+                )
+            if delegate in METADATA_INVALIDATING_METHODS:
+                try:
+                    return self.__getattribute__(f"_{delegate}")(obj=obj, **kwargs)
+                finally:
+                    metadata_cache.invalidate(obj)
         return self.__getattribute__(f"_{delegate}")(obj=obj, **kwargs)
 
     def exists(self, obj, **kwargs):
@@ -441,6 +496,12 @@ class BaseObjectStore(ObjectStore):
     def get_data(self, obj, **kwargs):
         return self._invoke("get_data", obj, **kwargs)
 
+    def get_data_range(self, obj, **kwargs) -> memoryview:
+        return self._invoke("get_data_range", obj, **kwargs)
+
+    def _get_data_range(self, obj, start=0, count=-1, **kwargs) -> memoryview:
+        return map_file_range(self.get_filename(obj, **kwargs), start, count)
+
     def get_filename(self, obj, **kwargs):
         return self._invoke("get_filename", obj, **kwargs)
 
@@ -450,6 +511,18 @@ class BaseObjectStore(ObjectStore):
     def get_object_url(self, obj, **kwargs):
         return self._invoke("get_object_url", obj, **kwargs)
 
+    def prefetch(self, obj, **kwargs):
+        return self._invoke("prefetch", obj, **kwargs)
+
+    def release(self, obj, **kwargs):
+        return self._invoke("release", obj, **kwargs)
+
+    def _prefetch(self, obj, **kwargs):
+        pass
+
+    def _release(self, obj, **kwargs):
+        pass
+
     def get_concrete_store_name(self, obj):
         return self._invoke("get_concrete_store_name", obj)
 
@@ -956,6 +1029,10 @@ class NestedObjectStore(BaseObjectStore):
         """For the first backend that has this `obj`, get data from it."""
         return self._call_method("_get_data", obj, ObjectNotFound, True, **kwargs)
 
+    def _get_data_range(self, obj, **kwargs):
+        """For the first backend that has this `obj`, get a range of its bytes."""
+        return self._call_method("_get_data_range", obj, ObjectNotFound, True, **kwargs)
+
     def _get_filename(self, obj, **kwargs):
         """For the first backend that has this `obj`, get its filename."""
         return self._call_method("_get_filename", obj, ObjectNotFound, True, **kwargs)
@@ -971,6 +1048,14 @@ class NestedObjectStore(BaseObjectStore):
         """For the first backend that has this `obj`, get its URL."""
         return self._call_method("_get_object_url", obj, None, False, **kwargs)
 
+    def _prefetch(self, obj, job_id=None, **kwargs):
+        """For the first backend that has this `obj`, pin and prefetch it."""
+        return self._call_method("_prefetch", obj, None, False, method_kwargs={"job_id": job_id}, **kwargs)
+
+    def _release(self, obj, job_id=None, **kwargs):
+        """For the first backend that has this `obj`, release it."""
+        return self._call_method("_release", obj, None, False, method_kwargs={"job_id": job_id}, **kwargs)
+
     def _get_concrete_store_name(self, obj):
         return self._call_method("_get_concrete_store_name", obj, None, False)
 
@@ -994,11 +1079,11 @@ class NestedObjectStore(BaseObjectStore):
         except AttributeError:
             return str(obj)
 
-    def _call_method(self, method, obj, default, default_is_exception, **kwargs):
+    def _call_method(self, method, obj, default, default_is_exception, method_kwargs=None, **kwargs):
         """Check all children object stores for the first one with the dataset."""
         for store in self.backends.values():
             if store.exists(obj, **kwargs):
-                return store.__getattribute__(method)(obj, **kwargs)
+                return store.__getattribute__(method)(obj, **(method_kwargs or {}), **kwargs)
         if default_is_exception:
             raise default(
                 f"objectstore, _call_method failed: {method} on {self._repr_object_for_exception(obj)}, kwargs: {kwargs}"
@@ -1190,10 +1275,10 @@ class DistributedObjectStore(NestedObjectStore):
         else:
             return self.backends[object_store_id]
 
-    def _call_method(self, method, obj, default, default_is_exception, **kwargs):
+    def _call_method(self, method, obj, default, default_is_exception, method_kwargs=None, **kwargs):
         object_store_id = self.__get_store_id_for(obj, **kwargs)
         if object_store_id is not None:
-            return self.backends[object_store_id].__getattribute__(method)(obj, **kwargs)
+            return self.backends[object_store_id].__getattribute__(method)(obj, **(method_kwargs or {}), **kwargs)
         if default_is_exception:
             raise default(
                 f"objectstore, _call_method failed: {method} on {self._repr_object_for_exception(obj)}, kwargs: {kwargs}"
@@ -1463,6 +1548,21 @@ def build_object_store_from_config(
         return objectstore_class(config=config, config_dict=config_dict, **objectstore_constructor_kwds)
 
 
+def map_file_range(path: str, start: int = 0, count: int = -1) -> memoryview:
+    """Return a read-only view of at most `count` bytes of the file at `path` starting at `start`.
+
+    The file is memory mapped, so only the pages actually read are loaded. The
+    mapping is released once the returned view is no longer referenced.
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        end = size if count < 0 else min(start + count, size)
+        if start >= end:
+            return memoryview(b"")
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)[start:end]
+
+
 def local_extra_dirs(func):
     """Non-local plugin decorator using local directories for the extra_dirs (job_work and temp)."""
 
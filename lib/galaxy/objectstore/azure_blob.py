@@ -2,6 +2,7 @@
 Object Store plugin for the Microsoft Azure Block Blob Storage system
 """
 
+import base64
 import logging
 import os
 import shutil
@@ -31,8 +32,15 @@ from .caching import (
     CacheTarget,
     enable_cache_monitor,
     InProcessCacheMonitor,
+    ObjectStoreCache,
     parse_caching_config_dict_from_xml,
 )
+from .ranged_download import (
+    ChecksumMismatch,
+    download_config_from_dict,
+    parse_download_config_dict_from_xml,
+    ranged_download,
+)
 
 NO_BLOBSERVICE_ERROR_MESSAGE = (
     "ObjectStore configured, but no azure.storage.blob dependency available."
@@ -54,6 +62,7 @@ def parse_config_xml(config_xml):
         max_chunk_size = int(container_xml.get("max_chunk_size", 250))  # currently unused
 
         cache_dict = parse_caching_config_dict_from_xml(config_xml)
+        download_dict = parse_download_config_dict_from_xml(config_xml)
 
         tag, attrs = "extra_dir", ("type", "path")
         extra_dirs = config_xml.findall(tag)
@@ -72,6 +81,7 @@ def parse_config_xml(config_xml):
                 "max_chunk_size": max_chunk_size,
             },
             "cache": cache_dict,
+            "download": download_dict,
             "extra_dirs": extra_dirs,
             "private": ConcreteObjectStore.parse_private_from_config_xml(config_xml),
         }
@@ -110,6 +120,8 @@ class AzureBlobObjectStore(ConcreteObjectStore):
         self.cache_size = cache_dict.get("size") or self.config.object_store_cache_size
         self.staging_path = cache_dict.get("path") or self.config.object_store_cache_path
         self.cache_updated_data = cache_dict.get("cache_updated_data", True)
+        self.object_cache = ObjectStoreCache.from_cache_dict(self.cache_target, cache_dict)
+        self.download_config = download_config_from_dict(config_dict.get("download"))
 
         self._initialize()
 
@@ -120,7 +132,9 @@ class AzureBlobObjectStore(ConcreteObjectStore):
         self._configure_connection()
 
         if self.enable_cache_monitor:
-            self.cache_monitor = InProcessCacheMonitor(self.cache_target, self.cache_monitor_interval)
+            self.cache_monitor = InProcessCacheMonitor(
+                self.cache_target, self.cache_monitor_interval, eviction_policy=self.object_cache.eviction_policy
+            )
 
     def to_dict(self):
         as_dict = super().to_dict()
@@ -138,7 +152,11 @@ class AzureBlobObjectStore(ConcreteObjectStore):
                     "size": self.cache_size,
                     "path": self.staging_path,
                     "cache_updated_data": self.cache_updated_data,
+                    "eviction_policy": self.object_cache.eviction_policy,
+                    "prefetch": self.object_cache.prefetch_enabled,
+                    "pin_ttl": self.object_cache.pin_ttl,
                 },
+                "download": self.download_config.to_dict(),
             }
         )
         return as_dict
@@ -256,6 +274,9 @@ class AzureBlobObjectStore(ConcreteObjectStore):
         return os.path.exists(cache_path)
 
     def _pull_into_cache(self, rel_path):
+        return self.object_cache.fetch(rel_path, self._download_into_cache)
+
+    def _download_into_cache(self, rel_path):
         # Ensure the cache directory structure exists (e.g., dataset_#_files/)
         rel_path_dir = os.path.dirname(rel_path)
         if not os.path.exists(self._get_cache_path(rel_path_dir)):
@@ -280,16 +301,45 @@ class AzureBlobObjectStore(ConcreteObjectStore):
                     self.cache_target.log_description,
                 )
                 return False
-            else:
-                self.transfer_progress = 0  # Reset transfer progress counter
-                self.service.get_blob_to_path(
-                    self.container_name, rel_path, local_destination, progress_callback=self._transfer_cb
-                )
+            if self.download_config.ranged and self._download_ranged(rel_path):
                 return True
+            self.transfer_progress = 0  # Reset transfer progress counter
+            self.service.get_blob_to_path(
+                self.container_name, rel_path, local_destination, progress_callback=self._transfer_cb
+            )
+            return True
         except AzureHttpError:
             log.exception("Problem downloading '%s' from Azure", rel_path)
         return False
 
+    def _download_ranged(self, rel_path):
+        """Download the blob in ranged parts, return ``False`` to fall back to a sequential download."""
+        properties = self.service.get_blob_properties(self.container_name, rel_path)
+        if type(properties) is Blob:
+            properties = properties.properties
+        content_md5 = properties.content_settings.content_md5
+        checksum = ("md5", base64.b64decode(content_md5).hex()) if content_md5 else None
+
+        def read_range(start, end):
+            return self.service.get_blob_to_bytes(
+                self.container_name, rel_path, start_range=start, end_range=end
+            ).content
+
+        try:
+            ranged_download(
+                self._get_cache_path(rel_path),
+                properties.content_length,
+                read_range,
+                self.download_config,
+                checksum=checksum,
+                fingerprint=properties.etag,
+            )
+        except ChecksumMismatch:
+            log.warning("Downloaded blob '%s' does not match its Content-MD5, downloading it sequentially", rel_path)
+            return False
+        log.debug("Pulled '%s' into cache to %s in ranged parts", rel_path, self._get_cache_path(rel_path))
+        return True
+
     def _push_to_os(self, rel_path, source_file=None, from_string=None):
         """
         Push the file pointed to by ``rel_path`` to the object store naming the blob
@@ -467,6 +517,7 @@ class AzureBlobObjectStore(ConcreteObjectStore):
             # but requires iterating through each individual blob in Azure and deleing it.
             if entire_dir and extra_dir:
                 shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path, entire_dir=True)
                 blobs = self.service.list_blobs(self.container_name, prefix=rel_path)
                 for blob in blobs:
                     log.debug("Deleting from Azure: %s", blob)
@@ -475,6 +526,7 @@ class AzureBlobObjectStore(ConcreteObjectStore):
             else:
                 # Delete from cache first
                 unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path)
                 # Delete from S3 as well
                 if self._in_azure(rel_path):
                     log.debug("Deleting from Azure: %s", rel_path)
@@ -491,6 +543,7 @@ class AzureBlobObjectStore(ConcreteObjectStore):
         # Check cache first and get file if not there
         if not self._in_cache(rel_path):
             self._pull_into_cache(rel_path)
+        self.object_cache.touch(rel_path)
         # Read the file content from cache
         data_file = open(self._get_cache_path(rel_path))
         data_file.seek(start)
@@ -498,6 +551,24 @@ class AzureBlobObjectStore(ConcreteObjectStore):
         data_file.close()
         return content
 
+    def _get_data_range(self, obj, start=0, count=-1, **kwargs):
+        rel_path = self._construct_path(obj, **kwargs)
+        if count < 0 or (self._in_cache(rel_path) and os.path.getsize(self._get_cache_path(rel_path)) > 0):
+            # Serve the remainder of the object or an already cached object from the cache
+            return super()._get_data_range(obj, start=start, count=count, **kwargs)
+        size = self._get_size_in_azure(rel_path)
+        if size is None or size < 0:
+            raise ObjectNotFound(f"objectstore.get_data_range, no blob: {obj}, kwargs: {kwargs}")
+        end = min(start + count, size) - 1
+        if end < start:
+            return memoryview(b"")
+        try:
+            blob = self.service.get_blob_to_bytes(self.container_name, rel_path, start_range=start, end_range=end)
+        except AzureHttpError:
+            log.exception("Problem reading range of '%s' from Azure", rel_path)
+            raise
+        return memoryview(blob.content)
+
     def _get_filename(self, obj, **kwargs):
         rel_path = self._construct_path(obj, **kwargs)
         base_dir = kwargs.get("base_dir", None)
@@ -522,6 +593,7 @@ class AzureBlobObjectStore(ConcreteObjectStore):
         #     return cache_path
         # Check if the file exists in the cache first, always pull if file size in cache is zero
         if self._in_cache(rel_path) and (dir_only or os.path.getsize(self._get_cache_path(rel_path)) > 0):
+            self.object_cache.touch(rel_path)
             return cache_path
         # Check if the file exists in persistent storage and, if it does, pull it into cache
         elif self._exists(obj, **kwargs):
@@ -555,6 +627,7 @@ class AzureBlobObjectStore(ConcreteObjectStore):
                     log.exception("Trouble copying source file '%s' to cache '%s'", source_file, cache_file)
             else:
                 source_file = self._get_cache_path(rel_path)
+            self.object_cache.record(rel_path)
 
             self._push_to_os(rel_path, source_file)
 
@@ -573,6 +646,13 @@ class AzureBlobObjectStore(ConcreteObjectStore):
                 log.exception("Trouble generating URL for dataset '%s'", rel_path)
         return None
 
+    def _prefetch(self, obj, job_id=None, **kwargs):
+        rel_path = self._construct_path(obj, **kwargs)
+        self.object_cache.prefetch(rel_path, self._download_into_cache, holder=str(job_id or ""))
+
+    def _release(self, obj, job_id=None, **kwargs):
+        self.object_cache.unpin(self._construct_path(obj, **kwargs), holder=str(job_id or ""))
+
     def _get_store_usage_percent(self):
         return 0.0
 
@@ -586,3 +666,4 @@ class AzureBlobObjectStore(ConcreteObjectStore):
 
     def shutdown(self):
         self.cache_monitor and self.cache_monitor.shutdown()
+        self.object_cache.shutdown()
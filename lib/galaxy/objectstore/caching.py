@@ -2,9 +2,16 @@
 """
 import logging
 import os
+import sqlite3
+import stat
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
+    Any,
+    Callable,
+    Dict,
     List,
     Optional,
     Tuple,
@@ -17,12 +24,25 @@ from galaxy.util import (
     string_as_bool,
 )
 from galaxy.util.sleeper import Sleeper
+from .ranged_download import is_partial_download
 
 log = logging.getLogger(__name__)
 
 
 ONE_GIGA_BYTE = 1024 * 1024 * 1024
 
+CACHE_INDEX_FILENAME = ".galaxy_cache_index.sqlite"
+EVICTION_POLICY_LRU = "lru"
+EVICTION_POLICY_LFU = "lfu"
+EVICTION_POLICIES = (EVICTION_POLICY_LRU, EVICTION_POLICY_LFU)
+DEFAULT_EVICTION_POLICY = EVICTION_POLICY_LRU
+# pins expire so that a crashed handler can never keep files in the cache forever
+DEFAULT_PIN_TTL = 24 * 60 * 60
+DEFAULT_PREFETCH_WORKERS = 2
+# minimum number of seconds between two index updates recording access to the same file
+TOUCH_INTERVAL = 30
+MAX_TOUCHED_PATHS = 100000
+
 
 FileListT = List[Tuple[time.struct_time, str, int]]
 
@@ -52,11 +72,33 @@ def check_caches(targets: List[CacheTarget]):
         check_cache(target)
 
 
-def check_cache(cache_target: CacheTarget):
-    """Run a step of the cache monitor."""
+def check_cache(cache_target: CacheTarget, eviction_policy: str = DEFAULT_EVICTION_POLICY):
+    """Run a step of the cache monitor.
+
+    If the cache directory has an index (see :class:`CacheIndex`) it is used to
+    pick files to evict, otherwise the directory is walked and the least recently
+    accessed files are removed.
+    """
+    if CacheIndex.exists_for(cache_target.path):
+        index = CacheIndex(cache_target.path)
+        try:
+            total_size = index.total_size()
+            delete_this_much = _cache_overflow(cache_target, total_size)
+            if delete_this_much > 0:
+                index.evict(delete_this_much, eviction_policy)
+        finally:
+            index.close()
+        return
     total_size, file_list = _get_cache_size_files(cache_target.path)
     # Sort the file list (based on access time)
     file_list.sort()
+    delete_this_much = _cache_overflow(cache_target, total_size)
+    if delete_this_much > 0:
+        _clean_cache(file_list, delete_this_much)
+
+
+def _cache_overflow(cache_target: CacheTarget, total_size: int) -> float:
+    """Return the number of bytes that need to be freed from the cache, 0 if none."""
     # Initiate cleaning once we reach cache_monitor_cache_limit percentage of the defined cache size?
     # Convert GBs to bytes for comparison
     cache_size_in_gb = cache_target.size * ONE_GIGA_BYTE
@@ -71,8 +113,8 @@ def check_cache(cache_target: CacheTarget):
         # is likely to be deleting frequently and may run the risk of hitting
         # the limit - maybe delete additional #%?
         # For now, delete enough to leave at least 10% of the total cache free
-        delete_this_much = total_size - cache_limit
-        _clean_cache(file_list, delete_this_much)
+        return total_size - cache_limit
+    return 0
 
 
 def _clean_cache(file_list: FileListT, delete_this_much: float) -> None:
@@ -135,6 +177,12 @@ def parse_caching_config_dict_from_xml(config_xml):
             "monitor": monitor,
             "cache_updated_data": cache_updated_data,
         }
+        if "eviction_policy" in c_xml.attrib:
+            cache_dict["eviction_policy"] = c_xml.get("eviction_policy")
+        if "prefetch" in c_xml.attrib:
+            cache_dict["prefetch"] = string_as_bool(c_xml.get("prefetch"))
+        if "pin_ttl" in c_xml.attrib:
+            cache_dict["pin_ttl"] = int(c_xml.get("pin_ttl"))
     else:
         cache_dict = {}
     return cache_dict
@@ -170,7 +218,13 @@ def enable_cache_monitor(config, config_dict) -> Tuple[bool, int]:
 
 
 class InProcessCacheMonitor:
-    def __init__(self, cache_target: CacheTarget, interval: int = 30, initial_sleep: Optional[int] = 2):
+    def __init__(
+        self,
+        cache_target: CacheTarget,
+        interval: int = 30,
+        initial_sleep: Optional[int] = 2,
+        eviction_policy: str = DEFAULT_EVICTION_POLICY,
+    ):
         # This Event object is initialized to False
         # It is set to True in shutdown(), causing
         # the cache monitor thread to return/terminate
@@ -181,6 +235,7 @@ class InProcessCacheMonitor:
         self.cache_target = cache_target
         self.interval = interval
         self.initial_sleep = initial_sleep
+        self.eviction_policy = eviction_policy
 
         self.cache_monitor_thread = threading.Thread(
             target=self._cache_monitor,
@@ -194,7 +249,7 @@ class InProcessCacheMonitor:
                 self.initial_sleep
             )  # startup sleep hack - probably originally implemented to prevent contention at app startup
         while not self.stop_cache_monitor_event.is_set():
-            check_cache(self.cache_target)
+            check_cache(self.cache_target, self.eviction_policy)
             self.sleeper.sleep(self.interval)
 
     def shutdown(self):
@@ -206,3 +261,488 @@ class InProcessCacheMonitor:
 
         # Wait for the cache monitor thread to join before ending
         self.cache_monitor_thread.join(5)
+
+
+class CacheIndex:
+    """On-disk index of the files held in an object store cache directory.
+
+    The index is a small SQLite database stored at the root of the cache
+    directory and shared by every Galaxy process using that directory. It
+    records the size, last access time and number of accesses of every cached
+    file, so that the cache size can be computed and eviction candidates picked
+    without walking the directory. Entries may be pinned by any number of
+    holders (e.g. the jobs using a file as input), each pin lasting until the
+    holder releases it or a given time has passed; entries holding a pin are
+    never evicted.
+
+    The first time an index is created for an existing cache directory the
+    directory is walked once to adopt the files already in it.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = os.path.abspath(cache_path)
+        self.index_path = os.path.join(self.cache_path, CACHE_INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @staticmethod
+    def exists_for(cache_path: str) -> bool:
+        return os.path.exists(os.path.join(cache_path, CACHE_INDEX_FILENAME))
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections must not be shared with forked children
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(self.cache_path, exist_ok=True)
+            new_index = not os.path.exists(self.index_path)
+            connection = sqlite3.connect(self.index_path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "rel_path TEXT PRIMARY KEY, "
+                "size INTEGER NOT NULL DEFAULT 0, "
+                "last_access REAL NOT NULL, "
+                "hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_pin ("
+                "rel_path TEXT NOT NULL, "
+                "holder TEXT NOT NULL, "
+                "pinned_until REAL NOT NULL, "
+                "PRIMARY KEY (rel_path, holder))"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+            if new_index:
+                self._adopt_existing_files(connection)
+        return self._connection
+
+    def _adopt_existing_files(self, connection: sqlite3.Connection) -> None:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.cache_path):
+            for filename in filenames:
+                if filename.startswith(CACHE_INDEX_FILENAME) or is_partial_download(filename):
+                    continue
+                file_path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                entries.append((os.path.relpath(file_path, self.cache_path), stat.st_size, stat.st_atime))
+        if entries:
+            log.debug("Adopting %d existing files into cache index %s", len(entries), self.index_path)
+            connection.executemany(
+                "INSERT OR IGNORE INTO cache_entry (rel_path, size, last_access, hits) VALUES (?, ?, ?, 1)", entries
+            )
+
+    def _execute(self, sql: str, parameters: Tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._connect().execute(sql, parameters)
+
+    def _fetchall(self, sql: str, parameters: Tuple = ()) -> List[Tuple]:
+        # the connection is shared between threads, read the rows before releasing the lock
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    def record(self, rel_path: str, size: int, now: Optional[float] = None) -> None:
+        """Record that ``rel_path`` has just been written to the cache with ``size`` bytes."""
+        if is_partial_download(rel_path):
+            # moved into place (and recorded) once complete
+            return
+        self._execute(
+            "INSERT INTO cache_entry (rel_path, size, last_access, hits) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT(rel_path) DO UPDATE SET size = excluded.size, last_access = excluded.last_access, "
+            "hits = hits + 1",
+            (rel_path, size, now or time.time()),
+        )
+
+    def touch(self, rel_path: str, now: Optional[float] = None) -> bool:
+        """Record an access to ``rel_path``, return ``False`` if it is not indexed."""
+        cursor = self._execute(
+            "UPDATE cache_entry SET last_access = ?, hits = hits + 1 WHERE rel_path = ?",
+            (now or time.time(), rel_path),
+        )
+        return cursor.rowcount > 0
+
+    def remove(self, rel_path: str, entire_dir: bool = False) -> None:
+        if entire_dir:
+            prefix = os.path.join(rel_path, "")
+            self._execute(
+                "DELETE FROM cache_entry WHERE rel_path = ? OR substr(rel_path, 1, ?) = ?",
+                (rel_path, len(prefix), prefix),
+            )
+        else:
+            self._execute("DELETE FROM cache_entry WHERE rel_path = ?", (rel_path,))
+
+    def pin(self, rel_path: str, until: float, holder: str = "") -> None:
+        """Pin ``rel_path`` for ``holder`` until it is unpinned or ``until`` has passed."""
+        self._execute(
+            "INSERT INTO cache_pin (rel_path, holder, pinned_until) VALUES (?, ?, ?) "
+            "ON CONFLICT(rel_path, holder) DO UPDATE SET pinned_until = MAX(pinned_until, excluded.pinned_until)",
+            (rel_path, holder, until),
+        )
+
+    def unpin(self, rel_path: str, holder: str = "") -> None:
+        """Drop the pin ``holder`` has on ``rel_path``, pins of other holders are kept."""
+        self._execute("DELETE FROM cache_pin WHERE rel_path = ? AND holder = ?", (rel_path, holder))
+
+    def pins(self, rel_path: str, now: Optional[float] = None) -> List[str]:
+        """Return the holders of the pins on ``rel_path`` that have not expired."""
+        rows = self._fetchall(
+            "SELECT holder FROM cache_pin WHERE rel_path = ? AND pinned_until > ? ORDER BY holder",
+            (rel_path, now or time.time()),
+        )
+        return [row[0] for row in rows]
+
+    def entry(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        rows = self._fetchall(
+            "SELECT size, last_access, hits, (SELECT COALESCE(MAX(pinned_until), 0) FROM cache_pin "
+            "WHERE cache_pin.rel_path = cache_entry.rel_path) FROM cache_entry WHERE rel_path = ?",
+            (rel_path,),
+        )
+        if not rows:
+            return None
+        return dict(zip(("size", "last_access", "hits", "pinned_until"), rows[0]))
+
+    def total_size(self) -> int:
+        return self._fetchall("SELECT COALESCE(SUM(size), 0) FROM cache_entry")[0][0]
+
+    def evict(
+        self,
+        delete_this_much: float,
+        eviction_policy: str = DEFAULT_EVICTION_POLICY,
+        exclude: Tuple[str, ...] = (),
+        now: Optional[float] = None,
+    ) -> int:
+        """Remove unpinned files until at least ``delete_this_much`` bytes were freed.
+
+        Files are removed least recently used first, or least frequently used
+        first if ``eviction_policy`` is ``lfu``. Return the number of bytes freed.
+        """
+        if eviction_policy == EVICTION_POLICY_LFU:
+            order_by = "hits, last_access"
+        else:
+            order_by = "last_access"
+        # drop the pins of holders that never released them (e.g. jobs lost by a restarted handler)
+        self._execute("DELETE FROM cache_pin WHERE pinned_until <= ?", (now or time.time(),))
+        candidates = self._fetchall(
+            "SELECT rel_path, size FROM cache_entry WHERE NOT EXISTS "
+            f"(SELECT 1 FROM cache_pin WHERE cache_pin.rel_path = cache_entry.rel_path) ORDER BY {order_by}"
+        )
+        deleted_amount = 0
+        for rel_path, size in candidates:
+            if deleted_amount >= delete_this_much:
+                break
+            if rel_path in exclude:
+                continue
+            # claim the entry unless it was pinned since the candidates were read
+            claimed = self._execute(
+                "DELETE FROM cache_entry WHERE rel_path = ? AND NOT EXISTS "
+                "(SELECT 1 FROM cache_pin WHERE cache_pin.rel_path = cache_entry.rel_path)",
+                (rel_path,),
+            )
+            if claimed.rowcount == 0:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_path, rel_path))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                log.warning("Failed to remove '%s' from object store cache", rel_path, exc_info=True)
+                self.record(rel_path, size)
+                continue
+            deleted_amount += size
+        log.debug("Cache cleaning done. Total space freed: %s", nice_size(deleted_amount))
+        return deleted_amount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """De-duplicate concurrent calls sharing a key.
+
+    The first caller for a key runs the function, callers arriving while it is
+    running wait for it and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        assert flight is not None
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class ObjectStoreCache:
+    """Read-through cache layer shared by the object stores backed by remote storage.
+
+    Remote stores keep a local copy of the objects they serve in a cache
+    directory. This class owns the bookkeeping for that directory: downloads go
+    through :meth:`fetch`, which makes sure concurrent requests for the same
+    object in this process result in a single download, and every file
+    written or read is recorded in a :class:`CacheIndex` used to evict files
+    when the cache grows over its limit. Files needed by queued or running jobs
+    can be pinned so they are not evicted, and optionally downloaded ahead of
+    time in a small pool of background threads.
+    """
+
+    def __init__(
+        self,
+        cache_target: CacheTarget,
+        eviction_policy: str = DEFAULT_EVICTION_POLICY,
+        prefetch: bool = False,
+        pin_ttl: int = DEFAULT_PIN_TTL,
+        prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+    ):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise Exception(f"Unknown object store cache eviction policy [{eviction_policy}]")
+        self.cache_target = cache_target
+        self.eviction_policy = eviction_policy
+        self.prefetch_enabled = prefetch
+        self.pin_ttl = pin_ttl
+        self.prefetch_workers = prefetch_workers
+        self.index = CacheIndex(cache_target.path)
+        self._single_flight = SingleFlight()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+
+    @classmethod
+    def from_cache_dict(cls, cache_target: CacheTarget, cache_dict: Dict[str, Any]) -> "ObjectStoreCache":
+        return cls(
+            cache_target,
+            eviction_policy=cache_dict.get("eviction_policy") or DEFAULT_EVICTION_POLICY,
+            prefetch=cache_dict.get("prefetch", False),
+            pin_ttl=cache_dict.get("pin_ttl") or DEFAULT_PIN_TTL,
+        )
+
+    def _cache_path(self, rel_path: str) -> str:
+        return os.path.join(self.index.cache_path, rel_path)
+
+    def _in_cache(self, rel_path: str) -> bool:
+        cache_path = self._cache_path(rel_path)
+        return os.path.exists(cache_path) and os.path.getsize(cache_path) > 0
+
+    def _update_index(self, method: str, *args) -> Any:
+        # the index only drives eviction, never fail a read or write because of it
+        try:
+            return getattr(self.index, method)(*args)
+        except sqlite3.Error:
+            log.warning("Failed to update object store cache index %s", self.index.index_path, exc_info=True)
+            return None
+
+    def fetch(self, rel_path: str, download: Callable[[str], bool]) -> bool:
+        """Pull ``rel_path`` into the cache using ``download`` unless it is already there."""
+
+        def _fetch() -> bool:
+            if self._in_cache(rel_path):
+                # another request pulled it into the cache while this one was waiting
+                self.touch(rel_path)
+                return True
+            file_ok = download(rel_path)
+            if file_ok:
+                self.record(rel_path)
+                self._enforce_limit(exclude=(rel_path,))
+            return file_ok
+
+        return self._single_flight.do(rel_path, _fetch)
+
+    def record(self, rel_path: str) -> None:
+        """Record that ``rel_path`` was written to the cache."""
+        try:
+            cache_stat = os.stat(self._cache_path(rel_path))
+        except OSError:
+            return
+        if not stat.S_ISREG(cache_stat.st_mode):
+            # directories (e.g. extra files paths) are not tracked
+            return
+        size = cache_stat.st_size
+        self._touched[rel_path] = time.time()
+        self._update_index("record", rel_path, size)
+
+    def touch(self, rel_path: str) -> None:
+        """Record a read of ``rel_path`` from the cache."""
+        now = time.time()
+        if now - self._touched.get(rel_path, 0) < TOUCH_INTERVAL:
+            return
+        if len(self._touched) > MAX_TOUCHED_PATHS:
+            self._touched.clear()
+        self._touched[rel_path] = now
+        if self._update_index("touch", rel_path, now) is False:
+            # written to the cache outside of this layer (e.g. a job output)
+            self.record(rel_path)
+
+    def forget(self, rel_path: str, entire_dir: bool = False) -> None:
+        """Drop ``rel_path`` (or everything below it) from the index after it was deleted."""
+        self._touched.pop(rel_path, None)
+        self._update_index("remove", rel_path, entire_dir)
+
+    def pin(self, rel_path: str, holder: str = "") -> None:
+        self._update_index("pin", rel_path, time.time() + self.pin_ttl, holder)
+
+    def unpin(self, rel_path: str, holder: str = "") -> None:
+        self._update_index("unpin", rel_path, holder)
+
+    def prefetch(self, rel_path: str, download: Callable[[str], bool], holder: str = "") -> None:
+        """Pin ``rel_path`` for ``holder`` and, if prefetching is enabled, pull it into the cache in the background."""
+        self.pin(rel_path, holder)
+        if not self.prefetch_enabled or self._in_cache(rel_path):
+            return
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.prefetch_workers, thread_name_prefix="ObjectStoreCachePrefetch"
+                )
+            self._executor.submit(self._prefetch, rel_path, download)
+
+    def _prefetch(self, rel_path: str, download: Callable[[str], bool]) -> None:
+        try:
+            self.fetch(rel_path, download)
+        except Exception:
+            log.exception("Failed to prefetch '%s' into the object store cache", rel_path)
+
+    def _enforce_limit(self, exclude: Tuple[str, ...] = ()) -> None:
+        if not (self.cache_target.size > 0):
+            return
+        total_size = self._update_index("total_size")
+        if total_size is None:
+            return
+        delete_this_much = _cache_overflow(self.cache_target, total_size)
+        if delete_this_much > 0:
+            self._update_index("evict", delete_this_much, self.eviction_policy, exclude)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.index.close()
+
+
+class ObjectStoreMetadataCache:
+    """In-memory cache of ``exists`` and ``size`` results of an object store.
+
+    Entries expire after ``ttl`` seconds and all entries for an object are
+    dropped whenever it is created, updated or deleted through the same object
+    store. Only positive results (the object exists, has a non-zero size) are
+    cached, so an object written by another process becomes visible
+    immediately and only changes to existing objects may be seen up to ``ttl``
+    seconds late. Objects that are not in one of their ``terminal_states`` yet
+    (e.g. the output of a running job) may still be written outside of the
+    object store and are never cached.
+
+    If a ``statsd_client`` is given, hits, misses and invalidations are
+    counted under ``galaxy.object_store.metadata_cache``, tagged by method.
+    """
+
+    def __init__(self, ttl: float, max_objects: int = 100000, statsd_client=None):
+        self.ttl = ttl
+        self.max_objects = max_objects
+        self.statsd_client = statsd_client
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        # object key -> {(method, kwargs): (expiration time, result)}
+        self._entries: "OrderedDict[Tuple[str, int], Dict[Tuple, Tuple[float, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _object_key(obj) -> Optional[Tuple[str, int]]:
+        obj_id = getattr(obj, "id", None)
+        if obj_id is None:
+            return None
+        return obj.__class__.__name__, obj_id
+
+    @staticmethod
+    def _is_settled(obj) -> bool:
+        terminal_states = getattr(obj, "terminal_states", None)
+        if terminal_states is None:
+            return True
+        return getattr(obj, "state", None) in terminal_states
+
+    def get_or_call(self, method: str, obj, kwargs: Dict[str, Any], call: Callable[[], Any]) -> Any:
+        object_key = self._object_key(obj) if self._is_settled(obj) else None
+        try:
+            call_key = (method, tuple(sorted(kwargs.items())))
+            hash(call_key)
+        except TypeError:
+            object_key = None
+        if object_key is None:
+            return call()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(object_key, {}).get(call_key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                self._entries.move_to_end(object_key)
+                self._incr("hits", method)
+                return entry[1]
+            self.misses += 1
+        self._incr("misses", method)
+        result = call()
+        if result:
+            with self._lock:
+                self._entries.setdefault(object_key, {})[call_key] = (now + self.ttl, result)
+                self._entries.move_to_end(object_key)
+                while len(self._entries) > self.max_objects:
+                    self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, obj) -> None:
+        object_key = self._object_key(obj)
+        if object_key is None:
+            return
+        with self._lock:
+            if self._entries.pop(object_key, None) is None:
+                return
+            self.invalidations += 1
+        self._incr("invalidations")
+
+    def _incr(self, counter: str, method: Optional[str] = None) -> None:
+        if self.statsd_client is not None:
+            tags = {"method": method} if method else None
+            self.statsd_client.incr(f"galaxy.object_store.metadata_cache.{counter}", tags=tags)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl": self.ttl,
+                "objects": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
@@ -26,6 +26,7 @@ from .caching import (
     CacheTarget,
     enable_cache_monitor,
     InProcessCacheMonitor,
+    ObjectStoreCache,
 )
 from .s3 import parse_config_xml
 
@@ -67,6 +68,9 @@ class CloudConfigMixin:
                 "size": self.cache_size,
                 "path": self.staging_path,
                 "cache_updated_data": self.cache_updated_data,
+                "eviction_policy": self.object_cache.eviction_policy,
+                "prefetch": self.object_cache.prefetch_enabled,
+                "pin_ttl": self.object_cache.pin_ttl,
             },
         }
 
@@ -105,6 +109,7 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
         self.cache_size = cache_dict.get("size") or self.config.object_store_cache_size
         self.staging_path = cache_dict.get("path") or self.config.object_store_cache_path
         self.cache_updated_data = cache_dict.get("cache_updated_data", True)
+        self.object_cache = ObjectStoreCache.from_cache_dict(self.cache_target, cache_dict)
 
         self._initialize()
 
@@ -124,7 +129,9 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
 
     def start_cache_monitor(self):
         if self.enable_cache_monitor:
-            self.cache_monitor = InProcessCacheMonitor(self.cache_target, self.cache_monitor_interval)
+            self.cache_monitor = InProcessCacheMonitor(
+                self.cache_target, self.cache_monitor_interval, eviction_policy=self.object_cache.eviction_policy
+            )
 
     @staticmethod
     def _get_connection(provider, credentials):
@@ -371,6 +378,9 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
         return os.path.exists(cache_path)
 
     def _pull_into_cache(self, rel_path):
+        return self.object_cache.fetch(rel_path, self._download_into_cache)
+
+    def _download_into_cache(self, rel_path):
         # Ensure the cache directory structure exists (e.g., dataset_#_files/)
         rel_path_dir = os.path.dirname(rel_path)
         if not os.path.exists(self._get_cache_path(rel_path_dir)):
@@ -586,6 +596,7 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
             # but requires iterating through each individual key in S3 and deleing it.
             if entire_dir and extra_dir:
                 shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path, entire_dir=True)
                 results = self.bucket.objects.list(prefix=rel_path)
                 for key in results:
                     log.debug("Deleting key %s", key.name)
@@ -594,6 +605,7 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
             else:
                 # Delete from cache first
                 unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path)
                 # Delete from S3 as well
                 if self._key_exists(rel_path):
                     key = self.bucket.objects.get(rel_path)
@@ -611,6 +623,7 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
         # Check cache first and get file if not there
         if not self._in_cache(rel_path):
             self._pull_into_cache(rel_path)
+        self.object_cache.touch(rel_path)
         # Read the file content from cache
         data_file = open(self._get_cache_path(rel_path))
         data_file.seek(start)
@@ -642,6 +655,7 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
         #     return cache_path
         # Check if the file exists in the cache first, always pull if file size in cache is zero
         if self._in_cache(rel_path) and (dir_only or os.path.getsize(self._get_cache_path(rel_path)) > 0):
+            self.object_cache.touch(rel_path)
             return cache_path
         # Check if the file exists in persistent storage and, if it does, pull it into cache
         elif self._exists(obj, **kwargs):
@@ -676,6 +690,7 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
                     log.exception("Trouble copying source file '%s' to cache '%s'", source_file, cache_file)
             else:
                 source_file = self._get_cache_path(rel_path)
+            self.object_cache.record(rel_path)
             # Update the file on cloud
             self._push_to_os(rel_path, source_file)
         else:
@@ -691,8 +706,16 @@ class Cloud(ConcreteObjectStore, CloudConfigMixin):
                 log.exception("Trouble generating URL for dataset '%s'", rel_path)
         return None
 
+    def _prefetch(self, obj, job_id=None, **kwargs):
+        rel_path = self._construct_path(obj, **kwargs)
+        self.object_cache.prefetch(rel_path, self._download_into_cache, holder=str(job_id or ""))
+
+    def _release(self, obj, job_id=None, **kwargs):
+        self.object_cache.unpin(self._construct_path(obj, **kwargs), holder=str(job_id or ""))
+
     def _get_store_usage_percent(self):
         return 0.0
 
     def shutdown(self):
         self.cache_monitor and self.cache_monitor.shutdown()
+        self.object_cache.shutdown()
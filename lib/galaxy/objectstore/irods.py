@@ -1,6 +1,7 @@
 """
 Object Store plugin for the Integrated Rule-Oriented Data System (iRODS)
 """
+import base64
 import logging
 import os
 import shutil
@@ -32,6 +33,16 @@ from galaxy.util import (
 )
 from galaxy.util.path import safe_relpath
 from . import DiskObjectStore
+from .caching import (
+    CacheTarget,
+    ObjectStoreCache,
+)
+from .ranged_download import (
+    ChecksumMismatch,
+    download_config_from_dict,
+    parse_download_config_dict_from_xml,
+    ranged_download,
+)
 
 IRODS_IMPORT_MESSAGE = "The Python irods package is required to use this feature, please install it"
 # 1 MB
@@ -84,6 +95,8 @@ def parse_config_xml(config_xml):
         staging_path = c_xml[0].get("path", None)
         cache_updated_data = string_as_bool(c_xml[0].get("cache_updated_data", "True"))
 
+        download_dict = parse_download_config_dict_from_xml(config_xml)
+
         attrs = ("type", "path")
         e_xml = config_xml.findall("extra_dir")
         if not e_xml:
@@ -113,6 +126,7 @@ def parse_config_xml(config_xml):
                 "path": staging_path,
                 "cache_updated_data": cache_updated_data,
             },
+            "download": download_dict,
             "extra_dirs": extra_dirs,
             "private": DiskObjectStore.parse_private_from_config_xml(config_xml),
         }
@@ -146,7 +160,11 @@ class CloudConfigMixin:
                 "size": self.cache_size,
                 "path": self.staging_path,
                 "cache_updated_data": self.cache_updated_data,
+                "eviction_policy": self.object_cache.eviction_policy,
+                "prefetch": self.object_cache.prefetch_enabled,
+                "pin_ttl": self.object_cache.pin_ttl,
             },
+            "download": self.download_config.to_dict(),
         }
 
 
@@ -207,13 +225,17 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
             _config_dict_error("connection->connection_pool_monitor_interval")
 
         cache_dict = config_dict.get("cache") or {}
-        self.cache_size = cache_dict.get("size") or self.config.object_store_cache_path
+        self.cache_size = cache_dict.get("size") or self.config.object_store_cache_size
         if self.cache_size is None:
             _config_dict_error("cache->size")
         self.staging_path = cache_dict.get("path") or self.config.object_store_cache_path
         if self.staging_path is None:
             _config_dict_error("cache->path")
         self.cache_updated_data = cache_dict.get("cache_updated_data", True)
+        self.object_cache = ObjectStoreCache.from_cache_dict(
+            CacheTarget(self.staging_path, self.cache_size, 0.9), cache_dict
+        )
+        self.download_config = download_config_from_dict(config_dict.get("download"))
 
         extra_dirs = {e["type"]: e["path"] for e in config_dict.get("extra_dirs", [])}
         if not extra_dirs:
@@ -263,6 +285,7 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
             if self.connection_pool_monitor_thread is not None:
                 self.connection_pool_monitor_thread.join(5)
 
+        self.object_cache.shutdown()
         log.debug("irods_pt shutdown: %s", ipt_timer)
 
     @classmethod
@@ -424,6 +447,9 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
         return os.path.exists(cache_path)
 
     def _pull_into_cache(self, rel_path):
+        return self.object_cache.fetch(rel_path, self._download_into_cache)
+
+    def _download_into_cache(self, rel_path):
         ipt_timer = ExecutionTimer()
         # Ensure the cache directory structure exists (e.g., dataset_#_files/)
         rel_path_dir = os.path.dirname(rel_path)
@@ -452,6 +478,8 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
 
         try:
             cache_path = self._get_cache_path(rel_path)
+            if self.download_config.ranged and self._download_ranged(rel_path, data_object_path):
+                return True
             self.session.data_objects.get(data_object_path, cache_path, **options)
             log.debug("Pulled data object '%s' into cache to %s", rel_path, cache_path)
             return True
@@ -461,6 +489,39 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
         finally:
             log.debug("irods_pt _download: %s", ipt_timer)
 
+    def _download_ranged(self, rel_path, data_object_path):
+        """Download the data object in ranged parts, return ``False`` to fall back to a sequential download."""
+        options = {kw.DEST_RESC_NAME_KW: self.resource}
+        data_object = self.session.data_objects.get(data_object_path, **options)
+        checksum = None
+        if data_object.checksum:
+            if data_object.checksum.startswith("sha2:"):
+                checksum = ("sha256", base64.b64decode(data_object.checksum[len("sha2:") :]).hex())
+            else:
+                checksum = ("md5", data_object.checksum)
+
+        def read_range(start, end):
+            with self.session.data_objects.open(data_object_path, "r", create=False, **options) as fh:
+                fh.seek(start)
+                return fh.read(end - start + 1)
+
+        try:
+            ranged_download(
+                self._get_cache_path(rel_path),
+                data_object.size,
+                read_range,
+                self.download_config,
+                checksum=checksum,
+                fingerprint=str(data_object.modify_time),
+            )
+        except ChecksumMismatch:
+            log.warning(
+                "Downloaded data object '%s' does not match its checksum, downloading it sequentially", data_object_path
+            )
+            return False
+        log.debug("Pulled data object '%s' into cache to %s in ranged parts", rel_path, self._get_cache_path(rel_path))
+        return True
+
     def _push_to_irods(self, rel_path, source_file=None, from_string=None):
         """
         Push the file pointed to by ``rel_path`` to the iRODS. Extract folder name
@@ -658,6 +719,7 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
             # but requires iterating through each individual key in irods and deleing it.
             if entire_dir and extra_dir:
                 shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path, entire_dir=True)
 
                 col_path = f"{self.home}/{rel_path}"
                 col = None
@@ -682,6 +744,7 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
             else:
                 # Delete from cache first
                 unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path)
                 # Delete from irods as well
                 p = Path(rel_path)
                 data_object_name = p.stem + p.suffix
@@ -710,6 +773,7 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
         # Check cache first and get file if not there
         if not self._in_cache(rel_path):
             self._pull_into_cache(rel_path)
+        self.object_cache.touch(rel_path)
         # Read the file content from cache
         data_file = open(self._get_cache_path(rel_path))
         data_file.seek(start)
@@ -718,6 +782,21 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
         log.debug("irods_pt _get_data: %s", ipt_timer)
         return content
 
+    def _get_data_range(self, obj, start=0, count=-1, **kwargs):
+        rel_path = self._construct_path(obj, **kwargs)
+        if count < 0 or (self._in_cache(rel_path) and os.path.getsize(self._get_cache_path(rel_path)) > 0):
+            # Serve the remainder of the object or an already cached object from the cache
+            return super()._get_data_range(obj, start=start, count=count, **kwargs)
+        p = Path(rel_path)
+        data_object_path = f"{self.home}/{p.parent}/{p.stem + p.suffix}"
+        options = {kw.DEST_RESC_NAME_KW: self.resource}
+        try:
+            with self.session.data_objects.open(data_object_path, "r", create=False, **options) as fh:
+                fh.seek(start)
+                return memoryview(fh.read(count))
+        except (DataObjectDoesNotExist, CollectionDoesNotExist):
+            raise ObjectNotFound(f"objectstore.get_data_range, no data object: {obj}, kwargs: {kwargs}")
+
     def _get_filename(self, obj, **kwargs):
         ipt_timer = ExecutionTimer()
         base_dir = kwargs.get("base_dir", None)
@@ -744,6 +823,7 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
         #     return cache_path
         # Check if the file exists in the cache first, always pull if file size in cache is zero
         if self._in_cache(rel_path) and (dir_only or os.path.getsize(self._get_cache_path(rel_path)) > 0):
+            self.object_cache.touch(rel_path)
             log.debug("irods_pt _get_filename: %s", ipt_timer)
             return cache_path
         # Check if the file exists in persistent storage and, if it does, pull it into cache
@@ -783,6 +863,7 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
                     log.exception("Trouble copying source file '%s' to cache '%s'", source_file, cache_file)
             else:
                 source_file = self._get_cache_path(rel_path)
+            self.object_cache.record(rel_path)
             # Update the file on iRODS
             self._push_to_irods(rel_path, source_file)
         else:
@@ -790,6 +871,13 @@ class IRODSObjectStore(DiskObjectStore, CloudConfigMixin):
             raise ObjectNotFound(f"objectstore.update_from_file, object does not exist: {obj}, kwargs: {kwargs}")
         log.debug("irods_pt _update_from_file: %s", ipt_timer)
 
+    def _prefetch(self, obj, job_id=None, **kwargs):
+        rel_path = self._construct_path(obj, **kwargs)
+        self.object_cache.prefetch(rel_path, self._download_into_cache, holder=str(job_id or ""))
+
+    def _release(self, obj, job_id=None, **kwargs):
+        self.object_cache.unpin(self._construct_path(obj, **kwargs), holder=str(job_id or ""))
+
     # Unlike S3, url is not really applicable to iRODS
     def _get_object_url(self, obj, **kwargs):
         if self._exists(obj, **kwargs):
@@ -0,0 +1,259 @@
+"""
+Download large objects from a remote object store into the cache as concurrent
+byte-range requests.
+
+The object is written to ``<destination>.partial`` and the parts completed so
+far are recorded in ``<destination>.partial.json``, so an interrupted download
+resumes where it stopped as long as the remote object did not change. Once all
+parts are written the file is optionally verified against a checksum provided
+by the backend and moved into place. Processes downloading the same object
+serialize on a lock held on ``<destination>.partial.lock``, a process that
+waited for another one to download the object does not download it again.
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from galaxy.util import string_as_bool
+
+log = logging.getLogger(__name__)
+
+# part size in megabytes
+DEFAULT_PART_SIZE = 64
+# a single thread keeps the backend's historical sequential download
+DEFAULT_THREADS = 1
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# suffixes of the files of a download in progress, next to its destination
+PARTIAL_SUFFIX = ".partial"
+LOCK_SUFFIX = f"{PARTIAL_SUFFIX}.lock"
+PARTIAL_SUFFIXES = (PARTIAL_SUFFIX, f"{PARTIAL_SUFFIX}.json", f"{PARTIAL_SUFFIX}.json.tmp", LOCK_SUFFIX)
+
+# read_range(start, end) returns the bytes of the object from start to end, both inclusive
+ReadRangeT = Callable[[int, int], bytes]
+# (hashlib algorithm name, expected hex digest)
+ChecksumT = Tuple[str, str]
+
+
+class ChecksumMismatch(Exception):
+    pass
+
+
+class DownloadConfig(NamedTuple):
+    threads: int = DEFAULT_THREADS
+    part_size: int = DEFAULT_PART_SIZE  # part size in megabytes
+    verify_checksum: bool = True
+
+    @property
+    def ranged(self) -> bool:
+        return self.threads > 1
+
+    @property
+    def part_size_bytes(self) -> int:
+        return self.part_size * 1024 * 1024
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+def download_config_from_dict(download_dict: Optional[Dict[str, Any]]) -> DownloadConfig:
+    download_dict = download_dict or {}
+    return DownloadConfig(
+        threads=int(download_dict.get("threads", DEFAULT_THREADS)),
+        part_size=int(download_dict.get("part_size", DEFAULT_PART_SIZE)),
+        verify_checksum=download_dict.get("verify_checksum", True),
+    )
+
+
+def parse_download_config_dict_from_xml(config_xml) -> Dict[str, Any]:
+    download_els = config_xml.findall("download")
+    if not download_els:
+        return {}
+    d_xml = download_els[0]
+    return {
+        "threads": int(d_xml.get("threads", DEFAULT_THREADS)),
+        "part_size": int(d_xml.get("part_size", DEFAULT_PART_SIZE)),
+        "verify_checksum": string_as_bool(d_xml.get("verify_checksum", "True")),
+    }
+
+
+def ranged_download(
+    destination: str,
+    size: int,
+    read_range: ReadRangeT,
+    config: DownloadConfig,
+    checksum: Optional[ChecksumT] = None,
+    fingerprint: Optional[str] = None,
+) -> None:
+    """Download an object of ``size`` bytes to ``destination`` using ``config.threads`` concurrent range reads.
+
+    ``fingerprint`` identifies the version of the remote object (e.g. its ETag);
+    partial downloads of another version are discarded instead of resumed.
+    Raise :class:`ChecksumMismatch` if ``checksum`` is given and does not match
+    the downloaded data, any error raised by ``read_range`` is propagated and
+    leaves the partial download in place to be resumed.
+    """
+    previous_destination = _stat_key(destination)
+    with _download_lock(destination):
+        current_destination = _stat_key(destination)
+        if current_destination != previous_destination and current_destination and current_destination[0] == size:
+            log.debug("%s was downloaded by another process while waiting for it", destination)
+            return
+        _ranged_download(destination, size, read_range, config, checksum, fingerprint)
+
+
+def _ranged_download(
+    destination: str,
+    size: int,
+    read_range: ReadRangeT,
+    config: DownloadConfig,
+    checksum: Optional[ChecksumT],
+    fingerprint: Optional[str],
+) -> None:
+    partial_path = f"{destination}{PARTIAL_SUFFIX}"
+    state_path = f"{partial_path}.json"
+    part_size = config.part_size_bytes
+    part_count = max((size + part_size - 1) // part_size, 1)
+    state = {"size": size, "part_size": part_size, "fingerprint": fingerprint}
+    completed = _load_completed_parts(partial_path, state_path, state)
+    if not completed:
+        with open(partial_path, "wb") as fh:
+            fh.truncate(size)
+    elif len(completed) < part_count:
+        log.debug("Resuming download of %s, %d of %d parts already done", destination, len(completed), part_count)
+    state_lock = threading.Lock()
+
+    fd = os.open(partial_path, os.O_RDWR)
+    try:
+
+        def transfer_part(part: int) -> None:
+            start = part * part_size
+            end = min(start + part_size, size) - 1
+            if end >= start:
+                data = read_range(start, end)
+                if len(data) != end - start + 1:
+                    raise Exception(f"Expected {end - start + 1} bytes for range {start}-{end}, got {len(data)}")
+                os.pwrite(fd, data, start)
+            with state_lock:
+                completed.add(part)
+                _write_state(state_path, dict(state, completed=sorted(completed)))
+
+        pending = [part for part in range(part_count) if part not in completed]
+        if pending:
+            with ThreadPoolExecutor(
+                max_workers=min(config.threads, len(pending)), thread_name_prefix="RangedDownload"
+            ) as executor:
+                futures = [executor.submit(transfer_part, part) for part in pending]
+                done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in not_done:
+                    future.cancel()
+                for future in done:
+                    # re-raise the first failure, completed parts are kept for the next attempt
+                    future.result()
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    if checksum and config.verify_checksum:
+        algorithm, expected = checksum
+        actual = file_digest(partial_path, algorithm)
+        if actual != expected.lower():
+            _discard(partial_path, state_path)
+            raise ChecksumMismatch(f"{algorithm} checksum of {destination} is {actual}, expected {expected}")
+    os.replace(partial_path, destination)
+    _discard(state_path)
+
+
+def is_partial_download(path: str) -> bool:
+    """Whether ``path`` belongs to a download in progress rather than a downloaded object."""
+    return path.endswith(PARTIAL_SUFFIXES)
+
+
+def file_digest(path: str, algorithm: str) -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_BUFFER_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def _download_lock(destination: str) -> Iterator[None]:
+    lock_path = f"{destination}{LOCK_SUFFIX}"
+    while True:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                # the previous holder removed the lock file before releasing it, lock the new one instead
+                if os.fstat(fd).st_ino == os.stat(lock_path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+    try:
+        yield
+    finally:
+        _discard(lock_path)
+        os.close(fd)
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_ino, stat.st_mtime_ns
+
+
+def _load_completed_parts(partial_path: str, state_path: str, state: Dict[str, Any]) -> Set[int]:
+    if not (os.path.exists(partial_path) and os.path.exists(state_path)):
+        return set()
+    try:
+        with open(state_path) as fh:
+            previous_state = json.load(fh)
+        if os.path.getsize(partial_path) == state["size"] and all(
+            previous_state.get(key) == value for key, value in state.items()
+        ):
+            return set(previous_state.get("completed", []))
+    except (OSError, ValueError):
+        log.debug("Ignoring unreadable partial download state %s", state_path)
+    _discard(partial_path, state_path)
+    return set()
+
+
+def _write_state(state_path: str, state: Dict[str, Any]) -> None:
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, "w") as fh:
+        json.dump(state, fh)
+    os.replace(temp_path, state_path)
+
+
+def _discard(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
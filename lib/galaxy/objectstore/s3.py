@@ -4,6 +4,7 @@ Object Store plugin for the Amazon Simple Storage Service (S3)
 import logging
 import multiprocessing
 import os
+import re
 import shutil
 import subprocess
 import time
@@ -36,8 +37,15 @@ from .caching import (
     CacheTarget,
     enable_cache_monitor,
     InProcessCacheMonitor,
+    ObjectStoreCache,
     parse_caching_config_dict_from_xml,
 )
+from .ranged_download import (
+    ChecksumMismatch,
+    download_config_from_dict,
+    parse_download_config_dict_from_xml,
+    ranged_download,
+)
 from .s3_multipart_upload import multipart_upload
 
 NO_BOTO_ERROR_MESSAGE = (
@@ -48,6 +56,22 @@ NO_BOTO_ERROR_MESSAGE = (
 log = logging.getLogger(__name__)
 logging.getLogger("boto").setLevel(logging.INFO)  # Otherwise boto is quite noisy
 
+MD5_ETAG_RE = re.compile(r"^[0-9a-f]{32}$")
+# server side encryption with S3 managed keys (or none) keeps the ETag the MD5 of the content
+MD5_ETAG_ENCRYPTIONS = (None, "AES256")
+
+
+def md5_from_etag(key) -> Optional[str]:
+    """Return the MD5 of the content of ``key`` if its ETag is one, ``None`` otherwise.
+
+    The ETags of multipart uploads and of objects encrypted with SSE-KMS or SSE-C keys are
+    not the MD5 of the content.
+    """
+    etag = (key.etag or "").strip('"').lower()
+    if key.encrypted not in MD5_ETAG_ENCRYPTIONS or not MD5_ETAG_RE.match(etag):
+        return None
+    return etag
+
 
 def download_directory(bucket, remote_folder, local_path):
     # List objects in the specified S3 folder
@@ -88,6 +112,7 @@ def parse_config_xml(config_xml):
         conn_path = cn_xml.get("conn_path", "/")
 
         cache_dict = parse_caching_config_dict_from_xml(config_xml)
+        download_dict = parse_download_config_dict_from_xml(config_xml)
 
         tag, attrs = "extra_dir", ("type", "path")
         extra_dirs = config_xml.findall(tag)
@@ -115,6 +140,7 @@ def parse_config_xml(config_xml):
                 "conn_path": conn_path,
             },
             "cache": cache_dict,
+            "download": download_dict,
             "extra_dirs": extra_dirs,
             "private": ConcreteObjectStore.parse_private_from_config_xml(config_xml),
         }
@@ -146,7 +172,11 @@ class CloudConfigMixin:
                 "size": self.cache_size,
                 "path": self.staging_path,
                 "cache_updated_data": self.cache_updated_data,
+                "eviction_policy": self.object_cache.eviction_policy,
+                "prefetch": self.object_cache.prefetch_enabled,
+                "pin_ttl": self.object_cache.pin_ttl,
             },
+            "download": self.download_config.to_dict(),
         }
 
 
@@ -188,6 +218,8 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
         self.cache_size = cache_dict.get("size") or self.config.object_store_cache_size
         self.staging_path = cache_dict.get("path") or self.config.object_store_cache_path
         self.cache_updated_data = cache_dict.get("cache_updated_data", True)
+        self.object_cache = ObjectStoreCache.from_cache_dict(self.cache_target, cache_dict)
+        self.download_config = download_config_from_dict(config_dict.get("download"))
 
         extra_dirs = {e["type"]: e["path"] for e in config_dict.get("extra_dirs", [])}
         self.extra_dirs.update(extra_dirs)
@@ -221,7 +253,9 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
 
     def start_cache_monitor(self):
         if self.enable_cache_monitor:
-            self.cache_monitor = InProcessCacheMonitor(self.cache_target, self.cache_monitor_interval)
+            self.cache_monitor = InProcessCacheMonitor(
+                self.cache_target, self.cache_monitor_interval, eviction_policy=self.object_cache.eviction_policy
+            )
 
     def _configure_connection(self):
         log.debug("Configuring S3 Connection")
@@ -390,6 +424,9 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
         #     return False
 
     def _pull_into_cache(self, rel_path):
+        return self.object_cache.fetch(rel_path, self._download_into_cache)
+
+    def _download_into_cache(self, rel_path):
         # Ensure the cache directory structure exists (e.g., dataset_#_files/)
         rel_path_dir = os.path.dirname(rel_path)
         if not os.path.exists(self._get_cache_path(rel_path_dir)):
@@ -419,6 +456,8 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
                     self.cache_target.log_description,
                 )
                 return False
+            if self.download_config.ranged and self._download_ranged(rel_path, key):
+                return True
             if self.use_axel:
                 log.debug("Parallel pulled key '%s' into cache to %s", rel_path, self._get_cache_path(rel_path))
                 ncores = multiprocessing.cpu_count()
@@ -435,6 +474,30 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
             log.exception("Problem downloading key '%s' from S3 bucket '%s'", rel_path, self._bucket.name)
         return False
 
+    def _download_ranged(self, rel_path, key):
+        """Download ``key`` in ranged parts, return ``False`` to fall back to a sequential download."""
+        etag = (key.etag or "").strip('"')
+        md5 = md5_from_etag(key)
+        checksum = ("md5", md5) if md5 else None
+
+        def read_range(start, end):
+            return Key(self._bucket, rel_path).get_contents_as_string(headers={"Range": f"bytes={start}-{end}"})
+
+        try:
+            ranged_download(
+                self._get_cache_path(rel_path),
+                key.size,
+                read_range,
+                self.download_config,
+                checksum=checksum,
+                fingerprint=etag,
+            )
+        except ChecksumMismatch:
+            log.warning("Downloaded key '%s' does not match its ETag, downloading it sequentially", rel_path)
+            return False
+        log.debug("Pulled key '%s' into cache to %s in ranged parts", rel_path, self._get_cache_path(rel_path))
+        return True
+
     def _push_to_os(self, rel_path, source_file=None, from_string=None):
         """
         Push the file pointed to by ``rel_path`` to the object store naming the key
@@ -613,6 +676,7 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
             # but requires iterating through each individual key in S3 and deleing it.
             if entire_dir and extra_dir:
                 shutil.rmtree(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path, entire_dir=True)
                 results = self._bucket.get_all_keys(prefix=rel_path)
                 for key in results:
                     log.debug("Deleting key %s", key.name)
@@ -621,6 +685,7 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
             else:
                 # Delete from cache first
                 unlink(self._get_cache_path(rel_path), ignore_errors=True)
+                self.object_cache.forget(rel_path)
                 # Delete from S3 as well
                 if self._key_exists(rel_path):
                     key = Key(self._bucket, rel_path)
@@ -638,6 +703,7 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
         # Check cache first and get file if not there
         if not self._in_cache(rel_path) or os.path.getsize(self._get_cache_path(rel_path)) == 0:
             self._pull_into_cache(rel_path)
+        self.object_cache.touch(rel_path)
         # Read the file content from cache
         data_file = open(self._get_cache_path(rel_path))
         data_file.seek(start)
@@ -645,6 +711,23 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
         data_file.close()
         return content
 
+    def _get_data_range(self, obj, start=0, count=-1, **kwargs):
+        rel_path = self._construct_path(obj, **kwargs)
+        if count < 0 or (self._in_cache(rel_path) and os.path.getsize(self._get_cache_path(rel_path)) > 0):
+            # Serve the remainder of the object or an already cached object from the cache
+            return super()._get_data_range(obj, start=start, count=count, **kwargs)
+        try:
+            key = self._bucket.get_key(rel_path)
+            if key is None:
+                raise ObjectNotFound(f"objectstore.get_data_range, no key: {obj}, kwargs: {kwargs}")
+            end = min(start + count, key.size) - 1
+            if end < start:
+                return memoryview(b"")
+            return memoryview(key.get_contents_as_string(headers={"Range": f"bytes={start}-{end}"}))
+        except S3ResponseError:
+            log.exception("Problem reading range of key '%s' from S3 bucket '%s'", rel_path, self._bucket.name)
+            raise
+
     def _get_filename(self, obj, **kwargs):
         base_dir = kwargs.get("base_dir", None)
         dir_only = kwargs.get("dir_only", False)
@@ -670,6 +753,7 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
         #     return cache_path
         # Check if the file exists in the cache first, always pull if file size in cache is zero
         if self._in_cache(rel_path) and (dir_only or os.path.getsize(self._get_cache_path(rel_path)) > 0):
+            self.object_cache.touch(rel_path)
             return cache_path
         # Check if the file exists in persistent storage and, if it does, pull it into cache
         elif self._exists(obj, **kwargs):
@@ -705,6 +789,7 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
                     log.exception("Trouble copying source file '%s' to cache '%s'", source_file, cache_file)
             else:
                 source_file = self._get_cache_path(rel_path)
+            self.object_cache.record(rel_path)
             # Update the file on S3
             self._push_to_os(rel_path, source_file)
         else:
@@ -720,11 +805,19 @@ class S3ObjectStore(ConcreteObjectStore, CloudConfigMixin):
                 log.exception("Trouble generating URL for dataset '%s'", rel_path)
         return None
 
+    def _prefetch(self, obj, job_id=None, **kwargs):
+        rel_path = self._construct_path(obj, **kwargs)
+        self.object_cache.prefetch(rel_path, self._download_into_cache, holder=str(job_id or ""))
+
+    def _release(self, obj, job_id=None, **kwargs):
+        self.object_cache.unpin(self._construct_path(obj, **kwargs), holder=str(job_id or ""))
+
     def _get_store_usage_percent(self):
         return 0.0
 
     def shutdown(self):
         self.cache_monitor and self.cache_monitor.shutdown()
+        self.object_cache.shutdown()
 
 
 class GenericS3ObjectStore(S3ObjectStore):
@@ -24,6 +24,7 @@ from typing import (
     Callable,
     cast,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
@@ -328,6 +329,9 @@ class TabularToolDataTable(ToolDataTable):
         )
         self.config_element = config_element
         self.data = []
+        # column index -> field value -> positions of the matching rows in self.data, built lazily
+        self._column_indexes: Dict[int, Dict[str, List[int]]] = {}
+        self._column_indexes_key: Optional[Tuple[int, int]] = None
         self.configure_and_load(config_element, tool_data_path, from_shed_config)
 
     def configure_and_load(
@@ -483,26 +487,76 @@ class TabularToolDataTable(ToolDataTable):
 
     def get_field(self, value):
         rval = None
-        for i in self.get_named_fields_list():
-            if i["value"] == value:
-                rval = TabularToolDataField(i)
+        named_columns = self.get_column_name_list()
+        for fields in self.get_fields_by_column_values(self.columns["value"], [value]):
+            rval = TabularToolDataField(self._named_fields(fields, named_columns))
         return rval
 
     # This method is used in tools, so need to keep its API stable
     def get_named_fields_list(self) -> List[Dict[Union[str, int], str]]:
-        rval = []
         named_columns = self.get_column_name_list()
-        for fields in self.get_fields():
-            field_dict = {}
-            for i, field in enumerate(fields):
-                if i == len(named_columns):
-                    break
-                field_name: Optional[Union[str, int]] = named_columns[i]
-                if field_name is None:
-                    field_name = i  # check that this is supposed to be 0 based.
-                field_dict[field_name] = field
-            rval.append(field_dict)
-        return rval
+        return [self._named_fields(fields, named_columns) for fields in self.get_fields()]
+
+    def _named_fields(self, fields: List[str], named_columns: List[Union[str, None]]) -> Dict[Union[str, int], str]:
+        field_dict: Dict[Union[str, int], str] = {}
+        for i, field in enumerate(fields):
+            if i == len(named_columns):
+                break
+            field_name: Optional[Union[str, int]] = named_columns[i]
+            if field_name is None:
+                field_name = i  # check that this is supposed to be 0 based.
+            field_dict[field_name] = field
+        return field_dict
+
+    def _column_index(self, column: int) -> Optional[Dict[str, List[int]]]:
+        """
+        Return a hash index of ``column`` mapping field values to row positions,
+        or None if not every row is guaranteed to have that column.
+
+        Indexes are built on first use and dropped whenever the rows change.
+        """
+        if column > self.largest_index:
+            return None
+        key = (id(self.data), len(self.data))
+        column_indexes = getattr(self, "_column_indexes", None)
+        if column_indexes is None or getattr(self, "_column_indexes_key", None) != key:
+            column_indexes = self._column_indexes = {}
+            self._column_indexes_key = key
+        column_index = column_indexes.get(column)
+        if column_index is None:
+            column_index = {}
+            for position, fields in enumerate(self.data):
+                column_index.setdefault(fields[column], []).append(position)
+            column_indexes[column] = column_index
+        return column_index
+
+    def _invalidate_column_indexes(self) -> None:
+        self._column_indexes = {}
+        self._column_indexes_key = None
+
+    def _append_fields(self, fields: List[str]) -> None:
+        position = len(self.data)
+        self.data.append(fields)
+        if getattr(self, "_column_indexes_key", None) == (id(self.data), position):
+            for column, column_index in self._column_indexes.items():
+                column_index.setdefault(fields[column], []).append(position)
+            self._column_indexes_key = (id(self.data), position + 1)
+        else:
+            self._invalidate_column_indexes()
+
+    def get_fields_by_column_values(self, column: int, values: Iterable[str]) -> List[List[str]]:
+        """
+        Returns the rows whose field at position ``column`` is one of ``values``, in table order.
+        """
+        column_index = self._column_index(column)
+        if column_index is None:
+            values = set(values)
+            return [fields for fields in self.get_fields() if fields[column] in values]
+        positions: List[int] = []
+        for value in set(values):
+            positions.extend(column_index.get(value, ()))
+        data = self.data
+        return [data[position] for position in sorted(positions)]
 
     def get_version_fields(self):
         return (self._loaded_content_version, self.get_fields())
@@ -544,6 +598,7 @@ class TabularToolDataTable(ToolDataTable):
     def extend_data_with(self, filename: str, errors: Optional[ErrorListT] = None) -> None:
         here = os.path.dirname(os.path.abspath(filename))
         self.data.extend(self.parse_file_fields(filename, errors=errors, here=here))
+        self._invalidate_column_indexes()
         if not self.allow_duplicate_entries:
             self._deduplicate_data()
 
@@ -617,18 +672,18 @@ class TabularToolDataTable(ToolDataTable):
             if return_col is None:
                 return []
         rval = []
+        column_names = self.get_column_name_list() if return_attr is None else []
         # Look for table entry.
-        for fields in self.get_fields():
-            if fields[query_col] == query_val:
-                if return_attr is None:
-                    field_dict = {}
-                    for i, col_name in enumerate(self.get_column_name_list()):
-                        field_dict[col_name or i] = fields[i]
-                    rval.append(field_dict)
-                else:
-                    rval.append(fields[return_col])
-                if limit is not None and len(rval) == limit:
-                    break
+        for fields in self.get_fields_by_column_values(query_col, [query_val]):
+            if return_attr is None:
+                field_dict = {}
+                for i, col_name in enumerate(column_names):
+                    field_dict[col_name or i] = fields[i]
+                rval.append(field_dict)
+            else:
+                rval.append(fields[return_col])
+            if limit is not None and len(rval) == limit:
+                break
         return rval
 
     # This method is used in tools, so need to keep its API stable
@@ -687,8 +742,10 @@ class TabularToolDataTable(ToolDataTable):
             fields = entry
         if self.largest_index < len(fields):
             fields = self._replace_field_separators(fields)
-            if (allow_duplicates and self.allow_duplicate_entries) or fields not in self.get_fields():
-                self.data.append(fields)
+            if (allow_duplicates and self.allow_duplicate_entries) or fields not in self.get_fields_by_column_values(
+                self.columns["value"], [fields[self.columns["value"]]]
+            ):
+                self._append_fields(fields)
             else:
                 raise MessageException(
                     f"Attempted to add fields ({fields}) to data table '{self.name}', but this entry already exists and allow_duplicates is False.",
@@ -805,6 +862,8 @@ class TabularToolDataTable(ToolDataTable):
                 hash_set.add(fields_hash)
         for i in reversed(dup_lines):
             self.data.pop(i)
+        if dup_lines:
+            self._invalidate_column_indexes()
 
     @property
     def xml_string(self):
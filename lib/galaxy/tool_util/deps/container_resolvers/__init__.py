@@ -32,6 +32,8 @@ class ResolutionCache(Bunch):
     """
 
     mulled_resolution_cache: Optional["Cache"] = None
+    # persistent cache of requirement sets without a mulled image, expires sooner than mulled_resolution_cache
+    mulled_unresolved_cache: Optional["Cache"] = None
 
 
 class ContainerResolver(Dictifiable, metaclass=ABCMeta):
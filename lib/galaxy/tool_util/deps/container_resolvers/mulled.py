@@ -379,24 +379,32 @@ def targets_to_mulled_name(
         unresolved_cache = set()
 
     mulled_resolution_cache = None
-    if resolution_cache and resolution_cache.mulled_resolution_cache:
+    mulled_unresolved_cache = None
+    if resolution_cache is not None:
         mulled_resolution_cache = resolution_cache.mulled_resolution_cache
+        mulled_unresolved_cache = resolution_cache.mulled_unresolved_cache
 
     name = None
 
     def cached_name(cache_key: str) -> Optional[str]:
-        if mulled_resolution_cache:
+        if mulled_resolution_cache is not None:
             try:
-                return resolution_cache.get(cache_key)  # type: ignore[union-attr] # mulled_resolution_cache not None implies resolution_cache not None
+                return mulled_resolution_cache.get(cache_key)
             except KeyError:
+                # beaker raises KeyError for missing and expired keys
                 return None
         return None
 
+    def is_unresolved(cache_key: str) -> bool:
+        if cache_key in unresolved_cache:
+            return True
+        return mulled_unresolved_cache is not None and cache_key in mulled_unresolved_cache
+
     if len(targets) == 1:
         target = targets[0]
         target_version = target.version
         cache_key = f"ns[{namespace}]__single__{target.package}__@__{target_version}"
-        if cache_key in unresolved_cache:
+        if is_unresolved(cache_key):
             return None
         name = cached_name(cache_key)
         if name:
@@ -435,7 +443,7 @@ def targets_to_mulled_name(
             raise Exception(f"Unimplemented mulled hash_func [{hash_func}]")
 
         cache_key = f"ns[{namespace}]__{hash_func}__{base_image_name}"
-        if cache_key in unresolved_cache:
+        if is_unresolved(cache_key):
             return None
         name = cached_name(cache_key)
         if name:
@@ -453,11 +461,13 @@ def targets_to_mulled_name(
                 # as tag to fully qualify image.
                 name = f"{base_image_name}:{tag}"
 
-    if name and mulled_resolution_cache:
+    if name and mulled_resolution_cache is not None:
         mulled_resolution_cache.put(cache_key, name)
 
     if name is None:
-        unresolved_cache.add(name)
+        unresolved_cache.add(cache_key)
+        if mulled_unresolved_cache is not None:
+            mulled_unresolved_cache.put(cache_key, True)
 
     return name
 
@@ -5,6 +5,7 @@ from typing import (
     Any,
     Container as TypingContainer,
     Dict,
+    Iterable,
     List,
     Optional,
     Type,
@@ -34,8 +35,11 @@ from .container_resolvers.mulled import (
     BuildMulledSingularityContainerResolver,
     CachedMulledDockerContainerResolver,
     CachedMulledSingularityContainerResolver,
+    image_name,
+    mulled_targets,
     MulledDockerContainerResolver,
     MulledSingularityContainerResolver,
+    targets_to_mulled_name,
 )
 from .requirements import ContainerDescription
 
@@ -62,10 +66,18 @@ ResolvedContainerDescription = collections.namedtuple(
 
 
 class ContainerFinder:
-    def __init__(self, app_info: "AppInfo", mulled_resolution_cache: Optional["Cache"] = None) -> None:
+    def __init__(
+        self,
+        app_info: "AppInfo",
+        mulled_resolution_cache: Optional["Cache"] = None,
+        mulled_unresolved_cache: Optional["Cache"] = None,
+    ) -> None:
         self.app_info = app_info
         self.mulled_resolution_cache = mulled_resolution_cache
-        self.default_container_registry = ContainerRegistry(app_info, mulled_resolution_cache=mulled_resolution_cache)
+        self.mulled_unresolved_cache = mulled_unresolved_cache
+        self.default_container_registry = ContainerRegistry(
+            app_info, mulled_resolution_cache=mulled_resolution_cache, mulled_unresolved_cache=mulled_unresolved_cache
+        )
         self.destination_container_registeries: Dict[str, ContainerRegistry] = {}
 
     def _enabled_container_types(self, destination_info: Dict[str, Any]) -> List[str]:
@@ -96,13 +108,17 @@ class ContainerFinder:
                     self.app_info,
                     destination_info=destination_info,
                     mulled_resolution_cache=self.mulled_resolution_cache,
+                    mulled_unresolved_cache=self.mulled_unresolved_cache,
                 )
                 self.destination_container_registeries[destination_id] = destination_container_registry
         elif not destination_id and (
             "container_resolvers" in destination_info or "container_resolvers_config_file" in destination_info
         ):
             destination_container_registry = ContainerRegistry(
-                self.app_info, destination_info=destination_info, mulled_resolution_cache=self.mulled_resolution_cache
+                self.app_info,
+                destination_info=destination_info,
+                mulled_resolution_cache=self.mulled_resolution_cache,
+                mulled_unresolved_cache=self.mulled_unresolved_cache,
             )
 
         if (
@@ -200,6 +216,10 @@ class ContainerFinder:
     def resolution_cache(self) -> ResolutionCache:
         return self.default_container_registry.get_resolution_cache()
 
+    def prewarm_resolution_cache(self, tool_infos: Iterable["ToolInfo"]) -> int:
+        """Resolve mulled image names of the supplied tools to fill the persistent resolution cache."""
+        return self.default_container_registry.prewarm_resolution_cache(tool_infos)
+
     def __overridden_container_id(self, container_type: str, destination_info: Dict[str, Any]) -> Optional[str]:
         if not self.__container_type_enabled(container_type, destination_info):
             return None
@@ -277,12 +297,14 @@ class ContainerRegistry:
         app_info: "AppInfo",
         destination_info: Optional[Dict[str, Any]] = None,
         mulled_resolution_cache: Optional["Cache"] = None,
+        mulled_unresolved_cache: Optional["Cache"] = None,
     ) -> None:
         self.resolver_classes = self.__resolvers_dict()
         self.enable_mulled_containers = app_info.enable_mulled_containers
         self.app_info = app_info
         self.container_resolvers = self.__build_container_resolvers(app_info, destination_info)
         self.mulled_resolution_cache = mulled_resolution_cache
+        self.mulled_unresolved_cache = mulled_unresolved_cache
 
     def __build_container_resolvers(
         self, app_info: "AppInfo", destination_info: Optional[Dict[str, Any]]
@@ -353,8 +375,48 @@ class ContainerRegistry:
         cache = ResolutionCache()
         if self.mulled_resolution_cache is not None:
             cache.mulled_resolution_cache = self.mulled_resolution_cache
+        if self.mulled_unresolved_cache is not None:
+            cache.mulled_unresolved_cache = self.mulled_unresolved_cache
         return cache
 
+    def prewarm_resolution_cache(self, tool_infos: Iterable["ToolInfo"]) -> int:
+        """Look up the mulled image names of the supplied tools on quay.io ahead of job submission.
+
+        Only the remote lookups of mulled resolvers are performed (nothing is pulled, built or
+        listed locally), each distinct requirement set once per namespace and hash function.
+        Returns the number of resolved image names.
+        """
+        resolvers = [r for r in self.container_resolvers if isinstance(r, MulledDockerContainerResolver)]
+        resolution_cache = self.get_resolution_cache()
+        session = Session()
+        seen = set()
+        resolved = 0
+        for tool_info in tool_infos:
+            if tool_info.requires_galaxy_python_environment:
+                continue
+            targets = mulled_targets(tool_info)
+            if not targets:
+                continue
+            for resolver in resolvers:
+                key = (resolver.namespace, resolver.hash_func, image_name(targets, resolver.hash_func))
+                if key in seen:
+                    continue
+                seen.add(key)
+                try:
+                    name = targets_to_mulled_name(
+                        targets,
+                        hash_func=resolver.hash_func,
+                        namespace=resolver.namespace,
+                        resolution_cache=resolution_cache,
+                        session=session,
+                    )
+                except Exception:
+                    log.exception("Failed to resolve mulled image name for tool '%s'", tool_info.tool_id)
+                    continue
+                if name:
+                    resolved += 1
+        return resolved
+
     def find_best_container_description(
         self, enabled_container_types: TypingContainer[str], tool_info: "ToolInfo", **kwds: Any
     ) -> Optional[ContainerDescription]:
@@ -134,6 +134,11 @@ def _namespace_has_repo_name(namespace: str, repo_name: str, resolution_cache: "
     return repo_name in repo_names
 
 
+def tag_cache_key(namespace: str, image: str) -> str:
+    """Key of the tags of an image in the persistent mulled tag cache."""
+    return f"{TAG_CACHE_KEY}:{namespace}/{image}"
+
+
 def mulled_tags_for(
     namespace: str,
     image: str,
@@ -154,29 +159,32 @@ def mulled_tags_for(
             return []
 
     cache_key = TAG_CACHE_KEY
-    if resolution_cache is not None:
-        if resolution_cache.mulled_resolution_cache is not None:
-            # Use persistent cache if possible. Since tags query is lightweight use a relatively short expiry time.
-            resolution_cache = resolution_cache.mulled_resolution_cache._get_cache(
-                "mulled_tag_cache", {"expire": expire}
-            )
-        assert resolution_cache is not None
-        if cache_key not in resolution_cache:
-            resolution_cache[cache_key] = collections.defaultdict(dict)
-        tag_cache = resolution_cache.get(cache_key)
+    if resolution_cache is not None and resolution_cache.mulled_resolution_cache is not None:
+        # Use persistent cache if possible. Since tags query is lightweight use a relatively short expiry time.
+        # Values read from the persistent cache are copies, so tags are stored per image rather than in
+        # a shared dictionary that would need to be written back.
+        persistent_tag_cache = resolution_cache.mulled_resolution_cache._get_cache(
+            "mulled_tag_cache", {"expire": expire}
+        )
+        persistent_key = tag_cache_key(namespace, image)
+        try:
+            tags = persistent_tag_cache.get(persistent_key)
+        except KeyError:
+            tags = quay_versions(namespace, image, session)
+            persistent_tag_cache.put(persistent_key, tags)
     else:
-        tag_cache = collections.defaultdict(dict)
-
-    tags_cached = False
-    try:
-        tags = tag_cache[namespace][image]
-        tags_cached = True
-    except KeyError:
-        pass
+        if resolution_cache is not None:
+            if cache_key not in resolution_cache:
+                resolution_cache[cache_key] = collections.defaultdict(dict)
+            tag_cache = resolution_cache.get(cache_key)
+        else:
+            tag_cache = collections.defaultdict(dict)
 
-    if not tags_cached:
-        tags = quay_versions(namespace, image, session)
-        tag_cache[namespace][image] = tags
+        try:
+            tags = tag_cache[namespace][image]
+        except KeyError:
+            tags = quay_versions(namespace, image, session)
+            tag_cache[namespace][image] = tags
 
     if tag_prefix is not None:
         tags = [t for t in tags if t.startswith(tag_prefix)]
@@ -443,6 +451,7 @@ __all__ = (
     "quay_versions",
     "split_container_name",
     "split_tag",
+    "tag_cache_key",
     "v1_image_name",
     "v2_image_name",
     "version_sorted",
@@ -34,6 +34,8 @@ from galaxy.util import (
 )
 from galaxy.util.bunch import Bunch
 from galaxy.util.dictifiable import Dictifiable
+from galaxy.util.hash_util import new_insecure_hash
+from galaxy.util.json import safe_dumps
 from .filters import FilterFactory
 from .integrated_panel import ManagesIntegratedToolPanelMixin
 from .lineages import LineageMap
@@ -172,6 +174,9 @@ class AbstractToolBox(Dictifiable, ManagesIntegratedToolPanelMixin):
         # Cache for tool's to_dict calls specific to toolbox. Invalidates on toolbox reload.
         self._tool_to_dict_cache = {}
         self._tool_to_dict_cache_admin = {}
+        # Serialized tool panels and their ETags, keyed by view and filters. Emptied whenever the panel may change.
+        self._panel_generation = 0
+        self._panel_json_cache: Dict[Any, Tuple[str, str]] = {}
         # In-memory dictionary that defines the layout of the tool panel.
         self._tool_panel = ToolPanelElements()
         self._index = 0
@@ -594,6 +599,7 @@ class AbstractToolBox(Dictifiable, ManagesIntegratedToolPanelMixin):
             log.debug(log_msg)
 
     def _load_tool_panel_views(self):
+        self._panel_changed()
         self._tool_panel_view_rendered = {}
         registry = ToolBoxRegistryImpl(self)
         for key, view in self._tool_panel_views.items():
@@ -1152,6 +1158,7 @@ class AbstractToolBox(Dictifiable, ManagesIntegratedToolPanelMixin):
         return tool
 
     def register_tool(self, tool):
+        self._panel_changed()
         tool_id = tool.id
         version = tool.version or None
         if tool_id not in self._tool_versions_by_id:
@@ -1227,6 +1234,7 @@ class AbstractToolBox(Dictifiable, ManagesIntegratedToolPanelMixin):
             message = f"No tool with id {escape(tool_id)}"
             status = "error"
         else:
+            self._panel_changed()
             tool = self._tools_by_id[tool_id]
             del self._tools_by_id[tool_id]
             self._tools_by_old_id[tool.old_id].remove(tool)
@@ -1350,6 +1358,29 @@ class AbstractToolBox(Dictifiable, ManagesIntegratedToolPanelMixin):
                 view_contents[elt.id] = elt.to_dict(**kwargs)
         return view_contents
 
+    def panel_json(self, trans, panel_view=False, **kwds) -> Tuple[str, str]:
+        """
+        Return the JSON serialization of ``to_panel_view`` (if ``panel_view`` is set)
+        or ``to_dict`` along with an ETag for it.
+
+        Serializations are cached per view and set of filters applied for the user
+        until a tool is registered or removed or the panel views are rebuilt.
+        """
+        key = (panel_view, self._filter_factory.build_filters_key(trans), tuple(sorted(kwds.items())))
+        cached = self._panel_json_cache.get(key)
+        if cached is None:
+            generation = self._panel_generation
+            rval = self.to_panel_view(trans, **kwds) if panel_view else self.to_dict(trans, **kwds)
+            as_json = safe_dumps(rval)
+            cached = (as_json, f'"{new_insecure_hash(as_json)}"')
+            if generation == self._panel_generation:
+                self._panel_json_cache[key] = cached
+        return cached
+
+    def _panel_changed(self):
+        self._panel_generation += 1
+        self._panel_json_cache = {}
+
     def _lineage_in_panel(self, panel_dict, tool=None, tool_lineage=None):
         """If tool with same lineage already in panel (or section) - find
         and return it. Otherwise return None.
@@ -28,6 +28,9 @@ class FilterFactory:
         self.__init_filters("tool", getattr(config, "tool_filters", ""), self.default_filters)
         self.__init_filters("section", getattr(config, "tool_section_filters", ""), self.default_filters)
         self.__init_filters("label", getattr(config, "tool_label_filters", ""), self.default_filters)
+        self.__has_custom_filters = any(
+            getattr(config, name, "") for name in ("tool_filters", "tool_section_filters", "tool_label_filters")
+        )
 
     def build_filters(self, trans, **kwds):
         """
@@ -53,6 +56,26 @@ class FilterFactory:
 
         return filters
 
+    def build_filters_key(self, trans):
+        """
+        Return a hashable key that is equal for any two contexts ``build_filters``
+        would filter the tool panel identically for.
+        """
+        user = trans.user
+        user_filters = None
+        if user:
+            user_filters = tuple(
+                (name, user.preferences.get(name))
+                for name in ("toolbox_tool_filters", "toolbox_section_filters", "toolbox_label_filters")
+            )
+        if self.__has_custom_filters or (user_filters and any(value for _, value in user_filters)):
+            # Custom filters may depend on anything about the user.
+            user_key = user and user.id
+        else:
+            # The default filters only depend on whether there is a user at all.
+            user_key = bool(user)
+        return (user_key, user_filters, trans.user_is_admin)
+
     def __init_filters(self, key, filters, toolbox_filters, validate=None):
         for filter in filters:
             if validate is None or filter in validate or filter in self.default_filters:
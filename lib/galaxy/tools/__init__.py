@@ -12,6 +12,7 @@ import tempfile
 from collections.abc import MutableMapping
 from pathlib import Path
 from typing import (
+    Any,
     cast,
     Dict,
     List,
@@ -105,7 +106,10 @@ from galaxy.tools.actions import (
 from galaxy.tools.actions.data_manager import DataManagerToolAction
 from galaxy.tools.actions.data_source import DataSourceToolAction
 from galaxy.tools.actions.model_operations import ModelOperationToolAction
-from galaxy.tools.cache import ToolDocumentCache
+from galaxy.tools.cache import (
+    MaterializedToolCache,
+    ToolDocumentCache,
+)
 from galaxy.tools.evaluation import global_tool_errors
 from galaxy.tools.imp_exp import JobImportHistoryArchiveWrapper
 from galaxy.tools.parameters import (
@@ -433,6 +437,11 @@ class ToolBox(AbstractToolBox):
             view_dicts=app.config.panel_views,
         )
         default_panel_view = app.config.default_panel_view
+        # Fully parsed tools behind this toolbox's LazyTool instances. The cache is keyed by the lazy tools, which
+        # reference their toolbox, so it must not outlive this toolbox and is not handed over on reload.
+        self.materialized_tools = MaterializedToolCache(
+            max_size=getattr(app.config, "lazy_load_tools_max_resident", 500)
+        )
 
         super().__init__(
             config_filenames=config_filenames,
@@ -477,6 +486,7 @@ class ToolBox(AbstractToolBox):
         for tool in converters:
             tool.hidden = False
             section.elems.append_tool(tool)
+        self._panel_changed()
 
     def persist_cache(self, register_postfork=False):
         """
@@ -529,6 +539,29 @@ class ToolBox(AbstractToolBox):
             return self.cache_regions[tool_cache_data_dir]
 
     def create_tool(self, config_file, tool_cache_data_dir=None, **kwds):
+        if not getattr(self.app.config, "lazy_load_tools", False):
+            return self._create_tool(config_file, tool_cache_data_dir=tool_cache_data_dir, **kwds)
+        # Tool shed details are part of the summary, don't hold on to the repository object.
+        lazy_kwds = {key: value for key, value in kwds.items() if key != "tool_shed_repository"}
+        lazy_kwds["tool_cache_data_dir"] = tool_cache_data_dir
+        cache = self.get_cache_region(tool_cache_data_dir)
+        if config_file.endswith(".xml") and cache and not cache.disabled:
+            tool_document = cache.get(config_file)
+            summary = tool_document and tool_document.get("summary")
+            if summary and summary["guid"] == kwds.get("guid"):
+                return LazyTool(self, config_file, summary, **lazy_kwds)
+        tool = self._create_tool(config_file, tool_cache_data_dir=tool_cache_data_dir, **kwds)
+        if type(tool) is not Tool:
+            # Special tool types are cheap to keep around and often looked at in detail.
+            return tool
+        summary = tool_summary(tool)
+        if config_file.endswith(".xml") and cache and not cache.disabled:
+            cache.set_summary(config_file, summary)
+        lazy_tool = LazyTool(self, config_file, summary, **lazy_kwds)
+        self.materialized_tools.put(lazy_tool, tool)
+        return lazy_tool
+
+    def _create_tool(self, config_file, tool_cache_data_dir=None, **kwds):
         cache = self.get_cache_region(tool_cache_data_dir)
         if config_file.endswith(".xml") and cache and not cache.disabled:
             tool_document = cache.get(config_file)
@@ -1954,6 +1987,7 @@ class Tool(Dictifiable):
         preferred_object_store_id=None,
         flush_job=True,
         skip=False,
+        add_outputs_to_history=True,
     ):
         """
         Return a pair with whether execution is successful as well as either
@@ -1973,6 +2007,7 @@ class Tool(Dictifiable):
                 preferred_object_store_id=preferred_object_store_id,
                 flush_job=flush_job,
                 skip=skip,
+                add_outputs_to_history=add_outputs_to_history,
             )
             job = rval[0]
             out_data = rval[1]
@@ -2284,6 +2319,8 @@ class Tool(Dictifiable):
             job_context,
             out_collections,
         )
+        # The discovered objects are committed with the job, insert them in batches.
+        job_context.preallocate_ids()
         # Return value only used in unit tests. Probably should be returning number of collected
         # bytes instead?
         return collected
@@ -2441,7 +2478,7 @@ class Tool(Dictifiable):
 
         tool_class = self.__class__
         # FIXME: the Tool class should declare directly, instead of ad hoc inspection
-        regular_form = tool_class == Tool or isinstance(self, (DatabaseOperationTool, InteractiveTool))
+        regular_form = tool_class in (Tool, LazyTool) or isinstance(self, (DatabaseOperationTool, InteractiveTool))
         tool_dict["form_style"] = "regular" if regular_form else "special"
         if tool_help:
             # create tool help
@@ -2727,6 +2764,98 @@ class Tool(Dictifiable):
         return external_paths
 
 
+# Attributes of a regular tool needed to register it in the toolbox, place it in the
+# tool panel, build its lineage and index it for search.
+LAZY_TOOL_SUMMARY_ATTRIBUTES = (
+    "id",
+    "old_id",
+    "all_ids",
+    "version",
+    "guid",
+    "name",
+    "description",
+    "hidden",
+    "labels",
+    "profile",
+    "config_file",
+    "tool_dir",
+    "repository_id",
+    "tool_shed",
+    "repository_name",
+    "repository_owner",
+    "changeset_revision",
+    "installed_changeset_revision",
+    "sharable_url",
+    "edam_operations",
+    "edam_topics",
+    "xrefs",
+    "target",
+    "uihints",
+    "require_login",
+    "raw_help",
+    "_is_workflow_compatible",
+    "_macro_paths",
+)
+
+
+def tool_summary(tool: Tool) -> Dict[str, Any]:
+    return {name: getattr(tool, name) for name in LAZY_TOOL_SUMMARY_ATTRIBUTES}
+
+
+class LazyTool(Tool):
+    """
+    Stand-in for a regular tool, created from a summary of the tool.
+
+    The summary is enough to register the tool, place it in the tool panel,
+    build its lineage and index it for search. Everything else is read from the
+    fully parsed tool, which is parsed on first use and kept in the toolbox's
+    ``materialized_tools`` cache. Attributes set on the stand-in (e.g. the
+    lineage or tool errors set by the toolbox) are also set on the parsed tool,
+    including when it has to be parsed again after being evicted.
+    """
+
+    def __init__(self, toolbox, config_file, summary, **kwds):
+        # Tool.__init__ is what parses the tool, so it is not called here.
+        state = self.__dict__
+        state.update(summary)
+        state["app"] = toolbox.app
+        state["_lazy_toolbox"] = toolbox
+        state["_lazy_config_file"] = config_file
+        state["_lazy_kwds"] = kwds
+        state["_lazy_state"] = dict(summary)
+
+    def __getattr__(self, name):
+        if name.startswith("_lazy_") or (name.startswith("__") and name.endswith("__")):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name, value):
+        self.__dict__[name] = value
+        self._lazy_state[name] = value
+        if (tool := self._lazy_toolbox.materialized_tools.get(self)) is not None:
+            setattr(tool, name, value)
+
+    @property
+    def materialized(self) -> bool:
+        return self._lazy_toolbox.materialized_tools.get(self) is not None
+
+    def materialize(self) -> Tool:
+        """Return the fully parsed tool, parsing it if it is not in memory."""
+        materialized_tools = self._lazy_toolbox.materialized_tools
+        if (tool := materialized_tools.get(self)) is None:
+            log.debug("Loading lazily loaded tool %s", self.id)
+            tool = self._lazy_toolbox._create_tool(self._lazy_config_file, **self._lazy_kwds)
+            for name, value in self._lazy_state.items():
+                setattr(tool, name, value)
+            materialized_tools.put(self, tool)
+        return tool
+
+    def remove_from_cache(self):
+        for region in self.app.toolbox.cache_regions.values():
+            region.delete(self.config_file)
+        self._lazy_toolbox.materialized_tools.discard(self)
+
+
 class OutputParameterJSONTool(Tool):
     """
     Alternate implementation of Tool that provides parameters and other values
@@ -390,11 +390,15 @@ class DefaultToolAction(ToolAction):
         preferred_object_store_id=None,
         flush_job=True,
         skip=False,
+        add_outputs_to_history=True,
     ):
         """
         Executes a tool, creating job and tool outputs, associating them, and
         submitting the job to the job queue. If history is not specified, use
-        trans.history as destination for tool's output datasets.
+        trans.history as destination for tool's output datasets. If
+        ``add_outputs_to_history`` is ``False`` the outputs are only staged and
+        the caller adds them to the history (e.g. together with the outputs of
+        other jobs of a batch, allocating their hids at once).
         """
         trans.check_user_activation()
         incoming = incoming or {}
@@ -656,7 +660,8 @@ class DefaultToolAction(ToolAction):
             if name not in incoming and name not in child_dataset_names:
                 # don't add already existing datasets, i.e. async created
                 history.stage_addition(data)
-        history.add_pending_items(set_output_hid=set_output_hid)
+        if add_outputs_to_history:
+            history.add_pending_items(set_output_hid=set_output_hid)
 
         log.info(add_datasets_timer)
         job_setup_timer = ExecutionTimer()
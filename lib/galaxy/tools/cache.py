@@ -5,6 +5,7 @@ import shutil
 import sqlite3
 import tempfile
 import zlib
+from collections import OrderedDict
 from threading import Lock
 from typing import (
     Dict,
@@ -63,8 +64,8 @@ class ToolDocumentCache:
         return os.access(self.cache_file, os.W_OK)
 
     def reopen_ro(self):
-        self._get_cache(flag="r")
         self.writeable_cache_file = None
+        self._get_cache(flag="r")
 
     def get(self, config_file):
         try:
@@ -114,6 +115,21 @@ class ToolDocumentCache:
         except sqlite3.OperationalError:
             log.debug("Tool document cache unavailable")
 
+    def set_summary(self, config_file, summary):
+        """Store the summary used to lazily load the tool next to its cached document."""
+        try:
+            if self.cache_file_is_writeable:
+                self._make_writable()
+                tool_document = self._cache.get(config_file)
+                if tool_document:
+                    tool_document["summary"] = summary
+                    try:
+                        self._cache[config_file] = tool_document
+                    except RuntimeError:
+                        log.debug("Tool document cache not writeable")
+        except sqlite3.OperationalError:
+            log.debug("Tool document cache unavailable")
+
     def delete(self, config_file):
         if self.cache_file_is_writeable:
             self._make_writable()
@@ -130,6 +146,39 @@ class ToolDocumentCache:
                 pass
 
 
+class MaterializedToolCache:
+    """
+    Keep the most recently used fully parsed tools backing
+    lazily loaded tools in memory.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._lock = Lock()
+        self._tools: OrderedDict = OrderedDict()
+
+    def get(self, lazy_tool):
+        with self._lock:
+            tool = self._tools.get(lazy_tool)
+            if tool is not None:
+                self._tools.move_to_end(lazy_tool)
+            return tool
+
+    def put(self, lazy_tool, tool):
+        with self._lock:
+            self._tools[lazy_tool] = tool
+            self._tools.move_to_end(lazy_tool)
+            while len(self._tools) > self.max_size:
+                self._tools.popitem(last=False)
+
+    def discard(self, lazy_tool):
+        with self._lock:
+            self._tools.pop(lazy_tool, None)
+
+    def __len__(self):
+        return len(self._tools)
+
+
 class ToolCache:
     """
     Cache tool definitions to allow quickly reloading the whole
@@ -126,6 +126,7 @@ def execute(
             preferred_object_store_id=preferred_object_store_id,
             flush_job=False,
             skip=skip,
+            add_outputs_to_history=add_outputs_to_history,
         )
         if job:
             log.debug(job_timer.to_str(tool_id=tool.id, job_id=job.id))
@@ -159,62 +160,93 @@ def execute(
     job_count = len(execution_tracker.param_combinations)
 
     jobs_executed = 0
+    batches_committed = False
     has_remaining_jobs = False
     execution_slice = None
     job_datasets: Dict[str, List[model.DatasetInstance]] = {}  # job: list of dataset instances created by job
+    flush_per_n_jobs = tool.app.config.flush_per_n_jobs
+    # The outputs of the jobs of a rerun are remapped by the tool action, so they need their hids right away.
+    add_outputs_to_history = rerun_remap_job_id is not None
+    tool_id = tool.id
 
-    for i, execution_slice in enumerate(execution_tracker.new_execution_slices()):
-        if max_num_jobs is not None and jobs_executed >= max_num_jobs:
-            has_remaining_jobs = True
-            break
-        else:
-            skip = execution_slice.param_combination.pop("__when_value__", None) is False
-            execute_single_job(execution_slice, completed_jobs[i], skip=skip)
-            history = execution_slice.history or history
-            jobs_executed += 1
+    def enqueue_jobs(jobs):
+        for job2 in jobs:
+            # Put the job in the queue if tracking in memory
+            if tool_id == "__DATA_FETCH__" and tool.app.config.is_fetch_with_celery_enabled():
+                job_id = job2.id
+                from galaxy.celery.tasks import (
+                    fetch_data,
+                    finish_job,
+                    set_job_metadata,
+                    setup_fetch_data,
+                )
+
+                raw_tool_source = tool.tool_source.to_string()
+                #  task_user_id parameter is used to do task user rate limiting. It is only passed
+                #  to first task in chain because it is only necessary to rate limit the first
+                #  task in a chain.
+                async_result = (
+                    setup_fetch_data.s(
+                        job_id, raw_tool_source=raw_tool_source, task_user_id=getattr(trans.user, "id", None)
+                    )
+                    | fetch_data.s(job_id=job_id)
+                    | set_job_metadata.s(
+                        extended_metadata_collection="extended" in tool.app.config.metadata_strategy,
+                        job_id=job_id,
+                    ).set(link_error=finish_job.si(job_id=job_id, raw_tool_source=raw_tool_source))
+                    | finish_job.si(job_id=job_id, raw_tool_source=raw_tool_source)
+                )()
+                job2.set_runner_external_id(async_result.task_id)
+                continue
+            tool.app.job_manager.enqueue(job2, tool=tool, flush=False)
+            trans.log_event(f"Added job to the job queue, id: {str(job2.id)}", tool_id=tool_id)
 
-    if job_datasets:
+    def commit_jobs():
+        # Write the jobs executed since the last commit in one flush, allocating the hids of all their outputs at
+        # once. Jobs are only queued once all of them have been created, see below.
         for job, datasets in job_datasets.items():
             for dataset_instance in datasets:
                 dataset_instance.dataset.job = job
+        job_datasets.clear()
 
-    if execution_slice:
-        history.add_pending_items()
-    # Make sure collections, implicit jobs etc are flushed even if there are no precreated output datasets
-    with transaction(trans.sa_session):
-        trans.sa_session.commit()
-
-    tool_id = tool.id
-    for job2 in execution_tracker.successful_jobs:
-        # Put the job in the queue if tracking in memory
-        if tool_id == "__DATA_FETCH__" and tool.app.config.is_fetch_with_celery_enabled():
-            job_id = job2.id
-            from galaxy.celery.tasks import (
-                fetch_data,
-                finish_job,
-                set_job_metadata,
-                setup_fetch_data,
-            )
+        if execution_slice:
+            history.add_pending_items()
+        # Make sure collections, implicit jobs etc are flushed even if there are no precreated output datasets
+        with transaction(trans.sa_session):
+            trans.sa_session.commit()
 
-            raw_tool_source = tool.tool_source.to_string()
-            #  task_user_id parameter is used to do task user rate limiting. It is only passed
-            #  to first task in chain because it is only necessary to rate limit the first
-            #  task in a chain.
-            async_result = (
-                setup_fetch_data.s(
-                    job_id, raw_tool_source=raw_tool_source, task_user_id=getattr(trans.user, "id", None)
-                )
-                | fetch_data.s(job_id=job_id)
-                | set_job_metadata.s(
-                    extended_metadata_collection="extended" in tool.app.config.metadata_strategy,
-                    job_id=job_id,
-                ).set(link_error=finish_job.si(job_id=job_id, raw_tool_source=raw_tool_source))
-                | finish_job.si(job_id=job_id, raw_tool_source=raw_tool_source)
-            )()
-            job2.set_runner_external_id(async_result.task_id)
-            continue
-        tool.app.job_manager.enqueue(job2, tool=tool, flush=False)
-        trans.log_event(f"Added job to the job queue, id: {str(job2.id)}", tool_id=tool_id)
+    try:
+        for i, execution_slice in enumerate(execution_tracker.new_execution_slices()):
+            if max_num_jobs is not None and jobs_executed >= max_num_jobs:
+                has_remaining_jobs = True
+                break
+            else:
+                skip = execution_slice.param_combination.pop("__when_value__", None) is False
+                execute_single_job(execution_slice, completed_jobs[i], skip=skip)
+                history = execution_slice.history or history
+                jobs_executed += 1
+                if flush_per_n_jobs > 0 and jobs_executed % flush_per_n_jobs == 0 and jobs_executed < job_count:
+                    session = trans.sa_session()
+                    try:
+                        # Keep the collection elements and inputs of the remaining jobs loaded.
+                        session.expire_on_commit = False
+                        commit_jobs()
+                        batches_committed = True
+                    finally:
+                        session.expire_on_commit = True
+    except Exception:
+        if batches_committed:
+            # The jobs of earlier batches are already in the database but were never queued, do not leave them and
+            # the implicit collections they populate waiting forever.
+            for job in execution_tracker.successful_jobs:
+                job.mark_deleted()
+                job.info = "Job was not queued because an error occurred while creating the other jobs of this batch."
+            execution_tracker.fail_dataset_collections(trans, "One or more jobs failed during dataset initialization.")
+            commit_jobs()
+        raise
+
+    commit_jobs()
+    enqueue_jobs(execution_tracker.successful_jobs)
     with transaction(trans.sa_session):
         trans.sa_session.commit()
 
@@ -448,6 +480,15 @@ class ExecutionTracker:
         else:
             return None
 
+    def fail_dataset_collections(self, trans, message):
+        for i, implicit_collection in enumerate(self.implicit_collections.values()):
+            if i == 0:
+                implicit_collection_jobs = implicit_collection.implicit_collection_jobs
+                implicit_collection_jobs.populated_state = "failed"
+                trans.sa_session.add(implicit_collection_jobs)
+            implicit_collection.collection.handle_population_failed(message)
+            trans.sa_session.add(implicit_collection.collection)
+
     def finalize_dataset_collections(self, trans):
         # TODO: this probably needs to be reworked some, we should have the collection methods
         # return a list of changed objects to add to the session and flush and we should only
@@ -455,15 +496,7 @@ class ExecutionTracker:
         # if you are mapping a list over a tool that dynamically generates lists - we won't actually
         # know the structure of the inner list until after its job is complete.
         if self.failed_jobs > 0:
-            for i, implicit_collection in enumerate(self.implicit_collections.values()):
-                if i == 0:
-                    implicit_collection_jobs = implicit_collection.implicit_collection_jobs
-                    implicit_collection_jobs.populated_state = "failed"
-                    trans.sa_session.add(implicit_collection_jobs)
-                implicit_collection.collection.handle_population_failed(
-                    "One or more jobs failed during dataset initialization."
-                )
-                trans.sa_session.add(implicit_collection.collection)
+            self.fail_dataset_collections(trans, "One or more jobs failed during dataset initialization.")
         else:
             completed_collections = {}
             if (
@@ -15,6 +15,7 @@ from galaxy.model import (
     MetadataFile,
     User,
 )
+from galaxy.tool_util.data import TabularToolDataTable
 from galaxy.util import string_as_bool
 from . import validation
 
@@ -45,6 +46,13 @@ class Filter:
         """Returns a list of options after the filter is applied"""
         raise TypeError("Abstract Method")
 
+    def filter_table(self, tool_data_table, trans, other_values):
+        """
+        Returns the rows of ``tool_data_table`` that pass the filter using the
+        table's column indexes, or None if the filter cannot be applied this way.
+        """
+        return None
+
 
 class StaticValueFilter(Filter):
     """
@@ -69,18 +77,27 @@ class StaticValueFilter(Filter):
         self.column = d_option.column_spec_to_index(column)
         self.keep = string_as_bool(elem.get("keep", "True"))
 
-    def filter_options(self, options, trans, other_values):
-        rval = []
+    def _filter_value(self, trans):
         filter_value = self.value
         try:
             filter_value = User.expand_user_properties(trans.user, filter_value)
         except Exception:
             pass
+        return filter_value
+
+    def filter_options(self, options, trans, other_values):
+        rval = []
+        filter_value = self._filter_value(trans)
         for fields in options:
             if self.keep == (filter_value == fields[self.column]):
                 rval.append(fields)
         return rval
 
+    def filter_table(self, tool_data_table, trans, other_values):
+        if not self.keep:
+            return None
+        return tool_data_table.get_fields_by_column_values(self.column, [self._filter_value(trans)])
+
 
 class RegexpFilter(Filter):
     """
@@ -263,9 +280,10 @@ class ParamValueFilter(Filter):
     def get_dependency_name(self):
         return self.ref_name
 
-    def filter_options(self, options, trans, other_values):
+    def _ref_values(self, trans, other_values):
+        """Returns the values to compare the column with, or None if no option can match."""
         if trans is not None and trans.workflow_building_mode:
-            return []
+            return None
         ref = other_values.get(self.ref_name, None)
         if ref is None:
             ref = []
@@ -287,14 +305,26 @@ class ParamValueFilter(Filter):
                     break
                 r = getattr(r, ref_attribute)
             ref_values.append(r)
-        ref_values = [str(_) for _ in ref_values]
+        return [str(_) for _ in ref_values]
 
+    def filter_options(self, options, trans, other_values):
+        ref_values = self._ref_values(trans, other_values)
+        if ref_values is None:
+            return []
         rval = []
         for fields in options:
             if self.keep == (fields[self.column] in ref_values):
                 rval.append(fields)
         return rval
 
+    def filter_table(self, tool_data_table, trans, other_values):
+        if not self.keep:
+            return None
+        ref_values = self._ref_values(trans, other_values)
+        if ref_values is None:
+            return []
+        return tool_data_table.get_fields_by_column_values(self.column, ref_values)
+
 
 class UniqueValueFilter(Filter):
     """
@@ -687,6 +717,7 @@ class DynamicOptions:
         return rval
 
     def get_fields(self, trans, other_values):
+        filters = self.filters
         if self.dataset_ref_name:
             try:
                 datasets = _get_ref_data(other_values, self.dataset_ref_name)
@@ -728,12 +759,20 @@ class DynamicOptions:
                         contents = fh.read(1048576)
                     options += self.parse_file_fields(StringIO(contents))
         elif self.tool_data_table:
-            options = self.tool_data_table.get_fields()
+            indexed_options = None
+            if filters and isinstance(self.tool_data_table, TabularToolDataTable):
+                # let the first filter narrow the table down using its column indexes
+                indexed_options = filters[0].filter_table(self.tool_data_table, trans, other_values)
+            if indexed_options is None:
+                options = self.tool_data_table.get_fields()
+            else:
+                options = indexed_options
+                filters = filters[1:]
         elif self.file_fields:
             options = list(self.file_fields)
         else:
             options = []
-        for filter in self.filters:
+        for filter in filters:
             options = filter.filter_options(options, trans, other_values)
         return options
 
@@ -743,6 +782,8 @@ class DynamicOptions:
         """
         rval = []
         val_index = self.columns["value"]
+        if not self.dataset_ref_name and not self.filters and isinstance(self.tool_data_table, TabularToolDataTable):
+            return self.tool_data_table.get_fields_by_column_values(val_index, [value])
         for fields in self.get_fields(trans, other_values):
             if fields[val_index] == value:
                 rval.append(fields)
@@ -3,7 +3,10 @@ import logging
 import os
 import shlex
 import tempfile
-from functools import total_ordering
+from functools import (
+    cached_property,
+    total_ordering,
+)
 from typing import (
     Any,
     cast,
@@ -14,6 +17,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     Tuple,
     TYPE_CHECKING,
     Union,
@@ -381,31 +385,32 @@ class DatasetFilenameWrapper(ToolParameterValueWrapper):
             self.unsanitized: DatasetInstance = dataset_instance
             self.dataset = wrap_with_safe_string(dataset_instance, no_wrap_classes=ToolParameterValueWrapper)
             self.metadata = self.MetadataWrapper(dataset_instance, compute_environment)
-            if isinstance(dataset_instance, HasTags):
-                self.groups = {tag.user_value.lower() for tag in dataset_instance.tags if tag.user_tname == "group"}
-            else:
-                # May be a 'FakeDatasetAssociation'
-                self.groups = set()
+        self._dataset_instance = dataset_instance
         self.compute_environment = compute_environment
-        # TODO: lazy initialize this...
         self.__io_type = io_type
-        self.false_path: Optional[str] = None
-        if dataset_instance:
-            if self.__io_type == "input":
-                path_rewrite = (
-                    compute_environment
-                    and dataset_instance
-                    and compute_environment.input_path_rewrite(dataset_instance)
-                )
-                if path_rewrite:
-                    self.false_path = path_rewrite
-            else:
-                path_rewrite = compute_environment and compute_environment.output_path_rewrite(dataset_instance)
-                if path_rewrite:
-                    self.false_path = path_rewrite
         self.datatypes_registry = datatypes_registry
         self._element_identifier = identifier
 
+    @cached_property
+    def groups(self) -> Set[str]:
+        dataset_instance = self._dataset_instance
+        if dataset_instance and isinstance(dataset_instance, HasTags):
+            return {tag.user_value.lower() for tag in dataset_instance.tags if tag.user_tname == "group"}
+        # May be a 'FakeDatasetAssociation'
+        return set()
+
+    @cached_property
+    def false_path(self) -> Optional[str]:
+        dataset_instance = self._dataset_instance
+        compute_environment = self.compute_environment
+        if not dataset_instance or not compute_environment:
+            return None
+        if self.__io_type == "input":
+            path_rewrite = compute_environment.input_path_rewrite(dataset_instance)
+        else:
+            path_rewrite = compute_environment.output_path_rewrite(dataset_instance)
+        return path_rewrite or None
+
     @property
     def element_identifier(self) -> str:
         identifier = self._element_identifier
@@ -618,6 +623,8 @@ class DatasetCollectionWrapper(ToolParameterValueWrapper, HasDatasets):
         self.datatypes_registry = datatypes_registry
         kwargs["datatypes_registry"] = datatypes_registry
         self.kwargs = kwargs
+        self.__element_instances: Optional[Dict[str, Union[DatasetCollectionWrapper, DatasetFilenameWrapper]]] = None
+        self.__element_instance_list: Optional[List[Union[DatasetCollectionWrapper, DatasetFilenameWrapper]]] = None
 
         if has_collection is None:
             self.__input_supplied = False
@@ -636,20 +643,22 @@ class DatasetCollectionWrapper(ToolParameterValueWrapper, HasDatasets):
             self.name = None
         self.collection = collection
 
-        elements = collection.elements
+    def __ensure_element_wrappers(self) -> None:
+        # Element wrappers are built on first use, templates using e.g. only ``all_paths`` never need them.
+        if self.__element_instance_list is not None:
+            return
         element_instances = {}
-
         element_instance_list = []
-        for dataset_collection_element in elements:
+        for dataset_collection_element in self.collection.elements:
             element_object = dataset_collection_element.element_object
             element_identifier = dataset_collection_element.element_identifier
 
             if dataset_collection_element.is_collection:
                 element_wrapper: Union[DatasetCollectionWrapper, DatasetFilenameWrapper] = DatasetCollectionWrapper(
-                    job_working_directory, dataset_collection_element, **kwargs
+                    self.job_working_directory, dataset_collection_element, **self.kwargs
                 )
             else:
-                element_wrapper = self._dataset_wrapper(element_object, identifier=element_identifier, **kwargs)
+                element_wrapper = self._dataset_wrapper(element_object, identifier=element_identifier, **self.kwargs)
 
             element_instances[element_identifier] = element_wrapper
             element_instance_list.append(element_wrapper)
@@ -678,6 +687,8 @@ class DatasetCollectionWrapper(ToolParameterValueWrapper, HasDatasets):
     def keys(self) -> Union[List[str], KeysView[Any]]:
         if not self.__input_supplied:
             return []
+        self.__ensure_element_wrappers()
+        assert self.__element_instances is not None
         return self.__element_instances.keys()
 
     @property
@@ -755,6 +766,8 @@ class DatasetCollectionWrapper(ToolParameterValueWrapper, HasDatasets):
     def __getitem__(self, key: Union[str, int]) -> Union[None, "DatasetCollectionWrapper", DatasetFilenameWrapper]:
         if not self.__input_supplied:
             return None
+        self.__ensure_element_wrappers()
+        assert self.__element_instance_list is not None and self.__element_instances is not None
         if isinstance(key, int):
             return self.__element_instance_list[key]
         else:
@@ -763,6 +776,8 @@ class DatasetCollectionWrapper(ToolParameterValueWrapper, HasDatasets):
     def __getattr__(self, key: str) -> Union[None, "DatasetCollectionWrapper", DatasetFilenameWrapper]:
         if not self.__input_supplied:
             return None
+        self.__ensure_element_wrappers()
+        assert self.__element_instances is not None
         try:
             return self.__element_instances[key]
         except KeyError:
@@ -773,12 +788,14 @@ class DatasetCollectionWrapper(ToolParameterValueWrapper, HasDatasets):
     ) -> Iterator[Union["DatasetCollectionWrapper", DatasetFilenameWrapper]]:
         if not self.__input_supplied:
             return [].__iter__()
+        self.__ensure_element_wrappers()
+        assert self.__element_instance_list is not None
         return self.__element_instance_list.__iter__()
 
     def __bool__(self) -> bool:
         # Fail `#if $param` checks in cheetah is optional input
         # not specified or if resulting collection is empty.
-        return self.__input_supplied and bool(self.__element_instance_list)
+        return self.__input_supplied and bool(self.collection.elements)
 
     __nonzero__ = __bool__
 
@@ -10,6 +10,7 @@ import errno
 import importlib
 import itertools
 import json
+import multiprocessing
 import os
 import random
 import re
@@ -25,6 +26,7 @@ import threading
 import time
 import unicodedata
 import xml.dom.minidom
+from concurrent.futures import ProcessPoolExecutor
 from datetime import (
     datetime,
     timezone,
@@ -35,6 +37,7 @@ from hashlib import md5
 from os.path import relpath
 from typing import (
     Any,
+    Callable,
     Iterable,
     Iterator,
     List,
@@ -282,6 +285,44 @@ def chunk_iterable(it: Iterable, size: int = 1000) -> Iterator[tuple]:
         yield p
 
 
+_forked_func: Optional[Callable[[Any], Any]] = None
+_forked_func_lock = threading.Lock()
+
+
+def _call_forked_func(item):
+    assert _forked_func
+    return _forked_func(item)
+
+
+def map_in_processes(func: Callable[[Any], Any], items: Iterable, processes: int = 1) -> List[Any]:
+    """
+    Return ``[func(item) for item in items]``, computed by up to ``processes`` forked worker processes.
+
+    ``func`` is inherited by the forked processes instead of being pickled, so
+    it may be a closure over (unpicklable) state of the calling process, but
+    items and results are pickled. Results are in the order of ``items`` and
+    the first exception raised by ``func`` is re-raised. Changes ``func`` makes
+    to objects of the calling process are lost. Items are mapped in the calling
+    process if ``processes`` is 1 or forking is not available.
+
+    >>> map_in_processes(lambda i: i * i, range(5), processes=2)
+    [0, 1, 4, 9, 16]
+    """
+    global _forked_func
+    items = list(items)
+    processes = min(processes, len(items))
+    if processes <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return [func(item) for item in items]
+    chunksize = max(len(items) // (processes * 4), 1)
+    with _forked_func_lock:
+        _forked_func = func
+        try:
+            with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("fork")) as executor:
+                return list(executor.map(_call_forked_func, items, chunksize=chunksize))
+        finally:
+            _forked_func = None
+
+
 def unique_id(KEY_SIZE=128):
     """
     Generates an unique id
@@ -93,13 +93,23 @@ def shell_process(cmds: Union[List[str], str], env: Optional[Dict[str, str]] = N
     return p
 
 
-def execute(cmds, input=None):
+def execute(cmds, input=None, timeout=None):
     """Execute commands and throw an exception on a non-zero exit.
     if input is not None then the string is sent to the process' stdin.
+    if timeout is not None and the commands do not finish within timeout
+    seconds, they are killed and subprocess.TimeoutExpired is raised.
 
     Return the standard output if the commands are successful
     """
-    return _wait(cmds, input=input, shell=False, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return _wait(
+        cmds,
+        input=input,
+        timeout=timeout,
+        shell=False,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
 
 
 def argv_to_str(command_argv, quote=True):
@@ -115,9 +125,14 @@ def argv_to_str(command_argv, quote=True):
     return " ".join(map_func(c) for c in command_argv if c is not None)
 
 
-def _wait(cmds, input=None, **popen_kwds):
+def _wait(cmds, input=None, timeout=None, **popen_kwds):
     p = subprocess.Popen(cmds, **popen_kwds)
-    stdout, stderr = p.communicate(input)
+    try:
+        stdout, stderr = p.communicate(input, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        p.kill()
+        p.communicate()
+        raise
     stdout, stderr = unicodify(stdout), unicodify(stderr)
     if p.returncode != 0:
         raise CommandLineException(argv_to_str(cmds), stdout, stderr, p.returncode)
@@ -1,6 +1,9 @@
 """Entry point for the usage of Cheetah templating within Galaxy."""
 
+import hashlib
+import threading
 import traceback
+from collections import OrderedDict
 from lib2to3.refactor import RefactoringTool
 
 from Cheetah.Compiler import Compiler
@@ -39,6 +42,121 @@ def create_compiler_class(module_code):
     return CustomCompilerClass
 
 
+DEFAULT_TEMPLATE_CACHE_SIZE = 1000
+
+
+class CompiledTemplateCache:
+    """Bounded, thread safe LRU cache of compiled Cheetah template classes.
+
+    Templates are keyed by a hash of their text and of the module code of the compiler class, so
+    the same command line or config file template is compiled once for all jobs of a tool. Cheetah's
+    own compilation cache is not used, it is unbounded and keyed on the compiler class, which is a
+    new class for every module code fixed up for python 2 templates.
+
+    Once a python 2 template only fills after fixing its module code, the fixed class is also stored
+    for the original template so later fills skip the failing attempts.
+
+    If a ``statsd_client`` is set, hits, misses and evictions are counted under ``galaxy.templates.cache``.
+    """
+
+    FIXED = "fixed"
+
+    def __init__(self, max_size=DEFAULT_TEMPLATE_CACHE_SIZE, statsd_client=None):
+        self.max_size = max_size
+        self.statsd_client = statsd_client
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._classes = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(template_text, compiler_class=Compiler):
+        template_hash = hashlib.sha1(template_text.encode("utf-8")).hexdigest()
+        if issubclass(compiler_class, FixedModuleCodeCompiler):
+            return template_hash, hashlib.sha1(compiler_class.module_code.encode("utf-8")).hexdigest()
+        return template_hash, f"{compiler_class.__module__}.{compiler_class.__qualname__}"
+
+    def compile(self, template_text, compiler_class=Compiler):
+        """Return the template class for ``template_text``, compiling it on a cache miss."""
+        key = self._key(template_text, compiler_class)
+        with self._lock:
+            klass = self._classes.get(key)
+            if klass is not None:
+                self._classes.move_to_end(key)
+                self.hits += 1
+                self._incr("hits")
+                return klass
+            self.misses += 1
+        self._incr("misses")
+        klass = Template.compile(
+            source=template_text, compilerClass=compiler_class, cacheCompilationResults=False, useCache=False
+        )
+        self._put(key, klass)
+        return klass
+
+    def fixed(self, template_text):
+        """Return the class with fixed module code remembered for ``template_text``, if any."""
+        key = (self._key(template_text)[0], self.FIXED)
+        with self._lock:
+            klass = self._classes.get(key)
+            if klass is not None:
+                self._classes.move_to_end(key)
+                self.hits += 1
+                self._incr("hits")
+            return klass
+
+    def remember_fixed(self, template_text, klass):
+        """Remember ``klass`` with fixed module code as the class to fill ``template_text`` with."""
+        self._put((self._key(template_text)[0], self.FIXED), klass)
+
+    def configure(self, max_size, statsd_client=None):
+        """Set the maximum number of cached classes and the statsd client to count hits and misses with."""
+        self.statsd_client = statsd_client
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def _put(self, key, klass):
+        with self._lock:
+            self._classes[key] = klass
+            self._classes.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        evictions = 0
+        while len(self._classes) > self.max_size:
+            self._classes.popitem(last=False)
+            evictions += 1
+        if evictions:
+            self.evictions += evictions
+            self._incr("evictions", evictions)
+
+    def _incr(self, counter, n=1):
+        if self.statsd_client is not None:
+            self.statsd_client.incr(f"galaxy.templates.cache.{counter}", n)
+
+    def clear(self):
+        with self._lock:
+            self._classes.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._classes),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+template_cache = CompiledTemplateCache()
+
+
 def fill_template(
     template_text,
     context=None,
@@ -61,8 +179,11 @@ def fill_template(
         context = kwargs
     if isinstance(python_template_version, str):
         python_template_version = Version(python_template_version)
+    klass = None
+    if compiler_class is Compiler and python_template_version.release[0] < 3:
+        klass = template_cache.fixed(template_text)
     try:
-        klass = Template.compile(source=template_text, compilerClass=compiler_class)
+        klass = klass or template_cache.compile(template_text, compiler_class)
     except ParseError as e:
         # Might happen on invalid syntax within a cheetah statement, like `#if $smxsize <> 128.0`
         if first_exception is None:
@@ -84,7 +205,7 @@ def fill_template(
         raise first_exception or e
     t = klass(searchList=[context])
     try:
-        return unicodify(t, log_exception=False)
+        filled = unicodify(t, log_exception=False)
     except (NotFound, InputNotFoundSyntaxError) as e:
         if first_exception is None:
             first_exception = e
@@ -141,6 +262,9 @@ def fill_template(
                 python_template_version=python_template_version,
             )
         raise first_exception or e
+    if compiler_class is not Compiler:
+        template_cache.remember_fixed(template_text, klass)
+    return filled
 
 
 def futurize_preprocessor(source):
@@ -87,6 +87,12 @@ class ConfiguresHandlers:
             ready_window_size_str = config_element.attrib.get("ready_window_size", None)
             if ready_window_size_str:
                 handling_config_dict["ready_window_size"] = int(ready_window_size_str)
+            readiness_tracking = config_element.attrib.get("readiness_tracking", None)
+            if readiness_tracking:
+                handling_config_dict["readiness_tracking"] = readiness_tracking
+            readiness_reconcile_interval_str = config_element.attrib.get("readiness_reconcile_interval", None)
+            if readiness_reconcile_interval_str:
+                handling_config_dict["readiness_reconcile_interval"] = int(readiness_reconcile_interval_str)
 
         return handling_config_dict
 
@@ -174,18 +174,30 @@ def get_index_query_params(
         ),
         deprecated=True,  # TODO: remove 'dataset_details' when the UI doesn't need it
     ),
+    after: Optional[str] = Query(
+        default=None,
+        title="After",
+        description=(
+            "Only return contents after the item identified by `<hid>-<type_id>`, usually the last item of the "
+            "previous page. Only valid when ordering by `hid`, unlike `offset` the cost of a page doesn't grow "
+            "with its position in the history."
+        ),
+        examples=["12-dataset-f2db41e1fa331b3e"],
+    ),
 ) -> HistoryContentsIndexParams:
     """This function is meant to be used as a dependency to render the OpenAPI documentation
     correctly"""
     return parse_index_query_params(
         v=v,
         dataset_details=dataset_details,
+        after=after,
     )
 
 
 def parse_index_query_params(
     v: Optional[str] = None,
     dataset_details: Optional[str] = None,
+    after: Optional[str] = None,
     **_,  # Additional params are ignored
 ) -> HistoryContentsIndexParams:
     """Parses query parameters for the history contents `index` operation
@@ -194,6 +206,7 @@ def parse_index_query_params(
         return HistoryContentsIndexParams(
             v=v,
             dataset_details=parse_dataset_details(dataset_details),
+            after=after,
         )
     except ValidationError as e:
         raise validation_error_to_message_exception(e)
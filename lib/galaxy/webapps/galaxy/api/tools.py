@@ -38,6 +38,11 @@ from galaxy.web import (
     expose_api_anonymous,
     expose_api_anonymous_and_sessionless,
     expose_api_raw_anonymous_and_sessionless,
+    format_return_as_json,
+)
+from galaxy.web.framework.decorators import (
+    JSONP_CALLBACK_KEY,
+    JSONP_CONTENT_TYPE,
 )
 from galaxy.webapps.base.controller import UsesVisualizationMixin
 from galaxy.webapps.base.webapp import GalaxyWebTransaction
@@ -114,12 +119,13 @@ class ToolsController(BaseGalaxyAPIController, UsesVisualizationMixin):
     hdca_manager: DatasetCollectionManager = depends(DatasetCollectionManager)
     service: ToolsService = depends(ToolsService)
 
-    @expose_api_anonymous_and_sessionless
+    @expose_api_raw_anonymous_and_sessionless
     def index(self, trans: GalaxyWebTransaction, **kwds):
         """
         GET /api/tools
 
-        returns a list of tools defined by parameters
+        returns a list of tools defined by parameters, the toolbox listing
+        carries an ETag and is answered with 304 if it is unchanged
 
         :param in_panel: if true, tools are returned in panel structure,
                          including sections and labels
@@ -132,6 +138,7 @@ class ToolsController(BaseGalaxyAPIController, UsesVisualizationMixin):
         """
 
         # Read params.
+        jsonp_callback = kwds.pop(JSONP_CALLBACK_KEY, None)
         in_panel = util.string_as_bool(kwds.get("in_panel", "True"))
         trackster = util.string_as_bool(kwds.get("trackster", "False"))
         q = kwds.get("q", "")
@@ -160,18 +167,19 @@ class ToolsController(BaseGalaxyAPIController, UsesVisualizationMixin):
                         pass
                     except exceptions.ObjectNotFound:
                         pass
-            return results
+            return self._format_json(trans, format_return_as_json(results), jsonp_callback)
 
         # Find whether to detect.
         if tool_id:
             detected_versions = self.service._detect(trans, tool_id)
-            return detected_versions
+            return self._format_json(trans, format_return_as_json(detected_versions), jsonp_callback)
 
         # Return everything.
         try:
-            return self.app.toolbox.to_dict(
+            panel_json, etag = self.app.toolbox.panel_json(
                 trans, in_panel=in_panel, trackster=trackster, tool_help=tool_help, view=view
             )
+            return self._conditional_response(trans, panel_json, etag, jsonp_callback)
         except exceptions.MessageException:
             raise
         except Exception:
@@ -189,28 +197,52 @@ class ToolsController(BaseGalaxyAPIController, UsesVisualizationMixin):
         rval["views"] = self.app.toolbox.panel_view_dicts()
         return rval
 
-    @expose_api_anonymous_and_sessionless
+    @expose_api_raw_anonymous_and_sessionless
     def panel_view(self, trans: GalaxyWebTransaction, view, **kwds):
         """
         GET /api/tool_panels/{view}
 
-        returns a dictionary of tools and tool sections for the given view
+        returns a dictionary of tools and tool sections for the given view,
+        with an ETag and a 304 response if it is unchanged
 
         :param trackster: if true, only tools that are compatible with
                           Trackster are returned
         """
 
         # Read param.
+        jsonp_callback = kwds.pop(JSONP_CALLBACK_KEY, None)
         trackster = util.string_as_bool(kwds.get("trackster", "False"))
 
         # Return panel view.
         try:
-            return self.app.toolbox.to_panel_view(trans, trackster=trackster, view=view)
+            panel_json, etag = self.app.toolbox.panel_json(trans, panel_view=True, trackster=trackster, view=view)
+            return self._conditional_response(trans, panel_json, etag, jsonp_callback)
         except exceptions.MessageException:
             raise
         except Exception:
             raise exceptions.InternalServerError("Error: Could not convert toolbox to dictionary")
 
+    def _conditional_response(
+        self, trans: GalaxyWebTransaction, body: str, etag: str, jsonp_callback: Optional[str] = None
+    ):
+        trans.response.headers["ETag"] = etag
+        # Allow clients to keep the panel as long as they revalidate it.
+        trans.response.headers["Cache-Control"] = "no-cache"
+        if_none_match = trans.request.headers.get("If-None-Match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            trans.response.status = 304
+            return ""
+        return self._format_json(trans, body, jsonp_callback)
+
+    def _format_json(self, trans: GalaxyWebTransaction, body: str, jsonp_callback: Optional[str] = None):
+        # The raw API decorator leaves JSONP and pretty printing in debug mode to the endpoint.
+        if trans.debug:
+            body = format_return_as_json(loads(body), pretty=True)
+        if jsonp_callback:
+            trans.response.set_content_type(JSONP_CONTENT_TYPE)
+            body = f"{jsonp_callback}({body});"
+        return body
+
     @expose_api_anonymous_and_sessionless
     def show(self, trans: GalaxyWebTransaction, id, **kwd):
         """
@@ -9,6 +9,7 @@ from typing import (
     List,
     Optional,
     Set,
+    Tuple,
     Union,
 )
 
@@ -131,6 +132,8 @@ log = logging.getLogger(__name__)
 
 DatasetDetailsType = Union[Set[DecodedDatabaseIdField], Literal["all"]]
 HistoryItemModel = Union[HistoryDatasetAssociation, HistoryDatasetCollectionAssociation]
+# orders for which contents can be paged with the `after` cursor
+KEYSET_ORDERS = ("hid", "hid-asc", "hid-dsc")
 
 
 class HistoryContentsIndexParams(Model):
@@ -138,6 +141,7 @@ class HistoryContentsIndexParams(Model):
 
     v: Optional[Literal["dev"]]
     dataset_details: Optional[DatasetDetailsType]
+    after: Optional[str] = None
 
 
 class LegacyHistoryContentsIndexParams(Model):
@@ -952,6 +956,22 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         ]
         return HistoryContentsResult(root=items)
 
+    def _parse_contents_cursor(self, after: Optional[str]) -> Optional[Tuple[int, str, int]]:
+        """Parses a `<hid>-<type_id>` contents cursor into the key used by `HistoryContentsManager.contents_after`."""
+        if after is None:
+            return None
+        try:
+            hid, type_id = after.split("-", 1)
+            content_type, encoded_id = type_id.rsplit("-", 1)
+            hid_value = int(hid)
+        except ValueError:
+            raise exceptions.RequestParameterInvalidException(
+                f"Invalid `after` value '{after}', expected the `hid` and `type_id` of an item like `12-dataset-<id>`"
+            )
+        if content_type not in (HistoryContentType.dataset, HistoryContentType.dataset_collection):
+            raise exceptions.RequestParameterInvalidException(f"Invalid content type '{content_type}' in `after`")
+        return hid_value, content_type, self.decode_id(encoded_id)
+
     def __index_v2(
         self,
         trans,
@@ -978,15 +998,31 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
 
         serialization_params = self._handle_extra_serialization_for_media_type(serialization_params, accept)
         filter_query_params.order = filter_query_params.order or "hid-asc"
-        order_by = self.build_order_by(self.history_contents_manager, filter_query_params.order)
-        contents = self.history_contents_manager.contents(
-            history,
-            filters=filters,
-            limit=filter_query_params.limit,
-            offset=filter_query_params.offset,
-            order_by=order_by,
-            serialization_params=serialization_params,
-        )
+        if filter_query_params.order in KEYSET_ORDERS:
+            # ordering by hid doesn't need an offset to get deep pages, contents are read from the hid indexes
+            contents = self.history_contents_manager.contents_after(
+                history,
+                after=self._parse_contents_cursor(params.after),
+                descending=filter_query_params.order != "hid-asc",
+                filters=filters,
+                limit=filter_query_params.limit,
+                offset=filter_query_params.offset,
+                serialization_params=serialization_params,
+            )
+        else:
+            if params.after is not None:
+                raise exceptions.RequestParameterInvalidException(
+                    f"The `after` parameter can only be used when ordering by one of {KEYSET_ORDERS}"
+                )
+            order_by = self.build_order_by(self.history_contents_manager, filter_query_params.order)
+            contents = self.history_contents_manager.contents(
+                history,
+                filters=filters,
+                limit=filter_query_params.limit,
+                offset=filter_query_params.offset,
+                order_by=order_by,
+                serialization_params=serialization_params,
+            )
         items = [
             self._serialize_content_item(
                 trans,
@@ -1,5 +1,17 @@
 import os
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+)
 from functools import partial
+from itertools import zip_longest
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+from sqlalchemy import select
 
 import galaxy.workflow.schedulers
 from galaxy import model
@@ -275,6 +287,47 @@ class WorkflowSchedulingManager(ConfiguresHandlers):
         self.app.application_stack.register_postfork_function(self.request_monitor.start)
 
 
+# Stored workflow versions are never modified, these stay loaded while a batch of invocations is scheduled.
+WORKFLOW_DEFINITION_CLASSES = (
+    model.Workflow,
+    model.WorkflowStep,
+    model.WorkflowStepInput,
+    model.WorkflowStepConnection,
+    model.WorkflowOutput,
+)
+
+
+def invocation_lanes(invocations, lanes: int) -> List[List[int]]:
+    """Split the ids of active invocations (rows of ``id``, ``history_id`` and ``user_id``) into
+    ``lanes`` lanes in fair order, invocations of a history are always in the same lane.
+
+    >>> invocation_lanes([(1, 10, 1), (2, 11, 1), (3, 12, 2), (4, 10, 1), (5, 13, 3)], 2)
+    [[1, 3, 4], [2, 5]]
+    """
+    rows_by_lane: List[list] = [[] for _ in range(lanes)]
+    for invocation in invocations:
+        rows_by_lane[invocation[1] % lanes].append(invocation)
+    return [fair_invocation_order(rows) for rows in rows_by_lane]
+
+
+def fair_invocation_order(invocations) -> List[int]:
+    """Order the ids of active invocations (rows of ``id``, ``history_id`` and ``user_id``) so that
+    users take turns, invocations of each user keep their order.
+
+    >>> fair_invocation_order([(1, 10, 1), (2, 10, 1), (3, 11, 1), (4, 12, 2), (5, 13, None)])
+    [1, 4, 5, 2, 3]
+    """
+    ids_by_user: Dict[Optional[int], List[int]] = {}
+    for invocation_id, _, user_id in invocations:
+        ids_by_user.setdefault(user_id, []).append(invocation_id)
+    return [
+        invocation_id
+        for invocation_ids in zip_longest(*ids_by_user.values())
+        for invocation_id in invocation_ids
+        if invocation_id is not None
+    ]
+
+
 class WorkflowRequestMonitor(Monitors):
     def __init__(self, app, workflow_scheduling_manager):
         self.app = app
@@ -282,6 +335,13 @@ class WorkflowRequestMonitor(Monitors):
         self._init_monitor_thread(
             name="WorkflowRequestMonitor.monitor_thread", target=self.__monitor, config=app.config
         )
+        self.batch_size = app.config.workflow_scheduling_batch_size
+        self.scheduling_threads = max(app.config.workflow_scheduling_threads, 1)
+        self.executor = None
+        if self.batch_size > 0 and self.scheduling_threads > 1:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.scheduling_threads, thread_name_prefix="WorkflowRequestMonitor.scheduling_thread"
+            )
         self.invocation_grabber = None
         self_handler_tags = set(self.app.job_config.self_handler_tags)
         self_handler_tags.add(self.workflow_scheduling_manager.default_handler_id)
@@ -312,13 +372,16 @@ class WorkflowRequestMonitor(Monitors):
                     if not self.monitor_running:
                         return
 
-                    self.__schedule(workflow_scheduler_id, workflow_scheduler)
+                    self._schedule(workflow_scheduler_id, workflow_scheduler)
                 log.trace(monitor_step_timer.to_str())
             except Exception:
                 log.exception("An exception occured scheduling while scheduling workflows")
             self._monitor_sleep(self.app.config.workflow_monitor_sleep)
 
-    def __schedule(self, workflow_scheduler_id, workflow_scheduler):
+    def _schedule(self, workflow_scheduler_id, workflow_scheduler):
+        if self.batch_size > 0:
+            self.__schedule_batches(workflow_scheduler_id, workflow_scheduler)
+            return
         invocation_ids = self.__active_invocation_ids(workflow_scheduler_id)
         for invocation_id in invocation_ids:
             log.debug("Attempting to schedule workflow invocation [%s]", invocation_id)
@@ -326,34 +389,88 @@ class WorkflowRequestMonitor(Monitors):
             if not self.monitor_running:
                 return
 
+    def __schedule_batches(self, workflow_scheduler_id, workflow_scheduler):
+        invocations = model.WorkflowInvocation.poll_active_workflow_owners(
+            self.app.model.engine,
+            scheduler=workflow_scheduler_id,
+            handler=self.app.config.server_name,
+        )
+        # Invocations of a history are always scheduled by the same thread, in order.
+        lanes = invocation_lanes(invocations, self.scheduling_threads)
+        if self.executor is None:
+            self.__schedule_lane(lanes[0], workflow_scheduler)
+        else:
+            futures = [self.executor.submit(self.__schedule_lane, lane, workflow_scheduler) for lane in lanes if lane]
+            wait(futures)
+            for future in futures:
+                if future.exception():
+                    log.error("Exception raised while scheduling workflow invocations", exc_info=future.exception())
+
+    def __schedule_lane(self, invocation_ids, workflow_scheduler):
+        for i in range(0, len(invocation_ids), self.batch_size):
+            if not self.monitor_running:
+                return
+            self.__attempt_schedule_batch(invocation_ids[i : i + self.batch_size], workflow_scheduler)
+
+    def __attempt_schedule_batch(self, invocation_ids, workflow_scheduler):
+        with self.app.model.context() as session:
+            # All invocations of the batch share one session, that isn't expired when scheduling an invocation
+            # commits, so the workflow of invocations of the same workflow version is only loaded once per batch.
+            # Everything else is expired before scheduling the next invocation.
+            session.expire_on_commit = False
+            try:
+                # load the batch at once, holding on to the invocations keeps them (and their workflows) in the session
+                invocations = session.scalars(
+                    select(model.WorkflowInvocation).where(model.WorkflowInvocation.id.in_(invocation_ids))
+                ).all()
+                log.debug("Attempting to schedule a batch of %d workflow invocations", len(invocations))
+                for i, invocation_id in enumerate(invocation_ids):
+                    if not self.monitor_running:
+                        return
+                    if i > 0:
+                        # Anything but the workflow definitions may have changed since it was loaded, scheduling the
+                        # previous invocation or another process (e.g. cancelling the invocation) could have updated it.
+                        for obj in list(session.identity_map.values()):
+                            if not isinstance(obj, WORKFLOW_DEFINITION_CLASSES):
+                                session.expire(obj)
+                    log.debug("Attempting to schedule workflow invocation [%s]", invocation_id)
+                    self.__schedule_invocation(session, invocation_id, workflow_scheduler)
+            finally:
+                session.expire_on_commit = True
+
     def __attempt_schedule(self, invocation_id, workflow_scheduler):
         with self.app.model.context() as session:
-            workflow_invocation = session.get(model.WorkflowInvocation, invocation_id)
+            return self.__schedule_invocation(session, invocation_id, workflow_scheduler)
 
-            try:
-                if workflow_invocation.state == workflow_invocation.states.CANCELLING:
-                    workflow_invocation.cancel_invocation_steps()
-                    workflow_invocation.mark_cancelled()
-                    session.commit()
-                    return False
-
-                if not workflow_invocation or not workflow_invocation.active:
-                    return False
-
-                # This ensures we're only ever working on the 'first' active
-                # workflow invocation in a given history, to force sequential
-                # activation.
-                if self.app.config.history_local_serial_workflow_scheduling:
-                    for i in workflow_invocation.history.workflow_invocations:
-                        if i.active and i.id < workflow_invocation.id:
-                            return False
-                workflow_scheduler.schedule(workflow_invocation)
-                log.debug("Workflow invocation [%s] scheduled", workflow_invocation.id)
-            except Exception:
-                # TODO: eventually fail this - or fail it right away?
-                log.exception("Exception raised while attempting to schedule workflow request.")
+    def __schedule_invocation(self, session, invocation_id, workflow_scheduler):
+        workflow_invocation = session.get(model.WorkflowInvocation, invocation_id)
+
+        try:
+            if workflow_invocation.state == workflow_invocation.states.CANCELLING:
+                workflow_invocation.cancel_invocation_steps()
+                workflow_invocation.mark_cancelled()
+                session.commit()
+                return False
+
+            if not workflow_invocation or not workflow_invocation.active:
                 return False
 
+            # This ensures we're only ever working on the 'first' active
+            # workflow invocation in a given history, to force sequential
+            # activation.
+            if self.app.config.history_local_serial_workflow_scheduling:
+                for i in workflow_invocation.history.workflow_invocations:
+                    if i.active and i.id < workflow_invocation.id:
+                        return False
+            workflow_scheduler.schedule(workflow_invocation)
+            log.debug("Workflow invocation [%s] scheduled", workflow_invocation.id)
+        except Exception:
+            # TODO: eventually fail this - or fail it right away?
+            log.exception("Exception raised while attempting to schedule workflow request.")
+            # leave the session usable for the remaining invocations of a batch
+            session.rollback()
+            return False
+
         # A workflow was obtained and scheduled...
         return True
 
@@ -370,3 +487,5 @@ class WorkflowRequestMonitor(Monitors):
 
     def shutdown(self):
         self.shutdown_monitor()
+        if self.executor:
+            self.executor.shutdown(cancel_futures=True)
@@ -171,6 +171,17 @@ class TestToolsApi(ApiTestCase, TestsTools):
         tool_ids = [_["id"] for _ in tools_index]
         assert "upload1" in tool_ids
 
+    def test_index_etag_and_jsonp(self):
+        index = self._get("tools")
+        self._assert_status_code_is(index, 200)
+        etag = index.headers["ETag"]
+        not_modified = self._get("tools", headers={"If-None-Match": etag})
+        self._assert_status_code_is(not_modified, 304)
+        jsonp = self._get("tools", data=dict(callback="panel_loaded"))
+        self._assert_status_code_is(jsonp, 200)
+        assert jsonp.headers["content-type"].startswith("application/javascript")
+        assert jsonp.text.startswith("panel_loaded(")
+
     @skip_without_tool("test_sam_to_bam_conversions")
     def test_requirements(self):
         requirements_response = self._get("tools/test_sam_to_bam_conversions/requirements", admin=True)
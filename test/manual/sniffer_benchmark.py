@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Compare ``guess_ext`` using the registry's sniff index with a linear walk of the sniff order.
+
+% python test/manual/sniffer_benchmark.py
+% python test/manual/sniffer_benchmark.py --repeat 5 lib/galaxy/datatypes/test test-data
+"""
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.datatypes.registry import example_datatype_registry_for_sample
+from galaxy.datatypes.sniff import (
+    FilePrefix,
+    guess_ext,
+)
+
+DESCRIPTION = "Benchmark datatype sniffing over a corpus of test files."
+DEFAULT_CORPUS = [
+    os.path.join(galaxy_root, "lib", "galaxy", "datatypes", "test"),
+    os.path.join(galaxy_root, "test-data"),
+]
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("corpus", nargs="*", default=DEFAULT_CORPUS, help="directories of files to sniff")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    registry = example_datatype_registry_for_sample()
+    paths = _corpus_files(args.corpus)
+    # read the prefixes up front so only the time spent in the sniffers is compared
+    file_prefixes = [FilePrefix(path) for path in paths]
+    linear, linear_exts = _time(file_prefixes, registry.sniff_order, args.repeat)
+    indexed, indexed_exts = _time(file_prefixes, registry.sniff_index, args.repeat)
+
+    mismatches = [(p, a, b) for p, a, b in zip(paths, linear_exts, indexed_exts) if a != b]
+    for path, linear_ext, indexed_ext in mismatches:
+        print(f"MISMATCH {path}: linear walk={linear_ext} sniff index={indexed_ext}")
+    print(f"{len(paths)} files, {len(registry.sniff_order)} sniffers, best of {args.repeat} runs")
+    print(f"linear walk: {linear:.3f}s")
+    print(f"sniff index: {indexed:.3f}s ({linear / indexed:.1f}x)")
+    return 1 if mismatches else 0
+
+
+def _corpus_files(directories):
+    paths = []
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            paths.extend(os.path.join(root, f) for f in sorted(files))
+    return paths
+
+
+def _time(file_prefixes, sniff_order, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        exts = [guess_ext(file_prefix, sniff_order) for file_prefix in file_prefixes]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, exts
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Compare tabular metadata detection with batched column typing against typing every value on its own.
+
+% python test/manual/tabular_metadata_benchmark.py
+% python test/manual/tabular_metadata_benchmark.py --lines 2000000 path/to/dataset.tabular
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.datatypes.tabular import Tabular
+from galaxy.datatypes.util.column_types import (
+    column_type_max,
+    DEFAULT_COLUMN_TYPE,
+    guess_column_type,
+)
+from galaxy.util.bunch import Bunch
+
+DESCRIPTION = "Benchmark setting metadata of tabular datasets."
+
+
+class BenchmarkDataset:
+    def __init__(self, path):
+        self.path = path
+        self.metadata = Bunch()
+
+    def has_data(self):
+        return os.path.getsize(self.path) > 0
+
+    def get_file_name(self):
+        return self.path
+
+    def get_size(self):
+        return os.path.getsize(self.path)
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("datasets", nargs="*", help="tabular files, a synthetic file is generated if omitted")
+    arg_parser.add_argument("--lines", type=int, default=500000, help="lines of the synthetic file")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    paths = args.datasets
+    tmp_dir = None
+    if not paths:
+        tmp_dir = tempfile.TemporaryDirectory()
+        paths = [os.path.join(tmp_dir.name, "synthetic.tabular")]
+        _write_synthetic(paths[0], args.lines)
+    mismatches = 0
+    for path in paths:
+        per_value, per_value_types = _time(lambda: _per_value_column_types(path), args.repeat)
+        batched, dataset = _time(lambda: _set_meta(path), args.repeat)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"{path}: {size_mb:.1f} MB, {dataset.metadata.data_lines} data lines, best of {args.repeat} runs")
+        print(f"  typing every value: {per_value:.3f}s")
+        print(f"  Tabular.set_meta:   {batched:.3f}s ({per_value / batched:.1f}x)")
+        if per_value_types != dataset.metadata.column_types:
+            mismatches += 1
+            print(f"  MISMATCH typing every value={per_value_types} set_meta={dataset.metadata.column_types}")
+    if tmp_dir:
+        tmp_dir.cleanup()
+    return 1 if mismatches else 0
+
+
+def _set_meta(path):
+    dataset = BenchmarkDataset(path)
+    Tabular().set_meta(dataset, max_data_lines=None)
+    return dataset
+
+
+def _per_value_column_types(path):
+    # Column typing as Tabular.set_meta used to do it, with one guess per value.
+    column_types = []
+    first_line_column_types = [DEFAULT_COLUMN_TYPE]
+    with open(path) as fh:
+        for i, line in enumerate(iter(fh.readline, "")):
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            if i == 0:
+                first_line_column_types = [guess_column_type(field) for field in fields]
+                column_types = [None] * len(fields)
+                continue
+            for field_count, field in enumerate(fields):
+                if field_count >= len(column_types):
+                    column_types.append(None)
+                column_types[field_count] = column_type_max(column_types[field_count], guess_column_type(field))
+    column_types.extend(first_line_column_types[len(column_types) :])
+    for i, column_type in enumerate(column_types):
+        if column_type is None:
+            first_line_column_type = first_line_column_types[i] if i < len(first_line_column_types) else None
+            column_types[i] = first_line_column_type or DEFAULT_COLUMN_TYPE
+    return column_types
+
+
+def _write_synthetic(path, lines):
+    rng = random.Random(42)
+    with open(path, "w") as fh:
+        fh.write("chrom\tstart\tend\tscore\tname\tblocks\tcount\n")
+        for i in range(lines):
+            start = rng.randint(0, 10**8)
+            # a count column that is only empty or ints, and one float value late in the file
+            count = "" if i % 7 == 0 else str(rng.randint(-1000, 1000))
+            if i == lines - 1:
+                count = "1.5"
+            fields = [
+                f"chr{rng.randint(1, 22)}",
+                str(start),
+                str(start + rng.randint(1, 10000)),
+                f"{rng.random():.6f}",
+                f"feature_{i}",
+                ",".join(str(rng.randint(1, 500)) for _ in range(3)),
+                count,
+            ]
+            fh.write("\t".join(fields) + "\n")
+
+
+def _time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+if __name__ == "__main__":
+    sys.exit(main())
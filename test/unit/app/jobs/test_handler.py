@@ -0,0 +1,57 @@
+from galaxy import model
+from galaxy.app_unittest_utils.galaxy_mock import MockApp
+from galaxy.jobs.handler import (
+    JOB_READY,
+    JOB_WAIT,
+    JobHandlerQueue,
+)
+from galaxy.util.bunch import Bunch
+
+DESTINATION = Bunch(id="local", tags=None)
+
+
+def test_anonymous_concurrency_limit_within_one_window():
+    app = _app(anonymous_user_concurrent_jobs=2)
+    session = app.model.context
+    galaxy_session = model.GalaxySession()
+    other_galaxy_session = model.GalaxySession()
+    jobs = [_job(galaxy_session) for _ in range(5)] + [_job(other_galaxy_session)]
+    session.add_all(jobs)
+    session.commit()
+    queue = JobHandlerQueue(app, dispatcher=None)
+    queue._JobHandlerQueue__clear_job_count()
+    queue._JobHandlerQueue__prefetch_ready_window(jobs)
+    states = []
+    for job in jobs:
+        state = queue._JobHandlerQueue__check_user_jobs(job, Bunch(job_destination=DESTINATION))
+        if state == JOB_READY:
+            # as done when the job is dispatched
+            queue.increase_running_job_count(job.user_id, DESTINATION.id, job.session_id)
+        states.append(state)
+    assert states == [JOB_READY, JOB_READY, JOB_WAIT, JOB_WAIT, JOB_WAIT, JOB_READY]
+
+
+def _app(**limits):
+    app = MockApp()
+    app.job_config.limits = Bunch(
+        **{
+            "registered_user_concurrent_jobs": None,
+            "anonymous_user_concurrent_jobs": None,
+            "destination_user_concurrent_jobs": {},
+            "destination_total_concurrent_jobs": {},
+            **limits,
+        }
+    )
+    app.job_config.handler_readiness_tracking = None
+    app.job_config.handler_assignment_methods = []
+    app.job_config.handler_max_grab = None
+    app.job_config.self_handler_tags = []
+    app.job_config.handler_tags = []
+    return app
+
+
+def _job(galaxy_session):
+    job = model.Job()
+    job.galaxy_session = galaxy_session
+    job.state = model.Job.states.NEW
+    return job
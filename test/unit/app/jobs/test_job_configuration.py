@@ -193,6 +193,10 @@ class TestSimpleJobConfXmlParser(BaseJobConfXmlParserTestCase):
         assert self.job_config.default_handler_id is None
         assert self.job_config.handlers == {}
 
+    def test_default_readiness_tracking(self):
+        assert self.job_config.handler_readiness_tracking == "full"
+        assert self.job_config.handler_readiness_reconcile_interval == 60
+
     def test_load_simple_destination(self):
         local_dest = self.job_config.destinations["local"][0]
         assert local_dest.id == "local"
@@ -1,6 +1,9 @@
+import collections
 import os
 import tempfile
 
+from sqlalchemy import event
+
 from galaxy import model
 from galaxy.job_execution.output_collect import (
     dataset_collector,
@@ -98,3 +101,60 @@ def test_job_context_discover_outputs_flushes_once(mocker):
         sa_session.commit()
     assert len(collection.dataset_instances) == 10
     assert collection.dataset_instances[0].dataset.file_size == 1
+
+
+def test_job_context_discover_outputs_inserts_in_batches():
+    app = _mock_app()
+    sa_session = app.model.context
+    job = model.Job()
+    job.history = model.History(name="Test History", user=model.User(email="batches@example.com", password="password"))
+    sa_session.add(job)
+    collection = model.DatasetCollection(collection_type="list", populated=False)
+    sa_session.add(collection)
+    with transaction(sa_session):
+        sa_session.commit()
+    job_working_directory = tempfile.mkdtemp()
+    setup_data(job_working_directory)
+    job_context = JobContext(
+        Tool(app),
+        NullToolProvidedMetadata(),
+        job,
+        job_working_directory,
+        PermissionProvider(),
+        MetadataSourceProvider(),
+        "?",
+        app.object_store,
+        "ok",
+        flush_per_n_datasets=4,
+        max_discovered_files=100,
+    )
+    collection_builder = builder.BoundCollectionBuilder(collection)
+    dataset_collectors = [dataset_collector(FilePatternDatasetCollectionDescription(pattern="__name__"))]
+    filenames = job_context.find_files("output", collection, dataset_collectors)
+    inserts: collections.Counter = collections.Counter()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            inserts[statement.split()[2]] += 1
+
+    event.listen(app.model.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        job_context.populate_collection_elements(
+            collection,
+            collection_builder,
+            filenames,
+            name="output",
+            metadata_source_name="",
+            final_job_state=job_context.final_job_state,
+        )
+        collection_builder.populate()
+        job_context.preallocate_ids()
+        with transaction(sa_session):
+            sa_session.commit()
+    finally:
+        event.remove(app.model.engine, "before_cursor_execute", before_cursor_execute)
+    assert len(collection.dataset_instances) == 10
+    # two flushes of 4 datasets while discovering and the remaining 2 datasets with the job
+    for table in ("dataset", "history_dataset_association", "dataset_collection_element", "job_to_output_dataset"):
+        assert inserts[table] == 3
+    assert [element.element_index for element in collection.elements] == list(range(10))
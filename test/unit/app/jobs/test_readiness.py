@@ -0,0 +1,59 @@
+from galaxy.jobs.readiness import JobReadinessIndex
+
+
+def test_job_ready_only_after_last_pending_input():
+    index = JobReadinessIndex()
+    index.add_job(1, owner=1, pending_dataset_ids=[100, 101])
+    assert index.ready_job_ids() == []
+    assert index.datasets_ready([100]) == []
+    assert index.ready_job_ids() == []
+    assert index.datasets_ready([101]) == [1]
+    assert index.ready_job_ids() == [1]
+    assert index.pending_dataset_ids() == set()
+
+
+def test_shared_input_releases_all_waiting_jobs():
+    index = JobReadinessIndex()
+    index.add_job(1, owner=1, pending_dataset_ids=[100])
+    index.add_job(2, owner=2, pending_dataset_ids=[100])
+    index.add_job(3, owner=2, pending_dataset_ids=[100, 101])
+    assert index.datasets_ready([100]) == [1, 2]
+    assert index.pending_dataset_ids() == {101}
+
+
+def test_remove_job_drops_pending_inputs():
+    index = JobReadinessIndex()
+    index.add_job(1, owner=1, pending_dataset_ids=[100])
+    index.add_job(2, owner=1, pending_dataset_ids=[])
+    index.remove_job(1)
+    index.remove_job(2)
+    assert 1 not in index
+    assert len(index) == 0
+    assert index.pending_dataset_ids() == set()
+    assert index.datasets_ready([100]) == []
+    assert index.ready_job_ids() == []
+
+
+def test_re_adding_job_replaces_pending_inputs():
+    index = JobReadinessIndex()
+    index.add_job(1, owner=1, pending_dataset_ids=[100])
+    index.add_job(1, owner=1, pending_dataset_ids=[101])
+    assert index.pending_dataset_ids() == {101}
+
+
+def test_ready_window_is_applied_per_owner():
+    index = JobReadinessIndex()
+    for job_id in range(1, 6):
+        index.add_job(job_id, owner="a", pending_dataset_ids=[])
+    index.add_job(6, owner="b", pending_dataset_ids=[])
+    index.add_job(7, owner=None, pending_dataset_ids=[])
+    assert index.ready_job_ids(window_size=2) == [1, 2, 6, 7]
+    assert index.ready_job_ids() == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_clear():
+    index = JobReadinessIndex()
+    index.add_job(1, owner=1, pending_dataset_ids=[100])
+    index.clear()
+    assert index.job_ids == set()
+    assert index.pending_dataset_ids() == set()
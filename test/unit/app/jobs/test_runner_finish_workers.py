@@ -0,0 +1,78 @@
+import threading
+from queue import Queue
+from unittest import mock
+
+from galaxy.jobs.runners import (
+    BaseJobRunner,
+    RunnerWorkQueue,
+)
+from galaxy.jobs.runners.cli import ShellJobRunner
+
+
+class FinishingJobRunner(BaseJobRunner):
+    runner_name = "FinishingJobRunner"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.finished_by = {}
+        self.queued_by = {}
+        self.done = threading.Event()
+
+    def queue_job(self, job_wrapper):
+        self.queued_by[job_wrapper.job_id] = threading.current_thread().name
+
+    def finish_job(self, job_state):
+        self.finished_by[job_state.job_wrapper.job_id] = threading.current_thread().name
+        self.done.set()
+
+
+def _runner(**kwargs):
+    app = mock.MagicMock()
+    app.config.monitor_thread_join_timeout = 0
+    return FinishingJobRunner(app, 1, **kwargs)
+
+
+def _job_state(job_id):
+    job_wrapper = mock.Mock(job_id=job_id, _job_io=None)
+    job_wrapper.get_id_tag.return_value = str(job_id)
+    return mock.Mock(job_wrapper=job_wrapper)
+
+
+def test_runner_work_queue_routes_finish_methods():
+    finish_queue: Queue = Queue()
+    runner = _runner()
+    work_queue = RunnerWorkQueue(finish_queue, [runner.finish_job])
+    work_queue.put((runner.finish_job, "finish"))
+    work_queue.put((runner.queue_job, "queue"))
+    assert finish_queue.get_nowait() == (runner.finish_job, "finish")
+    assert work_queue.get_nowait() == (runner.queue_job, "queue")
+
+
+def test_no_finish_workers_by_default():
+    runner = _runner()
+    runner._init_worker_threads()
+    try:
+        assert runner.finish_queue is None
+        assert runner.finish_threads == []
+        assert runner.queue_depths() == {"work_queue": 0, "finish_queue": 0}
+    finally:
+        runner.shutdown()
+
+
+def test_finish_workers_run_finish_job():
+    runner = _runner(finish_workers=2)
+    runner._init_worker_threads()
+    try:
+        assert len(runner.finish_threads) == 2
+        runner.work_queue.put((runner.finish_job, _job_state(1)))
+        assert runner.done.wait(5)
+        assert runner.finished_by[1].startswith("FinishingJobRunner.finish_thread-")
+    finally:
+        runner.shutdown()
+
+
+def test_cli_runner_accepts_finish_workers():
+    app = mock.MagicMock()
+    app.config.monitor_thread_join_timeout = 0
+    runner = ShellJobRunner(app, 1, finish_workers="2")
+    assert runner.runner_params.finish_workers == 2
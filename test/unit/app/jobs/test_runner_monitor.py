@@ -0,0 +1,144 @@
+from unittest.mock import (
+    call,
+    Mock,
+    patch,
+)
+
+from galaxy.jobs.runners import (
+    AsynchronousJobRunner,
+    MonitorMetrics,
+    MonitorSchedule,
+    STOP_SIGNAL,
+)
+from galaxy.jobs.runners.cli import ShellJobRunner
+from galaxy.util.bunch import Bunch
+
+
+class BackoffRunner(AsynchronousJobRunner):
+    runner_name = "BackoffRunner"
+    supports_monitor_backoff = True
+
+
+def _runner(runner_class=BackoffRunner, **kwargs):
+    app = Bunch(config=Bunch(redact_email_in_job_name=False, job_runner_monitor_sleep=1), model=Bunch(context=None))
+    return runner_class(app, 1, **kwargs)
+
+
+class BrokenFingerprintRunner(BackoffRunner):
+    @staticmethod
+    def _monitor_fingerprint(job_state):
+        raise AttributeError("tool")
+
+    def check_watched_items(self):
+        pass
+
+
+def _job_state():
+    return Bunch(job_id="1", last_check_time=None, next_check_time=0.0, unchanged_checks=0)
+
+
+def test_unchanged_jobs_back_off_exponentially():
+    schedule = MonitorSchedule(base_interval=1.0, max_interval=10.0, factor=2.0)
+    assert [schedule.interval(n) for n in range(6)] == [0.0, 1.0, 2.0, 4.0, 8.0, 10.0]
+
+
+def test_changed_job_is_checked_on_next_iteration():
+    schedule = MonitorSchedule(base_interval=1.0, max_interval=10.0)
+    job_state = _job_state()
+    for _ in range(3):
+        schedule.reschedule(job_state, changed=False, now=0.0)
+        schedule.pop_due(100.0)
+    assert job_state.unchanged_checks == 3
+    schedule.reschedule(job_state, changed=True, now=100.0)
+    assert job_state.unchanged_checks == 0
+    assert schedule.pop_due(100.0) == [job_state]
+
+
+def test_pop_due_only_returns_due_jobs_in_order():
+    schedule = MonitorSchedule(base_interval=1.0, max_interval=60.0)
+    fresh, stale = _job_state(), _job_state()
+    stale.unchanged_checks = 10
+    schedule.reschedule(stale, changed=False, now=0.0)
+    schedule.reschedule(fresh, changed=False, now=0.0)
+    assert len(schedule) == 2
+    assert schedule.pop_due(0.5) == []
+    assert schedule.pop_due(1.0) == [fresh]
+    assert schedule.pop_due(59.0) == []
+    assert schedule.pop_due(60.0) == [stale]
+    assert len(schedule) == 0
+
+
+def test_remove_from_schedule():
+    schedule = MonitorSchedule(base_interval=1.0, max_interval=60.0)
+    first, second = _job_state(), _job_state()
+    schedule.reschedule(first, changed=False, now=0.0)
+    schedule.reschedule(second, changed=False, now=0.0)
+    assert schedule.remove(first)
+    assert not schedule.remove(first)
+    assert schedule.job_states() == [second]
+    assert schedule.pop_due(60.0) == [second]
+
+
+def test_parked_jobs_are_still_watched():
+    runner = _runner(monitor_backoff_max_interval=60)
+    assert runner.monitor_schedule is not None
+    due, parked = _job_state(), _job_state()
+    runner.watched = [due]
+    runner.monitor_schedule.reschedule(parked, changed=False, now=0.0)
+    assert runner.watched_job_states() == [due, parked]
+    runner.unwatch(parked)
+    assert runner.watched_job_states() == [due]
+    runner.unwatch(due)
+    assert runner.watched_job_states() == []
+
+
+def test_backoff_requires_runner_support():
+    runner = _runner(AsynchronousJobRunner, monitor_backoff_max_interval=60)
+    assert runner.monitor_schedule is None
+
+
+def test_cli_runner_accepts_backoff_params():
+    runner = _runner(ShellJobRunner, monitor_backoff_max_interval="60", monitor_backoff_factor="3")
+    assert runner.monitor_schedule is not None
+    assert runner.monitor_schedule.max_interval == 60.0
+    assert runner.monitor_schedule.factor == 3.0
+
+
+def test_monitor_survives_fingerprint_and_metrics_errors():
+    runner = _runner(BrokenFingerprintRunner, monitor_backoff_max_interval=60)
+    statsd_client = Mock()
+    statsd_client.incr.side_effect = OSError("statsd unreachable")
+    runner.app.execution_timer_factory = Bunch(galaxy_statsd_client=statsd_client)
+    job_state = _job_state()
+    runner.monitor_queue.put(job_state)
+    with patch("galaxy.jobs.runners.time.sleep", side_effect=lambda _: runner.monitor_queue.put(STOP_SIGNAL)):
+        runner.monitor()
+    # a job whose fingerprint fails is treated as changed and stays watched
+    assert runner.watched_job_states() == [job_state]
+    assert job_state.unchanged_checks == 0
+    assert statsd_client.incr.called
+
+
+def test_monitor_metrics():
+    metrics = MonitorMetrics()
+    first, second = _job_state(), _job_state()
+    metrics.record_iteration([first, second], watched=2, now=10.0)
+    assert metrics.checks == 2
+    assert metrics.average_staleness == 0.0
+    first.last_check_time = second.last_check_time = 10.0
+    metrics.record_iteration([first], watched=2, now=14.0, queue_depths={"work_queue": 3})
+    assert metrics.iterations == 2
+    assert metrics.checks == 3
+    assert metrics.watched == 2
+    assert metrics.checks_per_second == 0.25
+    assert metrics.average_staleness == 4.0
+
+    statsd_client = Mock()
+    metrics.send(statsd_client, "galaxy.jobs.runners.backoffrunner.monitor", 1)
+    statsd_client.incr.assert_called_once_with("galaxy.jobs.runners.backoffrunner.monitor.checks", 1)
+    statsd_client.timing.assert_called_once_with("galaxy.jobs.runners.backoffrunner.monitor.average_staleness", 4000.0)
+    assert statsd_client.gauge.call_args_list == [
+        call("galaxy.jobs.runners.backoffrunner.monitor.checks_per_second", 0.25),
+        call("galaxy.jobs.runners.backoffrunner.monitor.watched", 2),
+        call("galaxy.jobs.runners.backoffrunner.monitor.work_queue_depth", 3),
+    ]
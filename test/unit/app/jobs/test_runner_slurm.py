@@ -0,0 +1,92 @@
+import subprocess
+from unittest import mock
+
+from galaxy.jobs.runners import slurm
+from galaxy.util import commands
+from galaxy.util.bunch import Bunch
+
+DRMAA_JOB_STATES = Bunch(
+    QUEUED_ACTIVE="queued_active",
+    SYSTEM_ON_HOLD="system_on_hold",
+    RUNNING="running",
+    SYSTEM_SUSPENDED="system_suspended",
+    DONE="done",
+    FAILED="failed",
+)
+
+SQUEUE_OUTPUT = """\
+101 PENDING
+102 RUNNING
+103 COMPLETED
+104 OUT_OF_MEMORY
+105 SPECIAL_EXIT
+106 CANCELLED+
+"""
+
+SQUEUE_CLUSTER_OUTPUT = """\
+CLUSTER: other
+201 RUNNING
+"""
+
+
+def test_parse_squeue_states():
+    states = slurm.parse_squeue_states(SQUEUE_OUTPUT, DRMAA_JOB_STATES)
+    assert states == {
+        "101": "queued_active",
+        "102": "running",
+        "103": "done",
+        "104": "failed",
+        "106": "failed",
+    }
+
+
+def test_parse_squeue_states_with_cluster():
+    states = slurm.parse_squeue_states(SQUEUE_CLUSTER_OUTPUT, DRMAA_JOB_STATES, cluster="other")
+    assert states == {"201.other": "running"}
+
+
+def _runner():
+    runner = slurm.SlurmJobRunner.__new__(slurm.SlurmJobRunner)
+    runner.drmaa_job_states = DRMAA_JOB_STATES
+    return runner
+
+
+def test_check_watched_items_bulk_single_call_per_cluster():
+    job_states = [Bunch(job_id=str(i)) for i in (101, 102, 103)] + [Bunch(job_id="201.other")]
+    calls = []
+
+    def execute(cmd, **kwargs):
+        calls.append(cmd)
+        return SQUEUE_CLUSTER_OUTPUT if "-M" in cmd else SQUEUE_OUTPUT
+
+    with mock.patch.object(slurm.commands, "execute", side_effect=execute):
+        states = _runner().check_watched_items_bulk(job_states)
+    assert len(calls) == 2
+    assert calls[0][-2:] == ["-j", "101,102,103"]
+    assert calls[1][-4:] == ["-M", "other", "-j", "201"]
+    assert states["102"] == "running"
+    assert states["201.other"] == "running"
+
+
+def test_check_watched_items_bulk_chunks_job_ids():
+    job_states = [Bunch(job_id=str(i)) for i in range(slurm.SQUEUE_MAX_JOB_IDS + 1)]
+    with mock.patch.object(slurm.commands, "execute", return_value="") as execute:
+        _runner().check_watched_items_bulk(job_states)
+    assert execute.call_count == 2
+
+
+def test_check_watched_items_bulk_squeue_failure():
+    job_states = [Bunch(job_id="101")]
+    exception = commands.CommandLineException("squeue", "", "slurm_load_jobs error: Invalid job id specified", 1)
+    with mock.patch.object(slurm.commands, "execute", side_effect=exception):
+        assert _runner().check_watched_items_bulk(job_states) == {}
+
+
+def test_check_watched_items_bulk_squeue_timeout():
+    job_states = [Bunch(job_id=str(i)) for i in range(slurm.SQUEUE_MAX_JOB_IDS + 1)]
+    timeout = subprocess.TimeoutExpired("squeue", slurm.SQUEUE_TIMEOUT)
+    with mock.patch.object(slurm.commands, "execute", side_effect=timeout) as execute:
+        # jobs without a bulk state are checked individually
+        assert _runner().check_watched_items_bulk(job_states) == {}
+    assert execute.call_count == 1
+    assert execute.call_args.kwargs["timeout"] == slurm.SQUEUE_TIMEOUT
@@ -7,6 +7,7 @@ from sqlalchemy import (
     column,
     desc,
     false,
+    select,
     true,
 )
 
@@ -105,6 +106,53 @@ class TestHistoryAsContainer(HistoryAsContainerBaseTestCase):
         assert self.contents_manager.contents(history, limit=0) == []
         assert self.contents_manager.contents(history, offset=len(contents)) == []
 
+    def test_contents_after(self):
+        user2 = self.user_manager.create(**user2_data)
+        self.trans.set_user(user2)
+        history = self.history_manager.create(name="history", user=user2)
+        contents = []
+        contents.extend([self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(3)])
+        contents.append(self.add_list_collection_to_history(history, contents[:3]))
+        contents.extend([self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(4, 6)])
+        contents.append(self.add_list_collection_to_history(history, contents[4:6]))
+        # a dataset and a collection sharing a hid, as when contents are copied between histories
+        contents.append(self.add_hda_to_history(history, name="hda-6", hid=9))
+        contents.append(self.add_list_collection_to_history(history, contents[:1]))
+        contents[-1].hid = 9
+        session = self.app.model.context
+        with transaction(session):
+            session.commit()
+
+        def key(item):
+            return (item.hid, item.history_content_type, item.id)
+
+        def pages(descending, limit):
+            items: list = []
+            after = None
+            while True:
+                page = self.contents_manager.contents_after(history, after=after, descending=descending, limit=limit)
+                items.extend(page)
+                if len(page) < limit:
+                    return items
+                after = key(page[-1])
+
+        self.log("should page through contents ordered by hid, type and id")
+        ascending = sorted(contents, key=key)
+        assert [item.hid for item in ascending] == [1, 2, 3, 4, 5, 6, 7, 9, 9]
+        assert self.contents_manager.contents_after(history) == ascending
+        for limit in (1, 2, 3):
+            assert pages(descending=False, limit=limit) == ascending
+            assert pages(descending=True, limit=limit) == ascending[::-1]
+
+        self.log("should allow an offset from the key")
+        after = key(ascending[2])
+        assert self.contents_manager.contents_after(history, after=after, limit=2, offset=1) == ascending[4:6]
+
+        self.log("should apply filters to each page")
+        filters = [parsed_filter(filter_type="orm", filter=column("history_content_type") == "dataset_collection")]
+        hdcas = [item for item in ascending if item.history_content_type == "dataset_collection"]
+        assert self.contents_manager.contents_after(history, after=key(ascending[0]), filters=filters) == hdcas
+
     def test_orm_filtering(self):
         parse_filter = self.history_contents_filters.parse_filter
         user2 = self.user_manager.create(**user2_data)
@@ -300,6 +348,48 @@ class TestHistoryAsContainer(HistoryAsContainerBaseTestCase):
         filters = [parse_filter("deleted", "eq", "True"), parse_filter("visible", "eq", "False")]
         assert self.contents_manager.contents_count(history, filters=filters) == 1
 
+    def test_state_counts(self):
+        user2 = self.user_manager.create(**user2_data)
+        self.trans.set_user(user2)
+        history = self.history_manager.create(name="history", user=user2)
+        other_history = self.history_manager.create(name="other history", user=user2)
+        session = self.app.model.context
+
+        self.log("an empty history should have no counts")
+        assert self.contents_manager.state_counts(history) == {}
+        assert self.contents_manager.active_counts(history) == dict(deleted=None, hidden=None, active=None)
+
+        self.log("counts should follow contents as they are added and change state")
+        hdas = [self.add_hda_to_history(history, name=("hda-" + str(x))) for x in range(5)]
+        hdca = self.add_list_collection_to_history(history, hdas[:2])
+        for hda, state in zip(hdas, ["ok", "ok", "running", "error", "queued"]):
+            hda.dataset.state = state
+        hdca.collection.populated_state = "ok"
+        with transaction(session):
+            session.commit()
+        assert self.contents_manager.state_counts(history) == dict(ok=3, running=1, error=1, queued=1)
+        assert self.contents_manager.active_counts(history) == dict(deleted=0, hidden=0, active=6)
+
+        self.log("counts should follow contents as they are deleted, hidden and moved")
+        hdas[0].deleted = True
+        hdas[1].visible = False
+        hdas[2].dataset.state = "ok"
+        hdas[3].history = other_history
+        with transaction(session):
+            session.commit()
+        assert self.contents_manager.state_counts(history) == dict(ok=2, queued=1)
+        assert self.contents_manager.active_counts(history) == dict(deleted=1, hidden=1, active=3)
+        assert self.contents_manager.state_counts(other_history) == dict(error=1)
+
+        self.log("compacting the counts should merge the rows of each history and state")
+        model = self.app.model
+        model.HistoryStateCount.compact(model.session)
+        rows = session.execute(select(model.HistoryStateCount.state).filter_by(history_id=history.id)).scalars()
+        assert sorted(rows) == ["ok", "queued"]
+        assert self.contents_manager.state_counts(history) == dict(ok=2, queued=1)
+        assert self.contents_manager.active_counts(history) == dict(deleted=1, hidden=1, active=3)
+        assert self.contents_manager.state_counts(other_history) == dict(error=1)
+
     def test_type_id(self):
         user2 = self.user_manager.create(**user2_data)
         self.trans.set_user(user2)
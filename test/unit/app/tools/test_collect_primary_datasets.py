@@ -2,6 +2,8 @@ import json
 import os
 from typing import cast
 
+from sqlalchemy import event
+
 from galaxy import (
     model,
     util,
@@ -199,6 +201,52 @@ class TestCollectPrimaryDatasets(TestCase, tools_support.UsesTools):
         # cloned output.
         assert len(history_2.datasets) == 2
 
+    def test_collect_allocates_hids_once_per_output(self):
+        for i in range(5):
+            self._setup_extra_file(name=f"test{i}")
+        next_hid_calls = []
+        next_hid = model.History._next_hid
+
+        def counting_next_hid(history, n=1):
+            next_hid_calls.append(n)
+            return next_hid(history, n=n)
+
+        model.History._next_hid = counting_next_hid  # type: ignore[assignment]
+        try:
+            datasets = self._collect()
+        finally:
+            model.History._next_hid = next_hid  # type: ignore[assignment]
+        assert next_hid_calls == [5]
+        hids = [hda.hid for hda in datasets[DEFAULT_TOOL_OUTPUT].values()]
+        assert hids == list(range(hids[0], hids[0] + 5))
+
+    def test_collect_inserts_datasets_in_batches(self):
+        for i in range(10):
+            self._setup_extra_file(name=f"test{i}")
+        inserts = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                inserts.append(statement.split("(")[0].strip())
+
+        engine = self.app.model.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            datasets = self._collect()
+            session = self.app.model.context
+            with transaction(session):
+                session.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        assert len(datasets[DEFAULT_TOOL_OUTPUT]) == 10
+        assert sorted(inserts) == [
+            "INSERT INTO dataset",
+            "INSERT INTO history_dataset_association",
+            "INSERT INTO job_to_output_dataset",
+        ]
+        dataset_ids = [hda.dataset.id for hda in datasets[DEFAULT_TOOL_OUTPUT].values()]
+        assert dataset_ids == list(range(dataset_ids[0], dataset_ids[0] + 10))
+
     def test_dbkey_from_filename(self):
         self._setup_extra_file(dbkey="hg19")
         created_hda = self._collect_default_extra()
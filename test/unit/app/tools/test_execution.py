@@ -8,9 +8,14 @@ from sqlalchemy import select
 
 import galaxy.model
 from galaxy.app_unittest_utils import tools_support
+from galaxy.exceptions import MessageException
 from galaxy.managers.collections import DatasetCollectionManager
 from galaxy.model.base import transaction
 from galaxy.model.orm.util import add_object_to_object_session
+from galaxy.tools.execute import (
+    execute,
+    MappingParameters,
+)
 from galaxy.util.bunch import Bunch
 from galaxy.util.unittest import TestCase
 
@@ -118,6 +123,47 @@ class TestToolExecution(TestCase, tools_support.UsesTools):
         state = self.__assert_rerenders_tool_without_errors(vars)
         assert hda == state["param1"]
 
+    def test_execute_in_batches(self):
+        self._init_tool(tools_support.SIMPLE_TOOL_CONTENTS)
+        self.app.config.flush_per_n_jobs = 2
+        self.tool_action.add_jobs_to_session = True
+        job_manager = MockJobManager(self.trans.sa_session)
+        self.app.job_manager = job_manager
+        execution_tracker = self.__execute_batch(5)
+        assert len(execution_tracker.successful_jobs) == 5
+        # jobs are only queued once all of them were created, every one of them was committed by then
+        assert job_manager.enqueued == [job.id for job in execution_tracker.successful_jobs]
+        assert all(persisted for _, persisted in job_manager.persisted)
+
+    def test_execute_in_batches_exception(self):
+        self._init_tool(tools_support.SIMPLE_TOOL_CONTENTS)
+        self.app.config.flush_per_n_jobs = 2
+        self.tool_action.add_jobs_to_session = True
+        self.tool_action.raise_message_exception(after_execution=3)
+        job_manager = MockJobManager(self.trans.sa_session)
+        self.app.job_manager = job_manager
+        message_exception_raised = False
+        try:
+            self.__execute_batch(5)
+        except MessageException:
+            message_exception_raised = True
+        assert message_exception_raised
+        # the jobs of the first batch were committed, but must neither be queued nor left waiting
+        assert job_manager.enqueued == []
+        jobs = self.trans.sa_session.scalars(select(galaxy.model.Job)).all()
+        assert len(jobs) == 3
+        assert all(job.state == galaxy.model.Job.states.DELETED for job in jobs)
+
+    def __execute_batch(self, count):
+        param_combinations = [{"param1": str(i)} for i in range(count)]
+        return execute(
+            self.trans,
+            self.tool,
+            MappingParameters({}, param_combinations),
+            self.history,
+            completed_jobs={i: None for i in range(count)},
+        )
+
     def __handle_with_incoming(self, **kwds):
         """Execute tool.handle_input with incoming specified by kwds
         (optionally extending a previous state).
@@ -169,6 +215,8 @@ class MockAction(tools_support.MockActionI):
         self.expect_redirect = False
         self.exception_after_exection = None
         self.error_message_after_excution = None
+        self.message_exception_after_execution = None
+        self.add_jobs_to_session = False
 
     def execute(self, tool, trans, **kwds):
         assert self.expected_trans == trans
@@ -182,8 +230,16 @@ class MockAction(tools_support.MockActionI):
         if self.error_message_after_excution is not None:
             if num_calls > self.error_message_after_excution:
                 return None, "Test Error Message"
+        if self.message_exception_after_execution is not None:
+            if num_calls > self.message_exception_after_execution:
+                raise MessageException("Test Message Exception")
 
-        return galaxy.model.Job(), OrderedDict(out1="1")
+        job = galaxy.model.Job()
+        if self.add_jobs_to_session:
+            job.tool_id = tool.id
+            job.state = galaxy.model.Job.states.NEW
+            trans.sa_session.add(job)
+        return job, OrderedDict(out1="1")
 
     def raise_exception(self, after_execution=0):
         self.exception_after_exection = after_execution
@@ -191,6 +247,20 @@ class MockAction(tools_support.MockActionI):
     def return_error(self, after_execution=0):
         self.error_message_after_excution = after_execution
 
+    def raise_message_exception(self, after_execution=0):
+        self.message_exception_after_execution = after_execution
+
+
+class MockJobManager:
+    def __init__(self, sa_session):
+        self.sa_session = sa_session
+        self.enqueued = []
+        self.persisted = []
+
+    def enqueue(self, job, tool=None, flush=True):
+        self.enqueued.append(job.id)
+        self.persisted.append((job.id, job in self.sa_session and job not in self.sa_session.new))
+
 
 class MockTrans:
     def __init__(self, app, history):
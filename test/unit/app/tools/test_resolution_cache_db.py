@@ -16,7 +16,7 @@ from galaxy.tool_util.deps.mulled.util import (
     _namespace_has_repo_name,
     mulled_tags_for,
     NAMESPACE_HAS_REPO_NAME_KEY,
-    TAG_CACHE_KEY,
+    tag_cache_key,
 )
 
 cache_namespace = "mulled_resolution"
@@ -63,6 +63,6 @@ def test_resolution_cache_expires(resolution_cache):
 def test_targets_to_mulled_name(resolution_cache):
     resolution_cache.mulled_resolution_cache[NAMESPACE_HAS_REPO_NAME_KEY] = ["mytool3000"]
     cache = resolution_cache.mulled_resolution_cache._get_cache("mulled_tag_cache", {"expire": 1})
-    cache[TAG_CACHE_KEY] = {"bioconda": {"mytool3000": ["1.0", "1.1"]}}
+    cache[tag_cache_key("bioconda", "mytool3000")] = ["1.0", "1.1"]
     tags = mulled_tags_for(namespace="bioconda", image="mytool3000", resolution_cache=resolution_cache)
     assert tags == ["1.1", "1.0"]
@@ -1,10 +1,16 @@
+import os
 from unittest.mock import Mock
 
 import pytest
 
 from galaxy import model
 from galaxy.model.base import transaction
+from galaxy.tool_util.data import (
+    TabularToolDataTable,
+    ToolDataPathFiles,
+)
 from galaxy.tools.parameters import basic
+from galaxy.util import XML
 from .util import BaseParameterTestCase
 
 
@@ -53,6 +59,27 @@ class TestSelectToolParameter(BaseParameterTestCase):
         assert ("testname2", "testpath2", False) in self.param.get_options(self.trans, {"input_bam": "testpath2"})
         assert len(self.param.get_options(self.trans, {"input_bam": "testpath3"})) == 0
 
+    def test_filter_tabular_tool_data_table(self):
+        loc_path = os.path.join(self.test_directory, "test_table.loc")
+        with open(loc_path, "w") as fh:
+            fh.write("testname1\ttestpath1\thg19\ntestname2\ttestpath2\thg38\ntestname3\ttestpath3\thg19\n")
+        table_elem = XML(
+            f"""<table name="test_table"><columns>name, value, dbkey</columns><file path="{loc_path}" /></table>"""
+        )
+        self.app.tool_data_tables["test_table"] = TabularToolDataTable(
+            table_elem, self.test_directory, ToolDataPathFiles(self.test_directory)
+        )
+        self.options_xml = """<options from_data_table="test_table">
+            <filter type="param_value" ref="input_bam" column="dbkey" />
+            <filter type="static_value" value="testpath1" column="value" keep="false" />
+        </options>"""
+        assert self.param.get_options(self.trans, {"input_bam": "hg19"}) == [("testname3", "testpath3", False)]
+        assert self.param.get_options(self.trans, {"input_bam": "hg18"}) == []
+        assert self.param.options.get_field_by_name_for_value("dbkey", "testpath2", self.trans, {}) == []
+        self._param = None
+        self.options_xml = """<options from_data_table="test_table" />"""
+        assert self.param.options.get_field_by_name_for_value("dbkey", "testpath2", self.trans, {}) == ["hg38"]
+
     # TODO: Good deal of overlap here with TestDataToolParameter, refactor.
     def setUp(self):
         super().setUp()
@@ -1,17 +1,28 @@
+import json
 import logging
+import os
 import time
+from unittest import mock
 
 import pytest
 import routes
 
 from galaxy import model
-from galaxy.app_unittest_utils.toolbox_support import BaseToolBoxTestCase
+from galaxy.app_unittest_utils.toolbox_support import (
+    BaseToolBoxTestCase,
+    reload_callback,
+)
 from galaxy.model.base import transaction
 from galaxy.tool_util.unittest_utils import mock_trans
 from galaxy.tool_util.unittest_utils.sample_data import (
     SIMPLE_MACRO,
     SIMPLE_TOOL_WITH_MACRO,
 )
+from galaxy.tools import (
+    LazyTool,
+    Tool,
+)
+from galaxy.tools.cache import ToolCache
 
 log = logging.getLogger(__name__)
 
@@ -25,6 +36,46 @@ class TestToolBox(BaseToolBoxTestCase):
         assert toolbox.get_tool("test_tool") is not None
         assert toolbox.get_tool("not_a_test_tool") is None
 
+    def test_lazy_load_tools(self):
+        self.app.config.enable_tool_document_cache = True
+        self.app.config.lazy_load_tools = True
+        self.app.config.lazy_load_tools_max_resident = 1
+        self.__init_versioned_tools()
+        cache_dir = os.path.join(self.test_directory, "tool_cache")
+        self._add_config(
+            f"""<toolbox tool_cache_data_dir="{cache_dir}"><tool file="tool_v01.xml" /><tool file="tool_v02.xml" /></toolbox>"""
+        )
+        tool_v01 = self.toolbox.get_tool("test_tool", tool_version="0.1")
+        tool_v02 = self.toolbox.get_tool("test_tool", tool_version="0.2")
+        assert isinstance(tool_v01, LazyTool)
+        assert tool_v02.materialized
+        assert not tool_v01.materialized
+        assert "param1" in tool_v01.inputs
+        assert tool_v01.materialized
+        assert not tool_v02.materialized
+        self.toolbox.persist_cache()
+
+        # A new toolbox is built from the cached summaries without parsing any tool.
+        self.app.tool_cache = ToolCache()
+        self.app.toolbox = self._toolbox = None
+        with mock.patch.object(Tool, "parse", side_effect=AssertionError("tool parsed")):
+            tool = self.toolbox.get_tool("test_tool")
+            assert tool.version == "0.2"
+            assert "test_tool/0.1" in tool.lineage.get_version_ids()
+            assert self.toolbox._tool_panel["tool_test_tool"] is tool
+            tool.tool_errors = "Current on-disk tool is not valid"
+            assert tool.to_dict(mock_trans())["form_style"] == "regular"
+        assert not tool.materialized
+        assert "param1" in tool.inputs
+        assert tool.materialize().tool_errors == "Current on-disk tool is not valid"
+        # the previous toolbox is referenced by its tools, they are not kept by the toolbox replacing it on reload
+        assert len(self.toolbox.materialized_tools) == 1
+        previous_materialized_tools = self.toolbox.materialized_tools
+        self.app.toolbox = self.toolbox
+        reload_callback(self)
+        assert self.toolbox.materialized_tools is not previous_materialized_tools
+        assert len(self.toolbox.materialized_tools) == 0
+
     def test_record_macros(self):
         self._init_tool()
         self._init_tool(
@@ -140,6 +191,21 @@ class TestToolBox(BaseToolBoxTestCase):
             as_dict = self.toolbox.to_dict(mock_trans(), in_panel=False)
             assert as_dict[0]["id"] == "test_tool"
 
+    def test_panel_json_cache(self):
+        self._init_tool_in_section()
+        panel_json, etag = self.toolbox.panel_json(mock_trans())
+        test_section = self._find_section(json.loads(panel_json), "t")
+        assert test_section["elems"][0]["id"] == "test_tool"
+        with mock.patch.object(self.toolbox, "to_dict", side_effect=AssertionError("panel serialized again")):
+            assert self.toolbox.panel_json(mock_trans()) == (panel_json, etag)
+        # Admins see tool config file paths.
+        assert self.toolbox.panel_json(mock_trans(is_admin=True))[1] != etag
+        self.toolbox.remove_tool_by_id("test_tool")
+        with mock.patch.object(self.toolbox, "to_dict", return_value=[]):
+            panel_json, new_etag = self.toolbox.panel_json(mock_trans())
+        assert panel_json == "[]"
+        assert new_etag != etag
+
     def test_out_of_panel_filtering(self):
         self._init_tool_in_section()
 
@@ -222,6 +222,17 @@ def test_dataset_wrapper_false_path():
     assert wrapper.file_name == new_path
 
 
+def test_dataset_wrapper_false_path_lazy():
+    dataset = cast(DatasetInstance, MockDataset())
+    compute_environment = MockComputeEnvironment(false_path="/new/path/dataset_123.dat")
+    compute_environment.input_path_rewrite = Mock(return_value=compute_environment.false_path)  # type: ignore[method-assign]
+    wrapper = DatasetFilenameWrapper(dataset, compute_environment=cast(ComputeEnvironment, compute_environment))
+    assert wrapper.ext == MOCK_DATASET_EXT
+    compute_environment.input_path_rewrite.assert_not_called()
+    assert str(wrapper) == str(wrapper) == "/new/path/dataset_123.dat"
+    compute_environment.input_path_rewrite.assert_called_once_with(dataset)
+
+
 class MockComputeEnvironment:
     def __init__(self, false_path, false_extra_files_path=None):
         self.false_path = false_path
@@ -114,3 +114,39 @@ def test_sniff_compressed_dynamic_datatypes_default_off():
     assert "fastq" not in sniff.guess_ext(fname, sniff_order)
     fname = sniff.get_test_fname("1.fastqsanger.bz2")
     assert "fastq" not in sniff.guess_ext(fname, sniff_order)
+
+
+def test_sniff_index_matches_sniff_order():
+    datatypes_registry = example_datatype_registry_for_sample()
+    sniff_index = datatypes_registry.sniff_index
+    assert sniff_index is datatypes_registry.sniff_index
+    for test_file in [
+        "1.sff",
+        "1.mtx",
+        "1.phyloxml",
+        "1.xmfa",
+        "Acanium.snaphmm",
+        "infernal_model.cm",
+        "example.iqtree",
+        "test.prj",
+        "megablast_xml_parser_test1.blastxml",
+        "brukerbaf.d.tar",
+        "some.wiff.tar",
+        "test.fast5.tar.gz",
+        "1.fastqsanger.gz",
+        "vcf_gzipped.vcf.gz",
+        "1.bam",
+        "1.sam",
+        "sequence.fasta",
+        "1.bed",
+        "2.txt",
+    ]:
+        file_prefix = sniff.FilePrefix(sniff.get_test_fname(test_file))
+        expected = sniff.guess_ext(file_prefix, datatypes_registry.sniff_order)
+        assert sniff.guess_ext(file_prefix, sniff_index) == expected, test_file
+        # signatures and tar checks narrow the sniffers that run
+        assert len(list(sniff_index.candidates(file_prefix))) < len(sniff_index)
+
+    # the index is rebuilt when the sniff order changes
+    datatypes_registry.sniff_order.pop()
+    assert datatypes_registry.sniff_index is not sniff_index
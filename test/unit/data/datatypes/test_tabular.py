@@ -1,9 +1,14 @@
 import tempfile
+import time
 
 from galaxy.datatypes.tabular import (
     MAX_DATA_LINES,
     Tabular,
 )
+from galaxy.datatypes.util.column_types import (
+    DEFAULT_BATCH_SIZE,
+    guess_values_type,
+)
 from .util import MockDataset
 
 
@@ -15,3 +20,37 @@ def test_tabular_set_meta_large_file():
         dataset = MockDataset(id=1)
         dataset.set_file_name(test_file.name)
         Tabular().set_meta(dataset)  # type: ignore [arg-type]
+
+
+def test_tabular_set_meta_column_types_across_batches():
+    with tempfile.NamedTemporaryFile(mode="w") as test_file:
+        test_file.write("#comment\n")
+        for i in range(DEFAULT_BATCH_SIZE * 2):
+            test_file.write(f"{i}\t{i}\tchr{i}\n")
+        # a float and an extra list column only show up in the last batch
+        test_file.write("1\t2.5\tchrX\t1,2\n")
+        test_file.flush()
+        dataset = MockDataset(id=1)
+        dataset.set_file_name(test_file.name)
+        Tabular().set_meta(dataset)  # type: ignore [arg-type]
+        assert dataset.metadata.column_types == ["int", "float", "str", "list"]
+        assert dataset.metadata.columns == 4
+        assert dataset.metadata.comment_lines == 1
+        assert dataset.metadata.data_lines == DEFAULT_BATCH_SIZE * 2 + 1
+
+
+def test_tabular_set_meta_int_column_with_non_numeric_value():
+    # a regular expression that backtracks catastrophically takes about 20 seconds per call for 10 values
+    start = time.perf_counter()
+    assert guess_values_type([str(123456 + i) for i in range(10)] + ["abc"]) == "str"
+    assert guess_values_type([str(123456 + i) for i in range(10)] + ["1.5e3"]) == "float"
+    with tempfile.NamedTemporaryFile(mode="w") as test_file:
+        for i in range(10):
+            test_file.write(f"{123456 + i}\tchr{i}\n")
+        test_file.write(".\tchrX\n")
+        test_file.flush()
+        dataset = MockDataset(id=1)
+        dataset.set_file_name(test_file.name)
+        Tabular().set_meta(dataset)  # type: ignore [arg-type]
+        assert dataset.metadata.column_types == ["str", "str"]
+    assert time.perf_counter() - start < 2
@@ -1,12 +1,17 @@
 import os
+import shutil
 from tempfile import mkdtemp
 
 from sqlalchemy import select
 
 from galaxy import model
+from galaxy.datatypes.sniff import get_test_fname
 from galaxy.model import store
 from galaxy.model.base import transaction
-from galaxy.model.store.discover import persist_target_to_export_store
+from galaxy.model.store.discover import (
+    persist_target_to_export_store,
+    SessionlessModelPersistenceContext,
+)
 from galaxy.model.unittest_utils import GalaxyDataTestApp
 
 
@@ -51,6 +56,38 @@ def test_model_create_context_persist_hdas():
         assert f.read().startswith("hello world\n")
 
 
+def test_model_create_context_persist_hdas_metadata_processes(monkeypatch):
+    monkeypatch.setattr(SessionlessModelPersistenceContext, "metadata_processes", 2)
+    work_directory = mkdtemp()
+    with open(os.path.join(work_directory, "file1.tabular"), "w") as f:
+        f.write("chr1\t1\t2\nchr2\t3\t4.5\n")
+    with open(os.path.join(work_directory, "file2.tabular"), "w") as f:
+        f.write("1\ta\n")
+    shutil.copy(get_test_fname("1.bam"), work_directory)
+    target = {
+        "destination": {
+            "type": "hdas",
+        },
+        "elements": [
+            {"filename": "file1.tabular", "ext": "tabular", "name": "file 1"},
+            {"filename": "file2.tabular", "ext": "tabular", "name": "file 2"},
+            {"filename": "1.bam", "ext": "bam", "name": "bam"},
+        ],
+    }
+    app = _mock_app()
+    with store.DirectoryModelExportStore(mkdtemp(), serialize_dataset_objects=True) as export_store:
+        persist_target_to_export_store(target, export_store, app.object_store, work_directory)
+        hdas = {hda.name: hda for hda in export_store.included_datasets}
+
+    assert hdas["file 1"].metadata.column_types == ["str", "int", "float"]
+    assert hdas["file 1"].metadata.data_lines == 2
+    assert hdas["file 2"].metadata.column_types == ["int", "str"]
+    assert hdas["file 2"].metadata.data_lines == 1
+    bam = hdas["bam"]
+    assert bam.metadata.sort_order == "coordinate"
+    assert os.path.getsize(bam.metadata.bam_index.get_file_name()) > 0
+
+
 def test_model_create_context_persist_error_hda():
     work_directory = mkdtemp()
     with open(os.path.join(work_directory, "file1.txt"), "w") as f:
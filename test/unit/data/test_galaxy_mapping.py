@@ -15,8 +15,18 @@ import galaxy.datatypes.registry
 import galaxy.model
 import galaxy.model.mapping as mapping
 from galaxy import model
-from galaxy.model.base import transaction
+from galaxy.model.base import (
+    preallocate_ids,
+    transaction,
+)
 from galaxy.model.database_utils import create_database
+from galaxy.model.dataset_collections.structure import (
+    get_structure,
+    load_element_levels,
+    Tree,
+)
+from galaxy.model.dataset_collections.subcollections import split_dataset_collection_instance
+from galaxy.model.dataset_collections.type_description import COLLECTION_TYPE_DESCRIPTION_FACTORY
 from galaxy.model.metadata import MetadataTempFile
 from galaxy.model.orm.util import (
     add_object_to_object_session,
@@ -307,6 +317,84 @@ class TestMappings(BaseModelTestCase):
         assert all(d.name == f"forward_{i}" for i, d in enumerate(forward_hdas))
         assert all(d.name == f"reverse_{i}" for i, d in enumerate(reverse_hdas))
 
+    def test_collection_structure_from_element_levels(self):
+        u = model.User(email="mary@example.com", password="password")
+        h1 = model.History(name="History 1", user=u)
+        to_persist = [u, h1]
+
+        def list_paired(prefix):
+            list_pair = model.DatasetCollection(collection_type="list:paired")
+            for i in range(5):
+                pair = model.DatasetCollection(collection_type="paired")
+                for index, identifier in enumerate(["forward", "reverse"]):
+                    hda = model.HistoryDatasetAssociation(
+                        extension="txt", history=h1, name=f"{prefix}_{identifier}_{i}", sa_session=self.model.session
+                    )
+                    to_persist.extend(
+                        [
+                            hda,
+                            model.DatasetCollectionElement(
+                                collection=pair, element=hda, element_identifier=identifier, element_index=index
+                            ),
+                        ]
+                    )
+                # persisted out of order to check elements are sorted by their index
+                to_persist.append(
+                    model.DatasetCollectionElement(
+                        collection=list_pair, element=pair, element_identifier=f"sample_{4 - i}", element_index=4 - i
+                    )
+                )
+            return model.HistoryDatasetCollectionAssociation(history=h1, collection=list_pair)
+
+        hdca1 = list_paired("a")
+        hdca2 = list_paired("b")
+        self.persist(*to_persist, hdca1, hdca2)
+
+        levels = load_element_levels(hdca1.collection, 2)
+        assert levels
+        assert [e.element_identifier for e in levels[0].elements] == [f"sample_{i}" for i in range(5)]
+        assert levels[0].offsets == [0, 5]
+        assert levels[1].offsets == [0, 2, 4, 6, 8, 10]
+        assert [e.element_identifier for e in levels[1].elements] == ["forward", "reverse"] * 5
+
+        type_description = COLLECTION_TYPE_DESCRIPTION_FACTORY.for_collection_type("list:paired")
+        tree = get_structure(hdca1, type_description)
+        assert tree.can_match(get_structure(hdca2, type_description))
+        assert [identifier for identifier, _ in tree.children] == [f"sample_{i}" for i in range(5)]
+        assert all(len(child.children) == 2 for _, child in tree.children)
+
+        walked = list(tree.walk_collections({"a": hdca1, "b": hdca2}))
+        assert len(walked) == 10
+        for i, (elements, when_value) in enumerate(walked):
+            assert when_value is None
+            identifier = ["forward", "reverse"][i % 2]
+            sample = 4 - i // 2
+            assert elements["a"].element_object.name == f"a_{identifier}_{sample}"
+            assert elements["b"].element_object.name == f"b_{identifier}_{sample}"
+
+        split = split_dataset_collection_instance(hdca1, "paired")
+        assert [e.element_identifier for e in split] == [f"sample_{i}" for i in range(5)]
+
+        # once the elements are loaded, walking them is cheaper than querying them again
+        assert len(hdca1.collection.elements) == 5
+        assert load_element_levels(hdca1.collection, 2) is None
+        assert [identifier for identifier, _ in get_structure(hdca1, type_description).children] == [
+            f"sample_{i}" for i in range(5)
+        ]
+
+        # elements that are not flushed yet are found by walking the objects
+        transient = model.DatasetCollection(collection_type="list")
+        self.persist(transient)
+        hda = model.HistoryDatasetAssociation(extension="txt", history=h1, sa_session=self.model.session)
+        model.DatasetCollectionElement(collection=transient, element=hda, element_identifier="new", element_index=0)
+        self.model.session.add(hda)
+        assert load_element_levels(transient, 1) is None
+        list_description = COLLECTION_TYPE_DESCRIPTION_FACTORY.for_collection_type("list")
+        assert [identifier for identifier, _ in Tree.for_dataset_collection(transient, list_description).children] == [
+            "new"
+        ]
+        self.model.session.rollback()
+
     def test_collections_in_histories(self):
         u = model.User(email="mary@example.com", password="password")
         h1 = model.History(name="History 1", user=u)
@@ -733,6 +821,27 @@ class TestMappings(BaseModelTestCase):
         self.persist(user, new_galaxy_session)
         assert user.current_galaxy_session == new_galaxy_session
 
+    def test_preallocate_ids(self):
+        session = self.session()
+        existing = self.persist(model.Dataset())
+        first = [model.Dataset() for _ in range(3)]
+        session.add_all(first)
+        preallocate_ids(session, [model.Dataset])
+        first_ids = [dataset.id for dataset in first]
+        assert first_ids == sorted(first_ids)
+        assert first_ids[0] > existing.id
+        # ids assigned but not yet flushed are not handed out again
+        second = [model.Dataset() for _ in range(2)]
+        session.add_all(second)
+        preallocate_ids(session, [model.Dataset])
+        assert min(dataset.id for dataset in second) > max(first_ids)
+        unassigned = model.HistoryDatasetAssociation(dataset=first[0], create_dataset=False, sa_session=session)
+        session.add(unassigned)
+        session.commit()
+        assert unassigned.id is not None
+        for dataset in first + second:
+            assert session.get(model.Dataset, dataset.id) is dataset
+
     def test_flush_refreshes(self):
         # Normally I don't believe in unit testing library code, but the behaviors around attribute
         # states and flushing in SQL Alchemy is very subtle and it is good to have a executable
@@ -1,4 +1,7 @@
 import uuid
+from unittest.mock import patch
+
+from sqlalchemy import select
 
 from galaxy import model
 from galaxy.objectstore import (
@@ -284,6 +287,91 @@ class TestCalculateUsage(BaseModelTestCase):
         assert usages[1].quota_source_label == "alt_source"
         assert usages[1].total_disk_usage == 15
 
+    def test_calculate_usage_reconciles_ledger(self):
+        model = self.model
+        u = self.u
+
+        self._add_dataset(10)
+        u.adjust_total_disk_usage(10, None)
+        u.adjust_total_disk_usage(7, "alt_source")
+        self.persist(u)
+        assert u.id in model.UserDiskUsageLedger.user_ids(model.session)
+
+        u.calculate_and_set_disk_usage(MockObjectStore())
+        assert u.id not in model.UserDiskUsageLedger.user_ids(model.session)
+        self._refresh_user_and_assert_disk_usage_is(10)
+
+    def test_adjust_usage_without_reconciliation_skips_ledger(self):
+        model = self.model
+        u = self.u
+
+        with patch.object(model.User, "record_disk_usage_changes", False):
+            u.adjust_total_disk_usage(10, None)
+            u.adjust_total_disk_usage(7, "alt_source")
+            self.persist(u)
+        assert u.id not in model.UserDiskUsageLedger.user_ids(model.session)
+        self._refresh_user_and_assert_disk_usage_is(10)
+
+    def test_calculate_usage_keeps_changes_recorded_during_calculation(self):
+        model = self.model
+        u = self.u
+
+        self._add_dataset(10)
+        self._add_dataset(15, "alt_source_store")
+        quota_source_map = QuotaSourceMap()
+        alt_source = QuotaSourceMap()
+        alt_source.default_quota_source = "alt_source"
+        quota_source_map.backends["alt_source_store"] = alt_source
+
+        calculate_disk_usage = u._calculate_disk_usage
+
+        def calculate_while_adding_datasets(quota_source_map, connection):
+            usages = calculate_disk_usage(quota_source_map, connection)
+            # another job finishes while the usage is calculated
+            u.adjust_total_disk_usage(5, None)
+            u.adjust_total_disk_usage(3, "alt_source")
+            model.session.flush()
+            return usages
+
+        u._calculate_disk_usage = calculate_while_adding_datasets  # type: ignore[assignment]
+        u.calculate_and_set_disk_usage(MockObjectStore(quota_source_map))
+        del u._calculate_disk_usage
+        model.context.refresh(u)
+        usages = u.dictify_usage()
+        assert usages[0].total_disk_usage == 15
+        assert usages[1].quota_source_label == "alt_source"
+        assert usages[1].total_disk_usage == 18
+        # changes not covered by the calculation stay in the ledger for the next reconciliation
+        assert u.id in model.UserDiskUsageLedger.user_ids(model.session)
+
+        u.calculate_and_set_disk_usage(MockObjectStore(quota_source_map))
+        assert u.id not in model.UserDiskUsageLedger.user_ids(model.session)
+        self._refresh_user_and_assert_disk_usage_is(10)
+
+    def test_calculate_usage_keeps_changes_committed_out_of_id_order(self):
+        model = self.model
+        u = self.u
+
+        self._add_dataset(10)
+        self.persist(model.UserDiskUsageLedger(id=5, user_id=u.id, amount=10))
+
+        calculate_disk_usage = u._calculate_disk_usage
+
+        def calculate_while_committing_late_entry(quota_source_map, connection):
+            usages = calculate_disk_usage(quota_source_map, connection)
+            # a change whose ledger entry id was assigned before the last entry's, but committed after the snapshot
+            u.disk_usage = u.table.c.disk_usage + 3
+            model.session.add(model.UserDiskUsageLedger(id=2, user_id=u.id, amount=3))
+            model.session.flush()
+            return usages
+
+        u._calculate_disk_usage = calculate_while_committing_late_entry  # type: ignore[assignment]
+        u.calculate_and_set_disk_usage(MockObjectStore())
+        del u._calculate_disk_usage
+        self._refresh_user_and_assert_disk_usage_is(13)
+        ledger_entry_ids = select(model.UserDiskUsageLedger.id).where(model.UserDiskUsageLedger.user_id == u.id)
+        assert model.session.scalars(ledger_entry_ids).all() == [2]
+
     def _refresh_user_and_assert_disk_usage_is(self, usage):
         u = self.u
         self.model.context.refresh(u)
@@ -0,0 +1,60 @@
+from galaxy.job_metrics.instrumenters.cgroup_sampling import (
+    CgroupSamplingPlugin,
+    summarize_samples,
+)
+
+SAMPLES_EXAMPLE = """#galaxy_slots 2
+1700000000 104857600 1000000 0 0
+1700000010 209715200 21000000 4096 8192
+1700000020 419430400 41000000 8192 16384
+1700000030 419430400 41100000 8192 16384
+1700000040 NA 61000000 NA NA
+1700000050 104857600 61100000 12288 65536
+1700000051 1048576
+"""
+
+
+def test_cgroup_sampling_collection(tmpdir):
+    plugin = CgroupSamplingPlugin()
+    job_dir = tmpdir.mkdir("job")
+    job_dir.join("__instrument_cgroup_sampling_samples").write(SAMPLES_EXAMPLE)
+    properties = plugin.job_properties(1, job_dir)
+    assert properties["samples"] == 6
+    assert properties["sampled_seconds"] == 50
+    assert properties["memory_p50"] == 209715200
+    assert properties["memory_p95"] == 419430400
+    assert properties["memory_max"] == 419430400
+    # 60.1 cpu seconds in 50 seconds on 2 allocated cores
+    assert properties["cpu_efficiency"] == 60.1
+    assert properties["idle_seconds"] == 20
+    assert properties["io_read_bytes"] == 12288
+    assert properties["io_write_bytes"] == 65536
+
+
+def test_cgroup_sampling_without_samples(tmpdir):
+    plugin = CgroupSamplingPlugin()
+    assert plugin.job_properties(1, tmpdir) == {}
+    assert summarize_samples([]) == {"samples": 0}
+    # a single sample has no cpu usage rate
+    properties = summarize_samples([(1700000000, 1024, 1000, None, None)])
+    assert properties["memory_max"] == 1024
+    assert "cpu_efficiency" not in properties
+    assert "io_read_bytes" not in properties
+
+
+def test_cgroup_sampling_formatting():
+    formatter = CgroupSamplingPlugin.formatter
+    assert formatter.format("memory_p95", 419430400) == ("95th percentile memory usage", "400.0 MB")
+    assert formatter.format("cpu_efficiency", 60) == ("CPU efficiency (of allocated cores)", "60.0%")
+    assert formatter.format("idle_seconds", 20) == ("Idle time", "20 seconds")
+
+
+def test_cgroup_sampling_instrumentation(tmpdir):
+    mock_cgroup_mount = "/proc/sys/made/up/cgroup/mount"
+    plugin = CgroupSamplingPlugin(cgroup_mount=mock_cgroup_mount, version="2", interval=30)
+    setup_commands = plugin.pre_execute_instrument(tmpdir)
+    assert len(setup_commands) == 2
+    assert mock_cgroup_mount in setup_commands[0]
+    assert "sleep 30" in setup_commands[1]
+    teardown_commands = plugin.post_execute_instrument(tmpdir)
+    assert len(teardown_commands) == 1
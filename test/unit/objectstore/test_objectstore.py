@@ -1,24 +1,38 @@
 import os
+import threading
 import time
 from tempfile import (
     mkdtemp,
     mkstemp,
 )
-from unittest.mock import patch
+from unittest.mock import (
+    call,
+    Mock,
+    patch,
+)
 from uuid import uuid4
 
 import pytest
 
 from galaxy.exceptions import ObjectInvalid
+from galaxy.model import Dataset
 from galaxy.objectstore.azure_blob import AzureBlobObjectStore
 from galaxy.objectstore.caching import (
+    CacheIndex,
     CacheTarget,
     check_cache,
+    EVICTION_POLICY_LFU,
     InProcessCacheMonitor,
+    ObjectStoreCache,
+    ObjectStoreMetadataCache,
+    SingleFlight,
 )
 from galaxy.objectstore.cloud import Cloud
 from galaxy.objectstore.pithos import PithosObjectStore
-from galaxy.objectstore.s3 import S3ObjectStore
+from galaxy.objectstore.s3 import (
+    md5_from_etag,
+    S3ObjectStore,
+)
 from galaxy.objectstore.unittest_utils import (
     Config as TestConfig,
     DISK_TEST_CONFIG,
@@ -28,6 +42,7 @@ from galaxy.util import (
     directory_hash_id,
     unlink,
 )
+from galaxy.util.bunch import Bunch
 
 
 # Unit testing the cloud and advanced infrastructure object stores is difficult, but
@@ -91,6 +106,13 @@ def test_disk_store():
             data = object_store.get_data(hello_world_dataset, start=1, count=6)
             assert data == "ello W"
 
+            # Test get_data_range
+            assert bytes(object_store.get_data_range(hello_world_dataset)) == b"Hello World!"
+            assert bytes(object_store.get_data_range(hello_world_dataset, start=1, count=6)) == b"ello W"
+            assert bytes(object_store.get_data_range(hello_world_dataset, start=6, count=100)) == b"World!"
+            assert bytes(object_store.get_data_range(hello_world_dataset, start=100, count=5)) == b""
+            assert bytes(object_store.get_data_range(empty_dataset, count=5)) == b""
+
             # Test Size
 
             # Test absent and empty datasets yield size of 0.
@@ -121,6 +143,62 @@ def test_disk_store():
             assert not os.path.exists(to_delete_real_path)
 
 
+def test_disk_store_metadata_cache():
+    with TestConfig(DISK_TEST_CONFIG_YAML) as (directory, object_store):
+        object_store.enable_metadata_cache(60)
+        metadata_cache = object_store.metadata_cache
+        dataset = MockDataset(3)
+        assert not object_store.exists(dataset)
+        assert not object_store.exists(dataset)
+        # negative results are not cached
+        assert metadata_cache.hits == 0
+        directory.write("Hello World!", "files1/000/dataset_3.dat")
+        assert object_store.exists(dataset)
+        assert object_store.size(dataset) == 12
+        with patch.object(object_store, "_exists", side_effect=AssertionError):
+            assert object_store.exists(dataset)
+        assert object_store.size(dataset) == 12
+        assert metadata_cache.hits == 2
+
+        # writing through the object store invalidates the cached results
+        new_contents = directory.write("Hello Galaxy World!", "job_working_directory1/example_output")
+        object_store.update_from_file(dataset, file_name=new_contents)
+        assert object_store.size(dataset) == 19
+        object_store.delete(dataset)
+        assert not object_store.exists(dataset)
+        assert metadata_cache.to_dict()["invalidations"] == 2
+
+
+def test_disk_store_metadata_cache_skips_unfinished_datasets():
+    with TestConfig(DISK_TEST_CONFIG_YAML) as (directory, object_store):
+        object_store.enable_metadata_cache(60)
+        dataset = Dataset(id=4, state=Dataset.states.RUNNING)
+        # the tool writes its output directly into the object store's files
+        directory.write("Hello", "files1/000/dataset_4.dat")
+        with patch.object(Dataset, "object_store", object_store):
+            assert dataset.get_size() == 5
+            directory.write("Hello World!", "files1/000/dataset_4.dat")
+            dataset.state = Dataset.states.OK
+            dataset.set_size()
+            assert dataset.file_size == 12
+        assert object_store.metadata_cache.hits == 0
+
+
+def test_metadata_cache_statsd():
+    statsd_client = Mock()
+    metadata_cache = ObjectStoreMetadataCache(60, statsd_client=statsd_client)
+    dataset = MockDataset(3)
+    assert metadata_cache.get_or_call("size", dataset, {}, lambda: 12) == 12
+    assert metadata_cache.get_or_call("size", dataset, {}, lambda: 13) == 12
+    metadata_cache.invalidate(dataset)
+    metadata_cache.invalidate(dataset)
+    assert statsd_client.incr.call_args_list == [
+        call("galaxy.object_store.metadata_cache.misses", tags={"method": "size"}),
+        call("galaxy.object_store.metadata_cache.hits", tags={"method": "size"}),
+        call("galaxy.object_store.metadata_cache.invalidations", tags=None),
+    ]
+
+
 DISK_TEST_CONFIG_BY_UUID_YAML = """
 type: disk
 files_dir: "${temp_directory}/files1"
@@ -855,6 +933,16 @@ extra_dirs:
 """
 
 
+def test_s3_md5_from_etag():
+    md5 = "d41d8cd98f00b204e9800998ecf8427e"
+    assert md5_from_etag(Bunch(etag=f'"{md5}"', encrypted=None)) == md5
+    assert md5_from_etag(Bunch(etag=f'"{md5}"', encrypted="AES256")) == md5
+    # SSE-KMS and multipart ETags are not the MD5 of the content
+    assert md5_from_etag(Bunch(etag=f'"{md5}"', encrypted="aws:kms")) is None
+    assert md5_from_etag(Bunch(etag=f'"{md5}-3"', encrypted=None)) is None
+    assert md5_from_etag(Bunch(etag=None, encrypted=None)) is None
+
+
 def test_config_parse_s3_with_default_cache():
     for config_str in [S3_DEFAULT_CACHE_TEST_CONFIG, S3_DEFAULT_CACHE_TEST_CONFIG_YAML]:
         with TestConfig(config_str, clazz=UninitializedS3ObjectStore) as (directory, object_store):
@@ -1222,6 +1310,146 @@ def test_fits_in_cache_check(tmp_path):
     assert noop_cache_target.fits_in_cache(1024 * 1024 * 1024 * 100)
 
 
+def test_cache_index_adopts_existing_files(tmp_path):
+    (tmp_path / "000").mkdir()
+    (tmp_path / "000" / "dataset_1.dat").write_text("moo")
+    index = CacheIndex(str(tmp_path))
+    assert index.total_size() == 3
+    assert index.entry(os.path.join("000", "dataset_1.dat"))["size"] == 3
+    index.close()
+    assert CacheIndex.exists_for(str(tmp_path))
+
+
+def test_cache_index_ignores_partial_downloads(tmp_path):
+    (tmp_path / "000").mkdir()
+    (tmp_path / "000" / "dataset_1.dat.partial").write_text("mo")
+    (tmp_path / "000" / "dataset_1.dat.partial.json").write_text("{}")
+    index = CacheIndex(str(tmp_path))
+    assert index.total_size() == 0
+    index.record(os.path.join("000", "dataset_1.dat.partial"), 2)
+    assert index.entry(os.path.join("000", "dataset_1.dat.partial")) is None
+    index.close()
+
+
+def test_check_cache_uses_index(tmp_path):
+    for name in ["a_file_0", "a_file_1", "a_file_2"]:
+        (tmp_path / name).write_text("this is an example file")
+    index = CacheIndex(str(tmp_path))
+    index.touch("a_file_0", now=100)
+    index.touch("a_file_1", now=300)
+    index.touch("a_file_2", now=200)
+    index.pin("a_file_0", until=time.time() + 60, holder="1")
+    index.pin("a_file_0", until=time.time() + 60, holder="2")
+    # every unpinned file needs to go, least recently used first
+    check_cache(CacheTarget(str(tmp_path), 1, 0.000000001))
+    assert (tmp_path / "a_file_0").exists()
+    assert not (tmp_path / "a_file_1").exists()
+    assert not (tmp_path / "a_file_2").exists()
+    assert index.entry("a_file_1") is None
+    # the file is still needed by the second holder
+    index.unpin("a_file_0", holder="1")
+    assert index.pins("a_file_0") == ["2"]
+    check_cache(CacheTarget(str(tmp_path), 1, 0.000000001))
+    assert (tmp_path / "a_file_0").exists()
+    index.unpin("a_file_0", holder="2")
+    check_cache(CacheTarget(str(tmp_path), 1, 0.000000001))
+    assert not (tmp_path / "a_file_0").exists()
+    assert index.total_size() == 0
+
+
+def test_cache_index_eviction_order(tmp_path):
+    for name in ["recent", "frequent"]:
+        (tmp_path / name).write_text("12345")
+    index = CacheIndex(str(tmp_path))
+    for _ in range(5):
+        index.touch("frequent", now=100)
+    index.touch("recent", now=200)
+    assert index.evict(1, now=time.time()) == 5
+    assert not (tmp_path / "frequent").exists()
+    (tmp_path / "frequent").write_text("12345")
+    index.record("frequent", 5, now=100)
+    for _ in range(5):
+        index.touch("frequent", now=100)
+    assert index.evict(1, EVICTION_POLICY_LFU, now=time.time()) == 5
+    assert not (tmp_path / "recent").exists()
+    assert (tmp_path / "frequent").exists()
+
+
+def test_cache_index_expired_pins(tmp_path):
+    (tmp_path / "a_file").write_text("12345")
+    index = CacheIndex(str(tmp_path))
+    index.pin("a_file", until=time.time() - 1, holder="1")
+    assert index.pins("a_file") == []
+    assert index.evict(1) == 5
+    assert not (tmp_path / "a_file").exists()
+
+
+def test_single_flight_deduplicates_concurrent_calls():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def download():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return True
+
+    def fetch():
+        results.append(single_flight.do("000/dataset_1.dat", download))
+
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == [1]
+    assert results == [True, True, True, True]
+
+
+def test_object_store_cache_fetch_and_prefetch(tmp_path):
+    object_cache = ObjectStoreCache(CacheTarget(str(tmp_path), 1, 0.9), prefetch=True)
+    downloads = []
+
+    def download(rel_path):
+        downloads.append(rel_path)
+        cache_path = tmp_path / rel_path
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text("moo")
+        return True
+
+    rel_path = os.path.join("000", "dataset_1.dat")
+    assert object_cache.fetch(rel_path, download)
+    assert object_cache.fetch(rel_path, download)
+    assert downloads == [rel_path]
+    assert object_cache.index.entry(rel_path)["size"] == 3
+
+    prefetched_path = os.path.join("000", "dataset_2.dat")
+    object_cache.prefetch(prefetched_path, download, holder="1")
+    object_cache.pin(prefetched_path, holder="2")
+    for _ in range(100):
+        # recorded in the index once the download is complete
+        if object_cache.index.entry(prefetched_path):
+            break
+        time.sleep(0.05)
+    object_cache.shutdown()
+    assert downloads == [rel_path, prefetched_path]
+    assert object_cache.index.entry(prefetched_path)["pinned_until"] > time.time()
+    object_cache.unpin(prefetched_path, holder="1")
+    assert object_cache.index.pins(prefetched_path) == ["2"]
+    object_cache.unpin(prefetched_path, holder="2")
+    assert object_cache.index.entry(prefetched_path)["pinned_until"] == 0
+
+    object_cache.forget("000", entire_dir=True)
+    assert object_cache.index.total_size() == 0
+
+
 AZURE_BLOB_NO_CACHE_TEST_CONFIG = """<object_store type="azure_blob">
     <auth account_name="azureact" account_key="password123" />
     <container name="unique_container_name" max_chunk_size="250"/>
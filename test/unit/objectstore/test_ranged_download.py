@@ -0,0 +1,154 @@
+import hashlib
+import os
+import threading
+import time
+from xml.etree.ElementTree import fromstring
+
+import pytest
+
+from galaxy.objectstore.ranged_download import (
+    ChecksumMismatch,
+    download_config_from_dict,
+    DownloadConfig,
+    is_partial_download,
+    parse_download_config_dict_from_xml,
+    ranged_download,
+)
+
+# 1 MB parts
+CONFIG = DownloadConfig(threads=4, part_size=1)
+DATA = os.urandom(5 * 1024 * 1024 + 123)
+MD5 = ("md5", hashlib.md5(DATA).hexdigest())
+
+
+def _read_range(start, end):
+    return DATA[start : end + 1]
+
+
+def test_ranged_download(tmp_path):
+    destination = str(tmp_path / "dataset_1.dat")
+    requested = []
+
+    def read_range(start, end):
+        requested.append((start, end))
+        return _read_range(start, end)
+
+    ranged_download(destination, len(DATA), read_range, CONFIG, checksum=MD5, fingerprint="v1")
+    with open(destination, "rb") as fh:
+        assert fh.read() == DATA
+    assert len(requested) == 6
+    assert sorted(requested)[-1] == (5 * 1024 * 1024, len(DATA) - 1)
+    assert sorted(os.listdir(tmp_path)) == ["dataset_1.dat"]
+
+
+def test_ranged_download_resumes(tmp_path):
+    destination = str(tmp_path / "dataset_1.dat")
+    failing_part_start = 3 * 1024 * 1024
+
+    def failing_read_range(start, end):
+        if start == failing_part_start:
+            raise OSError("connection reset")
+        return _read_range(start, end)
+
+    with pytest.raises(OSError):
+        ranged_download(destination, len(DATA), failing_read_range, DownloadConfig(threads=1, part_size=1), MD5, "v1")
+    assert not os.path.exists(destination)
+    assert os.path.exists(f"{destination}.partial.json")
+
+    requested = []
+
+    def read_range(start, end):
+        requested.append(start)
+        return _read_range(start, end)
+
+    ranged_download(destination, len(DATA), read_range, CONFIG, checksum=MD5, fingerprint="v1")
+    assert failing_part_start in requested
+    assert 0 not in requested
+    with open(destination, "rb") as fh:
+        assert fh.read() == DATA
+
+
+def test_ranged_download_restarts_if_object_changed(tmp_path):
+    destination = str(tmp_path / "dataset_1.dat")
+    with pytest.raises(OSError):
+        ranged_download(destination, len(DATA), _fail_after_first_part(), DownloadConfig(1, 1), MD5, "v1")
+    requested = []
+
+    def read_range(start, end):
+        requested.append(start)
+        return _read_range(start, end)
+
+    ranged_download(destination, len(DATA), read_range, CONFIG, checksum=MD5, fingerprint="v2")
+    assert 0 in requested
+
+
+def test_concurrent_ranged_downloads_of_same_object(tmp_path):
+    destination = str(tmp_path / "dataset_1.dat")
+    active = set()
+    overlapping = []
+    errors = []
+
+    def download(name):
+        def read_range(start, end):
+            active.add(name)
+            overlapping.append(len(active) > 1)
+            time.sleep(0.01)
+            active.discard(name)
+            return _read_range(start, end)
+
+        try:
+            ranged_download(destination, len(DATA), read_range, DownloadConfig(2, 1), checksum=MD5, fingerprint="v1")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=download, args=(name,)) for name in ("handler_1", "handler_2")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert overlapping and not any(overlapping)
+    with open(destination, "rb") as fh:
+        assert fh.read() == DATA
+    assert sorted(os.listdir(tmp_path)) == ["dataset_1.dat"]
+
+
+def test_ranged_download_checksum_mismatch(tmp_path):
+    destination = str(tmp_path / "dataset_1.dat")
+    with pytest.raises(ChecksumMismatch):
+        ranged_download(destination, len(DATA), _read_range, CONFIG, checksum=("md5", "0" * 32))
+    assert os.listdir(tmp_path) == []
+    ranged_download(destination, len(DATA), _read_range, CONFIG._replace(verify_checksum=False), ("md5", "0" * 32))
+    assert os.path.getsize(destination) == len(DATA)
+
+
+def test_ranged_download_empty_object(tmp_path):
+    destination = str(tmp_path / "dataset_1.dat")
+    ranged_download(destination, 0, _read_range, CONFIG, checksum=("md5", hashlib.md5(b"").hexdigest()))
+    assert os.path.getsize(destination) == 0
+
+
+def test_is_partial_download():
+    assert is_partial_download("000/dataset_1.dat.partial")
+    assert is_partial_download("000/dataset_1.dat.partial.json")
+    assert is_partial_download("000/dataset_1.dat.partial.json.tmp")
+    assert is_partial_download("000/dataset_1.dat.partial.lock")
+    assert not is_partial_download("000/dataset_1.dat")
+
+
+def test_parse_download_config():
+    config_xml = fromstring('<object_store type="aws_s3"><download threads="8" part_size="32" /></object_store>')
+    config = download_config_from_dict(parse_download_config_dict_from_xml(config_xml))
+    assert config.ranged
+    assert config.part_size_bytes == 32 * 1024 * 1024
+    assert config.verify_checksum
+    assert not download_config_from_dict(None).ranged
+
+
+def _fail_after_first_part():
+    def read_range(start, end):
+        if start > 0:
+            raise OSError("connection reset")
+        return _read_range(start, end)
+
+    return read_range
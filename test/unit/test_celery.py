@@ -22,6 +22,10 @@ def test_default_configuration():
         "task": "galaxy.prune_history_audit_table",
         "schedule": galaxy_conf.history_audit_table_prune_interval,
     }
+    assert conf.beat_schedule["compact-history-state-counts"] == {
+        "task": "galaxy.compact_history_state_counts",
+        "schedule": galaxy_conf.history_state_count_compaction_interval,
+    }
     assert conf.beat_schedule["cleanup-short-term-storage"] == {
         "task": "galaxy.cleanup_short_term_storage",
         "schedule": galaxy_conf.short_term_storage_cleanup_interval,
@@ -30,6 +34,12 @@ def test_default_configuration():
         "task": "galaxy.cleanup_expired_notifications",
         "schedule": galaxy_conf.expired_notifications_cleanup_interval,
     }
+    assert conf.beat_schedule["reconcile-user-disk-usage"] == {
+        "task": "galaxy.reconcile_user_disk_usage",
+        "schedule": galaxy_conf.disk_usage_reconciliation_interval,
+    }
+    # disabled by default
+    assert "prewarm-container-resolution-cache" not in conf.beat_schedule
 
 
 def test_galaxycelery_trim_module_name():
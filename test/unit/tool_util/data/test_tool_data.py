@@ -60,3 +60,30 @@ def test_to_json(merged_tdt_manager, tmp_path):
     assert not json_path.exists()
     merged_tdt_manager.to_json(json_path)
     assert json_path.exists()
+
+
+def test_indexed_lookups(tdt_manager, tmp_path):
+    table = tdt_manager["testalpha"]
+    assert table.get_entry("value", "data2", "name") == "data2name"
+    assert table.get_entry("name", "data1name", "value") == "data1"
+    assert table.get_entry("value", "data3", "name") is None
+    entries = table.get_entries("value", "data1", None)
+    assert entries == [{"value": "data1", "name": "data1name", "path": f"{tmp_path}/data1/entry.txt"}]
+    assert table.get_field("data2")["name"] == "data2name"
+    assert [fields[0] for fields in table.get_fields_by_column_values(0, ["data2", "data1", "missing"])] == [
+        "data1",
+        "data2",
+    ]
+
+    # indexes follow entries added to the table
+    table.add_entry(["data3", "data3name", "/data3"])
+    table.add_entry(["data3", "data3name_copy", "/data3_copy"])
+    assert table.get_entries("value", "data3", "name") == ["data3name", "data3name_copy"]
+    assert table.get_entry("name", "data3name_copy", "path") == "/data3_copy"
+
+    # and are rebuilt when the table is reloaded
+    loc1 = tmp_path / "testalpha.loc"
+    loc1.write_text(LOC_ALPHA_CONTENTS_V2)
+    tdt_manager.reload_tables("testalpha")
+    table = tdt_manager["testalpha"]
+    assert table.get_entries("value", "data3", "name") == ["data3name"]
@@ -4,12 +4,14 @@ import pytest
 from beaker.cache import CacheManager
 from beaker.util import parse_cache_config_options
 
+from galaxy.tool_util.deps.conda_util import CondaTarget
 from galaxy.tool_util.deps.container_resolvers import ResolutionCache
+from galaxy.tool_util.deps.container_resolvers.mulled import targets_to_mulled_name
 from galaxy.tool_util.deps.mulled.util import (
     _namespace_has_repo_name,
     mulled_tags_for,
     NAMESPACE_HAS_REPO_NAME_KEY,
-    TAG_CACHE_KEY,
+    tag_cache_key,
 )
 
 
@@ -22,8 +24,9 @@ def resolution_cache(tmpdir):
         "cache.lock_dir": str(tmpdir / "lock"),
         "cache.expire": "1",
     }
-    cm = CacheManager(**parse_cache_config_options(cache_opts)).get_cache("mulled_resolution")
-    resolution_cache.mulled_resolution_cache = cm
+    cache_manager = CacheManager(**parse_cache_config_options(cache_opts))
+    resolution_cache.mulled_resolution_cache = cache_manager.get_cache("mulled_resolution")
+    resolution_cache.mulled_unresolved_cache = cache_manager.get_cache("mulled_unresolved")
     return resolution_cache
 
 
@@ -48,6 +51,33 @@ def test_resolution_cache_expires(resolution_cache):
 def test_targets_to_mulled_name(resolution_cache):
     resolution_cache.mulled_resolution_cache[NAMESPACE_HAS_REPO_NAME_KEY] = ["mytool3000"]
     cache = resolution_cache.mulled_resolution_cache._get_cache("mulled_tag_cache", {"expire": 1})
-    cache[TAG_CACHE_KEY] = {"bioconda": {"mytool3000": ["1.0", "1.1"]}}
+    cache[tag_cache_key("bioconda", "mytool3000")] = ["1.0", "1.1"]
     tags = mulled_tags_for(namespace="bioconda", image="mytool3000", resolution_cache=resolution_cache)
     assert tags == ["1.1", "1.0"]
+
+
+def test_targets_to_mulled_name_cached(resolution_cache):
+    resolution_cache.mulled_resolution_cache[NAMESPACE_HAS_REPO_NAME_KEY] = ["mytool3000"]
+    cache = resolution_cache.mulled_resolution_cache._get_cache("mulled_tag_cache", {"expire": 1})
+    cache[tag_cache_key("bioconda", "mytool3000")] = ["1.0--0", "1.1--0"]
+    targets = [CondaTarget("mytool3000", "1.1")]
+    name = targets_to_mulled_name(targets, "v2", "bioconda", resolution_cache=resolution_cache)
+    assert name == "mytool3000:1.1--0"
+    # a new per-request cache finds the name in the persistent cache without consulting the tags
+    cache.clear()
+    persistent_only = ResolutionCache()
+    persistent_only.mulled_resolution_cache = resolution_cache.mulled_resolution_cache
+    assert targets_to_mulled_name(targets, "v2", "bioconda", resolution_cache=persistent_only) == name
+
+
+def test_targets_to_mulled_name_unresolved(resolution_cache):
+    resolution_cache.mulled_resolution_cache[NAMESPACE_HAS_REPO_NAME_KEY] = ["mytool3000"]
+    targets = [CondaTarget("othertool", "1.0")]
+    assert targets_to_mulled_name(targets, "v2", "bioconda", resolution_cache=resolution_cache) is None
+    assert "ns[bioconda]__single__othertool__@__1.0" in resolution_cache.mulled_unresolved_cache
+    # the namespace listing is not consulted again while the failed resolution is cached
+    resolution_cache.mulled_resolution_cache.clear()
+    new_request_cache = ResolutionCache()
+    new_request_cache.mulled_resolution_cache = resolution_cache.mulled_resolution_cache
+    new_request_cache.mulled_unresolved_cache = resolution_cache.mulled_unresolved_cache
+    assert targets_to_mulled_name(targets, "v2", "bioconda", resolution_cache=new_request_cache) is None
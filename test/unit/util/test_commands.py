@@ -1,6 +1,13 @@
 import os
+import subprocess
+import time
 
-from galaxy.util.commands import new_clean_env
+import pytest
+
+from galaxy.util.commands import (
+    execute,
+    new_clean_env,
+)
 
 
 def test_new_clean_env() -> None:
@@ -18,3 +25,11 @@ def test_new_clean_env() -> None:
             assert clean_env[k] == saved_environ[k]
     assert clean_env["LC_CTYPE"].endswith("UTF-8")
     assert clean_env["TMPDIR"]
+
+
+def test_execute_timeout() -> None:
+    assert execute(["echo", "hello"], timeout=10).strip() == "hello"
+    start = time.time()
+    with pytest.raises(subprocess.TimeoutExpired):
+        execute(["sleep", "10"], timeout=0.1)
+    assert time.time() - start < 5
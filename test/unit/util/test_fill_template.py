@@ -1,7 +1,16 @@
+from unittest.mock import (
+    call,
+    Mock,
+)
+
 import pytest
 from Cheetah.NameMapper import NotFound
 
-from galaxy.util.template import fill_template
+from galaxy.util.template import (
+    CompiledTemplateCache,
+    fill_template,
+    template_cache,
+)
 
 SIMPLE_TEMPLATE = """#for item in $a_list:
     echo $item
@@ -80,3 +89,52 @@ def test_fix_template_two_to_three():
 def test_fix_template_invalid_cheetah():
     template_str = fill_template(INVALID_CHEETAH_SYNTAX, python_template_version="2", retry=1)
     assert template_str == "1 is 1\n"
+
+
+def test_compiled_template_cache():
+    cache = CompiledTemplateCache(max_size=2)
+    klass = cache.compile(SIMPLE_TEMPLATE)
+    assert cache.compile(SIMPLE_TEMPLATE) is klass
+    cache.compile(GEN_EXPR_TEMPLATE)
+    cache.compile(SET_COMPR_TEMPLATE)
+    assert cache.stats() == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 1,
+        "misses": 3,
+        "evictions": 1,
+        "hit_rate": 0.25,
+    }
+    assert cache.compile(SIMPLE_TEMPLATE) is not klass
+
+
+def test_compiled_template_cache_configure():
+    statsd_client = Mock()
+    cache = CompiledTemplateCache()
+    cache.compile(SIMPLE_TEMPLATE)
+    cache.compile(GEN_EXPR_TEMPLATE)
+    cache.configure(1, statsd_client=statsd_client)
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["evictions"] == 1
+    cache.compile(GEN_EXPR_TEMPLATE)
+    cache.compile(SIMPLE_TEMPLATE)
+    assert statsd_client.incr.call_args_list == [
+        call("galaxy.templates.cache.evictions", 1),
+        call("galaxy.templates.cache.hits", 1),
+        call("galaxy.templates.cache.misses", 1),
+        call("galaxy.templates.cache.evictions", 1),
+    ]
+
+
+def test_fixed_template_remembered():
+    template_cache.clear()
+    assert fill_template(TWO_TO_THREE_TEMPLATE, python_template_version="2", retry=1) == "a a 1"
+    fixed = template_cache.fixed(TWO_TO_THREE_TEMPLATE)
+    assert fixed is not None
+    misses = template_cache.misses
+    # later fills start with the fixed template class and compile nothing
+    assert fill_template(TWO_TO_THREE_TEMPLATE, python_template_version="2", retry=1) == "a a 1"
+    assert template_cache.misses == misses
+    # but python 3 templates never use python 2 fixes
+    with pytest.raises(AttributeError):
+        fill_template(TWO_TO_THREE_TEMPLATE, retry=1)
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+
+from sqlalchemy import update
+from sqlalchemy.orm import object_session
+
+from galaxy import model
+from galaxy.app_unittest_utils.galaxy_mock import MockApp
+from galaxy.util.bunch import Bunch
+from galaxy.workflow.scheduling_manager import (
+    invocation_lanes,
+    WorkflowRequestMonitor,
+)
+
+SCHEDULER_ID = "default"
+HANDLER = "main"
+
+
+class RecordingScheduler:
+    def __init__(self, on_schedule=None):
+        self.scheduled = []
+        self.on_schedule = on_schedule
+
+    def schedule(self, workflow_invocation):
+        self.scheduled.append((threading.current_thread().name, workflow_invocation.id))
+        if self.on_schedule:
+            self.on_schedule(workflow_invocation)
+
+
+def test_invocation_lanes_keep_histories_together():
+    rows = [(1, 10, 1), (2, 11, 1), (3, 12, 2), (4, 10, 1), (5, 11, 1), (6, 13, 2)]
+    lanes = invocation_lanes(rows, 2)
+    assert lanes == [[1, 3, 4], [2, 6, 5]]
+    assert invocation_lanes(rows, 1) == [[1, 3, 2, 6, 4, 5]]
+
+
+def test_schedule_batches_users_take_turns():
+    app = _app()
+    users = [_user(app, i) for i in range(3)]
+    ids = [_invocation(app, users[0]) for _ in range(3)]
+    ids += [_invocation(app, user) for user in users[1:]]
+    scheduler = RecordingScheduler()
+    monitor = _monitor(app, batch_size=2, threads=1)
+    monitor._schedule(SCHEDULER_ID, scheduler)
+    assert [invocation_id for _, invocation_id in scheduler.scheduled] == [ids[0], ids[3], ids[4], ids[1], ids[2]]
+
+
+def test_schedule_batches_across_lanes():
+    app = _app()
+    user = _user(app, 0)
+    histories = [_history(app, user) for _ in range(4)]
+    ids_by_history = {history.id: [_invocation(app, user, history) for _ in range(3)] for history in histories}
+    scheduler = RecordingScheduler()
+    monitor = _monitor(app, batch_size=2, threads=2)
+    try:
+        monitor._schedule(SCHEDULER_ID, scheduler)
+    finally:
+        monitor.executor.shutdown()
+    assert sorted(invocation_id for _, invocation_id in scheduler.scheduled) == sorted(
+        invocation_id for ids in ids_by_history.values() for invocation_id in ids
+    )
+    assert len({thread for thread, _ in scheduler.scheduled}) == 2
+    for ids in ids_by_history.values():
+        # a history is scheduled by a single thread, in order
+        scheduled = [(thread, invocation_id) for thread, invocation_id in scheduler.scheduled if invocation_id in ids]
+        assert len({thread for thread, _ in scheduled}) == 1
+        assert [invocation_id for _, invocation_id in scheduled] == ids
+
+
+def test_schedule_batches_sees_changes_made_during_the_batch():
+    app = _app()
+    user = _user(app, 0)
+    first, second = _invocation(app, user), _invocation(app, user)
+
+    def cancel_second(workflow_invocation):
+        # e.g. a web request cancelling the invocation, not seen by the identity map of the batch's session
+        session = object_session(workflow_invocation)
+        session.connection().execute(
+            update(model.WorkflowInvocation.__table__)
+            .where(model.WorkflowInvocation.id == second)
+            .values(state=model.WorkflowInvocation.states.CANCELLED)
+        )
+        session.commit()
+
+    scheduler = RecordingScheduler(on_schedule=cancel_second)
+    monitor = _monitor(app, batch_size=2, threads=1)
+    monitor._schedule(SCHEDULER_ID, scheduler)
+    assert [invocation_id for _, invocation_id in scheduler.scheduled] == [first]
+
+
+def _app():
+    # the scheduling threads need to share a database
+    database_connection = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'universe.sqlite')}"
+    app = MockApp(database_connection=database_connection)
+    app.config.server_name = HANDLER
+    app.config.history_local_serial_workflow_scheduling = False
+    app.job_config.self_handler_tags = []
+    return app
+
+
+def _monitor(app, batch_size, threads):
+    app.config.workflow_scheduling_batch_size = batch_size
+    app.config.workflow_scheduling_threads = threads
+    workflow_scheduling_manager = Bunch(
+        default_handler_id=HANDLER,
+        handler_assignment_methods=None,
+        handler_max_grab=None,
+        active_workflow_schedulers={},
+    )
+    return WorkflowRequestMonitor(app, workflow_scheduling_manager)
+
+
+def _user(app, index):
+    user = model.User(email=f"scheduling{index}@example.com", password="password")
+    _persist(app, user)
+    return user
+
+
+def _history(app, user):
+    history = model.History(user=user)
+    _persist(app, history)
+    return history
+
+
+def _invocation(app, user, history=None):
+    invocation = model.WorkflowInvocation()
+    invocation.workflow = model.Workflow()
+    invocation.history = history or _history(app, user)
+    invocation.state = model.WorkflowInvocation.states.NEW
+    invocation.scheduler = SCHEDULER_ID
+    invocation.handler = HANDLER
+    _persist(app, invocation)
+    return invocation.id
+
+
+def _persist(app, obj):
+    session = app.model.context
+    session.add(obj)
+    session.commit()